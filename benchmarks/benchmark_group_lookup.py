@@ -0,0 +1,55 @@
+"""
+Compares looking up children by name in a group with thousands of children, using the name index in NamedList against
+scanning a plain list, which is how every group[name], name in group and attribute lookup worked before.
+
+Usage: python -m benchmarks.benchmark_group_lookup [--children N] [--repeats N]
+"""
+import argparse
+import timeit
+
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.helpers import _get_item
+from nexus_constructor.model.value_type import ValueTypes
+
+
+def create_group(number_of_children: int) -> Group:
+    group = Group("large_group")
+    group.nx_class = "NXcollection"
+    for index in range(number_of_children):
+        group.set_field_value(f"field_{index}", index, ValueTypes.INT)
+    return group
+
+
+def look_up_all_children(group: Group, names):
+    for name in names:
+        assert name in group
+        group[name].attributes.contains_attribute("units")
+
+
+def scan_all_children(children: list, names):
+    for name in names:
+        assert _get_item(children, name) is not None
+        _get_item(children, name).attributes.contains_attribute("units")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--children", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    group = create_group(args.children)
+    names = [child.name for child in group.children]
+    plain_children = list(group.children)
+    print(f"Looking up each of {len(names)} children by name")
+
+    for name, function in [
+        ("scan", lambda: scan_all_children(plain_children, names)),
+        ("indexed", lambda: look_up_all_children(group, names)),
+    ]:
+        best = min(timeit.repeat(function, number=1, repeat=args.repeats))
+        print(f"{name:>10}: {best:.4f} s")
+
+
+if __name__ == "__main__":
+    main()
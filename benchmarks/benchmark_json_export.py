@@ -0,0 +1,76 @@
+"""
+Compares exporting the filewriter JSON of a model with a large mesh using the streaming writer in json_writer against
+json.dump of Model.as_dict, which converts every array to nested lists of Python numbers first.
+
+Usage: python -m benchmarks.benchmark_json_export [--vertices N] [--repeats N]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from nexus_constructor.json.json_writer import write_model_json
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.model import Model
+
+
+class DiscardedOutput:
+    """
+    A file which throws away what is written to it, so that only the time taken to produce the text is measured.
+    """
+
+    def write(self, text: str):
+        pass
+
+
+def create_model(number_of_vertices: int) -> Model:
+    entry = Entry()
+    entry.instrument = Instrument()
+    component = Component("detector")
+    # Quads using random vertices, as only the size of the arrays matters here
+    rng = np.random.default_rng(0)
+    winding_order = rng.integers(0, number_of_vertices, size=number_of_vertices * 2)
+    component.set_off_shape(
+        OFFGeometryNoNexus.from_winding_order(
+            rng.random((number_of_vertices, 3)),
+            winding_order,
+            np.arange(0, len(winding_order), 4),
+        ),
+        units="m",
+    )
+    entry.instrument.add_component(component)
+    return Model(entry)
+
+
+def peak_memory(function) -> float:
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vertices", type=int, default=300000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    model = create_model(args.vertices)
+    print(f"Exporting a model with a mesh of {args.vertices} vertices")
+
+    for name, function in [
+        ("json.dump", lambda: json.dump(model.as_dict(), DiscardedOutput(), indent=2)),
+        ("streaming", lambda: write_model_json(model, DiscardedOutput(), indent=2)),
+    ]:
+        best = min(timeit.repeat(function, number=1, repeat=args.repeats))
+        print(f"{name:>10}: {best:.4f} s, peak {peak_memory(function):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures the frame time of the instrument view drawing many large component meshes at each level of detail, and with
+the level chosen by the size of each component on the screen.
+
+Each component is a flat grid of quads. Frames are timed with a QFrameAction while the view is redrawn continuously, so
+this needs a display with OpenGL rather than the offscreen platform.
+
+Usage: python -m benchmarks.benchmark_lod_rendering [--components N] [--faces N] [--seconds S]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from PySide2 import QtCore
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DLogic import Qt3DLogic
+from PySide2.Qt3DRender import Qt3DRender
+from PySide2.QtGui import QVector3D
+from PySide2.QtWidgets import QApplication
+
+from benchmarks.meshes import create_grid_mesh
+from nexus_constructor.instrument_view.instrument_view import InstrumentView
+from nexus_constructor.instrument_view.level_of_detail import DetailLevel
+
+
+def wait_for(app: QApplication, condition, timeout: float):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        app.processEvents(QtCore.QEventLoop.AllEvents, 50)
+
+
+def time_frames(app: QApplication, view: InstrumentView, seconds: float) -> np.ndarray:
+    """
+    :return: The time taken by each frame drawn during the given number of seconds, in seconds.
+    """
+    frame_times = []
+    frame_action = Qt3DLogic.QFrameAction(view.root_entity)
+    frame_action.triggered.connect(frame_times.append)
+    view.root_entity.addComponent(frame_action)
+    # Skip the frames drawn while switching level
+    wait_for(app, lambda: False, 0.5)
+    frame_times.clear()
+    wait_for(app, lambda: False, seconds)
+    view.root_entity.removeComponent(frame_action)
+    frame_action.setParent(None)
+    return np.array(frame_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument("--faces", type=int, default=200000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    QApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts, True)
+    app = QApplication(sys.argv[:1])
+    view = InstrumentView(None)
+    view.resize(1280, 720)
+    view.show()
+    view.view.renderSettings().setRenderPolicy(Qt3DRender.QRenderSettings.Always)
+
+    mesh = create_grid_mesh(args.faces)
+    side = mesh.vertices_array.max()
+    names = [f"bank_{index}" for index in range(args.components)]
+    for index, name in enumerate(names):
+        view.add_component(name, mesh)
+        # Shrink the banks to a metre across and spread them out along the x axis
+        transformation = Qt3DCore.QTransform()
+        transformation.setScale(1 / side)
+        transformation.setTranslation(
+            QVector3D(1.5 * (index - args.components / 2), 0, 0)
+        )
+        view.add_transformation(name, transformation)
+    wait_for(app, lambda: len(view._level_switches) == len(names), 600)
+    print(f"{args.components} components of {mesh.number_of_faces} faces")
+
+    for level in [*DetailLevel, None]:
+        for name in names:
+            view.set_detail_level(name, level)
+        frame_times = time_frames(app, view, args.seconds)
+        label = "automatic" if level is None else level.name.lower()
+        if len(frame_times) == 0:
+            print(f"{label:>13}: no frames were drawn")
+            continue
+        median = np.median(frame_times)
+        print(
+            f"{label:>13}: median frame {median * 1000:.1f} ms ({1 / median:.0f} fps), "
+            f"worst {frame_times.max() * 1000:.1f} ms over {len(frame_times)} frames"
+        )
+
+    view.delete()
+
+
+if __name__ == "__main__":
+    main()
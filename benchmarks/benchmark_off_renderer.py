@@ -0,0 +1,96 @@
+"""
+Compares building the Qt3D vertex and normal buffers for an OFF mesh with the vectorised pipeline in off_renderer
+against the previous pure Python implementation, which triangulated faces in a loop, computed one QVector3D.normal
+per triangle and packed the buffers with struct.
+
+Usage: python -m benchmarks.benchmark_off_renderer [--faces N] [--repeats N]
+"""
+import argparse
+import itertools
+import struct
+import timeit
+
+import numpy as np
+from PySide2.QtGui import QVector3D
+
+from benchmarks.meshes import create_grid_mesh
+from nexus_constructor.instrument_view.off_renderer import (
+    convert_faces_into_triangles,
+    convert_to_bytes,
+    create_normal_buffer,
+    create_vertex_buffer,
+)
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+
+
+def legacy_buffers(model: OFFGeometryNoNexus):
+    """
+    The buffer building as it was before the vectorised pipeline, operating on lists of QVector3D.
+    """
+    vertices = model.vertices
+    triangles = []
+    for face in model.faces:
+        triangles.extend(
+            [[face[0], face[i + 1], face[i + 2]] for i in range(len(face) - 2)]
+        )
+    vertex_buffer_values = list(
+        itertools.chain.from_iterable(
+            vertices[point_index].toTuple()
+            for point_index in itertools.chain.from_iterable(triangles)
+        )
+    )
+    normal_buffer_values = []
+    for triangle in triangles:
+        normal = QVector3D.normal(*[vertices[p] for p in triangle])
+        normal_buffer_values.extend(normal.toTuple() * 3)
+    return (
+        struct.pack(f"{len(vertex_buffer_values)}f", *vertex_buffer_values),
+        struct.pack(f"{len(normal_buffer_values)}f", *normal_buffer_values),
+    )
+
+
+def vectorised_buffers(model: OFFGeometryNoNexus):
+    triangles = convert_faces_into_triangles(
+        model.winding_order_array, model.face_offsets
+    )
+    return (
+        convert_to_bytes(create_vertex_buffer(model.vertices_array, triangles)),
+        convert_to_bytes(create_normal_buffer(model.vertices_array, triangles)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--faces", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    model = create_grid_mesh(args.faces)
+    print(
+        f"Mesh with {model.number_of_faces} faces and {len(model.vertices_array)} vertices"
+    )
+
+    legacy_vertices, legacy_normals = legacy_buffers(model)
+    new_vertices, new_normals = vectorised_buffers(model)
+    assert np.allclose(
+        np.frombuffer(legacy_vertices, np.float32),
+        np.frombuffer(new_vertices, np.float32),
+    )
+    assert np.allclose(
+        np.frombuffer(legacy_normals, np.float32),
+        np.frombuffer(new_normals, np.float32),
+        atol=1e-6,
+    )
+
+    for name, function in [
+        ("legacy", legacy_buffers),
+        ("vectorised", vectorised_buffers),
+    ]:
+        best = min(
+            timeit.repeat(lambda: function(model), number=1, repeat=args.repeats)
+        )
+        print(f"{name:>10}: {best:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measures how long the nexus-constructor takes from starting to first painting its main window, following the same
+steps as nexus-constructor.py. Each run is a fresh Python process so that the imports are timed from cold.
+
+Also reports the time taken by the imports, by creating the main window, and until the NXDL definitions being parsed
+in the background are ready.
+
+Usage: python -m benchmarks.benchmark_startup [--repeats N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+STEPS = ["imports", "window", "first paint", "definitions"]
+
+
+def time_startup() -> Dict[str, float]:
+    """
+    Starts the application in this process and closes it once the window has been painted.
+    :return: The time since starting at which each step finished, in seconds.
+    """
+    start = time.perf_counter()
+    from PySide2 import QtCore
+    from PySide2.QtCore import QEvent, QObject, QTimer
+    from PySide2.QtWidgets import QApplication, QMainWindow
+
+    from nexus_constructor.component_type import (
+        load_component_definitions_in_background,
+    )
+    from nexus_constructor.main_window import MainWindow
+    from nexus_constructor.model.entry import Entry, Instrument
+    from nexus_constructor.model.model import Model
+
+    timings = {"imports": time.perf_counter() - start}
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+            if event.type() == QEvent.Paint and "first paint" not in timings:
+                timings["first paint"] = time.perf_counter() - start
+                QTimer.singleShot(0, QApplication.instance().quit)
+            return False
+
+    definitions = load_component_definitions_in_background(
+        os.path.join(ROOT_DIR, "definitions")
+    )
+    definitions.add_done_callback(
+        lambda _: timings.setdefault("definitions", time.perf_counter() - start)
+    )
+    QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
+    QApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts, True)
+    app = QApplication(sys.argv[:1])
+    paint_filter = FirstPaintFilter()
+    app.installEventFilter(paint_filter)
+    window = QMainWindow()
+    entry = Entry()
+    entry.instrument = Instrument()
+    ui = MainWindow(Model(entry), definitions)
+    ui.setupUi(window)
+    window.showMaximized()
+    timings["window"] = time.perf_counter() - start
+
+    QTimer.singleShot(30000, app.quit)
+    app.exec_()
+    definitions.result()
+    app.removeEventFilter(paint_filter)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--child", action="store_true", help="Start once and print the timings"
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(time_startup()))
+        return
+
+    runs = []
+    for _ in range(args.repeats):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.benchmark_startup", "--child"],
+            cwd=ROOT_DIR,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        runs.append(json.loads(output.decode().strip().splitlines()[-1]))
+
+    print(f"Time since start over {args.repeats} runs")
+    for step in STEPS:
+        times = sorted(run[step] for run in runs if step in run)
+        if times:
+            print(
+                f"{step:>12}: best {times[0]:.3f} s, median {times[len(times) // 2]:.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
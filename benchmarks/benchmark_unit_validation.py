@@ -0,0 +1,50 @@
+"""
+Measures how long the unit validators take for each keystroke while units are typed, with the parsed units forgotten
+before every word, as for the first time it is typed, and remembered from earlier, as for words typed again.
+
+Usage: python -m benchmarks.benchmark_unit_validation [--repeats N]
+"""
+import argparse
+import timeit
+
+from nexus_constructor.unit_utils import (
+    METRES,
+    clear_unit_cache,
+    get_unit_registry,
+)
+from nexus_constructor.validators import UnitValidator
+
+WORDS = ["millimetres", "cm", "inches", "degrees", "micrometre", "kilometers"]
+
+
+def type_words(validator: UnitValidator, clear_cache: bool):
+    for word in WORDS:
+        if clear_cache:
+            clear_unit_cache()
+        for length in range(1, len(word) + 1):
+            validator.validate(word[:length], length)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    get_unit_registry()
+    validator = UnitValidator(expected_dimensionality=METRES)
+    keystrokes = sum(len(word) for word in WORDS)
+    print(f"Validating {keystrokes} keystrokes of units of length")
+
+    for name, clear_cache in [("first time", True), ("typed again", False)]:
+        best = min(
+            timeit.repeat(
+                lambda: type_words(validator, clear_cache),
+                number=1,
+                repeat=args.repeats,
+            )
+        )
+        print(f"{name:>12}: {best / keystrokes * 1e6:.1f} us per keystroke")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Meshes shared by the benchmarks.
+"""
+import numpy as np
+
+from nexus_constructor.model.geometry import OFFGeometryNoNexus, face_sizes_to_offsets
+
+
+def create_grid_mesh(number_of_faces: int) -> OFFGeometryNoNexus:
+    """
+    Creates a flat grid of quads with (at least) the requested number of faces, with shared vertices between quads.
+    """
+    side = int(np.ceil(np.sqrt(number_of_faces)))
+    x, y = np.meshgrid(np.arange(side + 1), np.arange(side + 1), indexing="ij")
+    vertices = np.column_stack((x.ravel(), y.ravel(), np.zeros(x.size))).astype(float)
+
+    corner = (np.arange(side)[:, np.newaxis] * (side + 1) + np.arange(side)).ravel()
+    winding_order = np.column_stack(
+        (corner, corner + side + 1, corner + side + 2, corner + 1)
+    ).ravel()
+    face_offsets = face_sizes_to_offsets(np.full(side * side, 4))
+    return OFFGeometryNoNexus.from_winding_order(vertices, winding_order, face_offsets)
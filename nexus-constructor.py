@@ -8,7 +8,7 @@ from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import QApplication, QMainWindow
 from PySide2 import QtCore
 
-from nexus_constructor.component_type import make_dictionary_of_class_definitions
+from nexus_constructor.component_type import load_component_definitions_in_background
 from nexus_constructor.main_window import MainWindow
 from nexus_constructor.model.entry import Instrument, Entry
 from nexus_constructor.model.model import Model
@@ -26,12 +26,15 @@ if __name__ == "__main__":
     if "help" in parser.parse_args():
         exit(0)
     logging.basicConfig(level=logging.INFO)
+    # The NXDL files are parsed while the window is being created
+    definitions_dir = os.path.abspath(os.path.join(root_dir, "definitions"))
+    nx_component_classes = load_component_definitions_in_background(definitions_dir)
     QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
+    # Lets Qt WebEngine, which the add component dialog uses, be loaded after the application has started
+    QApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts, True)
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(os.path.join("ui", "icon.png")))
     window = QMainWindow()
-    definitions_dir = os.path.abspath(os.path.join(root_dir, "definitions"))
-    _, nx_component_classes = make_dictionary_of_class_definitions(definitions_dir)
     instrument = Instrument()
     entry = Entry()
     entry.instrument = instrument
@@ -1,13 +1,25 @@
 # -*- mode: python ; coding: utf-8 -*-
 import PySide2
 import os
+import subprocess
+import sys
 
 block_cipher = None
 
+# Compile the NXDL definitions into the cache shipped next to them, so the application does not do it when it starts
+subprocess.check_call(
+    [sys.executable, "-m", "nexus_constructor.component_type", "definitions"],
+    cwd=SPECPATH,
+)
+
 added_files = [
     ("ui/*.png", "ui"),
     ("ui/*.svg", "ui"),
     ("definitions/base_classes/*.nxdl.xml", "definitions/base_classes"),
+    ("definitions/contributed_definitions/*.nxdl.xml", "definitions/contributed_definitions"),
+    ("definitions/applications/*.nxdl.xml", "definitions/applications"),
+    ("definitions/NXDL_VERSION", "definitions"),
+    ("definitions/nxdl_class_definitions.json", "definitions"),
 ]
 
 if os.path.isdir(os.path.join(PySide2.__path__[0], "Qt", "plugins", "renderers")):
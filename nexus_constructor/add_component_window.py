@@ -18,7 +18,7 @@ from nexus_constructor.geometry.disk_chopper.disk_chopper_checker import Chopper
 from nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator import (
     DiskChopperGeometryCreator,
 )
-from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.geometry.geometry_cache import geometry_cache
 from nexus_constructor.model.component import (
     Component,
     add_fields_to_component,
@@ -384,7 +384,7 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
             )
         elif self.meshRadioButton.isChecked():
             mesh_geometry = OFFGeometryNoNexus()
-            geometry_model = load_geometry(
+            geometry_model = geometry_cache.load_geometry(
                 self.cad_file_name, self.unitsLineEdit.text(), mesh_geometry
             )
 
@@ -536,6 +536,9 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         :param validity: A bool indicating whether the mesh file was opened successfully.
         """
         self.valid_file_given = validity
+        if validity:
+            # The file may only have been found valid after its name was entered, once it was checked in the background
+            self.populate_pixel_mapping_if_necessary()
 
     def populate_pixel_mapping_if_necessary(self):
         """
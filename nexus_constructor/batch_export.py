@@ -0,0 +1,200 @@
+"""
+Builds the filewriter JSON and forwarder configuration for many instruments without starting the GUI.
+
+Each input is either a filewriter JSON file, which is loaded as the instrument, or an OFF or STL geometry file, which
+becomes an instrument with a single component of that shape. The instruments are processed in parallel in a pool of
+processes, and the time taken by each step is reported for every file. Neither Qt widgets nor the 3D modules are
+imported, so no display is needed.
+
+Usage: python -m nexus_constructor.batch_export [--output-dir DIR] [--provider {ca,pva,fake}] [--units UNITS]
+       [--nx-class NX_CLASS] [--jobs N] FILE [FILE ...]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import attr
+
+from nexus_constructor.create_forwarder_config import (
+    create_forwarder_config,
+    provider_str_to_enum,
+)
+from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.json.json_writer import write_model_json
+from nexus_constructor.json.load_from_json import JSONReader
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.model import Model
+
+GEOMETRY_FILE_EXTENSIONS = (".off", ".stl")
+FORWARDER_CONFIG_EXTENSION = ".flat"
+
+
+@attr.s(frozen=True)
+class ExportOptions:
+    output_dir = attr.ib(type=str)
+    provider = attr.ib(type=Optional[str], default=None)
+    units = attr.ib(type=str, default="m")
+    nx_class = attr.ib(type=str, default="NXdetector")
+
+
+@attr.s
+class ExportResult:
+    filename = attr.ib(type=str)
+    # Seconds taken by each step, in the order they ran
+    timings = attr.ib(type=Dict[str, float], factory=dict)
+    warnings = attr.ib(type=List[str], factory=list)
+    error = attr.ib(type=Optional[str], default=None)
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+
+    def __str__(self) -> str:
+        steps = ", ".join(
+            f"{step} {seconds:.3f} s" for step, seconds in self.timings.items()
+        )
+        summary = f"{self.filename}: {steps}{', ' if steps else ''}total {self.total_time:.3f} s"
+        if self.error is not None:
+            summary += f"\n  error: {self.error}"
+        return "\n".join(
+            [summary] + [f"  warning: {warning}" for warning in self.warnings]
+        )
+
+
+def _model_from_geometry_file(filename: str, options: ExportOptions) -> Model:
+    component = Component(os.path.splitext(os.path.basename(filename))[0])
+    component.nx_class = options.nx_class
+    component.set_off_shape(
+        load_geometry(filename, options.units, OFFGeometryNoNexus()),
+        units=options.units,
+        filename=filename,
+    )
+    entry = Entry()
+    entry.instrument = Instrument()
+    entry.instrument.add_component(component)
+    return Model(entry)
+
+
+def _model_from_json_file(filename: str, result: ExportResult) -> Optional[Model]:
+    reader = JSONReader()
+    success = reader.load_model_from_json(filename, streaming=True)
+    result.warnings.extend(reader.warnings)
+    return Model(reader.entry) if success else None
+
+
+def export_instrument(filename: str, options: ExportOptions) -> ExportResult:
+    """
+    Writes the filewriter JSON, and the forwarder configuration if a provider is given, for one instrument.
+    :param filename: The filewriter JSON or geometry file the instrument is read from.
+    :param options: Where to write the output and how to build the instrument.
+    :return: The time taken by each step, and any warnings or error.
+    """
+    result = ExportResult(filename)
+    name = os.path.splitext(os.path.basename(filename))[0]
+    try:
+        start = time.perf_counter()
+        if filename.lower().endswith(GEOMETRY_FILE_EXTENSIONS):
+            model = _model_from_geometry_file(filename, options)
+        else:
+            model = _model_from_json_file(filename, result)
+        result.timings["load"] = time.perf_counter() - start
+        if model is None:
+            result.error = "Unable to load the instrument"
+            return result
+
+        start = time.perf_counter()
+        with open(os.path.join(options.output_dir, f"{name}.json"), "w") as file:
+            write_model_json(model, file, indent=2)
+        result.timings["json"] = time.perf_counter() - start
+
+        if options.provider is not None:
+            start = time.perf_counter()
+            with open(
+                os.path.join(options.output_dir, f"{name}{FORWARDER_CONFIG_EXTENSION}"),
+                "wb",
+            ) as file:
+                file.write(create_forwarder_config(model, options.provider))
+            result.timings["forwarder"] = time.perf_counter() - start
+    except Exception as error:
+        result.error = f"{error.__class__.__name__}: {error}"
+    return result
+
+
+def export_instruments(
+    filenames: List[str], options: ExportOptions, jobs: int = 1, report=print
+) -> List[ExportResult]:
+    """
+    Exports many instruments, in a pool of processes if more than one job is allowed.
+    :param filenames: The filewriter JSON and geometry files to read the instruments from.
+    :param options: Where to write the output and how to build the instruments.
+    :param jobs: The number of processes to use.
+    :param report: Called with the result of each file as it finishes.
+    :return: The results in the same order as the filenames.
+    """
+    os.makedirs(options.output_dir, exist_ok=True)
+    if jobs <= 1 or len(filenames) <= 1:
+        results = []
+        for filename in filenames:
+            results.append(export_instrument(filename, options))
+            report(results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(export_instrument, filename, options): index
+            for index, filename in enumerate(filenames)
+        }
+        results = [None] * len(filenames)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            report(results[futures[future]])
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "files", nargs="+", help="Filewriter JSON, OFF or STL files to export"
+    )
+    parser.add_argument(
+        "--output-dir", default=".", help="Directory the output files are written to"
+    )
+    parser.add_argument(
+        "--provider",
+        choices=sorted(provider_str_to_enum),
+        help="Also write a forwarder configuration with this provider type for the PVs",
+    )
+    parser.add_argument(
+        "--units", default="m", help="Units of length of the geometry files"
+    )
+    parser.add_argument(
+        "--nx-class",
+        default="NXdetector",
+        help="NeXus class of the component made from each geometry file",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count(), help="Number of processes to use"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = export_instruments(
+        args.files,
+        ExportOptions(args.output_dir, args.provider, args.units, args.nx_class),
+        args.jobs,
+    )
+    failures = sum(result.error is not None for result in results)
+    print(
+        f"Exported {len(results) - failures} of {len(results)} instruments in {time.perf_counter() - start:.3f} s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,9 @@
+import hashlib
+import json
+import logging
 import os
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 import xmltodict
 
 PIXEL_COMPONENT_TYPES = {"NXdetector"}
@@ -40,6 +44,13 @@ COMPONENT_TYPES = {
 
 CHOPPER_CLASS_NAME = "NXdisk_chopper"
 
+# Directories of NXDL files the field suggestions come from, the base classes first
+NXDL_DIRECTORIES = ("base_classes", "contributed_definitions", "applications")
+NXDL_VERSION_FILE = "NXDL_VERSION"
+# Changed whenever what is stored in the cache changes, so that old caches are rebuilt
+CLASS_DEFINITIONS_CACHE_FORMAT = 1
+CLASS_DEFINITIONS_CACHE_NAME = "nxdl_class_definitions.json"
+
 
 def __list_base_class_files(file_list):
     for file in file_list:
@@ -65,6 +76,216 @@ def make_dictionary_of_class_definitions(
     return all_class_definitions, component_definitions
 
 
+def _as_list(value: Any) -> List[Any]:
+    # xmltodict gives a single element on its own rather than in a list
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _add_fields(class_definitions: Dict[str, List[str]], nx_class: str, fields: Any):
+    class_fields = class_definitions.setdefault(nx_class, [])
+    for field in _as_list(fields):
+        name = field.get("@name") if isinstance(field, dict) else None
+        if name is not None and name not in class_fields:
+            class_fields.append(name)
+
+
+def _add_fields_from_groups(class_definitions: Dict[str, List[str]], element: Any):
+    for group in _as_list(element.get("group")):
+        if not isinstance(group, dict):
+            continue
+        if "@type" in group:
+            _add_fields(class_definitions, group["@type"], group.get("field"))
+        _add_fields_from_groups(class_definitions, group)
+
+
+def _add_definition_fields(class_definitions: Dict[str, List[str]], xml_text: str):
+    """
+    Adds the fields of a contributed definition or application definition to the classes they are used in. A
+    contributed base class adds its own fields to its class, and the fields in each group of a definition are added
+    to the group's class, after any fields the class already has.
+    :param class_definitions: The field names for each NeXus class, which is added to.
+    :param xml_text: The contents of the NXDL file.
+    """
+    xml_definition = xmltodict.parse(xml_text)["definition"]
+    if xml_definition.get("@category") == "base":
+        _add_fields(
+            class_definitions, xml_definition["@name"], xml_definition.get("field")
+        )
+    _add_fields_from_groups(class_definitions, xml_definition)
+
+
+def _nxdl_files(repo_directory: str) -> List[Tuple[str, str]]:
+    """
+    :param repo_directory: The directory of the NeXus definitions.
+    :return: The NXDL directory and path of every NXDL file, in the order they are read.
+    """
+    files = []
+    for directory in NXDL_DIRECTORIES:
+        full_directory = os.path.join(repo_directory, directory)
+        if not os.path.isdir(full_directory):
+            continue
+        for file in sorted(__list_base_class_files(os.listdir(full_directory))):
+            files.append((directory, os.path.join(full_directory, file)))
+    return files
+
+
+def definitions_hash(repo_directory: str) -> str:
+    """
+    Hashes the contents of the NXDL files and NXDL_VERSION, which is much quicker than parsing them.
+    :param repo_directory: The directory of the NeXus definitions.
+    :return: A hash which changes whenever any of the files the class definitions come from changes.
+    """
+    digest = hashlib.sha256(str(CLASS_DEFINITIONS_CACHE_FORMAT).encode())
+    version_file = os.path.join(repo_directory, NXDL_VERSION_FILE)
+    if os.path.isfile(version_file):
+        with open(version_file, "rb") as file:
+            digest.update(file.read())
+    for directory, path in _nxdl_files(repo_directory):
+        digest.update(f"\0{directory}/{os.path.basename(path)}\0".encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def compile_class_definitions(repo_directory: str) -> Dict[str, List[str]]:
+    """
+    Parses the base classes, contributed definitions and application definitions.
+    :param repo_directory: The directory of the NeXus definitions.
+    :return: The field names for each NeXus class, with the fields of the base class first.
+    """
+    class_definitions: Dict[str, List[str]] = {}
+    component_definitions: Dict[str, List[str]] = {}
+    nxdl_files = _nxdl_files(repo_directory)
+    for directory, path in nxdl_files:
+        if directory == NXDL_DIRECTORIES[0]:
+            with open(path) as def_file:
+                _create_base_class_dict(
+                    def_file.read(), None, class_definitions, component_definitions
+                )
+    for directory, path in nxdl_files:
+        if directory != NXDL_DIRECTORIES[0]:
+            with open(path) as def_file:
+                _add_definition_fields(class_definitions, def_file.read())
+    return class_definitions
+
+
+def default_cache_file() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "nexus-constructor", CLASS_DEFINITIONS_CACHE_NAME)
+
+
+def bundled_cache_file(repo_directory: str) -> str:
+    """
+    :param repo_directory: The directory of the NeXus definitions.
+    :return: The cache written next to the definitions by the build step and shipped with the packaged application.
+    """
+    return os.path.join(repo_directory, CLASS_DEFINITIONS_CACHE_NAME)
+
+
+def _read_cache(cache_file: str, key: str) -> Optional[Dict[str, List[str]]]:
+    try:
+        with open(cache_file) as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("key") != key:
+        return None
+    return cache.get("classes")
+
+
+def write_class_definitions_cache(
+    repo_directory: str, cache_file: Optional[str] = None
+) -> Dict[str, List[str]]:
+    """
+    Compiles the class definitions and writes them to the cache file, replacing any older cache.
+    :param repo_directory: The directory of the NeXus definitions.
+    :param cache_file: The file to write, or None for the file in the user's cache directory.
+    :return: The field names for each NeXus class.
+    """
+    cache_file = cache_file or default_cache_file()
+    key = definitions_hash(repo_directory)
+    class_definitions = compile_class_definitions(repo_directory)
+    temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        with open(temporary_file, "w") as file:
+            json.dump({"key": key, "classes": class_definitions}, file)
+        os.replace(temporary_file, cache_file)
+    except OSError as error:
+        logging.info(f"Unable to write the NXDL definitions cache: {error}")
+    return class_definitions
+
+
+def load_class_definitions(
+    repo_directory="nexus_definitions",
+    black_list: List[str] = None,
+    cache_file: Optional[str] = None,
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Gives the field names of the NeXus classes from the cache of compiled definitions, compiling them first if the
+    cache is missing or any of the NXDL files have changed since it was written.
+    :param repo_directory: The directory of the NeXus definitions.
+    :param black_list: NeXus classes to leave out.
+    :param cache_file: The cache file, or None for the cache shipped with the definitions if it is up to date and
+    otherwise the file in the user's cache directory.
+    :return: The fields of every class and the fields of the component classes, like
+    make_dictionary_of_class_definitions but including the contributed and application definitions.
+    """
+    key = definitions_hash(repo_directory)
+    cache_files = (
+        [cache_file]
+        if cache_file
+        else [bundled_cache_file(repo_directory), default_cache_file()]
+    )
+    class_definitions = None
+    for file in cache_files:
+        class_definitions = _read_cache(file, key)
+        if class_definitions is not None:
+            break
+    else:
+        # The shipped cache may be in a directory the user cannot write to, so a new cache goes in their own
+        class_definitions = write_class_definitions_cache(
+            repo_directory, cache_files[-1]
+        )
+
+    black_list = black_list or []
+    all_class_definitions = {
+        nx_class: fields
+        for nx_class, fields in class_definitions.items()
+        if nx_class not in black_list
+    }
+    component_definitions = {
+        nx_class: fields
+        for nx_class, fields in all_class_definitions.items()
+        if nx_class in COMPONENT_TYPES
+    }
+    return all_class_definitions, component_definitions
+
+
+def load_component_definitions_in_background(
+    repo_directory="nexus_definitions",
+    black_list: List[str] = None,
+    cache_file: Optional[str] = None,
+) -> "Future[Dict[str, List[str]]]":
+    """
+    Loads the NXDL definitions in another thread, so that the main window can be shown while they are read.
+    :param repo_directory: The directory of the NeXus definitions.
+    :param black_list: NeXus classes to leave out.
+    :param cache_file: The cache of compiled definitions, or None for the file in the user's cache directory.
+    :return: A future giving the component definitions from load_class_definitions.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nxdl")
+    future = executor.submit(
+        lambda: load_class_definitions(repo_directory, black_list, cache_file)[1]
+    )
+    executor.shutdown(wait=False)
+    return future
+
+
 def _create_base_class_dict(
     xml_text, black_list, class_definitions, component_definitions
 ):
@@ -88,3 +309,22 @@ def _create_base_class_dict(
     class_definitions[nx_class_name] = class_fields
     if nx_class_name in COMPONENT_TYPES:
         component_definitions[nx_class_name] = class_fields
+
+
+if __name__ == "__main__":
+    # Build step, run by nexus-constructor.spec so that the cache is shipped with the definitions and a packaged
+    # application does not compile them the first time it starts
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compiles the NXDL definitions into the cache loaded at startup"
+    )
+    parser.add_argument("definitions_dir")
+    parser.add_argument(
+        "--cache-file", help="Defaults to the cache shipped with the definitions"
+    )
+    args = parser.parse_args()
+    write_class_definitions_cache(
+        args.definitions_dir,
+        args.cache_file or bundled_cache_file(args.definitions_dir),
+    )
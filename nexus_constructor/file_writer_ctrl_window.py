@@ -1,18 +1,25 @@
+import threading
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import partial
-from typing import Callable, Dict, Union, Tuple, Type
-import json
+from typing import Callable, Dict, List, Mapping, Optional, Union, Tuple, Type
 import attr
 from PySide2 import QtCore
-from PySide2.QtCore import QTimer, QAbstractItemModel, QSettings
+from PySide2.QtCore import QTimer, QAbstractItemModel, QSettings, QObject, Signal
 from PySide2.QtGui import QStandardItemModel, QCloseEvent
-from PySide2.QtWidgets import QMainWindow, QLineEdit, QApplication
-from streaming_data_types import run_start_pl72, run_stop_6s4t
+from PySide2.QtWidgets import QMainWindow, QLineEdit, QApplication, QProgressDialog
+from streaming_data_types import run_stop_6s4t
 from nexus_constructor.kafka.command_producer import CommandProducer
 from nexus_constructor.kafka.kafka_interface import KafkaInterface
 from nexus_constructor.kafka.status_consumer import StatusConsumer
 from nexus_constructor.model.model import Model
+from nexus_constructor.run_start_serialiser import (
+    NexusStructureCache,
+    SerialisationCancelled,
+    model_snapshot,
+    serialise_run_start,
+)
 from nexus_constructor.ui_utils import validate_line_edit
 from nexus_constructor.validators import BrokerAndTopicValidator
 from ui.filewriter_ctrl_frame import Ui_FilewriterCtrl
@@ -44,6 +51,28 @@ class FileWriterSettings:
     FILE_NAME = "file_name"
 
 
+START_COMMAND = "start command for"
+STOP_COMMAND = "stop command for"
+# Milliseconds a serialisation runs for before its progress is shown
+PROGRESS_DIALOG_DELAY = 500
+
+
+class SerialisationSignals(QObject):
+    """
+    Carries the progress and result of a run start serialisation from the worker thread to the window.
+    """
+
+    progress = Signal(int)
+    finished = Signal("QVariant")
+
+
+@attr.s
+class Serialisation:
+    nexus_file_name = attr.ib(type=str)
+    cancelled = attr.ib(type=threading.Event)
+    progress_dialog = attr.ib(type=QProgressDialog)
+
+
 def extract_bool_from_qsettings(setting: Union[str, bool]):
     if type(setting) == str:
         setting = setting == "True"
@@ -59,7 +88,16 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
         self.known_writers = {}
         self.known_files = {}
         self.status_consumer = None
+        # The version of the last status snapshot shown
+        self.status_version: Optional[int] = None
         self.command_producer = None
+        # Commands sent whose delivery has not been reported yet, with a description of each
+        self.pending_commands: List[Tuple[str, Future]] = []
+        self.nexus_structure_cache = NexusStructureCache()
+        self.serialisation: Optional[Serialisation] = None
+        self._serialiser = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="run-start"
+        )
 
     def _restore_settings(self):
         """
@@ -144,6 +182,8 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
         )
 
         self.command_widget.ok_button.clicked.connect(self.send_command)
+        self.serialisation_signals = SerialisationSignals(self)
+        self.serialisation_signals.finished.connect(self._serialisation_finished)
         self.update_status_timer = QTimer()
         self.update_status_timer.timeout.connect(self._check_connection_status)
         self.update_status_timer.start(500)
@@ -151,10 +191,10 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
         self.files_list.clicked.connect(self.file_list_clicked)
         self.stop_file_writing_button.clicked.connect(self.stop_file_writing_clicked)
 
-        self.model = QStandardItemModel(0, 2, self)
-        self.model.setHeaderData(0, QtCore.Qt.Horizontal, "File writer")
-        self.model.setHeaderData(1, QtCore.Qt.Horizontal, "Last seen")
-        self.file_writers_list.setModel(self.model)
+        self.file_writers_model = QStandardItemModel(0, 2, self)
+        self.file_writers_model.setHeaderData(0, QtCore.Qt.Horizontal, "File writer")
+        self.file_writers_model.setHeaderData(1, QtCore.Qt.Horizontal, "Last seen")
+        self.file_writers_list.setModel(self.file_writers_model)
         self.file_writers_list.setColumnWidth(0, 320)
 
         self.file_list_model = QStandardItemModel(0, 3, self)
@@ -188,14 +228,43 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
             connection_ok = self.status_consumer.connected
             self.status_broker_led.set_status(connection_ok)
             if connection_ok:
-                current_writers = self.status_consumer.file_writers
-                self._update_writer_list(current_writers)
-                self._update_files_list(self.status_consumer.files)
+                snapshot = self.status_consumer.snapshot
+                if snapshot.version != self.status_version:
+                    self.status_version = snapshot.version
+                    self._update_writer_list(snapshot.file_writers)
+                    self._update_files_list(snapshot.files)
 
         if self.command_producer is None:
             self.command_broker_led.turn_off()
         else:
             self.command_broker_led.set_status(self.command_producer.connected)
+        self._update_command_status()
+
+    def _track_command(self, description: str, delivery: Future):
+        self.pending_commands.append((description, delivery))
+        self.status_bar.showMessage(f"Sending {description}")
+
+    def _update_command_status(self):
+        """
+        Shows whether the commands sent since the last check have been delivered to the broker.
+        """
+        still_pending = []
+        for description, delivery in self.pending_commands:
+            if not delivery.done():
+                still_pending.append((description, delivery))
+            elif delivery.cancelled():
+                self.status_bar.showMessage(f"Cancelled {description}")
+            elif delivery.exception() is not None:
+                self.status_bar.showMessage(
+                    f"Failed to send {description}: {delivery.exception()}"
+                )
+                if description.startswith(START_COMMAND):
+                    self.command_widget.ok_button.setEnabled(True)
+            else:
+                self.status_bar.showMessage(
+                    f"Delivered {description} to {delivery.result()}"
+                )
+        self.pending_commands = still_pending
 
     def status_broker_timer_changed(self, kafka_obj_type: KafkaInterface):
         result = BrokerAndTopicValidator.extract_addr_and_topic(
@@ -205,6 +274,7 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
             if self.status_consumer is not None:
                 self.status_consumer.close()
             self.status_consumer = kafka_obj_type(*result)
+            self.status_version = None
 
     def command_broker_timer_changed(self, kafka_obj_type: KafkaInterface):
         result = BrokerAndTopicValidator.extract_addr_and_topic(
@@ -215,47 +285,72 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
                 self.command_producer.close()
             self.command_producer = kafka_obj_type(*result)
 
-    def _update_writer_list(self, updated_list: Dict[str, Dict]):
-        for key in updated_list:
+    def _update_writer_list(self, updated_list: Mapping[str, Mapping]):
+        self._remove_expired(self.file_writers_model, self.known_writers, updated_list)
+        for key, status in updated_list.items():
+            current_file_writer = self.known_writers.get(key)
+            if (
+                current_file_writer is not None
+                and status["last_seen"] == current_file_writer.last_time
+            ):
+                continue
             current_time, time_str = self.get_time(key, updated_list)
-            if key not in self.known_writers:
-                number_of_filewriter_rows = self.model.rowCount(QtCore.QModelIndex())
-                new_file_writer = FileWriter(key, number_of_filewriter_rows)
-                self.known_writers[key] = new_file_writer
-                self.model.insertRow(number_of_filewriter_rows)
-                self.model.setData(self.model.index(number_of_filewriter_rows, 0), key)
-                self.model.setData(
-                    self.model.index(number_of_filewriter_rows, 1), time_str
+            if current_file_writer is None:
+                number_of_filewriter_rows = self.file_writers_model.rowCount(
+                    QtCore.QModelIndex()
                 )
-            current_file_writer = self.known_writers[key]
-            if current_time != current_file_writer.last_time:
-                self._set_time(self.model, current_file_writer, current_time, time_str)
+                current_file_writer = FileWriter(key, number_of_filewriter_rows)
+                self.known_writers[key] = current_file_writer
+                self.file_writers_model.insertRow(number_of_filewriter_rows)
+                self.file_writers_model.setData(
+                    self.file_writers_model.index(number_of_filewriter_rows, 0), key
+                )
+            self._set_time(
+                self.file_writers_model, current_file_writer, current_time, time_str,
+            )
 
-    def _update_files_list(self, updated_list: Dict[str, Dict]):
-        for key in updated_list:
+    def _update_files_list(self, updated_list: Mapping[str, Mapping]):
+        self._remove_expired(self.file_list_model, self.known_files, updated_list)
+        for key, status in updated_list.items():
+            current_file = self.known_files.get(key)
+            if (
+                current_file is not None
+                and status["last_seen"] == current_file.last_time
+            ):
+                continue
             current_time, time_str = self.get_time(key, updated_list)
-            if key not in self.known_files:
+            if current_file is None:
                 number_of_file_rows = self.file_list_model.rowCount(
                     QtCore.QModelIndex()
                 )
-                new_file = File(key, row=number_of_file_rows)
-                self.known_files[key] = new_file
+                current_file = File(key, row=number_of_file_rows)
+                self.known_files[key] = current_file
                 self.file_list_model.insertRow(number_of_file_rows)
                 self.file_list_model.setData(
                     self.file_list_model.index(number_of_file_rows, 0), key
                 )
-                self.file_list_model.setData(
-                    self.file_list_model.index(number_of_file_rows, 1), time_str
-                )
                 self.file_list_model.setData(
                     self.file_list_model.index(number_of_file_rows, 2),
-                    new_file.writer_id,
-                )
-            current_file = self.known_files[key]
-            if current_time != current_file.last_time:
-                self._set_time(
-                    self.file_list_model, current_file, current_time, time_str
+                    current_file.writer_id,
                 )
+            self._set_time(self.file_list_model, current_file, current_time, time_str)
+
+    @staticmethod
+    def _remove_expired(
+        model: QAbstractItemModel,
+        known: Dict[str, Union[File, FileWriter]],
+        updated_list: Mapping[str, Mapping],
+    ):
+        """
+        Removes the rows of file-writers or files which the status consumer has forgotten, and renumbers the rest.
+        """
+        expired = [key for key in known if key not in updated_list]
+        if not expired:
+            return
+        for row in sorted((known.pop(key).row for key in expired), reverse=True):
+            model.removeRow(row)
+        for row, remaining in enumerate(sorted(known.values(), key=lambda k: k.row)):
+            remaining.row = row
 
     @staticmethod
     def get_time(key: str, updated_list: Dict[str, Dict]) -> Tuple[int, str]:
@@ -275,29 +370,70 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
         current_index.last_time = current_time
 
     def send_command(self):
-        if self.command_producer is not None:
-            (
-                nexus_file_name,
-                broker,
-                start_time,
-                stop_time,
-                service_id,
-                abort_on_uninitialised_stream,
-            ) = self.command_widget.get_arguments()
-            self.command_producer.send_command(
-                bytes(
-                    run_start_pl72.serialise_pl72(
-                        job_id=str(uuid.uuid4()),
-                        filename=nexus_file_name,
-                        start_time=start_time,
-                        stop_time=stop_time,
-                        broker=broker,
-                        nexus_structure=json.dumps(self.model.as_dict()),
-                        service_id=service_id,
-                    )
-                )
+        """
+        Serialises the run start command in the background, showing its progress if it takes a while, and sends it
+        once it is ready.
+        """
+        if self.command_producer is None or self.serialisation is not None:
+            return
+        (
+            nexus_file_name,
+            broker,
+            start_time,
+            stop_time,
+            service_id,
+            abort_on_uninitialised_stream,
+        ) = self.command_widget.get_arguments()
+        self.command_widget.ok_button.setEnabled(False)
+
+        cancelled = threading.Event()
+        progress_dialog = QProgressDialog(
+            "Serialising the NeXus structure...", "Cancel", 0, 100, self
+        )
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(PROGRESS_DIALOG_DELAY)
+        progress_dialog.canceled.connect(cancelled.set)
+        self.serialisation_signals.progress.connect(progress_dialog.setValue)
+        self.serialisation = Serialisation(nexus_file_name, cancelled, progress_dialog)
+
+        serialisation = self._serialiser.submit(
+            serialise_run_start,
+            model_snapshot(self.model),
+            self.nexus_structure_cache,
+            cancelled,
+            self.serialisation_signals.progress.emit,
+            job_id=str(uuid.uuid4()),
+            filename=nexus_file_name,
+            start_time=start_time,
+            stop_time=stop_time,
+            broker=broker,
+            service_id=service_id,
+        )
+        serialisation.add_done_callback(self.serialisation_signals.finished.emit)
+
+    def _serialisation_finished(self, serialisation: Future):
+        progress_dialog = self.serialisation.progress_dialog
+        self.serialisation_signals.progress.disconnect(progress_dialog.setValue)
+        progress_dialog.reset()
+        progress_dialog.deleteLater()
+        description = f"{START_COMMAND} {self.serialisation.nexus_file_name}"
+        self.serialisation = None
+
+        error = serialisation.exception()
+        if isinstance(error, SerialisationCancelled):
+            self.status_bar.showMessage(f"Cancelled {description}")
+        elif error is not None:
+            self.status_bar.showMessage(f"Failed to serialise {description}: {error}")
+        elif self.command_producer is None:
+            self.status_bar.showMessage(
+                f"Failed to send {description}: no command broker"
+            )
+        else:
+            self._track_command(
+                description, self.command_producer.send_command(serialisation.result())
             )
-            self.command_widget.ok_button.setEnabled(False)
+            return
+        self.command_widget.ok_button.setEnabled(True)
 
     def file_list_clicked(self):
         if len(self.files_list.selectedIndexes()) > 0:
@@ -311,7 +447,7 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
             for fileKey in self.known_files:
                 current_file = self.known_files[fileKey]
                 if index.row() == current_file.row:
-                    self.command_producer.send_command(
+                    delivery = self.command_producer.send_command(
                         bytes(
                             run_stop_6s4t.serialise_6s4t(
                                 job_id=current_file.job_id,
@@ -319,9 +455,12 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
                             )
                         )
                     )
+                    self._track_command(f"{STOP_COMMAND} {current_file.name}", delivery)
                     break
 
     def closeEvent(self, event: QCloseEvent):
+        if self.serialisation is not None:
+            self.serialisation.cancelled.set()
         if self.status_consumer is not None:
             self.status_consumer.close()
         if self.command_producer is not None:
@@ -0,0 +1,211 @@
+"""
+An LRU cache of the meshes loaded from geometry files, so that a file picked in the Add Component dialog is parsed once
+while it is validated, its faces are counted for the pixel mapping and the component is created from it.
+
+Meshes are looked up by the path, modification time and size of the file and the units they were loaded in, so editing
+or replacing a file makes it load again. The mesh in metres is kept for each file and meshes in other units are scaled
+from it, which gives the same vertices as loading the file in those units.
+"""
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.model.geometry import OFFGeometry, OFFGeometryNoNexus
+from nexus_constructor.unit_utils import METRES, calculate_unit_conversion_factor
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# The path, modification time in nanoseconds and size in bytes of a file
+FileKey = Tuple[str, int, int]
+
+
+def file_key(filename: str) -> Optional[FileKey]:
+    """
+    :param filename: The name of the file.
+    :return: The key which identifies the current contents of the file, or None if the file cannot be found.
+    """
+    try:
+        status = os.stat(filename)
+    except OSError:
+        return None
+    return os.path.realpath(filename), status.st_mtime_ns, status.st_size
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
+
+
+@attr.s(frozen=True)
+class CachedMesh:
+    """
+    The arrays of a loaded mesh. They are read-only as they are shared by every geometry the mesh is loaded into.
+    """
+
+    vertices = attr.ib(type=np.ndarray, converter=_read_only)
+    winding_order = attr.ib(type=np.ndarray, converter=_read_only)
+    face_offsets = attr.ib(type=np.ndarray, converter=_read_only)
+
+    @classmethod
+    def from_geometry(cls, geometry: OFFGeometry) -> "CachedMesh":
+        return cls(
+            geometry.vertices_array, geometry.winding_order_array, geometry.face_offsets
+        )
+
+    @property
+    def number_of_faces(self) -> int:
+        return len(self.face_offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.vertices.nbytes + self.winding_order.nbytes + self.face_offsets.nbytes
+        )
+
+    def scaled(self, factor: float) -> "CachedMesh":
+        """
+        :param factor: The factor to multiply the vertices by.
+        :return: The mesh with its vertices scaled, sharing the faces of this mesh.
+        """
+        if factor == 1:
+            return self
+        return CachedMesh(
+            np.multiply(self.vertices, factor, dtype=float),
+            self.winding_order,
+            self.face_offsets,
+        )
+
+    def set_on(self, geometry: OFFGeometry) -> OFFGeometry:
+        """
+        Sets the vertices and faces of a geometry to this mesh.
+        :param geometry: The geometry to set the mesh of.
+        :return: The geometry.
+        """
+        geometry.vertices_array = self.vertices
+        geometry.set_winding_order(self.winding_order, self.face_offsets)
+        return geometry
+
+
+def _read_mesh_in_metres(filename: str) -> OFFGeometry:
+    return load_geometry(filename, METRES, OFFGeometryNoNexus())
+
+
+class GeometryCache:
+    """
+    Keeps the most recently used meshes until their arrays take up more than a given number of bytes. It can be used
+    from several threads, although a file which is not cached yet can then be read by more than one of them.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param max_bytes: The total size of the mesh arrays above which the least recently used meshes are evicted.
+        """
+        self.max_bytes = max_bytes
+        self._meshes: "OrderedDict[Tuple[FileKey, str], CachedMesh]" = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._meshes)
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes in the arrays of the cached meshes.
+        """
+        return self._size
+
+    def contains(self, filename: str, units: str) -> bool:
+        """
+        :return: True if the mesh of the current contents of the file, in the units, is cached.
+        """
+        key = file_key(filename)
+        with self._lock:
+            return key is not None and (key, units) in self._meshes
+
+    def clear(self):
+        with self._lock:
+            self._meshes.clear()
+            self._size = 0
+
+    def get_mesh(
+        self,
+        filename: str,
+        units: str,
+        read_mesh: Callable[[str], OFFGeometry] = _read_mesh_in_metres,
+    ) -> CachedMesh:
+        """
+        Gives the mesh in a geometry file, only reading the file if it has changed since it was last read.
+        :param filename: The name of the OFF or STL file.
+        :param units: The units of length the vertices in the file are in.
+        :param read_mesh: Reads the mesh from a file with its vertices in metres, if it is not in the cache.
+        :return: The mesh, with its vertices converted from the units to metres.
+        :raises ValueError: If the file is not a valid geometry file, or any other error read_mesh raises.
+        """
+        factor = calculate_unit_conversion_factor(units, METRES)
+        key = file_key(filename)
+        if key is None:
+            return CachedMesh.from_geometry(read_mesh(filename)).scaled(factor)
+
+        mesh = self._get((key, units))
+        if mesh is not None:
+            return mesh
+        mesh_in_metres = self._get((key, METRES))
+        if mesh_in_metres is None:
+            mesh_in_metres = CachedMesh.from_geometry(read_mesh(filename))
+            self._add((key, METRES), mesh_in_metres)
+        mesh = mesh_in_metres.scaled(factor)
+        if mesh is not mesh_in_metres:
+            self._add((key, units), mesh)
+        return mesh
+
+    def load_geometry(
+        self, filename: str, units: str, geometry: OFFGeometry
+    ) -> OFFGeometry:
+        """
+        Loads the mesh in a geometry file into an OFFGeometry, reusing the mesh if the file has already been read.
+        :param filename: The name of the OFF or STL file.
+        :param units: The units of length the vertices in the file are in.
+        :param geometry: The OFFGeometry to load the mesh into.
+        :return: The geometry.
+        """
+        return self.get_mesh(filename, units).set_on(geometry)
+
+    def _get(self, key: Tuple[FileKey, str]) -> Optional[CachedMesh]:
+        with self._lock:
+            mesh = self._meshes.get(key)
+            if mesh is not None:
+                self._meshes.move_to_end(key)
+            return mesh
+
+    def _add(self, key: Tuple[FileKey, str], mesh: CachedMesh):
+        if mesh.nbytes > self.max_bytes:
+            return
+        (path, _, _), _ = key
+        with self._lock:
+            # Meshes from an earlier version of the file will never be used again
+            for stale_key in [
+                other
+                for other in self._meshes
+                if other[0][0] == path and other[0] != key[0]
+            ]:
+                self._remove(stale_key)
+            if key in self._meshes:
+                self._remove(key)
+            self._meshes[key] = mesh
+            self._size += mesh.nbytes
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._meshes)))
+
+    def _remove(self, key: Tuple[FileKey, str]):
+        self._size -= self._meshes.pop(key).nbytes
+
+
+# Shared by the places which load the file picked for a component's shape
+geometry_cache = GeometryCache()
@@ -1,13 +1,33 @@
 import logging
-from io import StringIO
+import os
+import re
+import warnings
+from io import BytesIO, StringIO
+from typing import Optional, Tuple
 
-from PySide2.QtGui import QVector3D
-from nexusutils.readwriteoff import parse_off_file
-from stl import mesh
+import numpy as np
 
-from nexus_constructor.model.geometry import OFFGeometry, OFFGeometryNoNexus
+from nexus_constructor.model.geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    face_sizes_to_offsets,
+)
 from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
 
+# The layout of each triangle in a binary STL file, after the 80 byte header and the 4 byte triangle count
+STL_TRIANGLE_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+STL_HEADER_SIZE = 84
+
+OFF_COMMENT = re.compile(r"#[^\n]*")
+OFF_VALUE = re.compile(r"\S+")
+# The number of bytes read from the start of a file to check its header
+SNIFF_SIZE = 4096
+# The fewest bytes each vertex and face can take up in an OFF file, "0 0 0" and "0" with the line break after them
+OFF_MIN_VERTEX_SIZE = 6
+OFF_MIN_FACE_SIZE = 2
+
 
 def load_geometry(
     filename: str, units: str, geometry: OFFGeometry = OFFGeometryNoNexus()
@@ -26,14 +46,146 @@ def load_geometry(
 
     extension = filename[filename.rfind(".") :].lower()
 
+    if extension == ".stl":
+        triangles = _map_binary_stl(filename)
+        if triangles is not None:
+            _set_triangles(
+                triangles, calculate_unit_conversion_factor(units, METRES), geometry,
+            )
+            logging.info("STL loaded")
+            return geometry
+        if not _starts_with_solid(filename):
+            # Not an ASCII STL either, so let numpy-stl read it as binary and report any problem with it
+            with open(filename, "rb") as file:
+                return load_geometry_from_file_object(file, extension, units, geometry)
+
+    with open(filename) as file:
+        return load_geometry_from_file_object(file, extension, units, geometry)
+
+
+def _starts_with_solid(filename: str) -> bool:
+    with open(filename, "rb") as file:
+        return file.read(5) == b"solid"
+
+
+def _binary_stl_triangle_count(header: bytes, size: int) -> Optional[int]:
+    """
+    Binary STL files have no magic number and some start with "solid" like ASCII ones, so a file is taken to be binary
+    if its size matches the number of triangles in its header.
+    :param header: At least the first 84 bytes of the file.
+    :param size: The size of the file in bytes.
+    :return: The number of triangles, or None if the file is not a binary STL file.
+    """
+    if len(header) < STL_HEADER_SIZE:
+        return None
+    count = int(np.frombuffer(header, dtype="<u4", count=1, offset=80)[0])
+    if size != STL_HEADER_SIZE + count * STL_TRIANGLE_DTYPE.itemsize:
+        return None
+    return count
+
+
+def _sniff_off(head: str, size: int):
+    values = [OFF_COMMENT.sub("", line).split() for line in head.splitlines()]
+    # The last line may have been cut off, unless the whole file was read
+    lines = [line for line in values[: -1 if size > len(head) else None] if line]
+    if not lines:
+        if size > len(head):
+            # The header is after more comments than were read, so leave it to the full check
+            return
+        raise ValueError("OFF file is empty")
+    if lines[0][0] != "OFF":
+        raise ValueError("OFF file does not start with OFF")
+    counts = lines[0][1:] if len(lines[0]) > 1 else (lines[1] if len(lines) > 1 else [])
+    if len(counts) < 2:
+        if size > len(head):
+            return
+        raise ValueError("OFF file is missing the number of vertices and faces")
     try:
-        with open(filename) as file:
-            return load_geometry_from_file_object(file, extension, units, geometry)
-    except UnicodeDecodeError:
-        # Try again in case the file is in binary. At least one of these should work when a user selects a file because
-        # GeometryFileValidator inspects the file beforehand to check that it's valid.
+        number_of_vertices, number_of_faces = int(counts[0]), int(counts[1])
+    except ValueError:
+        raise ValueError(
+            "OFF file has a number of vertices or faces which is not a whole number"
+        )
+    if number_of_vertices < 0 or number_of_faces < 0:
+        raise ValueError("OFF file has a negative number of vertices or faces")
+    if (
+        size
+        < number_of_vertices * OFF_MIN_VERTEX_SIZE + number_of_faces * OFF_MIN_FACE_SIZE
+    ):
+        raise ValueError("OFF file is too short for its number of vertices and faces")
+
+
+def _sniff_stl(head: bytes, size: int):
+    if _binary_stl_triangle_count(head, size) is not None or head.startswith(b"solid"):
+        return
+    if len(head) < STL_HEADER_SIZE:
+        raise ValueError("STL file is too short for a header")
+    count = int(np.frombuffer(head, dtype="<u4", count=1, offset=80)[0])
+    if size < STL_HEADER_SIZE + count * STL_TRIANGLE_DTYPE.itemsize:
+        raise ValueError("STL file is too short for its number of triangles")
+
+
+def sniff_geometry_file(filename: str):
+    """
+    Checks the start of an OFF or STL file and its size, without reading the rest of it. This catches most files which
+    are the wrong type or cut short, but a file which passes can still be invalid.
+    :param filename: The name of the file, ending in .off or .stl.
+    :raises ValueError: If the file is certainly not a valid geometry file.
+    :raises OSError: If the file cannot be read.
+    """
+    size = os.path.getsize(filename)
+    if filename.lower().endswith(".stl"):
         with open(filename, "rb") as file:
-            return load_geometry_from_file_object(file, extension, units, geometry)
+            _sniff_stl(file.read(SNIFF_SIZE), size)
+    else:
+        # Comments may contain other characters, and the values are checked to be ASCII when the file is parsed
+        with open(filename, encoding="ascii", errors="replace", newline="") as file:
+            _sniff_off(file.read(SNIFF_SIZE), size)
+
+
+def _map_binary_stl(filename: str) -> Optional[np.ndarray]:
+    """
+    Memory maps the triangles of a binary STL file, so they are read straight from the file without a copy.
+    :param filename: The name of the file.
+    :return: A (T, 3, 3) array with the corners of each triangle, or None if the file is not a binary STL file.
+    """
+    with open(filename, "rb") as file:
+        header = file.read(STL_HEADER_SIZE)
+    count = _binary_stl_triangle_count(header, os.path.getsize(filename))
+    if count is None:
+        return None
+    if count == 0:
+        return np.zeros((0, 3, 3), dtype=np.float32)
+    return np.memmap(
+        filename,
+        dtype=STL_TRIANGLE_DTYPE,
+        mode="r",
+        offset=STL_HEADER_SIZE,
+        shape=(count,),
+    )["vertices"]
+
+
+def _set_triangles(
+    triangles: np.ndarray, mult_factor: float, geometry: OFFGeometry
+) -> OFFGeometry:
+    """
+    Sets the geometry to a mesh of triangles, storing each corner which is shared by several triangles only once.
+    :param triangles: A (T, 3, 3) array with the corners of each triangle.
+    :param mult_factor: The multiplication factor for unit conversion.
+    :param geometry: The OFFGeometry to set the mesh of.
+    :return: The geometry.
+    """
+    # Adding zero turns -0.0 into 0.0, so that corners can be compared by their bytes, which is much faster than
+    # comparing rows of floats
+    corners = (triangles + triangles.dtype.type(0)).reshape(-1, 3)
+    _, first_use, winding_order = np.unique(
+        corners.view(np.dtype((np.void, corners.itemsize * 3))).reshape(-1),
+        return_index=True,
+        return_inverse=True,
+    )
+    geometry.vertices_array = np.multiply(corners[first_use], mult_factor, dtype=float)
+    geometry.set_winding_order(winding_order.reshape(-1), np.arange(len(triangles)) * 3)
+    return geometry
 
 
 def load_geometry_from_file_object(
@@ -69,6 +221,116 @@ def load_geometry_from_file_object(
     return geometry
 
 
+def _parse_off(text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parses the text of an OFF file without creating a Python object for each value. The positions of the values and
+    the lines they are on are found from the characters of the text, then the vertex and face sections are each
+    converted to numbers in one go. Any values after the coordinates of a vertex or the vertex indices of a face, such
+    as colours, are ignored.
+    :param text: The contents of the OFF file.
+    :return: The (N, 3) vertices, the vertex indices of all the faces one after another and the size of each face.
+    :raises ValueError: If the text is not a valid OFF file.
+    """
+    text = OFF_COMMENT.sub("", text)
+    try:
+        characters = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise ValueError("OFF file contains characters which are not ASCII")
+    is_space = characters <= ord(" ")
+    value_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    value_lines = np.searchsorted(np.flatnonzero(characters == ord("\n")), value_starts)
+    # The index of the first value on each line which is not empty, and the number of values on it
+    line_starts = np.flatnonzero(np.diff(value_lines, prepend=-1) != 0)
+    values_per_line = np.diff(np.append(line_starts, len(value_starts)))
+
+    if not len(line_starts) or OFF_VALUE.match(text, value_starts[0]).group() != "OFF":
+        raise ValueError("OFF file does not start with OFF")
+    # The vertex, face and edge counts can be on the same line as OFF or the line after it
+    counts_line = 0 if values_per_line[0] > 1 else 1
+    first_count = 1 - counts_line
+    if (
+        counts_line >= len(line_starts)
+        or values_per_line[counts_line] < first_count + 2
+    ):
+        raise ValueError("OFF file is missing the number of vertices and faces")
+    number_of_vertices, number_of_faces = (
+        int(OFF_VALUE.match(text, value_starts[line_starts[counts_line] + i]).group())
+        for i in (first_count, first_count + 1)
+    )
+
+    first_vertex_line = counts_line + 1
+    first_face_line = first_vertex_line + number_of_vertices
+    end_face_line = first_face_line + number_of_faces
+    if first_face_line > len(line_starts) or np.any(
+        values_per_line[first_vertex_line:first_face_line] < 3
+    ):
+        raise ValueError("OFF file does not have three coordinates for each vertex")
+    if end_face_line > len(line_starts):
+        raise ValueError("OFF file has fewer faces than its number of faces")
+
+    def section(first_line: int, end_line: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts the values on a range of lines to numbers, giving them and the index of the first one on each line.
+        """
+        if first_line >= end_line:
+            return np.array([]), np.array([], dtype=int)
+        start = value_starts[line_starts[first_line]]
+        end = (
+            value_starts[line_starts[end_line]]
+            if end_line < len(line_starts)
+            else len(text)
+        )
+        section_text = text[start:end]
+        # Faces are read as integers unless their colours are written with decimal points or exponents
+        is_float = first_line < first_face_line or any(
+            character in section_text for character in ".eE"
+        )
+        dtype = float if is_float else int
+        with warnings.catch_warnings():
+            # numpy only warns when it cannot parse the whole string
+            warnings.simplefilter("error")
+            try:
+                values = np.fromstring(section_text, dtype=dtype, sep=" ")
+            except (ValueError, DeprecationWarning):
+                raise ValueError("OFF file contains values which are not numbers")
+        lines = slice(first_line, end_line)
+        if len(values) != values_per_line[lines].sum():
+            raise ValueError("OFF file contains values which are not numbers")
+        return values, line_starts[lines] - line_starts[first_line]
+
+    vertex_values, vertex_line_starts = section(first_vertex_line, first_face_line)
+    vertices = vertex_values[vertex_line_starts[:, np.newaxis] + np.arange(3)]
+
+    face_values, face_line_starts = section(first_face_line, end_face_line)
+    face_sizes = _whole_numbers(face_values[face_line_starts])
+    if np.any(face_sizes < 0) or np.any(
+        values_per_line[first_face_line:end_face_line] < face_sizes + 1
+    ):
+        raise ValueError("OFF file has faces with fewer vertex indices than their size")
+    index_in_face = np.arange(face_sizes.sum()) - np.repeat(
+        face_sizes_to_offsets(face_sizes), face_sizes
+    )
+    winding_order = _whole_numbers(
+        face_values[np.repeat(face_line_starts + 1, face_sizes) + index_in_face]
+    )
+    if np.any((winding_order < 0) | (winding_order >= number_of_vertices)):
+        raise ValueError("OFF file has faces with vertex indices which do not exist")
+    return vertices.reshape(-1, 3), winding_order, face_sizes
+
+
+def _whole_numbers(values: np.ndarray) -> np.ndarray:
+    """
+    Converts face sizes or vertex indices to integers, which they may not be if the faces had colours with decimal
+    points.
+    :raises ValueError: If any of the values are not whole numbers.
+    """
+    if values.dtype.kind == "f" and np.any(values != np.round(values)):
+        raise ValueError(
+            "OFF file has face sizes or vertex indices which are not whole numbers"
+        )
+    return values.astype(int)
+
+
 def _load_off_geometry(
     file: StringIO, mult_factor: float, geometry: OFFGeometry = OFFGeometryNoNexus()
 ) -> OFFGeometry:
@@ -81,13 +343,13 @@ def _load_off_geometry(
     returned.
     :return: An OFFGeometry instance containing that file's geometry.
     """
-    vertices, faces = parse_off_file(file)
+    text = file.read()
+    if isinstance(text, bytes):
+        text = text.decode("ascii")
+    vertices, winding_order, face_sizes = _parse_off(text)
 
-    geometry.vertices = [
-        QVector3D(x * mult_factor, y * mult_factor, z * mult_factor)
-        for x, y, z in (vertex for vertex in vertices)
-    ]
-    geometry.faces = [face.tolist()[1:] for face in faces]
+    geometry.vertices_array = vertices * mult_factor
+    geometry.set_winding_order(winding_order, face_sizes_to_offsets(face_sizes))
     logging.info("OFF loaded")
     return geometry
 
@@ -104,19 +366,24 @@ def _load_stl_geometry(
     returned.
     :return: An OFFGeometry instance containing that file's geometry.
     """
+    data = file.read()
+    if isinstance(data, bytes):
+        count = _binary_stl_triangle_count(data, len(data))
+        if count is not None:
+            triangles = np.frombuffer(
+                data, dtype=STL_TRIANGLE_DTYPE, count=count, offset=STL_HEADER_SIZE
+            )["vertices"]
+            _set_triangles(triangles, mult_factor, geometry)
+            logging.info("STL loaded")
+            return geometry
+        file = BytesIO(data)
+    else:
+        file = StringIO(data)
+
+    # Only ASCII files get this far, so numpy-stl is not imported until one is loaded
+    from stl import mesh
+
     mesh_data = mesh.Mesh.from_file("", fh=file, calculate_normals=False)
-    # numpy-stl loads numbers as python decimals, not floats, which aren't valid in json
-    geometry.vertices = [
-        QVector3D(
-            float(corner[0]) * mult_factor,
-            float(corner[1]) * mult_factor,
-            float(corner[2]) * mult_factor,
-        )
-        for triangle in mesh_data.vectors
-        for corner in triangle
-    ]
-    geometry.faces = [
-        [i * 3, (i * 3) + 1, (i * 3) + 2] for i in range(len(mesh_data.vectors))
-    ]
+    _set_triangles(mesh_data.vectors, mult_factor, geometry)
     logging.info("STL loaded")
     return geometry
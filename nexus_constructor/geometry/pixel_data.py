@@ -3,6 +3,9 @@ from enum import Enum
 
 import attr
 
+# The pixel ID of a face or cylinder which is not part of a pixel, in arrays of pixel IDs
+NO_PIXEL_ID = -1
+
 
 class CountDirection(Enum):
     ROW = 1
@@ -61,7 +64,8 @@ class PixelMapping(PixelData):
 
     To be used in conjunction with an OFFGeometry instance. This classes pixel_ids attribute should be the same length
     as the geometry's faces list. The value of this list at any given index should be the detector id number that the
-    face is part of, or None if it isn't part of any detecting face or volume.
+    face is part of, or None if it isn't part of any detecting face or volume. pixel_ids can also be an integer array,
+    with NO_PIXEL_ID in place of None.
 
     Used to populate the detector_faces dataset of the NXoff_geometry class.
     See http://download.nexusformat.org/sphinx/classes/base_classes/NXoff_geometry.html
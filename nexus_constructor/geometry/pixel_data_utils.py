@@ -14,6 +14,7 @@ from nexus_constructor.geometry.pixel_data import (
     CountDirection,
     Corner,
     PixelMapping,
+    NO_PIXEL_ID,
 )
 
 PIXEL_FIELDS = [
@@ -32,10 +33,9 @@ def get_detector_faces_from_pixel_mapping(
     Returns a list of tuples. Each tuple contains a face ID followed by the face's detector ID.
     Corresponds to the detector_faces dataset structure of the NXoff_geometry class.
     """
-    detector_faces = [
-        (id[0], id[1]) for id in enumerate(mapping.pixel_ids) if id[1] is not None
-    ]
-    return detector_faces
+    pixel_ids = _pixel_id_array(mapping)
+    faces = np.flatnonzero(pixel_ids != NO_PIXEL_ID)
+    return list(zip(faces.tolist(), pixel_ids[faces].tolist()))
 
 
 def get_detector_number_from_pixel_mapping(mapping: PixelMapping,) -> List[int]:
@@ -43,8 +43,19 @@ def get_detector_number_from_pixel_mapping(mapping: PixelMapping,) -> List[int]:
     Returns a list of pixel IDs. Used for writing information to the detector_number field in NXdetector and
     NXcylindrical_geometry.
     """
-    detector_numbers = [id for id in mapping.pixel_ids if id is not None]
-    return detector_numbers
+    pixel_ids = _pixel_id_array(mapping)
+    return pixel_ids[pixel_ids != NO_PIXEL_ID].tolist()
+
+
+def _pixel_id_array(mapping: PixelMapping) -> np.ndarray:
+    """
+    Gives the pixel IDs of a mapping as an integer array, with NO_PIXEL_ID for the faces or cylinders that have no ID.
+    """
+    if isinstance(mapping.pixel_ids, np.ndarray):
+        return mapping.pixel_ids
+    return np.array(
+        [NO_PIXEL_ID if id is None else id for id in mapping.pixel_ids], dtype=np.int64
+    )
 
 
 def get_x_offsets_from_pixel_grid(grid: PixelGrid) -> Union[np.ndarray, float]:
@@ -2,6 +2,16 @@ import numpy as np
 from PySide2.QtGui import QVector3D
 
 
+def qvector3d_to_numpy_array(input_vector: QVector3D) -> np.ndarray:
+    return np.array([input_vector.x(), input_vector.y(), input_vector.z()]).astype(
+        float
+    )
+
+
+def numpy_array_to_qvector3d(input_array: np.ndarray) -> QVector3D:
+    return QVector3D(input_array[0], input_array[1], input_array[2])
+
+
 def validate_nonzero_qvector(value: QVector3D):
     if value.x() == 0 and value.y() == 0 and value.z() == 0:
         raise ValueError("Vector is zero length")
@@ -0,0 +1,284 @@
+"""
+Axis-aligned bounding boxes of the components in the instrument view, held in a bounding volume hierarchy so that
+picking and framing only look at the components near the ray or point rather than at every mesh.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Bounds = Tuple[np.ndarray, np.ndarray]
+
+
+def transform_bounds(
+    lower: np.ndarray, upper: np.ndarray, matrix: np.ndarray
+) -> Bounds:
+    """
+    Finds the axis-aligned box around a box after it has been transformed.
+    :param lower: The lower corner of the box.
+    :param upper: The upper corner of the box.
+    :param matrix: The 4x4 transformation matrix, acting on column vectors.
+    :return: The lower and upper corners of the transformed box.
+    """
+    centre = (lower + upper) / 2
+    half_extent = (upper - lower) / 2
+    new_centre = matrix[:3, :3] @ centre + matrix[:3, 3]
+    new_half_extent = np.abs(matrix[:3, :3]) @ half_extent
+    return new_centre - new_half_extent, new_centre + new_half_extent
+
+
+def ray_box_distance(
+    origin: np.ndarray,
+    inverse_direction: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> Optional[float]:
+    """
+    Slab test of a ray against a box.
+    :param origin: The start of the ray.
+    :param inverse_direction: One over each component of the direction of the ray.
+    :param lower: The lower corner of the box.
+    :param upper: The upper corner of the box.
+    :return: The distance along the ray, in lengths of its direction, at which it enters the box, which is zero if it
+        starts inside it, or None if the ray misses the box.
+    """
+    with np.errstate(invalid="ignore"):
+        first = (lower - origin) * inverse_direction
+        second = (upper - origin) * inverse_direction
+    # A ray parallel to a slab and lying on one of its planes gives nan, which np.fmin and np.fmax ignore
+    near = np.fmax.reduce(np.fmin(first, second))
+    far = np.fmin.reduce(np.fmax(first, second))
+    if far < max(near, 0):
+        return None
+    return max(near, 0.0)
+
+
+class BoundingVolumeHierarchy:
+    """
+    Holds the bounds of each component in its own coordinates and in the world, found with the transformation of the
+    component, and a binary tree of boxes over the world bounds.
+
+    Moving a component updates its box and refits the boxes of the nodes above it, without rebuilding the tree. Adding
+    or removing components rebuilds the tree the next time it is used.
+    """
+
+    def __init__(self):
+        self._local_bounds: Dict[str, Bounds] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._world_bounds: Dict[str, Bounds] = {}
+        self._needs_rebuild = False
+
+        # The tree is held in arrays with one row for each node. Leaves have no children and the name of a component
+        self._names: List[str] = []
+        self._leaf_nodes: Dict[str, int] = {}
+        self._node_lower = np.empty((0, 3))
+        self._node_upper = np.empty((0, 3))
+        self._children = np.empty((0, 2), dtype=int)
+        self._parents = np.empty(0, dtype=int)
+        self._node_names: List[Optional[str]] = []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._local_bounds
+
+    def __len__(self) -> int:
+        return len(self._local_bounds)
+
+    def set_local_bounds(self, name: str, lower: np.ndarray, upper: np.ndarray):
+        """
+        Sets the bounds of a component's mesh in its own coordinates, adding the component if it is new.
+        :param name: The name of the component.
+        :param lower: The lower corner of the box around the mesh.
+        :param upper: The upper corner of the box around the mesh.
+        """
+        if name not in self._local_bounds:
+            self._needs_rebuild = True
+        self._local_bounds[name] = (np.asarray(lower, float), np.asarray(upper, float))
+        self._update_world_bounds(name)
+
+    def set_transform(self, name: str, matrix: np.ndarray):
+        """
+        Sets the transformation of a component and moves its box.
+        :param name: The name of the component.
+        :param matrix: The 4x4 matrix of the transformation, acting on column vectors.
+        """
+        self._matrices[name] = np.asarray(matrix, float)
+        if name in self._local_bounds:
+            self._update_world_bounds(name)
+
+    def remove(self, name: str):
+        self._matrices.pop(name, None)
+        if self._local_bounds.pop(name, None) is not None:
+            del self._world_bounds[name]
+            self._needs_rebuild = True
+
+    def clear(self):
+        self._local_bounds.clear()
+        self._matrices.clear()
+        self._world_bounds.clear()
+        self._needs_rebuild = True
+
+    def world_bounds(self, name: str) -> Optional[Bounds]:
+        """
+        :return: The lower and upper corners of the box around the component in the world, or None if it is unknown.
+        """
+        return self._world_bounds.get(name)
+
+    def bounds(self) -> Optional[Bounds]:
+        """
+        :return: The lower and upper corners of the box around all of the components, or None if there are none.
+        """
+        self._build()
+        if not self._names:
+            return None
+        return self._node_lower[0], self._node_upper[0]
+
+    def first_hit(
+        self, origin: np.ndarray, direction: np.ndarray
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Finds the component whose box a ray enters first. Nodes whose box the ray misses, or enters further along than
+        the nearest component found so far, are skipped along with everything below them.
+        :param origin: The start of the ray.
+        :param direction: The direction of the ray.
+        :return: The name of the component and the distance along the ray at which it enters its box, in lengths of
+            the direction, or None if the ray misses every component.
+        """
+        self._build()
+        if not self._names:
+            return None
+        origin = np.asarray(origin, float)
+        with np.errstate(divide="ignore"):
+            inverse_direction = 1 / np.asarray(direction, float)
+
+        nearest = None
+        nearest_distance = np.inf
+        stack = [(0, self._node_distance(0, origin, inverse_direction))]
+        while stack:
+            node, distance = stack.pop()
+            if distance is None or distance >= nearest_distance:
+                continue
+            name = self._node_names[node]
+            if name is not None:
+                nearest, nearest_distance = name, distance
+                continue
+            children = [
+                (child, self._node_distance(child, origin, inverse_direction))
+                for child in self._children[node]
+            ]
+            # Visit the nearer child first so that the further one is more likely to be skipped
+            children.sort(key=lambda item: -np.inf if item[1] is None else -item[1])
+            stack.extend(children)
+        if nearest is None:
+            return None
+        return nearest, nearest_distance
+
+    def components_at(self, point: np.ndarray) -> List[str]:
+        """
+        :param point: A point in the world.
+        :return: The names of the components whose box contains the point.
+        """
+        self._build()
+        if not self._names:
+            return []
+        point = np.asarray(point, float)
+        names = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if np.any(point < self._node_lower[node]) or np.any(
+                point > self._node_upper[node]
+            ):
+                continue
+            name = self._node_names[node]
+            if name is not None:
+                names.append(name)
+            else:
+                stack.extend(self._children[node])
+        return names
+
+    def _node_distance(
+        self, node: int, origin: np.ndarray, inverse_direction: np.ndarray
+    ) -> Optional[float]:
+        return ray_box_distance(
+            origin, inverse_direction, self._node_lower[node], self._node_upper[node]
+        )
+
+    def _update_world_bounds(self, name: str):
+        lower, upper = self._local_bounds[name]
+        matrix = self._matrices.get(name)
+        if matrix is not None:
+            lower, upper = transform_bounds(lower, upper, matrix)
+        self._world_bounds[name] = (lower, upper)
+        if not self._needs_rebuild:
+            self._refit(name)
+
+    def _refit(self, name: str):
+        """
+        Updates the box of a leaf and then of each node above it, stopping at the first one which does not change.
+        """
+        node = self._leaf_nodes[name]
+        self._node_lower[node], self._node_upper[node] = self._world_bounds[name]
+        node = self._parents[node]
+        while node >= 0:
+            children = self._children[node]
+            lower = self._node_lower[children].min(axis=0)
+            upper = self._node_upper[children].max(axis=0)
+            if np.array_equal(lower, self._node_lower[node]) and np.array_equal(
+                upper, self._node_upper[node]
+            ):
+                break
+            self._node_lower[node], self._node_upper[node] = lower, upper
+            node = self._parents[node]
+
+    def _build(self):
+        """
+        Builds the tree top down, splitting the components of each node at the median of their centres along the axis
+        in which the centres are most spread out.
+        """
+        if not self._needs_rebuild:
+            return
+        self._needs_rebuild = False
+        self._names = list(self._world_bounds.keys())
+        number_of_nodes = max(2 * len(self._names) - 1, 0)
+        self._node_lower = np.empty((number_of_nodes, 3))
+        self._node_upper = np.empty((number_of_nodes, 3))
+        self._children = np.full((number_of_nodes, 2), -1, dtype=int)
+        self._parents = np.full(number_of_nodes, -1, dtype=int)
+        self._node_names = [None] * number_of_nodes
+        self._leaf_nodes = {}
+        if not self._names:
+            return
+
+        lower = np.array([self._world_bounds[name][0] for name in self._names])
+        upper = np.array([self._world_bounds[name][1] for name in self._names])
+        centres = (lower + upper) / 2
+
+        # Nodes are numbered in the order they are made, so every node comes before its children
+        next_node = 1
+        stack = [(0, np.arange(len(self._names)))]
+        while stack:
+            node, components = stack.pop()
+            if len(components) == 1:
+                self._node_names[node] = self._names[components[0]]
+                self._leaf_nodes[self._names[components[0]]] = node
+                continue
+            component_centres = centres[components]
+            axis = np.argmax(np.ptp(component_centres, axis=0))
+            half = len(components) // 2
+            order = np.argpartition(component_centres[:, axis], half - 1)
+            for child, child_components in (
+                (next_node, components[order[:half]]),
+                (next_node + 1, components[order[half:]]),
+            ):
+                self._parents[child] = node
+                stack.append((child, child_components))
+            self._children[node] = (next_node, next_node + 1)
+            next_node += 2
+
+        leaves = np.array([self._leaf_nodes[name] for name in self._names])
+        self._node_lower[leaves] = lower
+        self._node_upper[leaves] = upper
+        for node in range(number_of_nodes - 1, -1, -1):
+            if self._node_names[node] is None:
+                children = self._children[node]
+                self._node_lower[node] = self._node_lower[children].min(axis=0)
+                self._node_upper[node] = self._node_upper[children].max(axis=0)
@@ -0,0 +1,198 @@
+"""
+A Phong-like material for meshes drawn with instanced rendering, where every instance of the mesh is moved by its own
+offset from a per-instance vertex attribute. The materials in Qt3DExtras do not know about per-instance attributes.
+
+Per-instance attributes need OpenGL 3.3 or OpenGL ES 3.0, as Qt3D ignores the attribute divisor with older versions.
+Where the context is older the instrument view merges the copies of a mesh into one and uses a normal material.
+"""
+from typing import Optional
+
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DRender import Qt3DRender
+from PySide2.QtCore import QByteArray
+from PySide2.QtGui import QColor, QOpenGLContext, QSurfaceFormat
+
+INSTANCE_OFFSET_ATTRIBUTE_NAME = "instanceOffset"
+
+# The API, profile and version of the context each technique is for, and the lines its shaders start with
+GL_SHADER_VERSION = "#version 150 core"
+GLES_SHADER_VERSION = "#version 300 es\nprecision highp float;"
+TECHNIQUES = [
+    (
+        Qt3DRender.QGraphicsApiFilter.OpenGL,
+        Qt3DRender.QGraphicsApiFilter.CoreProfile,
+        (3, 3),
+        GL_SHADER_VERSION,
+    ),
+    (
+        Qt3DRender.QGraphicsApiFilter.OpenGLES,
+        Qt3DRender.QGraphicsApiFilter.NoProfile,
+        (3, 0),
+        GLES_SHADER_VERSION,
+    ),
+]
+
+VERTEX_SHADER = f"""
+in vec3 vertexPosition;
+in vec3 vertexNormal;
+in vec3 {INSTANCE_OFFSET_ATTRIBUTE_NAME};
+
+out vec3 worldPosition;
+out vec3 worldNormal;
+
+uniform mat4 modelMatrix;
+uniform mat3 modelNormalMatrix;
+uniform mat4 mvp;
+
+void main()
+{{
+    vec4 position = vec4(vertexPosition + {INSTANCE_OFFSET_ATTRIBUTE_NAME}, 1.0);
+    worldNormal = normalize(modelNormalMatrix * vertexNormal);
+    worldPosition = vec3(modelMatrix * position);
+    gl_Position = mvp * position;
+}}
+"""
+
+# The mesh is lit by a light at the camera position, so faces pointing towards the camera are the brightest
+FRAGMENT_SHADER = """
+in vec3 worldPosition;
+in vec3 worldNormal;
+
+out vec4 fragColor;
+
+uniform vec4 ka;
+uniform vec4 kd;
+uniform vec4 ks;
+uniform float shininess;
+uniform float alpha;
+uniform vec3 eyePosition;
+
+void main()
+{
+    vec3 normal = normalize(worldNormal);
+    vec3 view = normalize(eyePosition - worldPosition);
+    float diffuse = abs(dot(normal, view));
+    float specular = 0.0;
+    if (shininess > 0.0)
+        specular = pow(max(dot(reflect(-view, normal), view), 0.0), shininess);
+    fragColor = vec4(ka.rgb + kd.rgb * diffuse + ks.rgb * specular, alpha);
+}
+"""
+
+
+_instancing_supported: Optional[bool] = None
+
+
+def instancing_supported() -> bool:
+    """
+    Checks once, with a context of the default surface format, whether the 3D view can draw meshes with
+    InstancedPhongMaterial.
+    :return: True if the context is OpenGL 3.3 or OpenGL ES 3.0 or later.
+    """
+    global _instancing_supported
+    if _instancing_supported is None:
+        context = QOpenGLContext()
+        context.setFormat(QSurfaceFormat.defaultFormat())
+        if not context.create():
+            _instancing_supported = False
+        else:
+            surface_format = context.format()
+            version = (surface_format.majorVersion(), surface_format.minorVersion())
+            _instancing_supported = version >= (
+                (3, 0) if context.isOpenGLES() else (3, 3)
+            )
+    return _instancing_supported
+
+
+class InstancedPhongMaterial(Qt3DRender.QMaterial):
+    """
+    Material for an OffMesh with positions, which offsets every instance of the mesh by its position.
+    """
+
+    def __init__(
+        self,
+        ambient: QColor,
+        diffuse: QColor,
+        parent: Qt3DCore.QEntity,
+        alpha: float = None,
+        shininess: float = 150.0,
+    ):
+        """
+        :param ambient: The ambient colour of the material.
+        :param diffuse: The diffuse colour of the material.
+        :param parent: The parent of the material.
+        :param alpha: The alpha value of the material. If provided the material is blended with what is behind it.
+        :param shininess: The shininess of the material, zero removes the specular highlight.
+        """
+        super().__init__(parent)
+
+        self.ambient_parameter = Qt3DRender.QParameter("ka", ambient)
+        self.diffuse_parameter = Qt3DRender.QParameter("kd", diffuse)
+        self.specular_parameter = Qt3DRender.QParameter(
+            "ks", QColor.fromRgbF(0.01, 0.01, 0.01)
+        )
+        self.shininess_parameter = Qt3DRender.QParameter("shininess", shininess)
+        self.alpha_parameter = Qt3DRender.QParameter(
+            "alpha", 1.0 if alpha is None else alpha
+        )
+        for parameter in [
+            self.ambient_parameter,
+            self.diffuse_parameter,
+            self.specular_parameter,
+            self.shininess_parameter,
+            self.alpha_parameter,
+        ]:
+            self.addParameter(parameter)
+
+        effect = Qt3DRender.QEffect(self)
+        for api, profile, (major, minor), shader_version in TECHNIQUES:
+            shader_program = Qt3DRender.QShaderProgram(self)
+            shader_program.setVertexShaderCode(
+                QByteArray(f"{shader_version}\n{VERTEX_SHADER}".encode())
+            )
+            shader_program.setFragmentShaderCode(
+                QByteArray(f"{shader_version}\n{FRAGMENT_SHADER}".encode())
+            )
+
+            render_pass = Qt3DRender.QRenderPass(self)
+            render_pass.setShaderProgram(shader_program)
+            if alpha is not None:
+                self._add_blending(render_pass)
+
+            technique = Qt3DRender.QTechnique(self)
+            api_filter = technique.graphicsApiFilter()
+            api_filter.setApi(api)
+            api_filter.setProfile(profile)
+            api_filter.setMajorVersion(major)
+            api_filter.setMinorVersion(minor)
+            technique.addRenderPass(render_pass)
+            effect.addTechnique(technique)
+        self.setEffect(effect)
+
+    @staticmethod
+    def _add_blending(render_pass: Qt3DRender.QRenderPass):
+        """
+        Blends the material with what is behind it in the same way as QPhongAlphaMaterial.
+        """
+        render_pass.addRenderState(Qt3DRender.QNoDepthMask(render_pass))
+        blend_arguments = Qt3DRender.QBlendEquationArguments(render_pass)
+        blend_arguments.setSourceRgb(Qt3DRender.QBlendEquationArguments.SourceAlpha)
+        blend_arguments.setDestinationRgb(
+            Qt3DRender.QBlendEquationArguments.OneMinusSourceAlpha
+        )
+        render_pass.addRenderState(blend_arguments)
+        blend_equation = Qt3DRender.QBlendEquation(render_pass)
+        blend_equation.setBlendFunction(Qt3DRender.QBlendEquation.Add)
+        render_pass.addRenderState(blend_equation)
+
+    def setAmbient(self, ambient: QColor):
+        self.ambient_parameter.setValue(ambient)
+
+    def setDiffuse(self, diffuse: QColor):
+        self.diffuse_parameter.setValue(diffuse)
+
+    def setShininess(self, shininess: float):
+        self.shininess_parameter.setValue(shininess)
+
+    def setAlpha(self, alpha: float):
+        self.alpha_parameter.setValue(alpha)
@@ -1,26 +1,71 @@
 import logging
-from typing import Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Optional, List, TYPE_CHECKING
 
+import numpy as np
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DExtras import Qt3DExtras
 from PySide2.Qt3DRender import Qt3DRender
-from PySide2.QtCore import QRectF
-from PySide2.QtGui import QVector3D, QColor
+from PySide2.QtCore import QPoint, QRect, QRectF, Signal
+from PySide2.QtGui import QMatrix4x4, QVector3D, QColor
 from PySide2.QtWidgets import QWidget, QVBoxLayout
 
+from nexus_constructor.instrument_view.bounding_volumes import BoundingVolumeHierarchy
 from nexus_constructor.instrument_view.gnomon import Gnomon
+from nexus_constructor.instrument_view.instanced_material import instancing_supported
 from nexus_constructor.instrument_view.instrument_view_axes import InstrumentViewAxes
 from nexus_constructor.instrument_view.instrument_zooming_3d_window import (
     InstrumentZooming3DWindow,
 )
-from nexus_constructor.model.geometry import OFFGeometry
+from nexus_constructor.instrument_view.level_of_detail import (
+    DetailLevel,
+    LOD_MIN_FACES,
+    LOD_PIXEL_THRESHOLDS,
+    MeshLevels,
+    bounding_box_geometry,
+    create_mesh_levels,
+    mesh_bounds,
+)
+from nexus_constructor.model.geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    NoShapeGeometry,
+)
 from nexus_constructor.model.instrument import SAMPLE_NAME
-from nexus_constructor.instrument_view.off_renderer import OffMesh
+from nexus_constructor.instrument_view.off_renderer import OffMesh, repeat_geometry
 from nexus_constructor.instrument_view.qentity_utils import (
     create_qentity,
     create_material,
 )
 
+if TYPE_CHECKING:
+    from nexus_constructor.model.component import Component  # noqa: F401
+
+# The smallest radius of the sphere the camera frames, so that it does not end up inside a component with no size
+MIN_VIEW_RADIUS = 0.1
+
+
+def geometry_to_draw(
+    geometry: OFFGeometry, positions: Optional[np.ndarray]
+) -> Tuple[OFFGeometry, Optional[np.ndarray]]:
+    """
+    :param geometry: The mesh of a component.
+    :param positions: The positions the mesh is repeated at, or None for a single mesh.
+    :return: The mesh to draw and the positions to draw it at with instanced rendering. The copies of the mesh are
+        merged into one mesh if the OpenGL context cannot draw instances.
+    """
+    if positions is not None and not instancing_supported():
+        return repeat_geometry(geometry, positions), None
+    return geometry, positions
+
+
+def matrix_to_array(matrix: QMatrix4x4) -> np.ndarray:
+    """
+    :param matrix: A Qt matrix, which holds its values column by column.
+    :return: The matrix as a 4x4 array.
+    """
+    return np.array(matrix.data()).reshape(4, 4).T
+
 
 class InstrumentView(QWidget):
     """
@@ -30,11 +75,18 @@ class InstrumentView(QWidget):
                    argument in order to appease Qt Designer.
     """
 
+    # Emitted with the name of the component clicked on in the view
+    component_picked = Signal(str)
+    # Emitted from the background thread with the name and revision of a component and its simplified meshes
+    _mesh_levels_created = Signal(str, int, "QVariant")
+
     def delete(self):
         """
         Fixes Qt3D segfault - this needs to be called when the program closes otherwise Qt tries to draw objects as python is cleaning them up.
         """
         self.clear_all_components()
+        if self._mesh_levels_executor is not None:
+            self._mesh_levels_executor.shutdown(wait=False)
         del self.root_entity
         del self.view
 
@@ -53,7 +105,8 @@ class InstrumentView(QWidget):
 
         # Create the 3DWindow and place it in a widget with a layout
         lay = QVBoxLayout(self)
-        self.view = InstrumentZooming3DWindow(self.component_root_entity)
+        self.view = InstrumentZooming3DWindow(self.fit_all)
+        self.view.clicked.connect(self._pick_component)
         self.view.defaultFrameGraph().setClearColor(QColor("lightgrey"))
         self.view.setRootEntity(self.root_entity)
         container = QWidget.createWindowContainer(self.view)
@@ -92,6 +145,25 @@ class InstrumentView(QWidget):
         self.component_entities = {}
         self.transformations = {}
 
+        # The revision of each component's mesh, which goes up every time the mesh is rebuilt, and the geometry and
+        # positions that the current mesh was built from
+        self.component_revisions = {}
+        self._mesh_sources = {}
+
+        # Large meshes are simplified in the background and drawn at the level of detail that suits their size on the
+        # screen, unless a level has been chosen for the component. The switch of each component with levels of detail
+        # is kept with the entity of each level
+        self.detail_overrides: Dict[str, DetailLevel] = {}
+        self._level_switches: Dict[
+            str, Tuple[Qt3DRender.QLevelOfDetailSwitch, List[Qt3DCore.QEntity]]
+        ] = {}
+        self._mesh_levels_executor: Optional[ThreadPoolExecutor] = None
+        self._mesh_levels_created.connect(self._add_mesh_levels)
+
+        # The box around each component in the world, for picking and framing components without going through
+        # every mesh
+        self.bounding_volumes = BoundingVolumeHierarchy()
+
         # Create layers in order to allow one camera to only see the gnomon and one camera to only see the
         # components and axis lines
         self.create_layers()
@@ -193,29 +265,226 @@ class InstrumentView(QWidget):
         return clear_buffers
 
     def add_component(
-        self, name: str, geometry: OFFGeometry, positions: List[QVector3D] = None
+        self, name: str, geometry: OFFGeometry, positions: np.ndarray = None
     ):
         """
         Add a component to the instrument view given a name and its geometry.
         :param name: The name of the component.
         :param geometry: The geometry information of the component that is used to create a mesh.
-        :param positions: Mesh is repeated at each of these positions
+        :param positions: Mesh is repeated at each of these positions, given as the rows of an (N, 3) array
         """
         if geometry is None:
             return
 
-        mesh = OffMesh(geometry.off_geometry, self.component_root_entity, positions)
+        # Replacing a component's mesh keeps its transformation
+        matrix = None
+        if name in self.component_entities:
+            old_transformation = self.transformations.pop(name, None)
+            if old_transformation is not None:
+                matrix = old_transformation.matrix()
+            self.component_entities.pop(name).setParent(None)
+            self._level_switches.pop(name, None)
+
+        revision = self.component_revisions.get(name, 0) + 1
+        off_geometry, drawn_positions = geometry_to_draw(
+            geometry.off_geometry, positions
+        )
         material = create_material(
             QColor("black") if name != SAMPLE_NAME else QColor("red"),
             QColor("grey"),
             self.component_root_entity,
             alpha=0.5 if name == SAMPLE_NAME else None,
+            instanced=drawn_positions is not None,
         )
 
-        self.component_entities[name] = create_qentity(
-            [mesh, material], self.component_root_entity
+        if off_geometry.number_of_faces >= LOD_MIN_FACES:
+            # Draw the bounding box until the levels of detail are ready
+            entity = create_qentity([material], self.component_root_entity)
+            create_qentity(
+                [
+                    OffMesh(bounding_box_geometry(off_geometry), None, drawn_positions),
+                    material,
+                ],
+                entity,
+            )
+            self._start_mesh_levels(name, revision, off_geometry, drawn_positions)
+        else:
+            mesh = OffMesh(off_geometry, self.component_root_entity, drawn_positions)
+            entity = create_qentity([mesh, material], self.component_root_entity)
+
+        self.component_entities[name] = entity
+        self.bounding_volumes.set_local_bounds(
+            name, *mesh_bounds(off_geometry, drawn_positions)
+        )
+        if matrix is not None:
+            transformation = Qt3DCore.QTransform()
+            transformation.setMatrix(matrix)
+            self.add_transformation(name, transformation)
+        self.component_revisions[name] = revision
+        self._mesh_sources[name] = (geometry, positions)
+
+    def _start_mesh_levels(
+        self,
+        name: str,
+        revision: int,
+        geometry: OFFGeometry,
+        positions: Optional[np.ndarray],
+    ):
+        # The worker gets its own geometry holding the arrays, so that the model can change while it runs
+        geometry = OFFGeometryNoNexus.from_winding_order(
+            geometry.vertices_array, geometry.winding_order_array, geometry.face_offsets
+        )
+        if self._mesh_levels_executor is None:
+            self._mesh_levels_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="mesh-levels"
+            )
+        self._mesh_levels_executor.submit(
+            self._create_mesh_levels, name, revision, geometry, positions
         )
 
+    def _create_mesh_levels(
+        self,
+        name: str,
+        revision: int,
+        geometry: OFFGeometry,
+        positions: Optional[np.ndarray],
+    ):
+        """
+        Creates the simplified meshes of a component. Runs in the background thread.
+        """
+        try:
+            levels = create_mesh_levels(geometry, positions)
+        except Exception:
+            logging.exception(f"Unable to simplify the mesh of {name}")
+            levels = None
+        self._mesh_levels_created.emit(name, revision, levels)
+
+    def _add_mesh_levels(self, name: str, revision: int, levels: Optional[MeshLevels]):
+        """
+        Replaces the bounding box drawn while the simplified meshes were made with an entity for each level of detail,
+        which QLevelOfDetailSwitch enables one at a time. If the mesh could not be simplified it is drawn in full.
+        """
+        if (
+            name not in self.component_entities
+            or self.component_revisions.get(name) != revision
+        ):
+            # The mesh has been replaced or deleted since. Revisions are kept after a component is deleted, so that
+            # the levels of a deleted mesh are not taken for those of a new component with the same name
+            return
+        entity = self.component_entities[name]
+        material = next(
+            component
+            for component in entity.components()
+            if isinstance(component, Qt3DRender.QMaterial)
+        )
+        geometry, positions = self._mesh_sources[name]
+        for placeholder in entity.childNodes():
+            if isinstance(placeholder, Qt3DCore.QEntity):
+                placeholder.setParent(None)
+
+        if levels is None:
+            off_geometry, drawn_positions = geometry_to_draw(
+                geometry.off_geometry, positions
+            )
+            create_qentity(
+                [OffMesh(off_geometry, None, drawn_positions), material], entity
+            )
+            return
+
+        # The levels were made from the mesh with any copies already merged when it is not drawn with instancing
+        drawn_positions = positions if instancing_supported() else None
+        level_entities = [
+            create_qentity(
+                [OffMesh(levels[level], None, drawn_positions), material], entity
+            )
+            for level in DetailLevel
+        ]
+        level_switch = Qt3DRender.QLevelOfDetailSwitch(entity)
+        level_switch.setCamera(self.view.camera())
+        level_switch.setThresholdType(
+            Qt3DRender.QLevelOfDetail.ProjectedScreenPixelSizeThreshold
+        )
+        level_switch.setThresholds(list(LOD_PIXEL_THRESHOLDS))
+        level_switch.setVolumeOverride(
+            Qt3DRender.QLevelOfDetailBoundingSphere(
+                QVector3D(*levels.centre), levels.radius
+            )
+        )
+        entity.addComponent(level_switch)
+        self._level_switches[name] = (level_switch, level_entities)
+        self._apply_detail_level(name)
+
+    def set_detail_level(self, name: str, level: Optional[DetailLevel]):
+        """
+        Chooses the mesh a large component is drawn with, rather than going by its size on the screen. Components with
+        small meshes are always drawn in full.
+        :param name: The name of the component.
+        :param level: The level of detail to draw the component at, or None to choose it by its size on the screen.
+        """
+        if level is None:
+            self.detail_overrides.pop(name, None)
+        else:
+            self.detail_overrides[name] = DetailLevel(level)
+        self._apply_detail_level(name)
+
+    def _apply_detail_level(self, name: str):
+        if name not in self._level_switches:
+            return
+        level_switch, level_entities = self._level_switches[name]
+        level = self.detail_overrides.get(name)
+        level_switch.setEnabled(level is None)
+        if level is None:
+            level = level_switch.currentIndex()
+        for index, level_entity in enumerate(level_entities):
+            level_entity.setEnabled(index == level)
+
+    def _mesh_is_current(
+        self, name: str, geometry: OFFGeometry, positions: Optional[np.ndarray]
+    ) -> bool:
+        """
+        Checks whether the mesh of a component was built from the given geometry and positions, so does not need to
+        be rebuilt. Geometry groups are compared by identity as the model replaces them whenever a shape is changed.
+        """
+        if name not in self.component_entities or name not in self._mesh_sources:
+            return False
+        old_geometry, old_positions = self._mesh_sources[name]
+        same_geometry = old_geometry is geometry or (
+            isinstance(old_geometry, NoShapeGeometry)
+            and isinstance(geometry, NoShapeGeometry)
+        )
+        if old_positions is None or positions is None:
+            return same_geometry and old_positions is positions
+        return same_geometry and np.array_equal(old_positions, positions)
+
+    def update_components(self, components: List["Component"]):
+        """
+        Brings the view in line with the given components by applying the differences to the view rather than
+        rebuilding it: meshes are only rebuilt for components whose shape has changed, transformations of existing
+        components have their matrix updated and components which are no longer present are detached.
+        :param components: All of the components which should be in the view.
+        """
+        names = set()
+        for component in components:
+            names.add(component.name)
+            geometry, positions = component.shape
+            if not self._mesh_is_current(component.name, geometry, positions):
+                self.add_component(component.name, geometry, positions)
+            if component.name in self.component_entities:
+                self.add_transformation(component.name, component.qtransform)
+
+        for name in list(self.component_entities.keys()):
+            if name not in names:
+                self.delete_component(name)
+
+    def update_transformations(self, components: List["Component"]):
+        """
+        Updates the matrix of the transformation of each of the given components already in the view.
+        :param components: The components to update the transformations of.
+        """
+        for component in components:
+            if component.name in self.component_entities:
+                self.add_transformation(component.name, component.qtransform)
+
     def get_entity(self, component_name: str) -> Qt3DCore.QEntity:
         """
         Obtain the entity from the InstrumentView based on its name.
@@ -227,14 +496,60 @@ class InstrumentView(QWidget):
                 f"Unable to retrieve component {component_name} because it doesn't exist."
             )
 
-    @staticmethod
-    def zoom_to_component(entity: Qt3DCore.QEntity, camera: Qt3DRender.QCamera):
+    def zoom_to_component(self, name: str):
         """
-        Instructs a camera to zoom in on an individual component.
-        :param entity: The component entity that the camera should zoom in on.
-        :param camera: The camera that will do the zooming.
+        Moves the camera to frame the box around a component.
+        :param name: The name of the component.
         """
-        camera.viewEntity(entity)
+        bounds = self.bounding_volumes.world_bounds(name)
+        if bounds is None:
+            logging.error(
+                f"Unable to zoom to component {name} because it doesn't exist."
+            )
+            return
+        self._view_bounds(*bounds)
+
+    def fit_all(self):
+        """
+        Moves the camera to frame the box around all of the components.
+        """
+        bounds = self.bounding_volumes.bounds()
+        if bounds is not None:
+            self._view_bounds(*bounds)
+
+    def _view_bounds(self, lower: np.ndarray, upper: np.ndarray):
+        self.view.camera().viewSphere(
+            QVector3D(*((lower + upper) / 2)),
+            max(np.linalg.norm(upper - lower) / 2, MIN_VIEW_RADIUS),
+        )
+
+    def component_at(self, x: float, y: float) -> Optional[str]:
+        """
+        Finds the component under a point in the view, by casting a ray from the camera through the point and taking
+        the first component whose box it enters.
+        :param x: The distance of the point from the left of the view, in pixels.
+        :param y: The distance of the point from the top of the view, in pixels.
+        :return: The name of the component, or None if there is no component under the point.
+        """
+        camera = self.view.camera()
+        viewport = QRect(0, 0, self.view.width(), self.view.height())
+        # Unprojecting counts from the bottom of the viewport
+        window_y = self.view.height() - y
+        near, far = (
+            QVector3D(x, window_y, depth).unproject(
+                camera.viewMatrix(), camera.projectionMatrix(), viewport
+            )
+            for depth in (0, 1)
+        )
+        hit = self.bounding_volumes.first_hit(
+            np.array(near.toTuple()), np.array((far - near).toTuple())
+        )
+        return None if hit is None else hit[0]
+
+    def _pick_component(self, position: QPoint):
+        name = self.component_at(position.x(), position.y())
+        if name is not None:
+            self.component_picked.emit(name)
 
     def clear_all_components(self):
         """
@@ -243,6 +558,10 @@ class InstrumentView(QWidget):
         for component in self.component_entities.keys():
             self.component_entities[component].setParent(None)
         self.component_entities = dict()
+        self._mesh_sources = dict()
+        self._level_switches = dict()
+        self.detail_overrides = dict()
+        self.bounding_volumes.clear()
 
     def delete_component(self, name: str):
         """
@@ -252,7 +571,11 @@ class InstrumentView(QWidget):
         try:
             self.component_entities[name].setParent(None)
             self.component_entities.pop(name)
-            self.transformations.pop(name)
+            self._mesh_sources.pop(name, None)
+            self._level_switches.pop(name, None)
+            self.detail_overrides.pop(name, None)
+            self.bounding_volumes.remove(name)
+            self.transformations.pop(name, None)
         except KeyError:
             logging.error(
                 f"Unable to delete component {name} because it doesn't exist."
@@ -263,9 +586,21 @@ class InstrumentView(QWidget):
     ):
         """
         Add a transformation to a component, each component has a single transformation which contains
-        the resultant transformation for its entire depends_on chain of translations and rotations
+        the resultant transformation for its entire depends_on chain of translations and rotations.
+        If the component already has a transformation its matrix is updated instead.
         """
+        existing_transformation = self.transformations.get(component_name)
+        if existing_transformation is not None:
+            if existing_transformation.matrix() != transformation.matrix():
+                existing_transformation.setMatrix(transformation.matrix())
+                self.bounding_volumes.set_transform(
+                    component_name, matrix_to_array(transformation.matrix())
+                )
+            return
         self.transformations[component_name] = transformation
+        self.bounding_volumes.set_transform(
+            component_name, matrix_to_array(transformation.matrix())
+        )
         component = self.component_entities[component_name]
         component.addComponent(transformation)
 
@@ -275,6 +610,7 @@ class InstrumentView(QWidget):
         """
         for component_name, transformation in self.transformations.items():
             self.component_entities[component_name].removeComponent(transformation)
+            self.bounding_volumes.set_transform(component_name, np.identity(4))
         self.transformations = {}
 
     @staticmethod
@@ -1,24 +1,50 @@
+from typing import Callable, Optional
+
 from PySide2 import QtGui
 from PySide2.Qt3DExtras import Qt3DExtras
-from PySide2.QtCore import Qt
+from PySide2.QtCore import QPoint, Qt, Signal
+
+# The furthest the mouse can move, in pixels, between being pressed and released for it to count as a click rather than
+# moving the camera
+CLICK_DISTANCE = 3
 
 
 class InstrumentZooming3DWindow(Qt3DExtras.Qt3DWindow):
-    def __init__(self, component_root_entity):
+    # Emitted with the position of a left click which did not move the camera
+    clicked = Signal(QPoint)
+
+    def __init__(self, fit_all: Callable[[], None]):
         """
         A custom 3D window that only zooms in on the instrument components when the escape key is pressed.
+        :param fit_all: Moves the camera to frame all of the instrument components.
         """
         super().__init__()
-        self.component_root_entity = component_root_entity
+        self.fit_all = fit_all
+        self._press_position: Optional[QPoint] = None
 
     def keyReleaseEvent(self, event: QtGui.QKeyEvent):
         """
-        Changes the behaviour of the Escape button by having this lead to the camera viewing all the components of a
-        certain entity rather than simply calling `viewAll`. Allows the superclass method to interpret the other key
+        Changes the behaviour of the Escape button by having this lead to the camera viewing all the instrument
+        components rather than simply calling `viewAll`. Allows the superclass method to interpret the other key
         releases.
         :param event: The key event.
         """
         if event.key() == Qt.Key.Key_Escape:
-            self.camera().viewEntity(self.component_root_entity)
+            self.fit_all()
             return
         super().keyReleaseEvent(event)
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == Qt.LeftButton:
+            self._press_position = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent):
+        if (
+            event.button() == Qt.LeftButton
+            and self._press_position is not None
+            and (event.pos() - self._press_position).manhattanLength() <= CLICK_DISTANCE
+        ):
+            self.clicked.emit(event.pos())
+        self._press_position = None
+        super().mouseReleaseEvent(event)
@@ -0,0 +1,174 @@
+"""
+Simplified versions of large meshes, which the instrument view draws instead of the full mesh when a component only
+covers a small part of the screen.
+"""
+from enum import IntEnum
+from typing import Optional, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.instrument_view.off_renderer import convert_faces_into_triangles
+from nexus_constructor.model.geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    face_sizes_to_offsets,
+)
+
+# Meshes with fewer faces than this are always drawn in full
+LOD_MIN_FACES = 5000
+# The number of triangles the decimated mesh is roughly reduced to
+DECIMATED_FACES = 2000
+# The size on the screen, in pixels, above which each level is drawn. There is one threshold for each DetailLevel
+LOD_PIXEL_THRESHOLDS = (400.0, 60.0, 0.0)
+
+# The corners of a box are numbered with bit 0 set for the upper x, bit 1 for the upper y and bit 2 for the upper z
+BOX_FACES = np.array(
+    [
+        [0, 4, 6, 2],
+        [1, 3, 7, 5],
+        [0, 1, 5, 4],
+        [2, 6, 7, 3],
+        [0, 2, 3, 1],
+        [4, 5, 7, 6],
+    ]
+)
+
+
+class DetailLevel(IntEnum):
+    """
+    The meshes a large component is drawn with, in the order of the children of its QLevelOfDetailSwitch.
+    """
+
+    FULL = 0
+    DECIMATED = 1
+    BOUNDING_BOX = 2
+
+
+@attr.s(frozen=True)
+class MeshLevels:
+    full = attr.ib(type=OFFGeometry)
+    decimated = attr.ib(type=OFFGeometry)
+    bounding_box = attr.ib(type=OFFGeometry)
+    # The centre and radius of a sphere around the mesh at all of its positions
+    centre = attr.ib(type=np.ndarray)
+    radius = attr.ib(type=float)
+
+    def __getitem__(self, level: DetailLevel) -> OFFGeometry:
+        return (self.full, self.decimated, self.bounding_box)[level]
+
+
+def mesh_bounds(
+    geometry: OFFGeometry, positions: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param geometry: The mesh.
+    :param positions: The positions the mesh is drawn at, if it is drawn at more than one.
+    :return: The lower and upper corners of the box around the mesh at all of its positions.
+    """
+    vertices = geometry.vertices_array
+    if len(vertices) == 0:
+        return np.zeros(3), np.zeros(3)
+    lower, upper = vertices.min(axis=0), vertices.max(axis=0)
+    if positions is not None and len(positions):
+        lower = lower + positions.min(axis=0)
+        upper = upper + positions.max(axis=0)
+    return lower, upper
+
+
+def bounding_box_geometry(geometry: OFFGeometry) -> OFFGeometryNoNexus:
+    """
+    :param geometry: The mesh.
+    :return: A box around the mesh, with its faces wound to face outwards.
+    """
+    lower, upper = mesh_bounds(geometry)
+    corners = np.arange(8)[:, np.newaxis] >> np.arange(3) & 1
+    vertices = np.where(corners, upper, lower)
+    return OFFGeometryNoNexus.from_winding_order(
+        vertices, BOX_FACES.ravel(), face_sizes_to_offsets(np.full(len(BOX_FACES), 4))
+    )
+
+
+def decimate_geometry(
+    geometry: OFFGeometry, target_faces: int = DECIMATED_FACES
+) -> OFFGeometryNoNexus:
+    """
+    Simplifies a mesh by vertex clustering: the vertices in each cell of a grid are merged into one at their mean, and
+    the triangles which then have fewer than three different corners are removed. The size of the cells is chosen from
+    the surface area of the mesh so that about the target number of triangles are left.
+    :param geometry: The mesh.
+    :param target_faces: The number of triangles to aim for.
+    :return: The simplified mesh, made of triangles.
+    """
+    vertices = geometry.vertices_array
+    triangles = convert_faces_into_triangles(
+        geometry.winding_order_array, geometry.face_offsets
+    )
+    lower, upper = mesh_bounds(geometry)
+    points = vertices[triangles]
+    area = (
+        np.linalg.norm(
+            np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0]), axis=1
+        ).sum()
+        / 2
+    )
+    # A surface covering n cells is drawn with about 2n triangles
+    cell_size = np.sqrt(2 * area / target_faces) if area > 0 else 0
+    if cell_size == 0:
+        cell_size = max((upper - lower).max(), 1.0) / np.sqrt(target_faces)
+
+    cells = np.floor((vertices - lower) / cell_size).astype(np.int64)
+    cells_per_axis = cells.max(axis=0) + 1
+    cell_keys = np.ravel_multi_index(cells.T, cells_per_axis)
+    _, clusters, cluster_sizes = np.unique(
+        cell_keys, return_inverse=True, return_counts=True
+    )
+    merged_vertices = (
+        np.column_stack(
+            [np.bincount(clusters, weights=vertices[:, axis]) for axis in range(3)]
+        )
+        / cluster_sizes[:, np.newaxis]
+    )
+
+    merged_triangles = clusters[triangles]
+    distinct_corners = (
+        (merged_triangles[:, 0] != merged_triangles[:, 1])
+        & (merged_triangles[:, 1] != merged_triangles[:, 2])
+        & (merged_triangles[:, 2] != merged_triangles[:, 0])
+    )
+    merged_triangles = merged_triangles[distinct_corners]
+    # Triangles merged into the same corners are only kept once, keeping the winding of the first
+    _, first = np.unique(np.sort(merged_triangles, axis=1), axis=0, return_index=True)
+    merged_triangles = merged_triangles[np.sort(first)]
+
+    return OFFGeometryNoNexus.from_winding_order(
+        merged_vertices,
+        merged_triangles.ravel(),
+        face_sizes_to_offsets(np.full(len(merged_triangles), 3)),
+    )
+
+
+def create_mesh_levels(
+    geometry: OFFGeometry,
+    positions: Optional[np.ndarray] = None,
+    target_faces: int = DECIMATED_FACES,
+) -> MeshLevels:
+    """
+    Creates the simplified meshes of a large component. Meant to be run in a background thread.
+    :param geometry: The full mesh.
+    :param positions: The positions the mesh is drawn at, if it is drawn at more than one.
+    :param target_faces: The number of triangles to aim for in the decimated mesh.
+    :return: The full, decimated and bounding box meshes.
+    """
+    bounding_box = bounding_box_geometry(geometry)
+    decimated = decimate_geometry(geometry, target_faces)
+    if decimated.number_of_faces == 0:
+        decimated = bounding_box
+    lower, upper = mesh_bounds(geometry, positions)
+    return MeshLevels(
+        geometry,
+        decimated,
+        bounding_box,
+        (lower + upper) / 2,
+        float(np.linalg.norm(upper - lower) / 2),
+    )
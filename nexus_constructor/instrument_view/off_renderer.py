@@ -5,103 +5,159 @@ Based off of a qml custom mesh example at https://github.com/iLya84a/qt3d/blob/m
 and a PyQt5 example from
 https://github.com/geehalel/npindi/blob/57c092200dd9cb259ac1c730a1258a378a1a6342/apps/mount3D/world3D-starspheres.py#L86
 """
-import itertools
 import logging
-import struct
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
+import numpy as np
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DRender import Qt3DRender
 from PySide2.QtGui import QVector3D
 
-from nexus_constructor.model.geometry import OFFGeometry
+from nexus_constructor.instrument_view.instanced_material import (
+    INSTANCE_OFFSET_ATTRIBUTE_NAME,
+)
+from nexus_constructor.model.geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    face_offsets_to_sizes,
+    vertices_to_array,
+)
 
 
-def flatten(list_to_flatten):
+def convert_to_bytes(vectors: np.ndarray) -> bytes:
     """
-    Flattens a list of lists into a single list
-    :param list_to_flatten: The list of lists
-    :return: A single list containing all values
+    Converts an array of vector components into the byte format required by Qt
+    :param vectors: The array of vector components to convert
+    :return: The byte representation
     """
-    return itertools.chain.from_iterable(list_to_flatten)
+    return np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
 
 
-def convert_to_bytes(vectors):
+def convert_faces_into_triangles(
+    winding_order: np.ndarray, face_offsets: np.ndarray
+) -> np.ndarray:
     """
-    Converts a list of vectors into the byte format required by Qt
-    :param vectors: The list of vectors to convert
-    :return: The byte representation
+    Fan triangulates the faces, so each face of n vertices becomes n - 2 triangles which share its first vertex
+    :param winding_order: Flattened 1D array of indices in vertices for each face
+    :param face_offsets: The start index for each face in winding_order
+    :return: A (T, 3) array of the vertex indices of each triangle
     """
-    return struct.pack(f"{len(vectors)}f", *vectors)
+    winding_order = np.asarray(winding_order)
+    face_offsets = np.asarray(face_offsets, dtype=int)
+    triangles_in_face = np.maximum(
+        face_offsets_to_sizes(face_offsets, len(winding_order)) - 2, 0
+    )
+    number_of_triangles = triangles_in_face.sum()
 
+    # The position of each triangle within its face, counting from zero for every face
+    first_triangle_in_face = np.cumsum(triangles_in_face) - triangles_in_face
+    triangle_in_face = np.arange(number_of_triangles) - np.repeat(
+        first_triangle_in_face, triangles_in_face
+    )
+    face_start = np.repeat(face_offsets, triangles_in_face)
 
-def convert_faces_into_triangles(faces):
-    """
-    Converts the faces into a list of triangles
-    :param faces: List of faces containing the triangles
-    :return: A list of the triangles that make a face
-    """
-    triangles = []
-    for face in faces:
-        triangles_in_face = len(face) - 2
-        triangles.extend(
-            [[face[0], face[i + 1], face[i + 2]] for i in range(triangles_in_face)]
+    return np.column_stack(
+        (
+            winding_order[face_start],
+            winding_order[face_start + triangle_in_face + 1],
+            winding_order[face_start + triangle_in_face + 2],
         )
-    return triangles
+    ).reshape(-1, 3)
 
 
-def create_vertex_buffer(vertices, triangles):
+def create_vertex_buffer(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
     """
-    For each point in each triangle in each face, add its points to the vertices list.
-    To do this we:
-    Separate faces into triangles (with them starting at the 0th point)
-    Get the vertices that are in the triangles
-    Adding them into a flat list of points
-    :param vertices: The vertices in the mesh
-    :param triangles: A list of the triangles that make up each face in the mesh
-    :return: A list of the points in the faces
+    For each point in each triangle, add its coordinates to a flat array of points.
+    :param vertices: The vertices in the mesh, as an (N, 3) array
+    :param triangles: A (T, 3) array of the triangles that make up each face in the mesh
+    :return: A flat float32 array of the points in the triangles
     """
-    flattened_triangles = flatten(triangles)
+    vertices = vertices_to_array(vertices).astype(np.float32, copy=False)
+    return vertices[np.asarray(triangles, dtype=int)].reshape(-1)
 
-    return flatten(
-        vertices[point_index].toTuple() for point_index in flattened_triangles
-    )
+
+def calculate_triangle_normals(
+    vertices: np.ndarray, triangles: np.ndarray
+) -> np.ndarray:
+    """
+    Calculates the unit normal of each triangle, following the same convention as QVector3D.normal
+    :param vertices: The vertices in the mesh, as an (N, 3) array
+    :param triangles: A (T, 3) array of the triangles that make up each face in the mesh
+    :return: A (T, 3) float32 array with the normal of each triangle
+    """
+    vertices = vertices_to_array(vertices).astype(np.float32, copy=False)
+    points = vertices[np.asarray(triangles, dtype=int)].reshape(-1, 3, 3)
+    normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    # Degenerate triangles have no normal, QVector3D.normal gives the zero vector for them
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
 
 
-def create_normal_buffer(vertices, triangles):
+def create_normal_buffer(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
     """
     Creates normal vectors for each vertex on the mesh.
     Qt requires each vertex to have it's own normal.
-    :param vertices: The vertices for the mesh
-    :param triangles: A list of the triangles that make up each face in the mesh
-    :return: A list of the normal points for the faces
-    """
-    normal_buffer_values = []
-    for triangle in triangles:
-        # Get the vertices of each triangle
-        points = [vertices[p] for p in triangle]
-        # Convert our vector objects into Qt Vectors
-        # Calculate the normal, leveraging Qt
-        normal = QVector3D.normal(*points)
-        # Need to have a normal for each vector
-        normal_buffer_values.extend(normal.toTuple() * 3)
-    return normal_buffer_values
-
-
-def repeat_shape_over_positions(
-    model: OFFGeometry, positions: List[QVector3D]
-) -> Tuple[List[List[int]], List[QVector3D]]:
-    faces = []
-    vertices = []
-    for i, position in enumerate(positions):
-        vertices.extend([vertex + position for vertex in model.vertices])
-        faces.extend(
-            [
-                [vertex + i * len(model.vertices) for vertex in face]
-                for face in model.faces
-            ]
-        )
-    return faces, vertices
+    :param vertices: The vertices for the mesh, as an (N, 3) array
+    :param triangles: A (T, 3) array of the triangles that make up each face in the mesh
+    :return: A flat float32 array of the normal for each point in the triangles
+    """
+    return np.repeat(
+        calculate_triangle_normals(vertices, triangles), 3, axis=0
+    ).reshape(-1)
+
+
+def calculate_vertex_normals(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Calculates a smooth normal for each vertex, by averaging the normals of the triangles which use it weighted by
+    their area
+    :param vertices: The vertices in the mesh, as an (N, 3) array
+    :param triangles: A (T, 3) array of the triangles that make up each face in the mesh
+    :return: An (N, 3) float32 array with the normal of each vertex
+    """
+    vertices = vertices_to_array(vertices).astype(np.float32, copy=False)
+    triangles = np.asarray(triangles, dtype=int)
+    points = vertices[triangles].reshape(-1, 3, 3)
+    # The length of the cross product is twice the triangle area, so leaving it unnormalised weights by area
+    triangle_normals = np.cross(
+        points[:, 1] - points[:, 0], points[:, 2] - points[:, 0]
+    )
+
+    corners = triangles.reshape(-1)
+    normals = np.column_stack(
+        [
+            np.bincount(
+                corners,
+                weights=np.repeat(triangle_normals[:, axis], 3),
+                minlength=len(vertices),
+            )
+            for axis in range(3)
+        ]
+    ).astype(np.float32)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+
+def repeat_geometry(
+    geometry: OFFGeometry, positions: Union[np.ndarray, List[QVector3D]]
+) -> OFFGeometryNoNexus:
+    """
+    Merges a copy of a mesh at each position into one mesh, for drawing a mesh at several positions without instanced
+    rendering.
+    :param geometry: The mesh to copy
+    :param positions: An (N, 3) array or list of positions to put a copy of the mesh at
+    :return: The mesh with all of the copies
+    """
+    positions = vertices_to_array(positions)
+    vertices = geometry.vertices_array
+    winding_order = geometry.winding_order_array
+    copies = np.arange(len(positions))[:, np.newaxis]
+    return OFFGeometryNoNexus.from_winding_order(
+        (vertices[np.newaxis] + positions[:, np.newaxis]).reshape(-1, 3),
+        (winding_order[np.newaxis] + copies * len(vertices)).reshape(-1),
+        (geometry.face_offsets[np.newaxis] + copies * len(winding_order)).reshape(-1),
+    )
 
 
 class QtOFFGeometry(Qt3DRender.QGeometry):
@@ -113,40 +169,98 @@ class QtOFFGeometry(Qt3DRender.QGeometry):
     q_attribute = Qt3DRender.QAttribute
 
     def __init__(
-        self, model: OFFGeometry, positions: List[QVector3D] = None, parent=None
+        self,
+        model: OFFGeometry,
+        positions: Union[np.ndarray, List[QVector3D]] = None,
+        parent=None,
+        indexed: bool = False,
+        smooth_normals: bool = False,
     ):
         """
         Creates the geometry for the OFF to be displayed in Qt3D.
         :param model: The geometry to render
-        :param positions: The posit
-        :param parent: A list of positions to copy the mesh into. If None specified a single mesh is
-        produced at the origin.
+        :param positions: An (N, 3) array or list of positions to draw the mesh at with instanced rendering. If None
+        specified a single mesh is produced at the origin.
+        :param parent: The parent of the geometry
+        :param indexed: If True the vertices are uploaded once and the triangles are described by an index buffer,
+        rather than copying the vertices of every triangle into the vertex buffer.
+        :param smooth_normals: If True each vertex gets the average normal of the triangles around it, otherwise every
+        face is flat shaded.
         """
         super().__init__(parent)
 
-        if positions is None:
-            positions = [QVector3D(0, 0, 0)]
-
-        faces, vertices = repeat_shape_over_positions(model, positions)
-
-        triangles = convert_faces_into_triangles(faces)
-        vertex_buffer_values = list(create_vertex_buffer(vertices, triangles))
-        normal_buffer_values = create_normal_buffer(vertices, triangles)
+        triangles = convert_faces_into_triangles(
+            model.winding_order_array, model.face_offsets
+        )
+        if indexed:
+            vertices, normals, indices = self._create_indexed_buffers(
+                model, triangles, smooth_normals
+            )
+        else:
+            vertices = create_vertex_buffer(model.vertices_array, triangles)
+            normals = (
+                calculate_vertex_normals(model.vertices_array, triangles)[
+                    triangles
+                ].reshape(-1)
+                if smooth_normals
+                else create_normal_buffer(model.vertices_array, triangles)
+            )
+            indices = None
 
         positionAttribute = self.create_attribute(
-            vertex_buffer_values, self.q_attribute.defaultPositionAttributeName()
+            vertices, self.q_attribute.defaultPositionAttributeName()
         )
         normalAttribute = self.create_attribute(
-            normal_buffer_values, self.q_attribute.defaultNormalAttributeName()
+            normals, self.q_attribute.defaultNormalAttributeName()
         )
 
         self.addAttribute(positionAttribute)
         self.addAttribute(normalAttribute)
-        self.vertex_count = len(vertex_buffer_values) // 3
+
+        self.instance_count = 1
+        if positions is not None:
+            # The mesh is uploaded once and drawn at each position with instanced rendering
+            positions = vertices_to_array(positions)
+            self.addAttribute(
+                self.create_attribute(
+                    positions, INSTANCE_OFFSET_ATTRIBUTE_NAME, divisor=1
+                )
+            )
+            self.instance_count = len(positions)
+
+        if indices is not None:
+            self.addAttribute(self.create_index_attribute(indices))
+            self.vertex_count = len(indices)
+        else:
+            self.vertex_count = len(vertices) // 3
 
         logging.info("Qt mesh built")
 
-    def create_attribute(self, buffer_values, name):
+    @staticmethod
+    def _create_indexed_buffers(
+        model: OFFGeometry, triangles: np.ndarray, smooth_normals: bool
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Creates the vertex, normal and index buffers for indexed rendering.
+        With smooth normals each vertex is stored once. A flat shaded face needs its own normal at each of its corners,
+        so in that case each face gets its own copy of its vertices, which are still shared by the triangles of the face.
+        :return: The flat vertex buffer, the flat normal buffer and the flat index buffer
+        """
+        vertices = model.vertices_array
+        if not smooth_normals:
+            winding_order = model.winding_order_array
+            vertices = vertices[winding_order]
+            triangles = convert_faces_into_triangles(
+                np.arange(len(winding_order)), model.face_offsets
+            )
+        normals = calculate_vertex_normals(vertices, triangles)
+        return (
+            vertices.astype(np.float32).reshape(-1),
+            normals.reshape(-1),
+            triangles.astype(np.uint32).reshape(-1),
+        )
+
+    def create_attribute(self, buffer_values, name, divisor: int = 0):
         SIZE_OF_FLOAT_IN_STRUCT = 4
         POINTS_IN_VECTOR = 3
 
@@ -159,10 +273,22 @@ class QtOFFGeometry(Qt3DRender.QGeometry):
         attribute.setDataSize(POINTS_IN_VECTOR)
         attribute.setByteOffset(0)
         attribute.setByteStride(POINTS_IN_VECTOR * SIZE_OF_FLOAT_IN_STRUCT)
-        attribute.setCount(len(buffer_values))
+        attribute.setCount(len(buffer_values.reshape(-1)) // POINTS_IN_VECTOR)
+        attribute.setDivisor(divisor)
         attribute.setName(name)
         return attribute
 
+    def create_index_attribute(self, indices: np.ndarray):
+        buffer = Qt3DRender.QBuffer(self)
+        buffer.setData(np.ascontiguousarray(indices, dtype=np.uint32).tobytes())
+
+        attribute = self.q_attribute(self)
+        attribute.setAttributeType(self.q_attribute.IndexAttribute)
+        attribute.setVertexBaseType(self.q_attribute.UnsignedInt)
+        attribute.setBuffer(buffer)
+        attribute.setCount(len(indices))
+        return attribute
+
 
 class OffMesh(Qt3DRender.QGeometryRenderer):
     """
@@ -173,19 +299,26 @@ class OffMesh(Qt3DRender.QGeometryRenderer):
         self,
         geometry: OFFGeometry,
         parent: Qt3DCore.QEntity,
-        positions: List[QVector3D] = None,
+        positions: Union[np.ndarray, List[QVector3D]] = None,
+        indexed: bool = False,
+        smooth_normals: bool = False,
     ):
         """
         Creates a geometry renderer for OFF geometry.
         :param geometry: The geometry to render
         :param parent: The parent entity to attach the mesh to.
-        :param positions: A list of positions to copy the mesh into. If None specified a single mesh is
-        produced at the origin.
+        :param positions: An (N, 3) array or list of positions to draw the mesh at with instanced rendering, using a
+        material created with instanced=True. If None specified a single mesh is produced at the origin.
+        :param indexed: If True the unique vertices are uploaded once along with an index buffer of the triangles.
+        :param smooth_normals: If True vertices get the average normal of the surrounding triangles rather than
+        the normal of their face.
         """
         super().__init__(parent)
 
-        self.setInstanceCount(1)
-        qt_geometry = QtOFFGeometry(geometry, positions, self)
+        qt_geometry = QtOFFGeometry(
+            geometry, positions, self, indexed=indexed, smooth_normals=smooth_normals
+        )
+        self.setInstanceCount(qt_geometry.instance_count)
         self.setVertexCount(qt_geometry.vertex_count)
         self.setFirstVertex(0)
         self.setPrimitiveType(Qt3DRender.QGeometryRenderer.Triangles)
@@ -5,6 +5,8 @@ from PySide2.Qt3DExtras import Qt3DExtras
 from PySide2.Qt3DRender import Qt3DRender
 from PySide2.QtGui import QColor
 
+from nexus_constructor.instrument_view.instanced_material import InstancedPhongMaterial
+
 
 def create_material(
     ambient: QColor,
@@ -12,6 +14,7 @@ def create_material(
     parent: Qt3DCore.QEntity,
     alpha: float = None,
     remove_shininess: bool = False,
+    instanced: bool = False,
 ) -> Qt3DRender.QMaterial:
     """
     Creates a material and then sets its ambient, diffuse, alpha (if provided) properties. Sets shininess to zero if
@@ -21,10 +24,14 @@ def create_material(
     :param alpha: The desired alpha value of the material. Optional argument as not all material-types have this
                   property.
     :param remove_shininess: Boolean indicating whether or not to remove shininess. This is used for the gnomon.
+    :param instanced: Boolean indicating whether the material is for a mesh drawn at many positions with instanced
+                      rendering.
     :return A material that is now able to be added to an entity.
     """
 
-    if alpha is not None:
+    if instanced:
+        material = InstancedPhongMaterial(ambient, diffuse, parent, alpha=alpha)
+    elif alpha is not None:
         material = Qt3DExtras.QPhongAlphaMaterial(parent)
         material.setAlpha(alpha)
     else:
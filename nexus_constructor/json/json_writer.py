@@ -0,0 +1,319 @@
+"""
+Writes JSON to a file in chunks, producing exactly the same text as json.dump.
+
+Numpy arrays in the document are formatted directly, one block of elements at a time, instead of the whole array being
+converted to nested lists of Python numbers first. The brackets and indentation between the elements of an array only
+depend on the position of an element in the array, so they are worked out once for a row and repeated. Lazy dataset
+values are written straight from their file a block at a time.
+"""
+import hashlib
+import io
+import json
+from itertools import chain
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from nexus_constructor.model.helpers import arrays_kept_in_dicts
+from nexus_constructor.model.lazy_values import LazyValues, read_values
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# The number of array elements formatted at a time
+ARRAY_BLOCK_SIZE = 1 << 16
+# Booleans, signed and unsigned integers and floats, which can be formatted without going through json
+NUMERIC_KINDS = "biuf"
+
+
+def _format_float(value: float) -> str:
+    # The same text json uses for each float, which is its repr apart from the values JavaScript has names for
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _format_numbers(block: np.ndarray) -> Iterator[str]:
+    values = block.ravel().tolist()
+    kind = block.dtype.kind
+    if kind == "f":
+        if np.isfinite(block).all():
+            return map(float.__repr__, values)
+        return map(_format_float, values)
+    if kind == "b":
+        return ("true" if value else "false" for value in values)
+    return map(int.__repr__, values)
+
+
+def _is_formatted_array(value: Any) -> bool:
+    # Whether the writer formats the value as an array, a block of elements at a time
+    if isinstance(value, LazyValues):
+        value = value.array_like()
+    elif not isinstance(value, np.ndarray):
+        return False
+    return (
+        value.dtype.kind in NUMERIC_KINDS and bool(value.shape) and 0 not in value.shape
+    )
+
+
+class JSONStreamWriter:
+    """
+    Writes a document of dicts, lists and values to a file in the same format as json.dump, with numeric numpy arrays
+    and lazy values allowed anywhere a list is.
+    """
+
+    def __init__(
+        self,
+        json_file: TextIO,
+        indent: Union[int, str, None] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        :param json_file: The file to write to, opened in text mode.
+        :param indent: The indent argument that would be given to json.dump.
+        :param chunk_size: Text is collected until there are at least this many characters before writing to the file.
+        :param progress: Called with the number of array elements written so far after each block of an array. An
+            exception it raises stops the writing.
+        """
+        self._file = json_file
+        self._indent = " " * indent if isinstance(indent, int) else indent
+        self._chunk_size = chunk_size
+        self._parts: List[str] = []
+        self._size = 0
+        self._progress = progress
+        self._elements_written = 0
+
+    def write(self, document: Any):
+        self._write_value(document, 0)
+        self._flush()
+
+    def _write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._parts:
+            self._file.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def _newline(self, level: int) -> str:
+        return "" if self._indent is None else "\n" + self._indent * level
+
+    def _item_separator(self, level: int) -> str:
+        return ", " if self._indent is None else "," + self._newline(level)
+
+    def _write_value(self, value: Any, level: int):
+        if _is_formatted_array(value):
+            if isinstance(value, LazyValues):
+                value = value.array_like()
+            self._write_array(value, level)
+        elif isinstance(value, np.ndarray):
+            self._write_value(value.tolist(), level)
+        elif isinstance(value, LazyValues):
+            self._write_value(value.read(), level)
+        elif isinstance(value, dict):
+            self._write_dict(value, level)
+        elif isinstance(value, (list, tuple)):
+            self._write_list(value, level)
+        elif isinstance(value, str):
+            self._write(encode_basestring_ascii(value))
+        else:
+            self._write(json.dumps(value))
+
+    def _write_dict(self, dictionary: dict, level: int):
+        if not dictionary:
+            self._write("{}")
+            return
+        self._write("{" + self._newline(level + 1))
+        for index, (key, value) in enumerate(dictionary.items()):
+            if not isinstance(key, str):
+                raise TypeError(f"keys must be str, not {key.__class__.__name__}")
+            if index:
+                self._write(self._item_separator(level + 1))
+            self._write(encode_basestring_ascii(key) + ": ")
+            self._write_value(value, level + 1)
+        self._write(self._newline(level) + "}")
+
+    def _write_list(self, values: Union[list, tuple], level: int):
+        if not values:
+            self._write("[]")
+            return
+        self._write("[" + self._newline(level + 1))
+        for index, value in enumerate(values):
+            if index:
+                self._write(self._item_separator(level + 1))
+            self._write_value(value, level + 1)
+        self._write(self._newline(level) + "]")
+
+    def _array_separators(self, shape: Tuple[int, ...], level: int) -> List[str]:
+        """
+        Works out the text which comes after each element in a row of an array, where a row is everything under one
+        index of the first dimension. After an element which is the last one of r lists, those lists are closed, a
+        comma is written and r new lists are opened.
+        :param shape: The shape of the array.
+        :param level: The nesting level of the array in the document.
+        :return: The text after each element of a row, with the text after the last element leading to the next row.
+        """
+        dimensions = len(shape)
+        row_shape = shape[1:]
+        positions = np.arange(int(np.prod(row_shape)))
+        lists_ended = np.zeros(len(positions), dtype=int)
+        stride = 1
+        for offset, length in enumerate(reversed(row_shape)):
+            ends_list = (positions // stride) % length == length - 1
+            lists_ended += ends_list & (lists_ended == offset)
+            stride *= length
+
+        separators = []
+        for ended in range(dimensions):
+            inner_level = level + dimensions - ended
+            separators.append(
+                "".join(
+                    self._newline(level + dimensions - 1 - i) + "]"
+                    for i in range(ended)
+                )
+                + self._item_separator(inner_level)
+                + "".join(
+                    "[" + self._newline(inner_level + i) for i in range(1, ended + 1)
+                )
+            )
+        return [separators[ended] for ended in lists_ended.tolist()]
+
+    def _write_array(self, array: np.ndarray, level: int):
+        dimensions = array.ndim
+        self._write(
+            "["
+            + "".join(self._newline(level + i) + "[" for i in range(1, dimensions))
+            + self._newline(level + dimensions)
+        )
+        closing = "".join(
+            self._newline(level + i) + "]" for i in reversed(range(dimensions))
+        )
+
+        separators = self._array_separators(array.shape, level)
+        rows_per_block = max(1, ARRAY_BLOCK_SIZE // len(separators))
+        for start in range(0, len(array), rows_per_block):
+            block = array[start : start + rows_per_block]
+            block_separators = separators * len(block)
+            if start + len(block) == len(array):
+                block_separators[-1] = closing
+            self._write(
+                "".join(
+                    chain.from_iterable(zip(_format_numbers(block), block_separators))
+                )
+            )
+            if self._progress is not None:
+                self._elements_written += block.size
+                self._progress(self._elements_written)
+
+
+def write_json(
+    document: Any,
+    json_file: TextIO,
+    indent: Union[int, str, None] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+):
+    """
+    Writes a document to a file in chunks, giving the same text as json.dump.
+    :param document: The document, which may contain numpy arrays.
+    :param json_file: The file to write to, opened in text mode.
+    :param indent: The indent argument that would be given to json.dump.
+    :param chunk_size: The number of characters to collect before each write to the file.
+    :param progress: Called with the number of array elements written so far, see array_elements.
+    """
+    JSONStreamWriter(json_file, indent, chunk_size, progress).write(document)
+
+
+def array_elements(document: Any) -> int:
+    """
+    :param document: A document which may contain numpy arrays and lazy values.
+    :return: The number of elements in the arrays the writer formats in blocks, which is what it reports progress in.
+    """
+    if _is_formatted_array(document):
+        return int(np.prod(document.shape))
+    if isinstance(document, dict):
+        return sum(array_elements(value) for value in document.values())
+    if isinstance(document, (list, tuple)):
+        return sum(array_elements(value) for value in document)
+    return 0
+
+
+def _update_digest(digest, value: Any):
+    if isinstance(value, (np.ndarray, LazyValues)):
+        array = np.ascontiguousarray(read_values(value))
+        digest.update(f"array {array.dtype.str} {array.shape} ".encode())
+        if array.dtype.hasobject:
+            digest.update(repr(array.tolist()).encode())
+        else:
+            digest.update(memoryview(array).cast("B"))
+    elif isinstance(value, dict):
+        digest.update(f"dict {len(value)} ".encode())
+        for key, item in value.items():
+            _update_digest(digest, key)
+            _update_digest(digest, item)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"list {len(value)} ".encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(f"{value.__class__.__name__} {value!r} ".encode())
+
+
+def document_digest(document: Any) -> bytes:
+    """
+    Hashes a document, reading the bytes of its arrays directly, which is much quicker than writing it as JSON.
+    Documents with the same digest give the same JSON text.
+    :param document: A document which may contain numpy arrays and lazy values.
+    :return: The SHA-256 digest of the document.
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, document)
+    return digest.digest()
+
+
+def document_to_json(
+    document: Any, progress: Optional[Callable[[int], None]] = None
+) -> str:
+    """
+    Gives the same text as json.dumps(document) for a document which may contain numpy arrays and lazy values.
+    :param document: The document, such as the as_dict of a model taken in arrays_kept_in_dicts.
+    :param progress: Called with the number of array elements written so far, see array_elements.
+    :return: The JSON text.
+    """
+    buffer = io.StringIO()
+    write_json(document, buffer, progress=progress)
+    return buffer.getvalue()
+
+
+def write_model_json(
+    model: Any, json_file: TextIO, indent: Optional[Union[int, str]] = None
+):
+    """
+    Writes the filewriter JSON for a model, giving the same text as json.dump(model.as_dict(), json_file), without
+    converting the numpy arrays in the model to lists.
+    :param model: The model, or any node of it with an as_dict method.
+    :param json_file: The file to write to, opened in text mode.
+    :param indent: The indent argument that would be given to json.dump.
+    """
+    with arrays_kept_in_dicts():
+        document = model.as_dict()
+    write_json(document, json_file, indent)
+
+
+def model_to_json(model: Any) -> str:
+    """
+    Gives the filewriter JSON for a model, the same text as json.dumps(model.as_dict()).
+    :param model: The model, or any node of it with an as_dict method.
+    :return: The JSON text.
+    """
+    buffer = io.StringIO()
+    write_model_json(model, buffer)
+    return buffer.getvalue()
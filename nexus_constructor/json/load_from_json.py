@@ -14,6 +14,7 @@ from nexus_constructor.json.load_from_json_utils import (
     DEPENDS_ON_IGNORE,
 )
 from nexus_constructor.json.shape_reader import ShapeReader
+from nexus_constructor.json.streaming_json import load_json_stream
 from nexus_constructor.json.transformation_reader import TransformationReader
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.entry import Entry
@@ -84,18 +85,21 @@ class JSONReader:
             f"in order to set depends_on value for component {dependent_component_name}."
         )
 
-    def load_model_from_json(self, filename: str) -> bool:
+    def load_model_from_json(self, filename: str, streaming: bool = False) -> bool:
         """
         Tries to load a model from a JSON file.
         :param filename: The filename of the JSON file.
+        :param streaming: If True the file is parsed incrementally and numeric values are read straight into numpy
+        arrays, which uses much less memory for files with large geometries.
         :return: True if the model was loaded without problems, False otherwise.
         """
         with open(filename, "r") as json_file:
 
-            json_data = json_file.read()
-
             try:
-                json_dict = json.loads(json_data)
+                if streaming:
+                    json_dict = load_json_stream(json_file)
+                else:
+                    json_dict = json.loads(json_file.read())
             except ValueError as exception:
                 self.warnings.append(
                     f"Provided file not recognised as valid JSON. Exception: {exception}"
@@ -1,9 +1,34 @@
-from typing import Union, Any
+import warnings
+from functools import lru_cache
+from typing import Union, Any, Optional, Sequence, Tuple
+
+import numpy as np
 
 from nexus_constructor.common_attrs import CommonAttrs, CommonKeys
+from nexus_constructor.model.value_type import VALUE_TYPE_TO_NP
 
 DEPENDS_ON_IGNORE = [None, "."]
 
+# Types in the JSON are not case sensitive, so they are looked up by their lower case name
+_VALUE_TYPES_BY_LOWER_CASE_NAME = {
+    value_type.lower(): value_type for value_type in VALUE_TYPE_TO_NP
+}
+
+# Signed and unsigned integers are the same kind of value as far as the JSON is concerned
+_INTEGER_KINDS = "iu"
+
+
+def _is_empty(value: Any) -> bool:
+    """
+    Checks if a value from the JSON is missing or empty. Unlike "not value" this also works for the numpy arrays
+    produced by the streaming loader.
+    :param value: The value to check.
+    :return: True if the value is falsy or an empty array, False otherwise.
+    """
+    if isinstance(value, np.ndarray):
+        return value.size == 0
+    return not value
+
 
 def _find_attribute_from_dict(attribute_name: str, entry: dict) -> Any:
     """
@@ -30,7 +55,7 @@ def _find_attribute_from_list_or_dict(
     if isinstance(entry, list):
         for item in entry:
             attribute = _find_attribute_from_dict(attribute_name, item)
-            if attribute:
+            if not _is_empty(attribute):
                 return attribute
         return None
     elif isinstance(entry, dict):
@@ -45,3 +70,115 @@ def _find_nx_class(entry: Union[list, dict]) -> str:
     """
     nx_class = _find_attribute_from_list_or_dict(CommonAttrs.NX_CLASS, entry)
     return nx_class if nx_class is not None else ""
+
+
+def _find_value_type(type_name: str) -> Optional[str]:
+    """
+    Finds the value type matching a type from the JSON, ignoring case.
+    :param type_name: The type from the JSON.
+    :return: The matching key of VALUE_TYPE_TO_NP, or None if the type is not recognised.
+    """
+    return _VALUE_TYPES_BY_LOWER_CASE_NAME.get(type_name.lower())
+
+
+@lru_cache()
+def _expected_dtypes(expected_types: Tuple[str, ...]) -> Tuple[np.dtype, ...]:
+    return tuple(
+        np.dtype(numpy_type)
+        for value_type, numpy_type in VALUE_TYPE_TO_NP.items()
+        if value_type in expected_types
+    )
+
+
+def _values_to_array(values: Any) -> Optional[np.ndarray]:
+    """
+    Converts a values list from the JSON to a numpy array, so that it only has to be converted once to check its shape
+    and type. Arrays from the streaming loader are returned as they are.
+    :param values: The list or array of values.
+    :return: The values as an array, or None if the list is ragged.
+    """
+    if isinstance(values, np.ndarray):
+        return values
+    with warnings.catch_warnings():
+        # Older versions of numpy make an object array from a ragged list and warn about it
+        warnings.simplefilter("error", np.VisibleDeprecationWarning)
+        try:
+            return np.asarray(values)
+        except (ValueError, np.VisibleDeprecationWarning):
+            return None
+
+
+def _is_same_kind(kind: str, other_kind: str) -> bool:
+    if kind in _INTEGER_KINDS:
+        return other_kind in _INTEGER_KINDS
+    return kind == other_kind
+
+
+def _has_kind(value: Any, kind: str) -> bool:
+    if kind in _INTEGER_KINDS:
+        return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+    if kind == "f":
+        return isinstance(value, (float, np.floating))
+    return isinstance(value, str)
+
+
+def _first_index(wrong_values: np.ndarray) -> Optional[Tuple[int, ...]]:
+    if not wrong_values.any():
+        return None
+    return tuple(
+        int(index)
+        for index in np.unravel_index(np.argmax(wrong_values), wrong_values.shape)
+    )
+
+
+def _first_value_with_unexpected_type(
+    array: np.ndarray, expected_types: Sequence[str], values: Any = None
+) -> Optional[Tuple[int, ...]]:
+    """
+    Checks that every value in an array has one of the expected types. The kind and item size of the array's dtype are
+    checked for the whole array at once, and the range of the values is only checked if the dtype is wider than the
+    expected types.
+    :param array: The values as an array.
+    :param expected_types: The value types from VALUE_TYPE_TO_NP that the values are allowed to have.
+    :param values: The list the array was made from, if any. A list mixing numbers and strings becomes an array of
+    strings, so the list is needed to find which of its values was not a number.
+    :return: None if all the values have an expected type, otherwise the index of the first value that does not.
+    """
+    expected_dtypes = _expected_dtypes(tuple(expected_types))
+    kind = array.dtype.kind
+    same_kind_dtypes = [
+        dtype for dtype in expected_dtypes if _is_same_kind(dtype.kind, kind)
+    ]
+    if kind == "U" and same_kind_dtypes:
+        return None
+    if any(np.can_cast(array.dtype, dtype) for dtype in same_kind_dtypes):
+        return None
+
+    if same_kind_dtypes and kind in _INTEGER_KINDS:
+        # The dtype is wider than the expected types, but all of the values may still fit in one of them
+        limits = np.iinfo(array.dtype)
+        lowest = max(min(np.iinfo(dtype).min for dtype in same_kind_dtypes), limits.min)
+        highest = min(
+            max(np.iinfo(dtype).max for dtype in same_kind_dtypes), limits.max
+        )
+        return _first_index((array < lowest) | (array > highest))
+    if same_kind_dtypes and kind == "f":
+        highest = max(np.finfo(dtype).max for dtype in same_kind_dtypes)
+        return _first_index(np.isfinite(array) & (np.abs(array) > highest))
+
+    if values is not None and not isinstance(values, np.ndarray):
+        # A list with values of different kinds, so look through it for the first value of a kind that was not
+        # expected. This stops as soon as one is found.
+        expected_kinds = {dtype.kind for dtype in expected_dtypes}
+        objects = np.asarray(values, dtype=object)
+        for index, value in enumerate(objects.flat):
+            if not any(
+                _has_kind(value, expected_kind) for expected_kind in expected_kinds
+            ):
+                return tuple(int(i) for i in np.unravel_index(index, objects.shape))
+    elif kind == "f" and any(dtype.kind in _INTEGER_KINDS for dtype in expected_dtypes):
+        index = _first_index(~np.isfinite(array) | (array != np.trunc(array)))
+        if index is not None:
+            return index
+    # Every value has the wrong type, such as an array of whole numbers written as floats
+    return tuple(0 for _ in array.shape)
@@ -1,7 +1,6 @@
 from typing import List, Union, Any, Dict
 
 import numpy as np
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.common_attrs import (
     CommonAttrs,
@@ -14,6 +13,9 @@ from nexus_constructor.common_attrs import (
 from nexus_constructor.json.load_from_json_utils import (
     _find_nx_class,
     _find_attribute_from_list_or_dict,
+    _first_value_with_unexpected_type,
+    _is_empty,
+    _values_to_array,
 )
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import (
@@ -28,10 +30,11 @@ from nexus_constructor.model.geometry import (
     Y_PIXEL_OFFSET,
     DETECTOR_FACES,
 )
+from nexus_constructor.model.lazy_values import spill_to_file
 from nexus_constructor.model.value_type import (
+    ValueTypes,
     INT_TYPES,
     FLOAT_TYPES,
-    VALUE_TYPE_TO_NP,
 )
 from nexus_constructor.unit_utils import (
     units_are_recognised_by_pint,
@@ -41,15 +44,6 @@ from nexus_constructor.unit_utils import (
 )
 
 
-def _convert_vertices_to_qvector3d(vertices: List[List[float]],) -> List[QVector3D]:
-    """
-    Converts a list of vertices to QVector3D
-    :param vertices: The list of vertices.
-    :return: The list of QVector3D vertices.
-    """
-    return [QVector3D(*vertex) for vertex in vertices]
-
-
 class ShapeReader:
     def __init__(self, component: Component, shape_info: Dict):
         self.component = component
@@ -126,7 +120,7 @@ class ShapeReader:
         faces_starting_indices = self._find_and_validate_values_list(
             faces_dataset, INT_TYPES, FACES
         )
-        if not faces_starting_indices:
+        if faces_starting_indices is None:
             return
 
         units = self._find_and_validate_units(vertices_dataset)
@@ -139,9 +133,9 @@ class ShapeReader:
         vertices = self._find_and_validate_values_list(
             vertices_dataset, FLOAT_TYPES, CommonAttrs.VERTICES
         )
-        if not vertices:
+        if vertices is None:
             return
-        vertices = _convert_vertices_to_qvector3d(vertices)
+        vertices = np.asarray(vertices, dtype=float)
 
         winding_order_dtype = self._find_and_validate_data_type(
             winding_order_dataset, INT_TYPES, WINDING_ORDER
@@ -149,7 +143,7 @@ class ShapeReader:
         winding_order = self._find_and_validate_values_list(
             winding_order_dataset, INT_TYPES, WINDING_ORDER
         )
-        if not winding_order:
+        if winding_order is None:
             return
 
         off_geometry = self.__create_off_geometry(
@@ -176,11 +170,11 @@ class ShapeReader:
     ):
         off_geometry = OFFGeometryNexus(name)
         off_geometry.nx_class = OFF_GEOMETRY_NX_CLASS
-        off_geometry.vertices = vertices
+        off_geometry.vertices_array = vertices
         off_geometry.units = units
         off_geometry.set_field_value(FACES, faces_starting_indices, faces_dtype)
         off_geometry.set_field_value(
-            WINDING_ORDER, np.array(winding_order), winding_order_dtype
+            WINDING_ORDER, np.asarray(winding_order), winding_order_dtype
         )
         return off_geometry
 
@@ -216,7 +210,7 @@ class ShapeReader:
         cylinders_list = self._find_and_validate_values_list(
             cylinders_dataset, INT_TYPES, CYLINDERS
         )
-        if not cylinders_list:
+        if cylinders_list is None:
             return
 
         vertices_dtype = self._find_and_validate_data_type(
@@ -225,7 +219,7 @@ class ShapeReader:
         vertices = self._find_and_validate_values_list(
             vertices_dataset, FLOAT_TYPES, CommonAttrs.VERTICES
         )
-        if not vertices:
+        if vertices is None:
             return
 
         cylindrical_geometry = self.__create_cylindrical_geometry(
@@ -241,7 +235,7 @@ class ShapeReader:
         cylindrical_geometry = CylindricalGeometry(name)
         cylindrical_geometry.nx_class = CYLINDRICAL_GEOMETRY_NX_CLASS
         cylindrical_geometry.set_field_value(
-            CYLINDERS, np.array(cylinders_list), cylinders_dtype
+            CYLINDERS, np.asarray(cylinders_list), cylinders_dtype
         )
         cylindrical_geometry.set_field_value(
             CommonAttrs.VERTICES, np.vstack(vertices), vertices_dtype
@@ -337,35 +331,33 @@ class ShapeReader:
         return units
 
     def _all_in_list_have_expected_type(
-        self, values: List, expected_types: List[str], list_parent_name: str
+        self,
+        values: Union[List, np.ndarray],
+        expected_types: List[str],
+        list_parent_name: str,
+        array: np.ndarray = None,
     ) -> bool:
         """
         Checks if all the items in a given list have the expected type.
         :param values: The list of values.
         :param expected_types: The expected types.
         :param list_parent_name: The name of the dataset the list belongs to.
+        :param array: The values already converted to an array, if they have been.
         :return: True of all the items in the list have the expected type, False otherwise.
         """
-        flat_array = np.array(values).flatten()
-        if all(
-            [
-                type(value)
-                in [
-                    numpy_dtype
-                    for human_readable_type, numpy_dtype in VALUE_TYPE_TO_NP.items()
-                    if human_readable_type in expected_types
-                ]
-                for value in flat_array
-            ]
-        ):
+        if array is None:
+            array = _values_to_array(values)
+        index = _first_value_with_unexpected_type(array, expected_types, values)
+        if index is None:
             return True
         self.warnings.append(
-            f"{self.error_message} Values in {list_parent_name} list do not all have type(s) {expected_types}."
+            f"{self.error_message} Values in {list_parent_name} list do not all have type(s) {expected_types}. "
+            f"The first value with the wrong type is at index {index[0] if len(index) == 1 else index}."
         )
         return False
 
     def _validate_list_size(
-        self, data_properties: Dict, values: List, parent_name: str
+        self, data_properties: Dict, values: Union[List, np.ndarray], parent_name: str
     ) -> bool:
         """
         Checks to see if the length of a list matches the size attribute in the dataset. A warning is recorded if the
@@ -377,8 +369,13 @@ class ShapeReader:
         :return: True if the sizes matched, the sizes didn't match, or the size information couldn't be found. False
         if the array does not have a uniform size.
         """
+        array = _values_to_array(values)
+        if array is None:
+            self.warnings.append(
+                f"{self.error_message} Incorrect array shape for {parent_name} dataset."
+            )
+            return False
         try:
-            array = np.array(values)
             size = data_properties[CommonKeys.DATASET][CommonKeys.SIZE]
             for i in range(len(size)):
                 if size[i] != array.shape[i]:
@@ -422,7 +419,10 @@ class ShapeReader:
         :param parent_name: The name of the parent dataset.
         :return: True if attribute is a list, False otherwise.
         """
-        if isinstance(attribute, list):
+        # Checked without converting the value, as a ragged list cannot be turned into an array
+        if isinstance(attribute, list) or (
+            isinstance(attribute, np.ndarray) and attribute.ndim > 0
+        ):
             return True
 
         self.warnings.append(
@@ -469,17 +469,19 @@ class ShapeReader:
         :return: The values list if it was found and passed validation, otherwise None is returned.
         """
         values = self._get_values_attribute(dataset, attribute_name)
-        if not values:
+        if _is_empty(values):
             return
 
         if not self._attribute_is_a_list(values, attribute_name):
             return
 
-        if not self._validate_list_size(dataset, values, attribute_name):
+        # The list is converted to an array once for checking both its shape and the type of its values
+        array = _values_to_array(values)
+        if not self._validate_list_size(dataset, array, attribute_name):
             return
 
         if not self._all_in_list_have_expected_type(
-            values, expected_types, attribute_name
+            values, expected_types, attribute_name, array
         ):
             return
 
@@ -522,12 +524,17 @@ class ShapeReader:
             detector_number = self._find_and_validate_values_list(
                 detector_number_dataset, INT_TYPES, DETECTOR_NUMBER
             )
-            if detector_number:
+            if detector_number is not None:
+                # Only needed when the pixel mapping is edited or the model is saved, so large arrays wait on disk
+                detector_number = spill_to_file(detector_number)
                 self.component.set_field_value(
                     DETECTOR_NUMBER, detector_number, detector_number_dtype
                 )
                 if isinstance(self.shape, CylindricalGeometry):
-                    self.shape.detector_number = detector_number
+                    # The shape shares the values, rather than keeping a copy in memory like its setter
+                    self.shape.set_field_value(
+                        DETECTOR_NUMBER, detector_number, ValueTypes.INT
+                    )
 
     def _handle_mapping(self, children: List[Dict]):
         shape_group = self._get_shape_dataset_from_list(
@@ -537,7 +544,9 @@ class ShapeReader:
             detector_faces_dataset = self._get_shape_dataset_from_list(
                 DETECTOR_FACES, shape_group[CommonKeys.CHILDREN], False
             )
-            self.shape.detector_faces = detector_faces_dataset[CommonKeys.VALUES]
+            # A detector shape without pixel data has no detector_faces
+            if detector_faces_dataset:
+                self.shape.detector_faces = detector_faces_dataset[CommonKeys.VALUES]
 
     def _find_and_add_pixel_offsets_to_component(
         self, offset_name: str, children: List[Dict]
@@ -559,9 +568,9 @@ class ShapeReader:
         pixel_offset = self._find_and_validate_values_list(
             offset_dataset, FLOAT_TYPES, offset_name
         )
-        if not pixel_offset:
+        if pixel_offset is None:
             return
 
         self.component.set_field_value(
-            offset_name, np.array(pixel_offset), pixel_offset_dtype
+            offset_name, np.asarray(pixel_offset), pixel_offset_dtype
         )
@@ -0,0 +1,481 @@
+"""
+An incremental JSON parser for loading large filewriter JSON files.
+
+The file is read in chunks and turned into a stream of events, similar to a SAX parser, rather than being read into a
+single string and parsed all at once. Numeric arrays which are the value of a "values" key are converted straight into
+typed numpy arrays, with their dtype and shape checked in bulk, so large geometries never exist as lists of Python
+floats.
+"""
+import re
+import warnings
+from json.decoder import scanstring
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+import numpy as np
+
+from nexus_constructor.common_attrs import CommonKeys
+
+START_MAP = "start_map"
+END_MAP = "end_map"
+MAP_KEY = "map_key"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+VALUE = "value"
+# A numeric array which has already been converted to a numpy array
+ARRAY = "array"
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER = re.compile(r"(-?(?:0|[1-9][0-9]*))(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+NUMBER_CHARACTERS_TO_END = re.compile(r"[0-9.eE+\-]*\Z")
+# Characters which can appear in an array of numbers, including any whitespace and commas after it
+NUMERIC_ARRAY_CHARACTERS = re.compile(r"[\[\]0-9 \t\n\r,.eE+\-]*")
+FLOAT_CHARACTERS = re.compile(r"[.eE]")
+BRACKETS_TO_SPACES = str.maketrans("[]", "  ")
+# Integers with more digits than this may not fit in an int64
+LONG_INTEGER = re.compile(r"[0-9]{19}")
+LONGEST_LITERAL = len("-Infinity")
+LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# What the parser expects to find next
+_EXPECT_VALUE = 0
+_EXPECT_VALUE_OR_END_ARRAY = 1
+_EXPECT_KEY = 2
+_EXPECT_KEY_OR_END_MAP = 3
+_EXPECT_SEPARATOR = 4
+
+
+class _NumericArrayReader:
+    """
+    Converts the text of a JSON array of numbers, with any level of nesting, into a numpy array one piece at a time,
+    so the memory needed for the temporary arrays does not grow with the size of the array. The structure of the array
+    is worked out from the positions of the brackets and commas without creating any Python lists, carrying the number
+    of elements in each unfinished list over from one piece to the next.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._number_of_dimensions = None
+        # The length of every list at each level, and the commas seen so far in the list which is still open
+        self._list_lengths = {}
+        self._open_list_commas = {}
+        self._ended_with_comma = False
+        self._parts = []
+        self.finished = False
+
+    def feed(self, text: str, final: bool) -> Optional[int]:
+        """
+        Reads as much of the text as ends with a complete number.
+        :param text: The text of the array from where the last piece ended, containing only numeric array characters.
+        :param final: True if the array does not carry on past the end of the text.
+        :return: The number of characters read, or None if the text is not part of a regular numeric array.
+        """
+        characters = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        change = (characters == ord("[")).view(np.int8) - (characters == ord("]")).view(
+            np.int8
+        )
+        depth = np.cumsum(change, dtype=np.int16)
+        depth += self._depth
+
+        closed = depth <= 0
+        if closed.any():
+            length = int(np.argmax(closed)) + 1
+            finished = True
+        elif final:
+            return None
+        else:
+            finished = False
+            # Stop after the last comma so no number is split between two pieces
+            length = text.rfind(",") + 1
+            if length == 0:
+                return 0
+        text = text[:length]
+        characters = characters[:length]
+        depth = depth[:length]
+
+        # numpy reads an empty field between two commas as zero, so look for them before parsing
+        if self._has_empty_field(characters):
+            return None
+
+        is_digit = (characters >= ord("0")) & (characters <= ord("9"))
+        if self._number_of_dimensions is None:
+            if not is_digit.any():
+                return None
+            self._number_of_dimensions = int(depth[np.argmax(is_digit)])
+        number_of_dimensions = self._number_of_dimensions
+        if np.any(depth[is_digit] != number_of_dimensions) or np.any(
+            depth > number_of_dimensions
+        ):
+            return None
+
+        for level in range(1, number_of_dimensions + 1):
+            if not self._check_list_lengths(characters, depth, level):
+                return None
+
+        innermost_ends = np.count_nonzero(
+            (characters == ord(",")) & (depth == number_of_dimensions)
+        ) + np.count_nonzero(
+            (characters == ord("]")) & (depth == number_of_dimensions - 1)
+        )
+        values = self._parse_numbers(text if finished else text[:-1], innermost_ends)
+        if values is None:
+            return None
+        self._parts.append(values)
+        self._depth = int(depth[-1])
+        self._ended_with_comma = not finished
+        self.finished = finished
+        return length
+
+    def _has_empty_field(self, characters: np.ndarray) -> bool:
+        """
+        Looks for an opening bracket or comma followed by a comma or closing bracket, with nothing but whitespace
+        between them, which means a number is missing.
+        """
+        significant = characters[
+            (characters != ord(" "))
+            & (characters != ord("\n"))
+            & (characters != ord("\r"))
+            & (characters != ord("\t"))
+        ]
+        if self._ended_with_comma:
+            significant = np.concatenate(([ord(",")], significant))
+        field_start = (significant[:-1] == ord("[")) | (significant[:-1] == ord(","))
+        field_end = (significant[1:] == ord(",")) | (significant[1:] == ord("]"))
+        return bool(np.any(field_start & field_end))
+
+    def _check_list_lengths(
+        self, characters: np.ndarray, depth: np.ndarray, level: int
+    ) -> bool:
+        """
+        Checks every list at the given level which ends in this piece has the same number of elements as the others.
+        """
+        openings = np.flatnonzero((characters == ord("[")) & (depth == level))
+        closings = np.flatnonzero((characters == ord("]")) & (depth == level - 1))
+        commas = np.flatnonzero((characters == ord(",")) & (depth == level))
+        carried_over = self._open_list_commas.get(level, 0)
+
+        if closings.size:
+            # A list with no opening bracket in this piece was opened in an earlier one, so it starts before the piece
+            starts = np.concatenate(([-1], openings))[
+                np.searchsorted(openings, closings)
+            ]
+            started_earlier = starts < 0
+            lengths = (
+                np.searchsorted(commas, closings)
+                - np.searchsorted(commas, starts)
+                + 1
+                + np.where(started_earlier, carried_over, 0)
+            )
+            expected = self._list_lengths.setdefault(level, int(lengths[0]))
+            if np.any(lengths != expected):
+                return False
+
+        if depth[-1] >= level:
+            if openings.size:
+                carried_over = commas.size - int(np.searchsorted(commas, openings[-1]))
+            else:
+                carried_over += commas.size
+        self._open_list_commas[level] = carried_over
+        return True
+
+    @staticmethod
+    def _parse_numbers(text: str, expected_count: int) -> Optional[np.ndarray]:
+        numbers_text = text.translate(BRACKETS_TO_SPACES)
+        if FLOAT_CHARACTERS.search(numbers_text):
+            dtype = np.float64
+        elif LONG_INTEGER.search(numbers_text):
+            return None
+        else:
+            dtype = np.int64
+
+        with warnings.catch_warnings():
+            # numpy only warns when it cannot parse the whole string, which means it is not valid JSON
+            warnings.simplefilter("error")
+            try:
+                values = np.fromstring(numbers_text, dtype=dtype, sep=",")
+            except (ValueError, DeprecationWarning):
+                return None
+        if values.size != expected_count:
+            return None
+        return values
+
+    def array(self) -> Optional[np.ndarray]:
+        """
+        :return: The whole array, with int64 values if every number is an integer and float64 values otherwise, or
+        None if the array is not finished.
+        """
+        if not self.finished:
+            return None
+        shape = [
+            self._list_lengths[level]
+            for level in range(1, self._number_of_dimensions + 1)
+        ]
+        values = np.concatenate(self._parts)
+        if values.size != np.prod(shape):
+            return None
+        return values.reshape(shape)
+
+
+class JSONEventParser:
+    """
+    Reads JSON from a file in chunks and produces (event, value) tuples. Numeric arrays which are the value of one of
+    the array keys produce a single ARRAY event with a numpy array instead of the events for each element. Other arrays,
+    such as ragged ones or ones containing strings, produce the usual events.
+    """
+
+    def __init__(
+        self,
+        json_file: TextIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        array_keys: Tuple[str, ...] = (CommonKeys.VALUES,),
+    ):
+        """
+        :param json_file: The file to read the JSON from, opened in text mode.
+        :param chunk_size: The number of characters to read from the file at a time.
+        :param array_keys: Numeric arrays which are the value of any of these keys are converted to numpy arrays.
+        """
+        self._file = json_file
+        self._chunk_size = chunk_size
+        self._array_keys = array_keys
+        self._buffer = ""
+        self._position = 0
+        # The position in the file of the start of the buffer, for error messages
+        self._offset = 0
+        self._end_of_file = False
+
+    def _read_more(self, minimum_size: int = 0) -> bool:
+        """
+        Appends at least one chunk from the file to the buffer, discarding the part of the buffer which has already
+        been parsed.
+        :param minimum_size: Read at least this many characters, used to grow the read size for long values.
+        :return: False if the end of the file has been reached, True otherwise.
+        """
+        if self._end_of_file:
+            return False
+        data = self._file.read(max(self._chunk_size, minimum_size))
+        if not data:
+            self._end_of_file = True
+            return False
+        self._offset += self._position
+        self._buffer = self._buffer[self._position :] + data
+        self._position = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message}: char {self._offset + self._position}")
+
+    def _peek(self) -> str:
+        """
+        Skips any whitespace and returns the next character without consuming it, or an empty string at the end of the
+        file.
+        """
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read_more():
+                return ""
+
+    def _ensure_available(self, number_of_characters: int):
+        while len(self._buffer) - self._position < number_of_characters:
+            if not self._read_more():
+                return
+
+    def _read_string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self._buffer, self._position + 1, True)
+                self._position = end
+                return value
+            except ValueError as error:
+                # The string may carry on into the next chunk
+                if not self._read_more(len(self._buffer)):
+                    raise self._error(f"Invalid string ({error.msg})")
+
+    def _read_number(self):
+        while True:
+            match = NUMBER.match(self._buffer, self._position)
+            # The number may carry on into the next chunk if nothing but number characters follow it
+            if match is not None and not NUMBER_CHARACTERS_TO_END.match(
+                self._buffer, match.end()
+            ):
+                break
+            if not self._read_more():
+                break
+        if match is None:
+            raise self._error("Expecting value")
+        integer, fraction, exponent = match.groups()
+        self._position = match.end()
+        if fraction or exponent:
+            return float(integer + (fraction or "") + (exponent or ""))
+        return int(integer)
+
+    def _read_literal(self):
+        self._ensure_available(LONGEST_LITERAL)
+        for text, value in LITERALS.items():
+            if self._buffer.startswith(text, self._position):
+                self._position += len(text)
+                return value
+        raise self._error("Expecting value")
+
+    def _read_numeric_array(self) -> Optional[np.ndarray]:
+        """
+        Tries to read a numeric array starting at the current position, leaving the position unchanged if the array
+        contains anything but numbers.
+        """
+        start = self._offset + self._position
+        reader = _NumericArrayReader()
+        # The text already read is kept so the array can be parsed again in the usual way if it is not numeric
+        pieces = []
+        while not reader.finished:
+            end = NUMERIC_ARRAY_CHARACTERS.match(self._buffer, self._position).end()
+            final = end < len(self._buffer) or self._end_of_file
+            length = reader.feed(self._buffer[self._position : end], final)
+            if length is None:
+                break
+            pieces.append(self._buffer[self._position : self._position + length])
+            self._position += length
+            if length == 0:
+                self._read_more()
+
+        array = reader.array()
+        if array is None:
+            self._offset = start
+            self._buffer = "".join(pieces) + self._buffer[self._position :]
+            self._position = 0
+        return array
+
+    def events(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Parses the file, yielding an (event, value) tuple for every part of the JSON document in order.
+        :raises ValueError: If the file does not contain valid JSON.
+        """
+        containers = []
+        key = None
+        expect = _EXPECT_VALUE
+        while True:
+            character = self._peek()
+
+            if expect == _EXPECT_VALUE_OR_END_ARRAY:
+                if character == "]":
+                    self._position += 1
+                    containers.pop()
+                    yield END_ARRAY, None
+                    expect = _EXPECT_SEPARATOR
+                    continue
+                expect = _EXPECT_VALUE
+
+            if expect == _EXPECT_VALUE:
+                value_key, key = key, None
+                expect = _EXPECT_SEPARATOR
+                if character == "{":
+                    self._position += 1
+                    containers.append(START_MAP)
+                    yield START_MAP, None
+                    expect = _EXPECT_KEY_OR_END_MAP
+                elif character == "[":
+                    array = (
+                        self._read_numeric_array()
+                        if value_key in self._array_keys
+                        else None
+                    )
+                    if array is not None:
+                        yield ARRAY, array
+                    else:
+                        self._position += 1
+                        containers.append(START_ARRAY)
+                        yield START_ARRAY, None
+                        expect = _EXPECT_VALUE_OR_END_ARRAY
+                elif character == '"':
+                    yield VALUE, self._read_string()
+                elif character and character in "-0123456789":
+                    self._ensure_available(LONGEST_LITERAL)
+                    if self._buffer.startswith("-Infinity", self._position):
+                        yield VALUE, self._read_literal()
+                    else:
+                        yield VALUE, self._read_number()
+                elif character:
+                    yield VALUE, self._read_literal()
+                else:
+                    raise self._error("Expecting value")
+
+            elif expect in (_EXPECT_KEY, _EXPECT_KEY_OR_END_MAP):
+                if character == "}" and expect == _EXPECT_KEY_OR_END_MAP:
+                    self._position += 1
+                    containers.pop()
+                    yield END_MAP, None
+                    expect = _EXPECT_SEPARATOR
+                    continue
+                if character != '"':
+                    raise self._error(
+                        "Expecting property name enclosed in double quotes"
+                    )
+                key = self._read_string()
+                if self._peek() != ":":
+                    raise self._error("Expecting ':' delimiter")
+                self._position += 1
+                yield MAP_KEY, key
+                expect = _EXPECT_VALUE
+
+            elif expect == _EXPECT_SEPARATOR:
+                if not containers:
+                    if character:
+                        raise self._error("Extra data")
+                    return
+                if character == ",":
+                    self._position += 1
+                    expect = (
+                        _EXPECT_KEY if containers[-1] == START_MAP else _EXPECT_VALUE
+                    )
+                elif character == "}" and containers[-1] == START_MAP:
+                    self._position += 1
+                    containers.pop()
+                    yield END_MAP, None
+                elif character == "]" and containers[-1] == START_ARRAY:
+                    self._position += 1
+                    containers.pop()
+                    yield END_ARRAY, None
+                else:
+                    raise self._error("Expecting ',' delimiter")
+
+
+def load_json_stream(json_file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Loads a JSON document from a file with JSONEventParser. The result is the same as json.load except that numeric
+    arrays which are the value of a "values" key are numpy arrays rather than lists.
+    :param json_file: The file to read the JSON from, opened in text mode.
+    :param chunk_size: The number of characters to read from the file at a time.
+    :return: The loaded document.
+    :raises ValueError: If the file does not contain valid JSON.
+    """
+    # Each entry is a container being built and, for maps, the key its next value belongs to
+    containers = []
+    result = None
+    for event, value in JSONEventParser(json_file, chunk_size).events():
+        if event == MAP_KEY:
+            containers[-1][1] = value
+            continue
+        if event in (END_MAP, END_ARRAY):
+            value = containers.pop()[0]
+        elif event == START_MAP:
+            containers.append([{}, None])
+            continue
+        elif event == START_ARRAY:
+            containers.append([[], None])
+            continue
+
+        if not containers:
+            result = value
+        elif isinstance(containers[-1][0], dict):
+            containers[-1][0][containers[-1][1]] = value
+        else:
+            containers[-1][0].append(value)
+    return result
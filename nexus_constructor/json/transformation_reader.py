@@ -5,10 +5,11 @@ from PySide2.QtGui import QVector3D
 from nexus_constructor.common_attrs import CommonAttrs, CommonKeys, TransformationType
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
-from nexus_constructor.model.value_type import VALUE_TYPE_TO_NP
 from nexus_constructor.json.load_from_json_utils import (
     _find_attribute_from_list_or_dict,
     _find_nx_class,
+    _find_value_type,
+    _is_empty,
     DEPENDS_ON_IGNORE,
 )
 
@@ -116,7 +117,7 @@ class TransformationReader:
         :return: The value of the attribute if is is found in the list, otherwise the failure value is returned.
         """
         attribute = _find_attribute_from_list_or_dict(attribute_name, attributes_list)
-        if not attribute:
+        if _is_empty(attribute):
             self.warnings.append(
                 f"Unable to find {attribute_name} attribute in transformation"
                 f" {transformation_name} from component {self.parent_component.name}"
@@ -130,9 +131,9 @@ class TransformationReader:
         :param dtype: The type value obtained from the JSON.
         :return: The corresponding type from the dictionary if it exists, otherwise an empty string is returned.
         """
-        for key in VALUE_TYPE_TO_NP.keys():
-            if dtype.lower() == key.lower():
-                return key
+        value_type = _find_value_type(dtype)
+        if value_type is not None:
+            return value_type
         self.warnings.append(
             f"Could not recognise dtype {dtype} from transformation"
             f" {transformation_name} in component {self.parent_component.name}."
@@ -1,36 +1,181 @@
 import logging
+import queue
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Dict, Optional, Set
+
+import attr
 import confluent_kafka
+
 from nexus_constructor.kafka.kafka_interface import KafkaInterface
 
+# Commands sent close together are grouped into compressed batches, which makes the large run start messages holding
+# the NeXus structure much smaller on the wire
+DEFAULT_PRODUCER_CONFIG = {
+    "message.max.bytes": "100000000",
+    "compression.type": "lz4",
+    "linger.ms": "5",
+    "batch.num.messages": "100",
+    "queue.buffering.max.messages": "1000",
+}
+DEFAULT_MAX_QUEUED_COMMANDS = 100
+POLL_TIMEOUT = 0.1
+CLOSE_FLUSH_TIMEOUT = 2.0
+
+
+class CommandDeliveryError(Exception):
+    pass
+
+
+@attr.s(frozen=True)
+class DeliveryReport:
+    topic = attr.ib(type=str)
+    partition = attr.ib(type=int)
+    offset = attr.ib(type=int)
+
+    def __str__(self) -> str:
+        return f"{self.topic} [{self.partition}] @ {self.offset}"
+
 
 class CommandProducer(KafkaInterface):
-    def __init__(self, address, topic):
+    """
+    Sends commands to the file-writer from a background thread. Commands wait in a bounded queue until the thread hands
+    them to the Kafka producer, and each one has a future which resolves when the broker acknowledges it.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        topic: str,
+        config: Optional[Dict[str, str]] = None,
+        max_queued_commands: int = DEFAULT_MAX_QUEUED_COMMANDS,
+        producer: Any = None,
+    ):
+        """
+        :param address: The address of the broker.
+        :param topic: The topic the commands are sent to.
+        :param config: Producer settings overriding the defaults, such as the compression type or linger time.
+        :param max_queued_commands: The number of commands which can wait to be produced before more are refused.
+        :param producer: The producer to send the commands with, instead of creating a Kafka producer.
+        """
         super().__init__()
         self._topic = topic
-        configs = {"bootstrap.servers": address, "message.max.bytes": "100000000"}
-        self._producer = confluent_kafka.Producer(configs)
+        if producer is None:
+            configs = {**DEFAULT_PRODUCER_CONFIG, **(config or {})}
+            configs["bootstrap.servers"] = address
+            producer = confluent_kafka.Producer(configs)
+        self._producer = producer
+        self._commands: "queue.Queue" = queue.Queue(maxsize=max_queued_commands)
+        self._in_flight: Set[Future] = set()
+        self._queue_lock = threading.Lock()
+        self._stopped = False
         self._poll_thread.start()
 
+    @property
+    def queued_commands(self) -> int:
+        return self._commands.qsize()
+
     def _poll_loop(self):
         try:
             self._producer.list_topics()
         except confluent_kafka.KafkaException:
             self.connected = False
+            self._stop("Unable to connect to the broker")
             return
         else:
             self.connected = True
 
         while not self._cancelled:
-            self._producer.poll(0.5)
-
-    def send_command(self, payload: bytes):
-        def ack(err, msg):
-            if err:
-                logging.debug(f"Message failed delivery: {err}")
+            try:
+                command = self._commands.get(timeout=POLL_TIMEOUT)
+            except queue.Empty:
+                pass
             else:
-                logging.debug(
-                    f"Message delivered to {msg.topic()} {msg.partition()} @ {msg.offset()}"
+                self._produce(*command)
+                # Hand over everything queued meanwhile so that it can go in the same batch
+                while True:
+                    try:
+                        self._produce(*self._commands.get_nowait())
+                    except queue.Empty:
+                        break
+            self._producer.poll(0)
+
+        self._producer.flush(CLOSE_FLUSH_TIMEOUT)
+        self._stop("The producer was closed before the command was delivered")
+
+    def _produce(self, payload: bytes, future: Future):
+        if not future.set_running_or_notify_cancel():
+            return
+        self._in_flight.add(future)
+        while True:
+            try:
+                self._producer.produce(
+                    self._topic, payload, on_delivery=partial(self._delivered, future)
                 )
+                return
+            except BufferError:
+                # The producer's own queue is full, so wait for some deliveries to make room
+                if self._cancelled:
+                    break
+                self._producer.poll(POLL_TIMEOUT)
+            except confluent_kafka.KafkaException as error:
+                self._fail(future, str(error))
+                return
+        self._fail(future, "The producer was closed before the command was sent")
+
+    def _delivered(self, future: Future, err, msg):
+        if err:
+            logging.debug(f"Message failed delivery: {err}")
+            self._fail(future, str(err))
+        else:
+            report = DeliveryReport(msg.topic(), msg.partition(), msg.offset())
+            logging.debug(f"Message delivered to {report}")
+            self._in_flight.discard(future)
+            future.set_result(report)
+
+    def _fail(self, future: Future, reason: str):
+        self._in_flight.discard(future)
+        if not future.done():
+            future.set_exception(CommandDeliveryError(reason))
+
+    def _stop(self, reason: str):
+        """
+        Fails the commands which are still queued or waiting for acknowledgement, and refuses any sent afterwards.
+        """
+        with self._queue_lock:
+            self._stopped = True
+        while True:
+            try:
+                _, future = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                self._fail(future, reason)
+        for future in list(self._in_flight):
+            self._fail(future, reason)
 
-        self._producer.produce(self._topic, payload, on_delivery=ack)
-        self._producer.poll(0)
+    def send_command(self, payload: bytes) -> Future:
+        """
+        Queues a command to be sent without waiting for it to be produced or delivered.
+        :param payload: The serialised command.
+        :return: A future which resolves to a DeliveryReport when the broker acknowledges the command, or raises a
+            CommandDeliveryError if it is refused, could not be delivered or the queue is full. Cancelling the future
+            before the command is produced stops it being sent.
+        """
+        future = Future()
+        with self._queue_lock:
+            if self._stopped:
+                future.set_exception(
+                    CommandDeliveryError("The producer is not connected")
+                )
+                return future
+            try:
+                self._commands.put_nowait((payload, future))
+            except queue.Full:
+                future.set_exception(
+                    CommandDeliveryError(
+                        f"Too many commands waiting to be sent ({self._commands.maxsize})"
+                    )
+                )
+        return future
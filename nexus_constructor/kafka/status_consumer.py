@@ -1,47 +1,76 @@
 import json
 import logging
 import time
-from copy import copy
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping
 from uuid import uuid1
+
+import attr
 import confluent_kafka
 from nexus_constructor.kafka.kafka_interface import KafkaInterface
 
+# The number of messages handled at a time, so that a burst of status messages updates the snapshot once
+CONSUME_BATCH_SIZE = 500
+CONSUME_TIMEOUT = 0.5
+# Seconds since their last status message after which file-writers and files are forgotten
+DEFAULT_TTL = 60.0
+
+
+@attr.s(frozen=True)
+class StatusSnapshot:
+    """
+    The file-writers and files seen by the status consumer at one time. A snapshot is never changed once published, and
+    the version goes up by one each time a different one is published.
+    """
+
+    version = attr.ib(type=int, default=0)
+    # Each maps a name to a read-only dict with the time it was last seen, in milliseconds since the epoch
+    file_writers = attr.ib(type=Mapping[str, Mapping[str, Any]], factory=dict)
+    files = attr.ib(type=Mapping[str, Mapping[str, Any]], factory=dict)
+
 
 class StatusConsumer(KafkaInterface):
-    def __init__(self, address, topic):
+    def __init__(self, address, topic, ttl: float = DEFAULT_TTL, consumer: Any = None):
+        """
+        :param address: The address of the broker.
+        :param topic: The topic the file-writers publish their status to.
+        :param ttl: Seconds without a status message after which a file-writer or file is forgotten.
+        :param consumer: The consumer to read the status messages with, instead of creating a Kafka consumer.
+        """
         super().__init__()
         self._topic = topic
-        configs = {
-            "bootstrap.servers": address,
-            "message.max.bytes": "100000000",
-            "group.id": str(uuid1),
-        }
-        self._consumer = confluent_kafka.Consumer(configs)
-        self._file_writers = {}
-        self._files = {}
+        self._ttl = ttl
+        if consumer is None:
+            configs = {
+                "bootstrap.servers": address,
+                "message.max.bytes": "100000000",
+                "group.id": str(uuid1()),
+            }
+            consumer = confluent_kafka.Consumer(configs)
+        self._consumer = consumer
+        self._snapshot = StatusSnapshot()
         self._poll_thread.start()
 
     @property
-    def file_writers(self):
+    def snapshot(self) -> StatusSnapshot:
         with self._lock:
-            return_filewriters = copy(self._file_writers)
-        return return_filewriters
+            return self._snapshot
 
-    @file_writers.setter
-    def file_writers(self, updated_map):
-        with self._lock:
-            self._file_writers = copy(updated_map)
+    @property
+    def file_writers(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.snapshot.file_writers
 
     @property
-    def files(self):
-        with self._lock:
-            return_files = copy(self._files)
-        return return_files
+    def files(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.snapshot.files
 
-    @files.setter
-    def files(self, updated_map):
+    def _publish(self, file_writers: Dict[str, Dict], files: Dict[str, Dict]):
         with self._lock:
-            self._files = copy(updated_map)
+            self._snapshot = StatusSnapshot(
+                self._snapshot.version + 1,
+                MappingProxyType(file_writers),
+                MappingProxyType(files),
+            )
 
     def _poll_loop(self):
         try:
@@ -59,36 +88,65 @@ class StatusConsumer(KafkaInterface):
         self._consumer.subscribe([self._topic])
         self.connected = True
 
-        known_writers = {}
-        known_files = {}
         while not self._cancelled:
             try:
-                msg = self._consumer.poll(0.5)
+                messages = self._consumer.consume(
+                    num_messages=CONSUME_BATCH_SIZE, timeout=CONSUME_TIMEOUT
+                )
             except RuntimeError:
                 self.connected = False
                 break
-            if msg is None:
-                continue
+            self._update(messages)
+
+    def _update(self, messages: List[Any]):
+        """
+        Applies a batch of status messages and expires old entries, publishing a new snapshot if anything changed.
+        Entries are copied when they change rather than updated, so that earlier snapshots stay as they were.
+        """
+        snapshot = self.snapshot
+        oldest = (time.time() - self._ttl) * 1000
+        if not messages and not any(
+            entry["last_seen"] < oldest
+            for entries in (snapshot.file_writers, snapshot.files)
+            for entry in entries.values()
+        ):
+            return
+
+        file_writers = dict(snapshot.file_writers)
+        files = dict(snapshot.files)
+        changed = False
+        for msg in messages:
             if msg.error():
                 logging.error(msg.error())
-            else:
+                continue
+            try:
                 msg_obj = json.loads(msg.value())
-                if "service_id" in msg_obj:
-                    writer_id = msg_obj["service_id"]
-                    if writer_id not in known_writers:
-                        known_writers[writer_id] = {"last_seen": 0}
-                    known_writers[writer_id]["last_seen"] = msg.timestamp()[1]
-                    # msg.timestamp()[0] is the timestamp type
-                if "file_being_written" in msg_obj:
-                    file_name = msg_obj["file_being_written"]
-                    if file_name is not None and file_name not in known_files:
-                        known_files[file_name] = {
-                            "file_name": file_name,
-                            "last_seen": 0,
-                        }
-                    known_files[file_name]["last_seen"] = msg.timestamp()[1]
-                    self.file_writers = known_writers
-                    self.files = known_files
+            except ValueError as error:
+                logging.error(f"Invalid status message: {error}")
+                continue
+            # msg.timestamp()[0] is the timestamp type
+            last_seen = msg.timestamp()[1]
+            writer_id = msg_obj.get("service_id")
+            if writer_id is not None:
+                file_writers[writer_id] = MappingProxyType({"last_seen": last_seen})
+                changed = True
+            file_name = msg_obj.get("file_being_written")
+            if file_name is not None:
+                files[file_name] = MappingProxyType(
+                    {"file_name": file_name, "last_seen": last_seen}
+                )
+                changed = True
+
+        for entries in (file_writers, files):
+            expired = [
+                key for key, entry in entries.items() if entry["last_seen"] < oldest
+            ]
+            for key in expired:
+                del entries[key]
+            changed = changed or bool(expired)
+
+        if changed:
+            self._publish(file_writers, files)
 
     def close(self):
         self._cancelled = True
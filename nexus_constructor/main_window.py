@@ -1,6 +1,7 @@
+import importlib.util
 import uuid
-from typing import Dict
-import json
+from concurrent.futures import Future
+from typing import Dict, Union
 
 from PySide2.QtCore import QSettings
 from PySide2.QtWidgets import (
@@ -11,14 +12,12 @@ from PySide2.QtWidgets import (
     QDialog,
     QInputDialog,
 )
-from nexusutils.nexusbuilder import NexusBuilder
 
-from nexus_constructor.add_component_window import AddComponentDialog
 from nexus_constructor.model.component import Component
 from nexus_constructor.json.load_from_json import JSONReader
+from nexus_constructor.json.json_writer import write_model_json
 from nexus_constructor.ui_utils import file_dialog, show_warning_dialog
 from nexus_constructor.model.model import Model
-from nexus_constructor.create_forwarder_config import create_forwarder_config
 from ui.main_window import Ui_MainWindow
 
 
@@ -28,10 +27,19 @@ FLATBUFFER_FILE_TYPES = {"FlatBuffer Files": ["flat", "FLAT"]}
 
 
 class MainWindow(Ui_MainWindow, QMainWindow):
-    def __init__(self, model: Model, nx_classes: Dict):
+    """
+    The main window. The add component dialog, file-writer control window, Kafka and the IDF loader are only imported
+    when they are first used, so that the window appears sooner.
+    """
+
+    def __init__(self, model: Model, nx_classes: Union[Dict, "Future[Dict]"]):
+        """
+        :param model: The model of the instrument.
+        :param nx_classes: The fields of each component NeXus class, or a future giving them while they are parsed.
+        """
         super().__init__()
         self.model = model
-        self.nx_classes = nx_classes
+        self._nx_classes = nx_classes
 
     def setupUi(self, main_window):
         super().setupUi(main_window)
@@ -68,18 +76,25 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self.file_writer_control_window = None
         self._update_views()
 
-    def _set_up_file_writer_control_window(self, main_window):
-        try:
-            import confluent_kafka  # noqa: F401
+    @property
+    def nx_classes(self) -> Dict:
+        """
+        The fields of each component NeXus class, waiting for them to finish being parsed if needed.
+        """
+        if isinstance(self._nx_classes, Future):
+            self._nx_classes = self._nx_classes.result()
+        return self._nx_classes
 
-            self.control_file_writer_action = QAction(main_window)
-            self.control_file_writer_action.setText("Control file-writer")
-            self.file_menu.addAction(self.control_file_writer_action)
-            self.control_file_writer_action.triggered.connect(
-                self.show_control_file_writer_window
-            )
-        except ImportError:
-            pass
+    def _set_up_file_writer_control_window(self, main_window):
+        # Only checks that Kafka is installed, loading it is left until the window is opened
+        if importlib.util.find_spec("confluent_kafka") is None:
+            return
+        self.control_file_writer_action = QAction(main_window)
+        self.control_file_writer_action.setText("Control file-writer")
+        self.file_menu.addAction(self.control_file_writer_action)
+        self.control_file_writer_action.triggered.connect(
+            self.show_control_file_writer_window
+        )
 
     def show_control_file_writer_window(self):
         if self.file_writer_control_window is None:
@@ -110,6 +125,8 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
     def _load_idf(self, filename):
         try:
+            from nexusutils.nexusbuilder import NexusBuilder
+
             builder = NexusBuilder(
                 str(uuid.uuid4()),
                 idf_file=filename,
@@ -132,7 +149,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
         if filename:
             with open(filename, "w") as file:
-                json.dump(self.model.as_dict(), file, indent=2)
+                write_model_json(self.model, file, indent=2)
 
     def save_to_forwarder_config(self):
         filename = file_dialog(
@@ -148,6 +165,10 @@ class MainWindow(Ui_MainWindow, QMainWindow):
                 False,
             )
             if ok_pressed:
+                from nexus_constructor.create_forwarder_config import (
+                    create_forwarder_config,
+                )
+
                 with open(filename, "wb") as flat_file:
                     flat_file.write(create_forwarder_config(self.model, provider_type,))
 
@@ -158,7 +179,7 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         filename = file_dialog(False, "Open File Writer JSON File", JSON_FILE_TYPES)
         if filename:
             reader = JSONReader()
-            success = reader.load_model_from_json(filename)
+            success = reader.load_model_from_json(filename, streaming=True)
             if reader.warnings:
                 show_warning_dialog(
                     "\n".join(reader.warnings),
@@ -170,23 +191,22 @@ class MainWindow(Ui_MainWindow, QMainWindow):
                 self._update_views()
 
     def _update_transformations_3d_view(self):
-        self.sceneWidget.clear_all_transformations()
-        for component in self.model.entry.instrument.get_component_list():
-            self.sceneWidget.add_transformation(component.name, component.qtransform)
+        self.sceneWidget.update_transformations(
+            self.model.entry.instrument.get_component_list()
+        )
 
     def _update_views(self):
-        self.sceneWidget.clear_all_transformations()
-        self.sceneWidget.clear_all_components()
         self.component_tree_view_tab.set_up_model(self.model)
         self._update_3d_view_with_component_shapes()
 
     def _update_3d_view_with_component_shapes(self):
-        for component in self.model.entry.instrument.get_component_list():
-            shape, positions = component.shape
-            self.sceneWidget.add_component(component.name, shape, positions)
-            self.sceneWidget.add_transformation(component.name, component.qtransform)
+        self.sceneWidget.update_components(
+            self.model.entry.instrument.get_component_list()
+        )
 
     def show_add_component_window(self, component: Component = None):
+        from nexus_constructor.add_component_window import AddComponentDialog
+
         self.add_component_window = QDialog()
         self.add_component_window.ui = AddComponentDialog(
             self.model,
@@ -3,11 +3,17 @@ import attr
 import numpy as np
 
 from nexus_constructor.common_attrs import CommonKeys
-from nexus_constructor.model.helpers import _get_item, _set_item
+from nexus_constructor.model.helpers import (
+    _get_item,
+    _set_item,
+    track_rename,
+    values_for_dict,
+    NamedList,
+)
 from nexus_constructor.model.value_type import ValueType, ValueTypes
 
 
-class Attributes(list):
+class Attributes(NamedList):
     """Abstract class used for common functionality between a group and dataset. """
 
     def set_attribute_value(
@@ -45,7 +51,7 @@ class FieldAttribute:
     the trade-off being a longer message (which is not a priority)
     """
 
-    name = attr.ib(type=str)
+    name = attr.ib(type=str, on_setattr=track_rename)
     values = attr.ib(type=ValueType, cmp=False)
     type = attr.ib(type=str, default=ValueTypes.STRING)
 
@@ -57,11 +63,8 @@ class FieldAttribute:
         return np.array_equal(self.values, other_attribute.values)
 
     def as_dict(self) -> Dict[str, Any]:
-        values = self.values
-        if isinstance(values, np.ndarray):
-            values = values.tolist()
         return {
             CommonKeys.NAME: self.name,
             CommonKeys.TYPE: self.type,
-            CommonKeys.VALUES: values,
+            CommonKeys.VALUES: values_for_dict(self.values),
         }
@@ -1,10 +1,8 @@
 import logging
-from typing import Tuple, Union, List, Dict, Any, Optional
+from typing import Tuple, Union, List, Dict, Any, Optional, TYPE_CHECKING
 import attr
 import numpy as np
-from PySide2.Qt3DCore import Qt3DCore
 from PySide2.QtGui import QMatrix4x4, QVector3D, QTransform
-from PySide2.QtWidgets import QListWidget
 
 from nexus_constructor.common_attrs import (
     CommonAttrs,
@@ -32,7 +30,7 @@ from nexus_constructor.model.geometry import (
 )
 from nexus_constructor.model.group import Group, TRANSFORMS_GROUP_NAME
 from nexus_constructor.model.helpers import _generate_incremental_name
-from nexus_constructor.model.transformation import Transformation
+from nexus_constructor.model.transformation import Transformation, next_in_chain
 from nexus_constructor.model.value_type import ValueTypes
 from nexus_constructor.geometry.pixel_data import PixelGrid, PixelMapping, PixelData
 from nexus_constructor.geometry.pixel_data_utils import (
@@ -44,7 +42,10 @@ from nexus_constructor.geometry.pixel_data_utils import (
     PIXEL_FIELDS,
     get_detector_faces_from_pixel_mapping,
 )
-from nexus_constructor.ui_utils import show_warning_dialog
+
+if TYPE_CHECKING:
+    # The model is also used without a GUI, so the widget and 3D modules are only imported where they are needed
+    from PySide2.QtWidgets import QListWidget  # noqa: F401
 
 
 def _normalise(input_vector: QVector3D) -> Tuple[QVector3D, float]:
@@ -115,9 +116,14 @@ class Component(Group):
         Creates a QTransform based on the full chain of transforms this component points to.
         :return: QTransform of final transformation
         """
-        transform_matrix = QMatrix4x4()
-        for transform in self.transforms_full_chain:
-            transform_matrix *= transform.qmatrix
+        first_transform = next_in_chain(self)
+        transform_matrix = (
+            first_transform.world_matrix
+            if first_transform is not None
+            else QMatrix4x4()
+        )
+        from PySide2.Qt3DCore import Qt3DCore
+
         transformation = Qt3DCore.QTransform()
         transformation.setMatrix(transform_matrix)
         return transformation
@@ -277,7 +283,7 @@ class Component(Group):
         self,
     ) -> Tuple[
         Union[NoShapeGeometry, CylindricalGeometry, OFFGeometryNexus],
-        Optional[List[QVector3D]],
+        Optional[np.ndarray],
     ]:
         if PIXEL_SHAPE_GROUP_NAME in self:
             return (
@@ -305,8 +311,10 @@ class Component(Group):
         shape_group = _get_shape_group_for_pixel_data(pixel_data)
         geometry = OFFGeometryNexus(shape_group)
         geometry.nx_class = OFF_GEOMETRY_NX_CLASS
-        geometry.record_faces(loaded_geometry.faces)
-        geometry.record_vertices(loaded_geometry.vertices)
+        geometry.set_winding_order(
+            loaded_geometry.winding_order_array, loaded_geometry.face_offsets
+        )
+        geometry.record_vertices(loaded_geometry.vertices_array)
         geometry.units = units
         geometry.file_path = filename
 
@@ -387,11 +395,9 @@ class Component(Group):
             ValueTypes.INT,
         )
 
-    def _create_transformation_vectors_for_pixel_offsets(
-        self,
-    ) -> Optional[List[QVector3D]]:
+    def _create_transformation_vectors_for_pixel_offsets(self,) -> Optional[np.ndarray]:
         """
-        Construct a transformation (as a QVector3D) for each pixel offset
+        Construct a transformation for each pixel offset, as the rows of an (N, 3) array
         """
         try:
             x_offsets = self.get_field_value(X_PIXEL_OFFSET)
@@ -406,12 +412,9 @@ class Component(Group):
         except AttributeError:
             z_offsets = np.zeros_like(x_offsets)
         # offsets datasets can be 2D to match dimensionality of detector, so flatten to 1D
-        return [
-            QVector3D(x, y, z)
-            for x, y, z in zip(
-                x_offsets.flatten(), y_offsets.flatten(), z_offsets.flatten()
-            )
-        ]
+        return np.column_stack(
+            (np.ravel(x_offsets), np.ravel(y_offsets), np.ravel(z_offsets),)
+        ).astype(float)
 
     def as_dict(self) -> Dict[str, Any]:
         dictionary = super(Component, self).as_dict()
@@ -441,12 +444,14 @@ class Component(Group):
         return dictionary
 
 
-def add_fields_to_component(component: Component, fields_widget: QListWidget):
+def add_fields_to_component(component: Component, fields_widget: "QListWidget"):
     """
     Adds fields from a list widget to a component.
     :param component: Component to add the field to.
     :param fields_widget: The field list widget to extract field information such the name and value of each field.
     """
+    from nexus_constructor.ui_utils import show_warning_dialog
+
     for i in range(fields_widget.count()):
         widget = fields_widget.itemWidget(fields_widget.item(i))
         try:
@@ -1,26 +1,73 @@
 import attr
-from typing import List, Dict, Any
-import numpy as np
+from typing import Callable, List, Dict, Any, Optional, Union
 
 from nexus_constructor.common_attrs import CommonAttrs, CommonKeys, NodeType
 from nexus_constructor.model.attributes import Attributes
-from nexus_constructor.model.helpers import get_absolute_path
+from nexus_constructor.model.helpers import (
+    get_absolute_path,
+    track_rename,
+    values_for_dict,
+)
+from nexus_constructor.model.lazy_values import LazyValues, read_values
 from nexus_constructor.model.value_type import ValueType
 
 
 @attr.s
 class Dataset:
-    name = attr.ib(type=str)
-    values = attr.ib(type=List[ValueType])
+    """
+    A dataset, whose values can be kept in memory or be a LazyValues source which is only read from its file when the
+    values are used or exported.
+    """
+
+    name = attr.ib(type=str, on_setattr=track_rename)
+    _values = attr.ib(type=Union[List[ValueType], LazyValues])
     type = attr.ib(type=str)
     size = attr.ib(factory=tuple)
     parent_node = attr.ib(type="Node", default=None)
     attributes = attr.ib(type=Attributes, factory=Attributes, init=False)
+    # Called whenever the values are replaced, so that anything worked out from them can be discarded
+    _values_listeners = attr.ib(
+        type=List[Callable[[], None]], factory=list, init=False, eq=False, repr=False
+    )
 
     @property
     def absolute_path(self):
         return get_absolute_path(self)
 
+    @property
+    def values(self) -> Union[List[ValueType], ValueType]:
+        return read_values(self._values)
+
+    @values.setter
+    def values(self, new_values: Union[List[ValueType], LazyValues]):
+        if new_values is not self._values:
+            self.release_values()
+        self._values = new_values
+        for listener in list(self._values_listeners):
+            listener()
+
+    def add_values_listener(self, listener: Callable[[], None]):
+        if listener not in self._values_listeners:
+            self._values_listeners.append(listener)
+
+    def remove_values_listener(self, listener: Callable[[], None]):
+        if listener in self._values_listeners:
+            self._values_listeners.remove(listener)
+
+    @property
+    def values_source(self) -> Optional[LazyValues]:
+        """
+        The lazy source of the values, or None if the values are held in memory.
+        """
+        return self._values if isinstance(self._values, LazyValues) else None
+
+    def release_values(self):
+        """
+        Closes the file of lazy values and drops what was read from it. They are read again if they are used later.
+        """
+        if isinstance(self._values, LazyValues):
+            self._values.release()
+
     @property
     def nx_class(self):
         return self.attributes.get_attribute_value(CommonAttrs.NX_CLASS)
@@ -40,8 +87,5 @@ class Dataset:
         }
         if self.attributes:
             return_dict[CommonKeys.ATTRIBUTES] = self.attributes.as_dict()
-        values = self.values
-        if isinstance(values, np.ndarray):
-            values = values.tolist()
-        return_dict[CommonKeys.VALUES] = values
+        return_dict[CommonKeys.VALUES] = values_for_dict(self._values)
         return return_dict
@@ -1,19 +1,20 @@
+import itertools
 from abc import ABC, abstractmethod
-from math import sin, cos, pi, acos, degrees
-from typing import List, Tuple
+from math import acos, degrees
+from typing import List, Tuple, Union
 
 import numpy as np
 from PySide2.QtGui import QVector3D, QMatrix4x4
 
 from nexus_constructor.common_attrs import CommonAttrs
-from nexus_constructor.geometry.utils import get_an_orthogonal_unit_vector
-from nexus_constructor.model.group import Group
-from nexus_constructor.model.value_type import ValueTypes
-from nexus_constructor.ui_utils import (
+from nexus_constructor.geometry.utils import (
+    get_an_orthogonal_unit_vector,
     numpy_array_to_qvector3d,
     qvector3d_to_numpy_array,
 )
-from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.value_type import ValueTypes
+from nexus_constructor.unit_utils import convert_array, METRES
 
 
 WINDING_ORDER = "winding_order"
@@ -26,48 +27,174 @@ Z_PIXEL_OFFSET = "z_pixel_offset"
 DETECTOR_FACES = "detector_faces"
 
 
+def faces_to_winding_order(faces: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts a list of faces into the flat winding order and face offset arrays used by NXoff_geometry
+    :param faces: list of integer lists. Each sublist is a winding path around the corners of a polygon.
+    :return: The winding order, and the start index of each face in the winding order
+    """
+    face_sizes = np.fromiter((len(face) for face in faces), dtype=int, count=len(faces))
+    winding_order = np.fromiter(
+        itertools.chain.from_iterable(faces), dtype=int, count=face_sizes.sum()
+    )
+    return winding_order, face_sizes_to_offsets(face_sizes)
+
+
+def face_sizes_to_offsets(face_sizes: np.ndarray) -> np.ndarray:
+    """
+    Converts the number of vertices in each face into the start index of each face in the winding order
+    :param face_sizes: The number of vertices in each face
+    :return: The start index of each face in the winding order
+    """
+    face_offsets = np.zeros(len(face_sizes), dtype=int)
+    np.cumsum(face_sizes[:-1], out=face_offsets[1:])
+    return face_offsets
+
+
+def face_offsets_to_sizes(
+    face_offsets: np.ndarray, winding_order_length: int
+) -> np.ndarray:
+    """
+    Converts the start index of each face in the winding order into the number of vertices in each face
+    :param face_offsets: The start index of each face in the winding order
+    :param winding_order_length: The total length of the winding order
+    :return: The number of vertices in each face
+    """
+    return np.diff(np.append(face_offsets, winding_order_length))
+
+
+def winding_order_to_faces(
+    winding_order: np.ndarray, face_offsets: np.ndarray
+) -> List[List[int]]:
+    """
+    Converts the flat winding order and face offset arrays into a list of the vertex indices for each face
+    :param winding_order: Flattened 1D array of indices in vertices for each face
+    :param face_offsets: The start index of each face in the winding order
+    :return: List of vertex indices for each face
+    """
+    if len(face_offsets) == 0:
+        return []
+    return [face.tolist() for face in np.split(winding_order, face_offsets[1:])]
+
+
+def vertices_to_array(vertices: Union[np.ndarray, List[QVector3D], None]) -> np.ndarray:
+    """
+    Converts vertices given as a list of QVector3D or coordinates into an (N, 3) float array. Float arrays are not
+    copied.
+    :param vertices: The vertices as an array or a list of QVector3D
+    :return: The vertices as an (N, 3) float array
+    """
+    if vertices is None:
+        return np.empty((0, 3), dtype=float)
+    if len(vertices) and isinstance(vertices[0], QVector3D):
+        vertices = [(vertex.x(), vertex.y(), vertex.z()) for vertex in vertices]
+    vertices = np.asarray(vertices)
+    if vertices.dtype.kind != "f":
+        vertices = vertices.astype(float)
+    return vertices.reshape(-1, 3)
+
+
+def array_to_qvector3d_list(vertices: np.ndarray) -> List[QVector3D]:
+    """
+    Converts an (N, 3) array of vertices into a list of QVector3D, for the places in the UI which need them
+    :param vertices: The vertices as an (N, 3) array
+    :return: The vertices as a list of QVector3D
+    """
+    return [QVector3D(x, y, z) for x, y, z in vertices.tolist()]
+
+
 class OFFGeometry(ABC):
+    """
+    3D mesh description of the shape of an object, based on the OFF file format.
+    Vertices are held as an (N, 3) array and faces as a flat winding order plus the start index of each face, as in
+    NXoff_geometry. The list-based accessors are built from these arrays on demand.
+    """
+
     @property
     @abstractmethod
-    def winding_order(self) -> List[int]:
+    def vertices_array(self) -> np.ndarray:
         """
-        Flattened 1D list of indices in vertices for each face
-        winding_order_indices gives the start index for each face in this list
+        (N, 3) float array of the vertex coordinates
         """
         pass
 
+    @vertices_array.setter
+    @abstractmethod
+    def vertices_array(self, new_vertices: np.ndarray):
+        pass
+
     @property
     @abstractmethod
-    def winding_order_indices(self) -> List[int]:
+    def winding_order_array(self) -> np.ndarray:
         """
-        The start index for each face in winding_order
+        Flattened 1D array of indices in vertices for each face
+        face_offsets gives the start index for each face in this array
         """
         pass
 
     @property
     @abstractmethod
-    def off_geometry(self) -> "OFFGeometry":
+    def face_offsets(self) -> np.ndarray:
+        """
+        The start index for each face in winding_order_array
+        """
         pass
 
-    @property
     @abstractmethod
-    def vertices(self) -> List[QVector3D]:
+    def set_winding_order(self, winding_order: np.ndarray, face_offsets: np.ndarray):
+        """
+        Replaces the faces of the geometry
+        :param winding_order: Flattened 1D array of indices in vertices for each face
+        :param face_offsets: The start index for each face in winding_order
+        """
         pass
 
-    @vertices.setter
+    @property
     @abstractmethod
-    def vertices(self, new_vertices: List[QVector3D]):
+    def off_geometry(self) -> "OFFGeometry":
         pass
 
     @property
-    @abstractmethod
+    def winding_order(self) -> List[int]:
+        """
+        Flattened 1D list of indices in vertices for each face
+        winding_order_indices gives the start index for each face in this list
+        """
+        return self.winding_order_array.tolist()
+
+    @property
+    def winding_order_indices(self) -> List[int]:
+        """
+        The start index for each face in winding_order
+        """
+        return self.face_offsets.tolist()
+
+    @property
+    def face_sizes(self) -> np.ndarray:
+        """
+        The number of vertices in each face
+        """
+        return face_offsets_to_sizes(self.face_offsets, len(self.winding_order_array))
+
+    @property
+    def number_of_faces(self) -> int:
+        return len(self.face_offsets)
+
+    @property
+    def vertices(self) -> List[QVector3D]:
+        return array_to_qvector3d_list(self.vertices_array)
+
+    @vertices.setter
+    def vertices(self, new_vertices: Union[np.ndarray, List[QVector3D]]):
+        self.vertices_array = vertices_to_array(new_vertices)
+
+    @property
     def faces(self) -> List[List[int]]:
-        pass
+        return winding_order_to_faces(self.winding_order_array, self.face_offsets)
 
     @faces.setter
-    @abstractmethod
     def faces(self, new_faces: List[List[int]]):
-        pass
+        self.set_winding_order(*faces_to_winding_order(new_faces))
 
 
 class OFFGeometryNoNexus(OFFGeometry):
@@ -79,47 +206,63 @@ class OFFGeometryNoNexus(OFFGeometry):
 
     def __init__(
         self,
-        vertices: List[QVector3D] = None,
+        vertices: Union[np.ndarray, List[QVector3D]] = None,
         faces: List[List[int]] = None,
         name: str = "",
     ):
         """
-        :param vertices: list of Vector objects used as corners of polygons in the geometry
+        :param vertices: (N, 3) array or list of Vector objects used as corners of polygons in the geometry
         :param faces: list of integer lists. Each sublist is a winding path around the corners of a polygon.
             Each sublist item is an index into the vertices list to identify a specific point in 3D space
         """
         self.name = name
-        self._vertices = vertices
-        self._faces = faces
-
-    @property
-    def winding_order(self) -> List[int]:
-        return [point for face in self.faces for point in face]
+        self._vertices = vertices_to_array(vertices)
+        self._winding_order, self._face_offsets = faces_to_winding_order(
+            faces if faces is not None else []
+        )
 
-    @property
-    def winding_order_indices(self) -> List[int]:
-        face_sizes = [len(face) for face in self.faces]
-        return [sum(face_sizes[0:i]) for i in range(len(face_sizes))]
+    @classmethod
+    def from_winding_order(
+        cls,
+        vertices: np.ndarray,
+        winding_order: np.ndarray,
+        face_offsets: np.ndarray,
+        name: str = "",
+    ) -> "OFFGeometryNoNexus":
+        """
+        Creates the geometry directly from arrays, without going through lists of faces
+        :param vertices: (N, 3) array of vertex coordinates
+        :param winding_order: Flattened 1D array of indices in vertices for each face
+        :param face_offsets: The start index for each face in winding_order
+        :param name: The name of the geometry
+        """
+        geometry = cls(vertices, name=name)
+        geometry.set_winding_order(winding_order, face_offsets)
+        return geometry
 
     @property
     def off_geometry(self) -> OFFGeometry:
         return self
 
     @property
-    def vertices(self) -> List[QVector3D]:
+    def vertices_array(self) -> np.ndarray:
         return self._vertices
 
-    @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
-        self._vertices = new_vertices
+    @vertices_array.setter
+    def vertices_array(self, new_vertices: np.ndarray):
+        self._vertices = vertices_to_array(new_vertices)
 
     @property
-    def faces(self) -> List[List[int]]:
-        return self._faces
+    def winding_order_array(self) -> np.ndarray:
+        return self._winding_order
 
-    @faces.setter
-    def faces(self, new_faces: List[List[int]]):
-        self._faces = new_faces
+    @property
+    def face_offsets(self) -> np.ndarray:
+        return self._face_offsets
+
+    def set_winding_order(self, winding_order: np.ndarray, face_offsets: np.ndarray):
+        self._winding_order = np.asarray(winding_order)
+        self._face_offsets = np.asarray(face_offsets)
 
 
 class CylindricalGeometry(Group):
@@ -208,53 +351,43 @@ class CylindricalGeometry(Group):
 
     @property
     def off_geometry(self, steps: int = 10) -> OFFGeometry:
-        unit_conversion_factor = calculate_unit_conversion_factor(self.units, METRES)
-
-        # A list of vertices describing the circle at the bottom of the cylinder
-        bottom_circle = [
-            QVector3D(sin(2 * pi * i / steps), cos(2 * pi * i / steps), 0) * self.radius
-            for i in range(steps)
-        ]
+        # Vertices describing the circle at the bottom of the cylinder
+        angles = 2 * np.pi * np.arange(steps) / steps
+        bottom_circle = (
+            np.column_stack((np.sin(angles), np.cos(angles), np.zeros(steps)))
+            * self.radius
+        )
 
         # The top of the cylinder is the bottom shifted upwards
-        top_circle = [vector + QVector3D(0, 0, self.height) for vector in bottom_circle]
-
-        # The true cylinder are all vertices from the unit cylinder multiplied by the conversion factor
-        vertices = [
-            vector * unit_conversion_factor for vector in bottom_circle + top_circle
-        ]
-
-        # rotate each vertex to produce the desired cylinder mesh
-        rotate_matrix = self._rotation_matrix()
-        vertices = [vector * rotate_matrix for vector in vertices]
-
-        def vertex_above(vertex):
-            """
-            Returns the index of the vertex above this one in the cylinder.
-            """
-            return vertex + steps
-
-        def next_vertex(vertex):
-            """
-            Returns the next vertex around in the top or bottom circle of the cylinder.
-            """
-            return (vertex + 1) % steps
-
-        # Rectangular faces joining the top and bottom
-        rectangle_faces = [
-            [i, vertex_above(i), vertex_above(next_vertex(i)), next_vertex(i)]
-            for i in range(steps)
-        ]
+        top_circle = bottom_circle + (0, 0, self.height)
+
+        # The true cylinder are all vertices from the unit cylinder converted to metres
+        vertices = convert_array(
+            np.vstack((bottom_circle, top_circle)), self.units, METRES
+        )
+
+        # rotate each vertex to produce the desired cylinder mesh, multiplying row vectors as
+        # QVector3D * QMatrix4x4 does. QMatrix4x4.data() is column-major, so transpose after reshaping.
+        rotate_matrix = np.array(self._rotation_matrix().data()).reshape(4, 4).T
+        vertices = vertices @ rotate_matrix[:3, :3]
+
+        # Rectangular faces joining the top and bottom, made of each vertex, the vertex above it,
+        # and the next vertex around the circle in the top and bottom
+        vertex = np.arange(steps)
+        next_vertex = (vertex + 1) % steps
+        rectangle_faces = np.column_stack(
+            (vertex, vertex + steps, next_vertex + steps, next_vertex)
+        )
 
         # Step sided shapes describing the top and bottom
         # The bottom uses steps of -1 to preserve winding order
-        top_bottom_faces = [
-            [i for i in range(steps)],
-            [i for i in range((2 * steps) - 1, steps - 1, -1)],
-        ]
+        winding_order = np.concatenate(
+            (rectangle_faces.ravel(), vertex, np.arange((2 * steps) - 1, steps - 1, -1))
+        )
+        face_offsets = np.append(np.arange(steps) * 4, [4 * steps, 5 * steps])
 
-        return OFFGeometryNoNexus(
-            vertices=vertices, faces=rectangle_faces + top_bottom_faces
+        return OFFGeometryNoNexus.from_winding_order(
+            vertices, winding_order, face_offsets
         )
 
     def _rotation_matrix(self) -> QMatrix4x4:
@@ -291,54 +424,34 @@ class OFFGeometryNexus(OFFGeometry, Group):
         """
         self.set_field_value(DETECTOR_FACES, np.array(detector_faces), ValueTypes.INT)
 
-    @property
-    def winding_order(self) -> List[int]:
-        return [point for face in self.faces for point in face]
-
-    @property
-    def winding_order_indices(self) -> List[int]:
-        face_sizes = [len(face) for face in self.faces]
-        return [sum(face_sizes[0:i]) for i in range(len(face_sizes))]
-
     @property
     def off_geometry(self) -> OFFGeometry:
-        return OFFGeometryNoNexus(self.vertices, self.faces)
+        return OFFGeometryNoNexus.from_winding_order(
+            self.vertices_array, self.winding_order_array, self.face_offsets
+        )
 
     @property
-    def vertices(self) -> List[QVector3D]:
-        vertices_from_file = self.get_field_value(CommonAttrs.VERTICES)
-        number_of_vertices = vertices_from_file.shape[0]
-        return [
-            numpy_array_to_qvector3d(vertices_from_file[vertex_number][:])
-            for vertex_number in range(number_of_vertices)
-        ]
+    def vertices_array(self) -> np.ndarray:
+        return vertices_to_array(self.get_field_value(CommonAttrs.VERTICES))
 
-    @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
+    @vertices_array.setter
+    def vertices_array(self, new_vertices: np.ndarray):
         self.record_vertices(new_vertices)
 
     @property
-    def faces(self) -> List[List[int]]:
+    def winding_order_array(self) -> np.ndarray:
+        return np.asarray(self.get_field_value(WINDING_ORDER))
+
+    @property
+    def face_offsets(self) -> np.ndarray:
+        """
+        The faces dataset, which gives the starting index for each face in winding_order
         """
-        Convert winding order dataset, which is a flat list for all faces,
-        into a list of the vertex indices for each face
-        :return: List of vertex indices for each face
-        """
-        winding_order_from_file = self.get_field_value(WINDING_ORDER)
-        # Gives starting index for each face in winding_order
-        face_starting_indices = self.get_field_value(FACES)
-        faces = [
-            winding_order_from_file[
-                face_start : face_starting_indices[index + 1]
-            ].tolist()
-            for index, face_start in enumerate(face_starting_indices[:-1])
-        ]
-        faces.append(winding_order_from_file[face_starting_indices[-1] :].tolist())
-        return faces
+        return np.asarray(self.get_field_value(FACES))
 
-    @faces.setter
-    def faces(self, new_faces: List[List[int]]):
-        self.record_faces(new_faces)
+    def set_winding_order(self, winding_order: np.ndarray, face_offsets: np.ndarray):
+        self.set_field_value(WINDING_ORDER, np.asarray(winding_order), ValueTypes.INT)
+        self.set_field_value(FACES, np.asarray(face_offsets), ValueTypes.INT)
 
     @property
     def units(self) -> str:
@@ -361,24 +474,16 @@ class OFFGeometryNexus(OFFGeometry, Group):
         Record face data in file
         :param new_faces: The new face data, list of list for each face with indices of vertices in face
         """
-        winding_order = np.array(
-            [index for new_face in new_faces for index in new_face]
-        )
-        self.set_field_value(WINDING_ORDER, winding_order, ValueTypes.INT)
-        faces_length = [0]
-        faces_length.extend([len(new_face) for new_face in new_faces[:-1]])
-        faces_start_indices = np.cumsum(faces_length)
-        self.set_field_value(FACES, faces_start_indices, ValueTypes.INT)
+        self.set_winding_order(*faces_to_winding_order(new_faces))
 
-    def record_vertices(self, new_vertices: List[QVector3D]):
+    def record_vertices(self, new_vertices: Union[np.ndarray, List[QVector3D]]):
         """
         Record vertex data in file
-        :param new_vertices: The new vertices data, list of cartesian coords for each vertex
+        :param new_vertices: The new vertices data, (N, 3) array or list of cartesian coords for each vertex
         """
-        vertices = np.array(
-            [qvector3d_to_numpy_array(vertex) for vertex in new_vertices]
+        self.set_field_value(
+            CommonAttrs.VERTICES, vertices_to_array(new_vertices), ValueTypes.FLOAT
         )
-        self.set_field_value(CommonAttrs.VERTICES, vertices, ValueTypes.FLOAT)
         self[CommonAttrs.VERTICES].attributes.set_attribute_value(
             CommonAttrs.UNITS, "m"
         )
@@ -5,6 +5,9 @@ from nexus_constructor.model.attributes import Attributes
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.helpers import (
     get_absolute_path,
+    as_named_list,
+    track_rename,
+    NamedList,
     _get_item,
     _set_item,
     _remove_item,
@@ -18,15 +21,29 @@ TRANSFORMS_GROUP_NAME = "transformations"
 CHILD_EXCLUDELIST = [TRANSFORMS_GROUP_NAME]
 
 
+def _release_values(old_child: Any, new_child: Any = None):
+    """
+    Releases the lazy values of a dataset which is being removed from a group, unless it is being put back.
+    """
+    if isinstance(old_child, Dataset) and old_child is not new_child:
+        old_child.release_values()
+
+
 @attr.s
 class Group:
     """
     Base class for any group which has a set of children and an nx_class attribute.
     """
 
-    name = attr.ib(type=str)
+    name = attr.ib(type=str, on_setattr=track_rename)
     parent_node = attr.ib(type="Node", default=None)
-    children = attr.ib(factory=list, init=False)
+    children = attr.ib(
+        type=NamedList,
+        factory=NamedList,
+        init=False,
+        converter=as_named_list,
+        on_setattr=attr.setters.convert,
+    )
     attributes = attr.ib(type=Attributes, factory=Attributes, init=False)
 
     def __getitem__(self, key: str):
@@ -39,6 +56,7 @@ class Group:
             value.parent_node = self
         except AttributeError:
             pass
+        _release_values(_get_item(self.children, key), value)
         _set_item(self, self.children, key, value)
 
     def __contains__(self, item: str):
@@ -50,6 +68,7 @@ class Group:
         return True if result is not None else False
 
     def __delitem__(self, key):
+        _release_values(_get_item(self.children, key))
         _remove_item(self.children, key)
 
     @property
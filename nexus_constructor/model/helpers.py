@@ -1,4 +1,239 @@
-from typing import List, Any, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Any, Union, Iterable, Optional
+
+import numpy as np
+
+from nexus_constructor.model.lazy_values import LazyValues
+
+# Set while building a dictionary for a writer which formats numpy arrays itself
+_keep_arrays_in_dicts = ContextVar("keep_arrays_in_dicts", default=False)
+
+
+def _name_of(item: Any) -> Optional[str]:
+    return getattr(item, "name", None)
+
+
+class NamedList(list):
+    """
+    A list of elements with name attributes which keeps an index from name to the position of the element, so that
+    looking up or replacing an element by name does not have to scan the list. The index always points to the first
+    element with a given name, the same element a scan would find. Elements without a name attribute are kept in the
+    list but are not indexed.
+
+    Mutations which can change which element is first for a name, or move elements, mark the index as stale and it is
+    rebuilt on the next lookup. Renaming a node is picked up through track_rename, which the name attributes of the
+    model classes use as their on_setattr hook.
+    """
+
+    # Incremented when a node is renamed in a list that track_rename cannot find, so every list can tell its index may
+    # be out of date
+    rename_generation = 0
+
+    # Class level defaults, so that lists created by copy or pickle, which skip __init__, start with a stale index
+    _index = None
+    _has_duplicates = False
+    _has_unnamed = False
+    _generation = -1
+
+    def __init__(self, iterable: Iterable[Any] = ()):
+        super().__init__(iterable)
+        self._mark_stale()
+
+    def __getstate__(self):
+        # The index is rebuilt rather than copied
+        return {}
+
+    def _mark_stale(self):
+        self._index = None
+
+    def _rebuild_index(self):
+        self._index = {}
+        self._has_duplicates = False
+        self._has_unnamed = False
+        for position, item in enumerate(self):
+            name = _name_of(item)
+            if name is None:
+                self._has_unnamed = True
+                continue
+            if name in self._index:
+                self._has_duplicates = True
+            else:
+                self._index[name] = position
+        self._generation = NamedList.rename_generation
+
+    def _index_is_valid(self) -> bool:
+        return (
+            self._index is not None and self._generation == NamedList.rename_generation
+        )
+
+    def index_of_name(self, item_name: str) -> Optional[int]:
+        """
+        Returns the position of the first element with the given name, or None if there is no such element.
+        """
+        if not self._index_is_valid():
+            self._rebuild_index()
+        position = self._index.get(item_name)
+        if position is not None and _name_of(self[position]) != item_name:
+            # Renamed without going through track_rename, so fall back to a full rebuild
+            self._rebuild_index()
+            position = self._index.get(item_name)
+        if position is None and self._has_unnamed:
+            # A scan of the list would have failed on the elements without a name
+            raise AttributeError(
+                f"Unable to look up {item_name}, not every element has a name"
+            )
+        return position
+
+    def get_by_name(self, item_name: str) -> Any:
+        """
+        Returns the first element with the given name, or None if there is no such element.
+        """
+        position = self.index_of_name(item_name)
+        return self[position] if position is not None else None
+
+    def rename(self, item: Any, old_name: str, new_name: str) -> bool:
+        """
+        Updates the index for an element which is about to be renamed.
+        :param item: The element being renamed.
+        :param old_name: The name of the element before the rename.
+        :param new_name: The name of the element after the rename.
+        :return: Whether the element was found in the list. It is only found if it is the first with its old name.
+        """
+        try:
+            position = self.index_of_name(old_name)
+        except AttributeError:
+            return False
+        if position is None or self[position] is not item:
+            return False
+        if self._has_duplicates:
+            # Another element may become the first with the old name
+            self._mark_stale()
+            return True
+        del self._index[old_name]
+        if new_name in self._index:
+            self._has_duplicates = True
+            self._index[new_name] = min(self._index[new_name], position)
+        else:
+            self._index[new_name] = position
+        return True
+
+    def _forget(self, item: Any, position: int):
+        """
+        Removes an element from the index after it has been removed from the end of the list.
+        """
+        name = _name_of(item)
+        if self._index is None:
+            return
+        if position != len(self):
+            # The elements after it have moved
+            self._mark_stale()
+        elif name is None:
+            self._mark_stale()
+        elif self._index.get(name) == position:
+            del self._index[name]
+
+    def _normalised_position(self, index: int) -> int:
+        return index + len(self) if index < 0 else index
+
+    def append(self, item: Any):
+        super().append(item)
+        name = _name_of(item)
+        if self._index is None:
+            return
+        if name is None:
+            self._has_unnamed = True
+        elif name in self._index:
+            self._has_duplicates = True
+        else:
+            self._index[name] = len(self) - 1
+
+    def extend(self, iterable: Iterable[Any]):
+        for item in iterable:
+            self.append(item)
+
+    def __iadd__(self, iterable: Iterable[Any]):
+        self.extend(iterable)
+        return self
+
+    def insert(self, index: int, item: Any):
+        if self._normalised_position(index) >= len(self):
+            self.append(item)
+            return
+        super().insert(index, item)
+        self._mark_stale()
+
+    def pop(self, index: int = -1) -> Any:
+        position = self._normalised_position(index)
+        item = super().pop(index)
+        self._forget(item, position)
+        return item
+
+    def remove(self, item: Any):
+        super().remove(item)
+        self._mark_stale()
+
+    def clear(self):
+        super().clear()
+        self._mark_stale()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, int) and self._index is not None:
+            old_item = self[index]
+            super().__setitem__(index, value)
+            name = _name_of(value)
+            if name is not None and name == _name_of(old_item):
+                # The element keeps its position and name, so the index is unchanged
+                return
+        else:
+            super().__setitem__(index, value)
+        self._mark_stale()
+
+    def __delitem__(self, index):
+        if isinstance(index, int):
+            position = self._normalised_position(index)
+            item = self[index]
+            super().__delitem__(index)
+            self._forget(item, position)
+        else:
+            super().__delitem__(index)
+            self._mark_stale()
+
+    def __imul__(self, n: int):
+        result = super().__imul__(n)
+        self._mark_stale()
+        return result
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._mark_stale()
+
+    def reverse(self):
+        super().reverse()
+        self._mark_stale()
+
+
+def track_rename(instance: Any, attribute: Any, new_value: str) -> str:
+    """
+    on_setattr hook for the name attribute of nodes. Updates the index of the children of the node's parent, or lets
+    every NamedList know that its index may be out of date if the node is not found there.
+    """
+    old_name = getattr(instance, attribute.name, None)
+    if old_name != new_value:
+        siblings = getattr(getattr(instance, "parent_node", None), "children", None)
+        if not (
+            isinstance(siblings, NamedList)
+            and siblings.rename(instance, old_name, new_value)
+        ):
+            NamedList.rename_generation += 1
+    return new_value
+
+
+def as_named_list(value: Iterable[Any]) -> NamedList:
+    """
+    Converter for lists of named elements, so that assigning a plain list keeps the index.
+    """
+    return value if isinstance(value, NamedList) else NamedList(value)
 
 
 def __find_item_index(list_to_look_in: List[Any], item_name: str):
@@ -8,6 +243,8 @@ def __find_item_index(list_to_look_in: List[Any], item_name: str):
     :param item_name: the item name to actually search for
     :return: The index of the object if any are found.
     """
+    if isinstance(list_to_look_in, NamedList):
+        return list_to_look_in.index_of_name(item_name)
     for count, element in enumerate(list_to_look_in):
         if element.name == item_name:
             return count
@@ -20,6 +257,8 @@ def _get_item(list_to_look_in: List[Any], item_name: str) -> Any:
     :param item_name: the name of the item
     :return: the item itself
     """
+    if isinstance(list_to_look_in, NamedList):
+        return list_to_look_in.get_by_name(item_name)
     index = __find_item_index(list_to_look_in, item_name)
     return list_to_look_in[index] if index is not None else None
 
@@ -70,3 +309,30 @@ def _generate_incremental_name(base_name, transforms_list):
     while _get_item(transforms_list, f"{base_name}_{number}") is not None:
         number += 1
     return f"{base_name}_{number}"
+
+
+@contextmanager
+def arrays_kept_in_dicts():
+    """
+    Within this context as_dict leaves numpy array values as they are, rather than converting them to nested lists of
+    Python numbers, for writers that can format the arrays directly. Lazy values are left as LazyValues sources.
+    """
+    token = _keep_arrays_in_dicts.set(True)
+    try:
+        yield
+    finally:
+        _keep_arrays_in_dicts.reset(token)
+
+
+def values_for_dict(values: Any) -> Any:
+    """
+    Converts dataset or attribute values for as_dict, turning numpy arrays into lists unless in arrays_kept_in_dicts.
+    Lazy values are read from their file, except in arrays_kept_in_dicts where the writer reads them in blocks.
+    """
+    if _keep_arrays_in_dicts.get():
+        return values
+    if isinstance(values, LazyValues):
+        values = values.read()
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return values
@@ -0,0 +1,296 @@
+"""
+Dataset values which stay in a file until they are used, so that a model with several large detectors does not hold
+every vertex, face and detector number in memory.
+
+A source opens its file the first time its values are read or exported. Open sources are kept in an LRU of the bytes
+they hold, and the least recently used ones are released, closing their files and dropping their arrays, to keep
+within the budget. A released source opens its file again when its values are next used.
+
+Large arrays loaded from a filewriter JSON file are spilled to temporary files, which are deleted when their source is.
+"""
+import os
+import tempfile
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Arrays smaller than this are kept in memory rather than spilled to a temporary file
+SPILL_MIN_BYTES = 16 * 1024 * 1024
+
+
+class LazyValues(ABC):
+    """
+    The values of a dataset kept in a file. Subclasses open the file and give an array-like view of the values, which
+    can be sliced to read part of them.
+    """
+
+    def __init__(self):
+        self._array_like: Any = None
+        self._array: Optional[np.ndarray] = None
+
+    @abstractmethod
+    def _open(self) -> Any:
+        """
+        :return: An object with the shape, ndim and dtype of the values which gives numpy arrays when sliced.
+        """
+        pass
+
+    def _close(self):
+        pass
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.array_like().shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array_like().dtype
+
+    @property
+    def is_open(self) -> bool:
+        return self._array_like is not None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the values held, or zero if the file is not open.
+        """
+        if self._array_like is None:
+            return 0
+        return int(np.prod(self._array_like.shape)) * self._array_like.dtype.itemsize
+
+    def array_like(self) -> Any:
+        """
+        Opens the file if it is not open already, without reading the values into memory.
+        :return: The array-like view of the values.
+        """
+        if self._array_like is None:
+            self._array_like = self._open()
+        open_values.touch(self)
+        return self._array_like
+
+    def read(self) -> np.ndarray:
+        """
+        :return: The values as a numpy array, which is a memory map of the file where the file format allows.
+        """
+        if self._array is None:
+            self._array = np.asarray(self.array_like())
+        open_values.touch(self)
+        return self._array
+
+    def release(self):
+        """
+        Drops the values read from the file and closes it. Arrays already returned by read stay valid.
+        """
+        open_values.discard(self)
+        self._array = None
+        if self._array_like is not None:
+            self._array_like = None
+            self._close()
+
+
+class NpyFileValues(LazyValues):
+    """
+    Values in a .npy file, memory-mapped so that only the parts which are used are read from disk.
+    """
+
+    def __init__(self, filename: str):
+        """
+        :param filename: The name of the .npy file.
+        """
+        super().__init__()
+        self.filename = filename
+
+    def _open(self) -> np.ndarray:
+        return np.load(self.filename, mmap_mode="r")
+
+
+class FileSliceValues(LazyValues):
+    """
+    Values stored as a contiguous block of raw numbers in a file, such as the vertices in a binary geometry file.
+    """
+
+    def __init__(
+        self, filename: str, dtype: Any, shape: Tuple[int, ...], offset: int = 0
+    ):
+        """
+        :param filename: The name of the file.
+        :param dtype: The numpy dtype of the numbers, including their byte order.
+        :param shape: The shape of the values.
+        :param offset: The position of the first byte of the values in the file.
+        """
+        super().__init__()
+        self.filename = filename
+        self._dtype = np.dtype(dtype)
+        self._shape = tuple(shape)
+        self.offset = offset
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def _open(self) -> np.ndarray:
+        return np.memmap(
+            self.filename,
+            dtype=self._dtype,
+            mode="r",
+            offset=self.offset,
+            shape=self._shape,
+        )
+
+
+class HDF5DatasetValues(LazyValues):
+    """
+    Values in a dataset of an HDF5 file. Exporting them reads the dataset in blocks, while reading them for use in the
+    model reads the whole dataset.
+    """
+
+    def __init__(self, filename: str, path: str):
+        """
+        :param filename: The name of the HDF5 file.
+        :param path: The path of the dataset in the file.
+        """
+        super().__init__()
+        self.filename = filename
+        self.path = path
+        self._file = None
+
+    def _open(self) -> Any:
+        import h5py
+
+        self._file = h5py.File(self.filename, "r")
+        try:
+            return self._file[self.path]
+        except KeyError:
+            self._close()
+            raise
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class OpenValues:
+    """
+    Keeps track of the most recently used open sources until the bytes they hold go over a budget, then releases the
+    least recently used ones. A source larger than the whole budget stays open until it is released explicitly.
+
+    Sources are only held weakly, so that one which is no longer used by the model is closed, and its file deleted if
+    it was spilled, as soon as it is garbage collected rather than when the budget is next exceeded.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param max_bytes: The total size of the values held above which the least recently used sources are released.
+        """
+        self.max_bytes = max_bytes
+        self._sources: "OrderedDict[int, weakref.ref]" = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._live_sources())
+
+    def __contains__(self, source: LazyValues) -> bool:
+        reference = self._sources.get(id(source))
+        return reference is not None and reference() is source
+
+    def _live_sources(self) -> List[LazyValues]:
+        with self._lock:
+            sources = [reference() for reference in self._sources.values()]
+        return [source for source in sources if source is not None]
+
+    def _forget(self, key: int, reference: weakref.ref):
+        with self._lock:
+            if self._sources.get(key) is reference:
+                del self._sources[key]
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes held by the open sources.
+        """
+        return sum(source.nbytes for source in self._live_sources())
+
+    def touch(self, source: LazyValues):
+        """
+        Marks a source as the most recently used, and releases others if the open sources are over the budget.
+        :param source: The source which has just been used.
+        """
+        with self._lock:
+            key = id(source)
+            if source not in self:
+                self._sources[key] = weakref.ref(
+                    source, lambda reference: self._forget(key, reference)
+                )
+            self._sources.move_to_end(key)
+            others = self._live_sources()[:-1]
+            size = source.nbytes + sum(other.nbytes for other in others)
+            for other in others:
+                if size <= self.max_bytes:
+                    break
+                size -= other.nbytes
+                other.release()
+
+    def discard(self, source: LazyValues):
+        with self._lock:
+            if source in self:
+                del self._sources[id(source)]
+
+    def release_all(self):
+        for source in self._live_sources():
+            source.release()
+
+
+# Every lazy source in the model shares this budget
+open_values = OpenValues()
+
+
+_spill_directory: Optional[tempfile.TemporaryDirectory] = None
+
+
+def _remove_file(filename: str):
+    try:
+        os.remove(filename)
+    except OSError:
+        # Still memory-mapped on Windows, so it is left for the temporary directory to be cleaned up at exit
+        pass
+
+
+def spill_to_file(values: Any, min_bytes: Optional[int] = None) -> Any:
+    """
+    Writes a large array to a temporary file, so that it is only read back when it is used.
+    :param values: Dataset values.
+    :param min_bytes: The size below which arrays are kept in memory, SPILL_MIN_BYTES if not given.
+    :return: A source of the values in the temporary file, or the values themselves if they are not a large array.
+    """
+    if min_bytes is None:
+        min_bytes = SPILL_MIN_BYTES
+    if not isinstance(values, np.ndarray) or values.nbytes < min_bytes:
+        return values
+    global _spill_directory
+    if _spill_directory is None:
+        _spill_directory = tempfile.TemporaryDirectory(prefix="nexus-constructor-")
+    handle, filename = tempfile.mkstemp(suffix=".bin", dir=_spill_directory.name)
+    with os.fdopen(handle, "wb") as file:
+        np.ascontiguousarray(values).tofile(file)
+    source = FileSliceValues(filename, values.dtype, values.shape)
+    weakref.finalize(source, _remove_file, filename)
+    return source
+
+
+def read_values(values: Any) -> Any:
+    """
+    :param values: Dataset values, or a lazy source of them.
+    :return: The values, read from the file if they are lazy.
+    """
+    return values.read() if isinstance(values, LazyValues) else values
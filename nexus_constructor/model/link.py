@@ -1,13 +1,14 @@
 import attr
 
 from nexus_constructor.common_attrs import CommonKeys, NodeType
+from nexus_constructor.model.helpers import track_rename
 
 TARGET = "target"
 
 
 @attr.s
 class Link:
-    name = attr.ib(type=str)
+    name = attr.ib(type=str, on_setattr=track_rename)
     target = attr.ib(type=str)
 
     def as_dict(self):
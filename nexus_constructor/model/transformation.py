@@ -1,8 +1,8 @@
+import copy
 from typing import List, Union, Dict, Any
 
 import attr
 import numpy as np
-from PySide2.Qt3DCore import Qt3DCore
 from PySide2.QtGui import QVector3D, QMatrix4x4
 
 from nexus_constructor.common_attrs import (
@@ -29,6 +29,10 @@ class Transformation(Dataset):
     _parent_component = attr.ib(type="Component", default=None)
     _dependents = attr.ib(type=List[Union["Transformation", "Component"]], init=False)
     _ui_value = attr.ib(type=float, default=None)
+    # The matrix of this transformation alone, along with the values it was calculated from
+    _local_matrix = attr.ib(default=None, init=False, eq=False, repr=False)
+    # The matrix of this transformation composed with everything it depends on
+    _world_matrix = attr.ib(default=None, init=False, eq=False, repr=False)
 
     @_dependents.default
     def _initialise_dependents(self):
@@ -41,6 +45,7 @@ class Transformation(Dataset):
     @transform_type.setter
     def transform_type(self, new_type):
         self.attributes.set_attribute_value(CommonAttrs.TRANSFORMATION_TYPE, new_type)
+        self.invalidate_matrix()
 
     @property
     def vector(self) -> QVector3D:
@@ -53,6 +58,7 @@ class Transformation(Dataset):
     def vector(self, new_vector: QVector3D):
         vector_as_np_array = np.array([new_vector.x(), new_vector.y(), new_vector.z()])
         self.attributes.set_attribute_value(CommonAttrs.VECTOR, vector_as_np_array)
+        self.invalidate_matrix()
 
     @property
     def ui_value(self) -> float:
@@ -80,27 +86,116 @@ class Transformation(Dataset):
             value = new_value
         else:
             value = new_value[0]
+        old_value = self._ui_value
         try:
             self._ui_value = float(value)
         except ValueError:
             self._ui_value = 0.0
+        # The getter writes the value back every time it is read, which should not throw away the cached matrices
+        if self._ui_value != old_value:
+            self.invalidate_matrix()
+
+    def __attrs_post_init__(self):
+        if isinstance(self._values, Dataset):
+            self._values.add_values_listener(self.invalidate_matrix)
+
+    @Dataset.values.setter
+    def values(self, new_values):
+        if isinstance(self._values, Dataset):
+            self._values.remove_values_listener(self.invalidate_matrix)
+        Dataset.values.fset(self, new_values)
+        # The value of the transformation comes from the values dataset, which can also be edited in place
+        if isinstance(new_values, Dataset):
+            new_values.add_values_listener(self.invalidate_matrix)
+        self.invalidate_matrix()
 
     @property
     def qmatrix(self) -> QMatrix4x4:
         """
         Get a Qt3DCore.QTransform describing the transformation
         """
-        transform = Qt3DCore.QTransform()
-        if self.transform_type == TransformationType.ROTATION:
-            quaternion = transform.fromAxisAndAngle(self.vector, self.ui_value)
-            transform.setRotation(quaternion)
-        elif self.transform_type == TransformationType.TRANSLATION:
-            transform.setTranslation(self.vector.normalized() * self.ui_value)
-        else:
-            raise (
-                RuntimeError(f'Unknown transformation of type "{self.transform_type}".')
+        return copy.copy(self._update_local_matrix())
+
+    def _update_local_matrix(self) -> QMatrix4x4:
+        """
+        Recalculates the matrix of this transformation alone if the values it was calculated from have changed, also
+        discarding the composed matrices of its dependents in that case.
+        :return: The cached matrix, which must not be modified.
+        """
+        ui_value = self.ui_value
+        vector = self.vector
+        matrix_key = (self.transform_type, vector.toTuple(), ui_value)
+        if self._local_matrix is None or self._local_matrix[0] != matrix_key:
+            # Not imported at module level, as the batch exporter loads models without the 3D modules
+            from PySide2.Qt3DCore import Qt3DCore
+
+            transform = Qt3DCore.QTransform()
+            if self.transform_type == TransformationType.ROTATION:
+                quaternion = transform.fromAxisAndAngle(vector, ui_value)
+                transform.setRotation(quaternion)
+            elif self.transform_type == TransformationType.TRANSLATION:
+                transform.setTranslation(vector.normalized() * ui_value)
+            else:
+                raise (
+                    RuntimeError(
+                        f'Unknown transformation of type "{self.transform_type}".'
+                    )
+                )
+            if self._local_matrix is not None:
+                # Changed without going through a setter, for example by editing the attributes directly
+                self.invalidate_matrix()
+            self._local_matrix = (matrix_key, transform.matrix())
+        return self._local_matrix[1]
+
+    @property
+    def world_matrix(self) -> QMatrix4x4:
+        """
+        Get the matrix of this transformation composed with the full chain of transformations it depends on, which is
+        cached until this transformation or one it depends on changes.
+        """
+        if self._world_matrix is None:
+            # Only the links above the nearest one whose composed matrix is still cached are composed, as changing a
+            # link discards the composed matrices of its dependents. A chain which loops back on itself ends there.
+            chain = []
+            visited = set()
+            link = self
+            while (
+                link is not None
+                and link._world_matrix is None
+                and id(link) not in visited
+            ):
+                visited.add(id(link))
+                chain.append(link)
+                link = next_in_chain(link)
+            if link is None or link._world_matrix is None:
+                matrix = QMatrix4x4()
+            else:
+                matrix = link._world_matrix
+            for link in reversed(chain):
+                link_matrix = copy.copy(link._update_local_matrix())
+                link_matrix *= matrix
+                link._world_matrix = matrix = link_matrix
+        return copy.copy(self._world_matrix)
+
+    def invalidate_matrix(self):
+        """
+        Discards the cached matrices of this transformation and the composed matrices of all of its dependents, so
+        they are recalculated the next time they are used.
+        """
+        self._local_matrix = None
+        to_invalidate = [self]
+        invalidated = set()
+        while to_invalidate:
+            transform = to_invalidate.pop()
+            if id(transform) in invalidated:
+                continue
+            invalidated.add(id(transform))
+            transform._world_matrix = None
+            to_invalidate.extend(
+                dependent
+                for dependent in transform.dependents
+                if isinstance(dependent, Transformation)
             )
-        return transform.matrix()
 
     @property
     def units(self):
@@ -125,6 +220,7 @@ class Transformation(Dataset):
         self.attributes.set_attribute_value(CommonAttrs.DEPENDS_ON, new_depends_on)
         if new_depends_on is not None:
             new_depends_on.register_dependent(self)
+        self.invalidate_matrix()
 
     @property
     def dependents(self) -> List[Union["Transformation", "Component"]]:
@@ -182,3 +278,24 @@ class Transformation(Dataset):
             pass
 
         return return_dict
+
+
+def next_in_chain(
+    item: Union[Transformation, "Component"]
+) -> Union[Transformation, None]:
+    """
+    Gets the transformation that the given transformation or component depends on, following the same rules as
+    Component.transforms_full_chain: a component in the chain is skipped over to the transformation it depends on and
+    a transformation which depends on itself, or has no depends_on attribute at all, marks the end of the chain.
+    :param item: The transformation or component to get the next transformation in the chain of
+    :return: The next transformation, or None if the end of the chain has been reached
+    """
+    try:
+        depends_on = item.depends_on
+        if depends_on is not None and not isinstance(depends_on, Transformation):
+            depends_on = depends_on.depends_on
+        if depends_on is None or depends_on.depends_on is depends_on:
+            return None
+    except AttributeError:
+        return None
+    return depends_on
@@ -1,44 +1,341 @@
-from PySide2.QtWidgets import QWidget, QLabel, QLineEdit, QHBoxLayout, QListWidget
+"""
+The editor for the detector IDs of the faces of a mesh or the cylinders of a cylindrical geometry. The IDs are kept in
+a single integer array which a table view shows, so only the rows on screen are drawn and an editor is only created for
+the row being edited. This keeps the Add Component dialog responsive for meshes with hundreds of thousands of faces.
+"""
+import typing
+from functools import partial
+from typing import Optional, Sequence
 
+import numpy as np
+from PySide2.QtCore import (
+    QAbstractItemModel,
+    QAbstractTableModel,
+    QModelIndex,
+    Qt,
+)
+from PySide2.QtWidgets import (
+    QAbstractItemView,
+    QAction,
+    QHeaderView,
+    QItemDelegate,
+    QLabel,
+    QLineEdit,
+    QSpinBox,
+    QStyleOptionViewItem,
+    QTableView,
+    QToolBar,
+    QVBoxLayout,
+    QWidget,
+)
+
+from nexus_constructor.geometry.pixel_data import NO_PIXEL_ID
+from nexus_constructor.ui_utils import file_dialog, show_warning_dialog
 from nexus_constructor.validators import NullableIntValidator
 
+PIXEL_ID_FILE_TYPES = {"CSV Files": ["csv", "txt"], "NumPy Files": ["npy"]}
 
-class PixelMappingWidget(QWidget):
-    def __init__(self, parent: QListWidget, id_no: int, text: str):
+
+def read_pixel_ids(filename: str) -> np.ndarray:
+    """
+    Reads pixel IDs from a NumPy file or a text file of comma separated values, in the order they appear in the file.
+    Empty values in a CSV file are faces or cylinders without a pixel ID.
+    :param filename: The name of the file, a NumPy file if it ends in .npy.
+    :return: The IDs as an integer array, with NO_PIXEL_ID where there is no ID.
+    :raises ValueError: If the file contains values which are not IDs.
+    """
+    if filename.lower().endswith(".npy"):
+        values = np.ravel(np.load(filename, allow_pickle=False))
+        if values.dtype.kind not in "iu":
+            raise ValueError("The file contains pixel IDs which are not integers")
+        has_id = np.ones(len(values), dtype=bool)
+    else:
+        with open(filename) as file:
+            fields = np.array(
+                [
+                    field.strip()
+                    for line in file
+                    if line.strip()
+                    for field in line.split(",")
+                ],
+                dtype=str,
+            )
+        has_id = fields != ""
+        try:
+            values = fields[has_id].astype(np.int64)
+        except ValueError:
+            raise ValueError("The file contains pixel IDs which are not integers")
+    if np.any(values < 0):
+        raise ValueError("The file contains negative pixel IDs")
+    pixel_ids = np.full(len(has_id), NO_PIXEL_ID, dtype=np.int64)
+    pixel_ids[has_id] = values
+    return pixel_ids
+
+
+class PixelMappingModel(QAbstractTableModel):
+    """
+    A table with a row for each face or cylinder, holding its pixel ID.
+    """
+
+    def __init__(self, parent: QWidget = None):
+        super().__init__(parent)
+        self.pixel_ids = np.full(0, NO_PIXEL_ID, dtype=np.int64)
+        self.text = ""
+
+    def reset(self, n_items: int, text: str):
         """
-        A custom widget used for acting as a template in the pixel mapping list. Consists of a label and an input box.
-        :param parent: The QListWidget that will contain this list item.
-        :param id_no: The "temporary" ID number based on the number of faces in the mesh/number of cylinders. Used
-        to distinguish elements in the list but doesn't define the actual IDs that are saved upon clicking Add Component.
-        :param text: The text that appears in the list widget. Will be either "cylinder" or "face."
+        Replaces the table with one where none of the items have a pixel ID.
+        :param n_items: The number of faces or cylinders.
+        :param text: What the items are, either "face" or "cylinder".
         """
-        super().__init__(parent)
-        self.pixelIDLabel = QLabel()
-        self.pixelIDLineEdit = QLineEdit()
+        self.beginResetModel()
+        self.pixel_ids = np.full(n_items, NO_PIXEL_ID, dtype=np.int64)
+        self.text = text
+        self.endResetModel()
 
-        # Create the label text based on the face number
-        self.pixelIDLabel.setText("Pixel ID for " + text + " #" + str(id_no) + ":")
+    def has_pixel_ids(self) -> bool:
+        """
+        :return: True if at least one item has been given a pixel ID.
+        """
+        return bool(np.any(self.pixel_ids != NO_PIXEL_ID))
 
-        # Give the line edit a validator that requires values of zero or greater
-        self.pixelIDLineEdit.setValidator(NullableIntValidator(bottom=0))
+    def set_pixel_ids(self, pixel_ids: Sequence[int], rows: Sequence[int] = None):
+        """
+        Sets the pixel IDs of several items at once.
+        :param pixel_ids: The IDs, which can include NO_PIXEL_ID to remove the ID of an item.
+        :param rows: The rows to give the IDs to, in the same order as the IDs. If not given, the IDs are given to the
+        first rows of the table.
+        :raises ValueError: If the numbers of IDs and rows differ, a row is not in the table or an ID is negative.
+        """
+        pixel_ids = np.asarray(pixel_ids, dtype=np.int64).ravel()
+        if rows is None:
+            rows = np.arange(len(pixel_ids))
+        rows = np.asarray(rows, dtype=int).ravel()
+        if len(pixel_ids) != len(rows) or np.any(
+            (rows < 0) | (rows >= len(self.pixel_ids))
+        ):
+            raise ValueError(
+                f"{len(pixel_ids)} pixel IDs were given for {len(self.pixel_ids)} {self.text}s"
+            )
+        if np.any((pixel_ids < 0) & (pixel_ids != NO_PIXEL_ID)):
+            raise ValueError("Pixel IDs cannot be negative")
+        if not len(rows):
+            return
+        self.pixel_ids[rows] = pixel_ids
+        self.dataChanged.emit(self.index(rows.min(), 0), self.index(rows.max(), 0))
 
-        self.layout = QHBoxLayout()
-        self.layout.addWidget(self.pixelIDLabel)
-        self.layout.addWidget(self.pixelIDLineEdit)
+    def fill_range(self, first_id: int, step: int = 1, rows: Sequence[int] = None):
+        """
+        Gives rows consecutive pixel IDs.
+        :param first_id: The ID of the first row.
+        :param step: The difference between the IDs of one row and the next.
+        :param rows: The rows to fill, in order. All of the rows if not given.
+        """
+        rows = self._rows_or_all(rows)
+        self.set_pixel_ids(first_id + step * np.arange(len(rows)), rows)
 
-        self.setLayout(self.layout)
+    def fill_pattern(self, pattern: Sequence[int], rows: Sequence[int] = None):
+        """
+        Gives rows pixel IDs by repeating a pattern of IDs.
+        :param pattern: The IDs to repeat.
+        :param rows: The rows to fill, in order. All of the rows if not given.
+        """
+        rows = self._rows_or_all(rows)
+        if not len(pattern):
+            raise ValueError("The pattern does not contain any pixel IDs")
+        self.set_pixel_ids(
+            np.resize(np.asarray(pattern, dtype=np.int64), len(rows)), rows
+        )
 
-    @property
-    def id(self):
+    def clear(self, rows: Sequence[int] = None):
         """
-        :return: The user-entered ID converted to an int. Returns None if the text field is empty.
+        Removes the pixel IDs of rows.
+        :param rows: The rows to clear. All of the rows if not given.
         """
-        text = self.pixelIDLineEdit.text()
-        if text:
-            return int(text)
+        rows = self._rows_or_all(rows)
+        self.set_pixel_ids(np.full(len(rows), NO_PIXEL_ID), rows)
+
+    def _rows_or_all(self, rows: Optional[Sequence[int]]) -> np.ndarray:
+        if rows is None:
+            return np.arange(len(self.pixel_ids))
+        return np.asarray(rows, dtype=int)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.pixel_ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1
 
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> typing.Any:
+        if index.isValid() and (role == Qt.DisplayRole or role == Qt.EditRole):
+            pixel_id = self.pixel_ids[index.row()]
+            return "" if pixel_id == NO_PIXEL_ID else str(pixel_id)
         return None
 
-    @id.setter
-    def id(self, pixel_id: int):
-        self.pixelIDLineEdit.setText(str(pixel_id))
+    def setData(
+        self, index: QModelIndex, value: typing.Any, role: int = Qt.EditRole
+    ) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        try:
+            pixel_id = NO_PIXEL_ID if value in ("", None) else int(value)
+            self.set_pixel_ids([pixel_id], [index.row()])
+        except ValueError:
+            return False
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ) -> typing.Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return f"{self.text.capitalize()} #{section}"
+        return "Pixel ID"
+
+
+class PixelIDDelegate(QItemDelegate):
+    """
+    Edits a pixel ID with a line edit, which is only created while the ID is being edited.
+    """
+
+    def createEditor(
+        self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> QWidget:
+        editor = QLineEdit(parent)
+        # Requires values of zero or greater, or nothing for an item without a pixel ID
+        editor.setValidator(NullableIntValidator(bottom=0))
+        return editor
+
+    def setEditorData(self, editor: QLineEdit, index: QModelIndex):
+        editor.setText(index.model().data(index, Qt.EditRole))
+
+    def setModelData(
+        self, editor: QLineEdit, model: QAbstractItemModel, index: QModelIndex
+    ):
+        model.setData(index, editor.text(), Qt.EditRole)
+
+    def updateEditorGeometry(
+        self, editor: QWidget, option: QStyleOptionViewItem, index: QModelIndex
+    ):
+        editor.setGeometry(option.rect)
+
+
+class PixelMappingWidget(QWidget):
+    """
+    A table of pixel IDs with a tool bar for filling in the IDs of the selected rows, or every row if none are
+    selected, in one go.
+    """
+
+    def __init__(self, parent: QWidget = None):
+        super().__init__(parent)
+        self.model = PixelMappingModel(self)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(PixelIDDelegate(self))
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        # Rows of a fixed height mean the view never has to measure every row
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        self.first_id_spin_box = QSpinBox()
+        self.first_id_spin_box.setRange(0, 2 ** 31 - 1)
+        self.step_spin_box = QSpinBox()
+        self.step_spin_box.setRange(-(2 ** 31), 2 ** 31 - 1)
+        self.step_spin_box.setValue(1)
+        self.pattern_line_edit = QLineEdit()
+        self.pattern_line_edit.setPlaceholderText("e.g. 1, 2, 3")
+
+        self.fill_range_action = QAction(text="Fill")
+        self.fill_range_action.triggered.connect(self._fill_range)
+        self.fill_pattern_action = QAction(text="Fill Pattern")
+        self.fill_pattern_action.triggered.connect(self._fill_pattern)
+        self.import_action = QAction(text="Import...")
+        self.import_action.triggered.connect(self._import)
+        self.clear_action = QAction(text="Clear")
+        self.clear_action.triggered.connect(
+            partial(self._apply, lambda rows: self.model.clear(rows))
+        )
+
+        self.range_tool_bar = QToolBar()
+        self.range_tool_bar.addWidget(QLabel("First ID:"))
+        self.range_tool_bar.addWidget(self.first_id_spin_box)
+        self.range_tool_bar.addWidget(QLabel("Step:"))
+        self.range_tool_bar.addWidget(self.step_spin_box)
+        self.range_tool_bar.addAction(self.fill_range_action)
+        self.pattern_tool_bar = QToolBar()
+        self.pattern_tool_bar.addWidget(QLabel("Pattern:"))
+        self.pattern_tool_bar.addWidget(self.pattern_line_edit)
+        self.pattern_tool_bar.addAction(self.fill_pattern_action)
+        self.pattern_tool_bar.addAction(self.import_action)
+        self.pattern_tool_bar.addAction(self.clear_action)
+
+        self.setLayout(QVBoxLayout())
+        self.layout().setContentsMargins(0, 0, 0, 0)
+        self.layout().addWidget(self.range_tool_bar)
+        self.layout().addWidget(self.pattern_tool_bar)
+        self.layout().addWidget(self.view)
+
+    def count(self) -> int:
+        """
+        :return: The number of faces or cylinders in the mapping.
+        """
+        return self.model.rowCount()
+
+    def selected_rows(self) -> Optional[np.ndarray]:
+        """
+        :return: The selected rows in ascending order, or None if no rows are selected.
+        """
+        ranges = self.view.selectionModel().selection()
+        if ranges.isEmpty():
+            return None
+        rows = np.concatenate(
+            [np.arange(selection.top(), selection.bottom() + 1) for selection in ranges]
+        )
+        return np.unique(rows)
+
+    def _apply(self, fill):
+        try:
+            fill(self.selected_rows())
+        except ValueError as error:
+            show_warning_dialog(str(error), "Invalid pixel IDs", parent=self)
+
+    def _fill_range(self):
+        self._apply(
+            lambda rows: self.model.fill_range(
+                self.first_id_spin_box.value(), self.step_spin_box.value(), rows
+            )
+        )
+
+    def _fill_pattern(self):
+        def fill(rows):
+            try:
+                pattern = [
+                    int(value)
+                    for value in self.pattern_line_edit.text().replace(",", " ").split()
+                ]
+            except ValueError:
+                raise ValueError("The pattern must be a list of integers")
+            self.model.fill_pattern(pattern, rows)
+
+        self._apply(fill)
+
+    def _import(self):
+        filename = file_dialog(False, "Import Pixel IDs", PIXEL_ID_FILE_TYPES)
+        if not filename:
+            return
+
+        def fill(rows):
+            try:
+                pixel_ids = read_pixel_ids(filename)
+            except OSError as error:
+                raise ValueError(str(error))
+            if rows is None:
+                rows = np.arange(min(len(pixel_ids), self.count()))
+            self.model.set_pixel_ids(pixel_ids, rows)
+
+        self._apply(fill)
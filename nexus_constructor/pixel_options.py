@@ -2,9 +2,9 @@ from typing import Tuple, Optional, List
 
 import numpy as np
 from PySide2.QtCore import Signal, QObject
-from PySide2.QtWidgets import QSpinBox, QDoubleSpinBox, QListWidgetItem
+from PySide2.QtWidgets import QSpinBox, QDoubleSpinBox
 
-from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.geometry.geometry_cache import geometry_cache
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import (
     OFFGeometryNexus,
@@ -19,7 +19,7 @@ from nexus_constructor.geometry.pixel_data import (
     Corner,
     PixelData,
 )
-from nexus_constructor.pixel_mapping_widget import PixelMappingWidget
+from nexus_constructor.unit_utils import METRES
 from nexus_constructor.validators import PixelValidator
 from ui.pixel_options import Ui_PixelOptionsWidget
 
@@ -63,8 +63,6 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
 
         QObject.__init__(self)
 
-        self.pixel_mapping_widgets = []
-
         self._pixel_validator = None
         self.current_mapping_filename = None
 
@@ -89,6 +87,11 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         # Setup the pixel grid behaviour
         self.setup_pixel_grid_options()
 
+        # Check the pixel mapping has at least one ID whenever the IDs change
+        pixel_mapping_model = self.pixel_mapping_widget.model
+        pixel_mapping_model.dataChanged.connect(self.update_pixel_mapping_validity)
+        pixel_mapping_model.modelReset.connect(self.update_pixel_mapping_validity)
+
         # Cause the overall Pixel Options validity to change when a different type of Pixel Layout has been selected
         self.single_pixel_radio_button.clicked.connect(self.update_pixel_input_validity)
         self.entire_shape_radio_button.clicked.connect(self.update_pixel_input_validity)
@@ -272,31 +275,33 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
 
             else:
                 self.create_pixel_mapping_list(n_cylinders, "cylinder")
-                self.pixel_mapping_widgets[0].id = detector_number[0]
+                self.pixel_mapping_widget.model.set_pixel_ids(detector_number[:1])
 
     def _fill_off_geometry_pixel_mapping(self, shape: OFFGeometryNexus):
         """
         Fill in the pixel mapping information from an OFFGeometry component.
         :param shape: The shape data from the NeXus file.
         """
-        # Retrieve the detector face information from the shape and use this to create the required number of pixel
-        # mapping widgets
+        # Retrieve the detector face information from the shape and use this to create a pixel mapping row for each
+        # face
         n_faces, detector_faces = self._get_detector_face_information(shape)
         self.create_pixel_mapping_list(n_faces, "face")
 
-        # Populate the pixel mapping widgets based on the contents of the detector_faces array
-        for detector_face in detector_faces:
-            self.pixel_mapping_widgets[detector_face[0]].id = detector_face[1]
+        # Populate the pixel mapping based on the contents of the detector_faces array
+        detector_faces = np.reshape(detector_faces, (-1, 2))
+        self.pixel_mapping_widget.model.set_pixel_ids(
+            detector_faces[:, 1], rows=detector_faces[:, 0]
+        )
 
     @staticmethod
     def _get_detector_face_information(
         shape: OFFGeometryNexus,
     ) -> Tuple[int, List[Tuple[int, int]]]:
-        return len(shape.faces), shape.detector_faces
+        return shape.number_of_faces, shape.detector_faces
 
     def get_current_mapping_filename(self) -> str:
         """
-        Retrieves the filename of the mesh that has been used to generate the list of pixel mapping widgets. Used in
+        Retrieves the filename of the mesh that has been used to generate the pixel mapping. Used in
         order to prevent creating the same list twice should the same file be selected twice with the file dialog.
         :return: The filename of the mesh.
         """
@@ -356,7 +361,7 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         AddComponentDialog will call the method for populating the pixel mapping list. If these conditions are not meant
         then the list will remain empty.
         """
-        if self.pixel_mapping_list_widget.count() == 0:
+        if self.pixel_mapping_widget.count() == 0:
             self.pixel_mapping_button_pressed.emit()
 
     @staticmethod
@@ -430,12 +435,12 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
     @staticmethod
     def get_number_of_faces_from_mesh_file(filename: str) -> int:
         """
-        Creates a temporary geometry and uses this is order to determine the number of faces in the file.
+        Determines the number of faces in the file, using the mesh in the geometry cache if the file has already been
+        loaded.
         :param filename: The filename for the mesh.
         :return: The number of faces in the mesh.
         """
-        temp_geometry = load_geometry(filename, "m")
-        return len(temp_geometry.faces)
+        return geometry_cache.get_mesh(filename, METRES).number_of_faces
 
     def hide_pixel_options_stack(self):
         """
@@ -444,21 +449,20 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         """
         self.pixel_options_stack.setVisible(False)
 
-    def get_pixel_mapping_ids(self) -> List[int]:
+    def get_pixel_mapping_ids(self) -> np.ndarray:
         """
-        :return: A list of the IDs for the current PixelMappingWidgets.
+        :return: The array holding the ID of each face or cylinder in the pixel mapping, with NO_PIXEL_ID for those
+        which have not been given one.
         """
-        return [
-            pixel_mapping_widget.id
-            for pixel_mapping_widget in self.pixel_mapping_widgets
-        ]
+        return self.pixel_mapping_widget.model.pixel_ids
 
     def update_pixel_mapping_validity(self):
         """
         Checks that at least one ID has been given in the Pixel Mapping and then updates the PixelValidator.
         """
-        nonempty_ids = [widget.id is not None for widget in self.pixel_mapping_widgets]
-        self._pixel_validator.set_pixel_mapping_valid(any(nonempty_ids))
+        self._pixel_validator.set_pixel_mapping_valid(
+            self.pixel_mapping_widget.model.has_pixel_ids()
+        )
 
     def generate_pixel_data(self) -> PixelData:
         """
@@ -485,7 +489,8 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
             )
 
         if self.entire_shape_radio_button.isChecked():
-            return PixelMapping(self.get_pixel_mapping_ids())
+            # Copied so that later edits to the mapping do not change the PixelData
+            return PixelMapping(self.get_pixel_mapping_ids().copy())
 
     def update_pixel_input_validity(self):
         """
@@ -513,36 +518,16 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         when the number of cylinders change in the case of NXcylindrical_geometry, or when the user switches between
         mesh and cylinder.
         """
-        self.pixel_mapping_widgets = []
-        self.pixel_mapping_list_widget.clear()
+        self.pixel_mapping_widget.model.reset(0, "")
         self.current_mapping_filename = None
 
     def create_pixel_mapping_list(self, n_items: int, text: str):
         """
-        Creates a list of pixel mapping widgets.
-        :param n_items: The number of widgets to create.
-        :param text: The label to be displayed next to the line edit. This is either faces or cylinders.
+        Creates a pixel mapping with a row for each face or cylinder, none of which have a pixel ID yet.
+        :param n_items: The number of rows to create.
+        :param text: What each row is the pixel ID of. This is either face or cylinder.
         """
-        self.reset_pixel_mapping_list()
-
-        for i in range(n_items):
-            pixel_mapping_widget = PixelMappingWidget(
-                self.pixel_mapping_list_widget, i, text
-            )
-            pixel_mapping_widget.pixelIDLineEdit.textEdited.connect(
-                self.update_pixel_mapping_validity
-            )
-
-            # Make sure the list item is as large as the widget
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(pixel_mapping_widget.sizeHint())
-
-            self.pixel_mapping_list_widget.addItem(list_item)
-            self.pixel_mapping_list_widget.setItemWidget(
-                list_item, pixel_mapping_widget
-            )
-
-            # Keep the PixelMappingWidget so that its ID can be retrieved easily when making a PixelMapping object.
-            self.pixel_mapping_widgets.append(pixel_mapping_widget)
+        self.current_mapping_filename = None
+        self.pixel_mapping_widget.model.reset(n_items, text)
 
     pixel_mapping_button_pressed = Signal()
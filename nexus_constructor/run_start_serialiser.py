@@ -0,0 +1,101 @@
+"""
+Serialises run start commands away from the GUI thread.
+
+A snapshot of the model is taken on the GUI thread with as_dict, leaving the arrays as they are, which is quick. The
+snapshot is then written as JSON and encoded as a run start message in a worker, reporting its progress and stopping
+if it is cancelled. The JSON of the last snapshot is kept with a digest of it, so sending a model which has not changed
+since the last command skips writing the JSON again.
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from streaming_data_types import run_start_pl72
+
+from nexus_constructor.json.json_writer import (
+    array_elements,
+    document_digest,
+    document_to_json,
+)
+from nexus_constructor.model.helpers import arrays_kept_in_dicts
+
+
+class SerialisationCancelled(Exception):
+    pass
+
+
+def model_snapshot(model: Any) -> Dict[str, Any]:
+    """
+    :param model: The model, or any node of it with an as_dict method.
+    :return: The as_dict of the model with its numpy arrays and lazy values left as they are.
+    """
+    with arrays_kept_in_dicts():
+        return model.as_dict()
+
+
+class NexusStructureCache:
+    """
+    The JSON of the last snapshot written, which is reused for a snapshot with the same digest.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digest: Optional[bytes] = None
+        self._json: Optional[str] = None
+
+    def to_json(
+        self, snapshot: Dict[str, Any], progress: Optional[Callable[[int], None]] = None
+    ) -> str:
+        """
+        :param snapshot: The snapshot of the model.
+        :param progress: Called with the number of array elements written so far, if the JSON is written.
+        :return: The JSON text of the snapshot.
+        """
+        digest = document_digest(snapshot)
+        with self._lock:
+            if digest == self._digest:
+                return self._json
+        text = document_to_json(snapshot, progress)
+        with self._lock:
+            self._digest = digest
+            self._json = text
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._digest = None
+            self._json = None
+
+
+def serialise_run_start(
+    snapshot: Dict[str, Any],
+    cache: NexusStructureCache,
+    cancelled: threading.Event,
+    progress: Callable[[int], None] = lambda percent: None,
+    **run_start_arguments,
+) -> bytes:
+    """
+    Encodes a run start message with the snapshot as its NeXus structure. Meant to be run in a worker thread.
+    :param snapshot: The snapshot of the model, see model_snapshot.
+    :param cache: The JSON of the last snapshot written.
+    :param cancelled: Set to stop the serialisation, which then raises SerialisationCancelled.
+    :param progress: Called with the percentage done.
+    :param run_start_arguments: The other arguments of run_start_pl72.serialise_pl72.
+    :return: The serialised message.
+    """
+    total = array_elements(snapshot)
+
+    def report(elements_written: int):
+        if cancelled.is_set():
+            raise SerialisationCancelled()
+        progress(int(99 * elements_written / total) if total else 0)
+
+    report(0)
+    nexus_structure = cache.to_json(snapshot, report)
+    report(total)
+    message = bytes(
+        run_start_pl72.serialise_pl72(
+            nexus_structure=nexus_structure, **run_start_arguments
+        )
+    )
+    progress(100)
+    return message
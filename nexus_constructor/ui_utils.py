@@ -1,10 +1,13 @@
 import re
 from typing import Optional
 
-import numpy as np
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QFileDialog, QMessageBox
 
+from nexus_constructor.geometry.utils import (  # noqa: F401
+    numpy_array_to_qvector3d,
+    qvector3d_to_numpy_array,
+)
+
 
 FILE_DIALOG_NATIVE = QFileDialog.DontUseNativeDialog
 
@@ -62,16 +65,6 @@ def validate_line_edit(
     )
 
 
-def qvector3d_to_numpy_array(input_vector: QVector3D) -> np.ndarray:
-    return np.array([input_vector.x(), input_vector.y(), input_vector.z()]).astype(
-        float
-    )
-
-
-def numpy_array_to_qvector3d(input_array: np.ndarray) -> QVector3D:
-    return QVector3D(input_array[0], input_array[1], input_array[2])
-
-
 def generate_unique_name(base: str, items: list):
     """
     Generates a unique name for a new item using a common base string
@@ -1,11 +1,75 @@
 import logging
+import tokenize
+from functools import lru_cache
+from typing import Optional, Tuple
 
+import numpy as np
 import pint
 
 RADIANS = "radians"
 METRES = "metres"
+# Different unit strings and pairs of units remembered. The validators check the text on every keystroke, so each
+# prefix of what is typed takes an entry.
+UNIT_CACHE_SIZE = 1024
 
-ureg = pint.UnitRegistry()
+
+@lru_cache(maxsize=None)
+def get_unit_registry() -> pint.UnitRegistry:
+    """
+    Creating the registry takes most of a second, so it is only done the first time units are checked or converted
+    rather than while the application starts.
+    :return: The unit registry shared by the whole application.
+    """
+    return pint.UnitRegistry()
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _parse_units(units: str) -> Optional[pint.Quantity]:
+    """
+    :return: The quantity the string describes, or None if pint does not recognise it. Not to be modified.
+    """
+    try:
+        return get_unit_registry()(units)
+    except (pint.errors.PintError, AttributeError, tokenize.TokenError):
+        return None
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _conversion_factor(original_units: str, desired_units: str) -> Optional[float]:
+    """
+    :return: The factor converting from the original to the desired units, or None if there is no conversion.
+    """
+    quantity = _parse_units(original_units)
+    if quantity is None:
+        return None
+    try:
+        return quantity.to(desired_units).magnitude
+    except (pint.errors.PintError, ValueError, AttributeError, tokenize.TokenError):
+        return None
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _linear_conversion(original_units: str, desired_units: str) -> Tuple[float, float]:
+    # Every conversion pint makes is a scale and an offset, which can be found from where zero and one go
+    registry = get_unit_registry()
+    offset = registry.Quantity(0.0, original_units).to(desired_units).magnitude
+    scale = registry.Quantity(1.0, original_units).to(desired_units).magnitude - offset
+    return scale, offset
+
+
+def clear_unit_cache():
+    """
+    Forgets the parsed units and conversion factors, for example after units are added to the registry.
+    """
+    for function in (_parse_units, _conversion_factor, _linear_conversion):
+        function.cache_clear()
+
+
+def __getattr__(name: str):
+    # Keeps unit_utils.ureg working without creating the registry on import
+    if name == "ureg":
+        return get_unit_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> bool:
@@ -17,13 +81,7 @@ def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> b
         `units_are_recognised_by_pint` returns false.
     :return: True if the unit is contained in the pint registry, False otherwise.
     """
-    try:
-        ureg(input)
-    except (
-        pint.errors.UndefinedUnitError,
-        AttributeError,
-        pint.compat.tokenize.TokenError,
-    ):
+    if _parse_units(input) is None:
         if emit_logging_msg:
             logging.info(f"Unit input {input} is not recognised.")
         return False
@@ -39,9 +97,7 @@ def units_are_expected_dimensionality(
     :param input: The units string.
     :return: True if the conversion was successful, False otherwise.
     """
-    try:
-        ureg(input).to(expected_unit_type)
-    except (pint.errors.DimensionalityError, ValueError, AttributeError):
+    if _conversion_factor(input, expected_unit_type) is None:
         if emit_logging_msg:
             logging.info(
                 f"Unit input {input} has wrong type. Expected something that could be converted to {expected_unit_type}."
@@ -58,7 +114,8 @@ def units_have_magnitude_of_one(input: str, emit_logging_msg=True) -> bool:
     :param input: The units string.
     :return: True if the unit has a magnitude of one, False otherwise.
     """
-    if ureg(input).magnitude != 1:
+    quantity = _parse_units(input)
+    if quantity is None or quantity.magnitude != 1:
         if emit_logging_msg:
             logging.info(
                 f"Unit input {input} has wrong magnitude. The input should have a magnitude of one."
@@ -74,4 +131,26 @@ def calculate_unit_conversion_factor(original_units: str, desired_units: str) ->
     :param desired_units: The units that the original units are to be converted to.
     :return: A float value for converting from the original units and the desired units.
     """
-    return ureg(original_units).to(desired_units).magnitude
+    factor = _conversion_factor(original_units, desired_units)
+    if factor is None:
+        # Raises the error pint gives for the conversion
+        return get_unit_registry()(original_units).to(desired_units).magnitude
+    return factor
+
+
+def convert_array(values, original_units: str, desired_units: str) -> np.ndarray:
+    """
+    Converts a whole array of values at once, including between units with an offset such as degrees Celsius.
+    :param values: The values in the original units.
+    :param original_units: The units of the values.
+    :param desired_units: The units to convert the values to.
+    :return: The values in the desired units, as floats. The array given is returned when the units are the same.
+    """
+    values = np.asarray(values)
+    if original_units == desired_units:
+        return values
+    scale, offset = _linear_conversion(original_units, desired_units)
+    converted = values * scale
+    if offset:
+        converted += offset
+    return converted
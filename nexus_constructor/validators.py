@@ -1,17 +1,26 @@
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import List
+from typing import List, Optional, Tuple
 import numpy as np
-import pint
-from PySide2.QtCore import Signal, QObject
+from PySide2.QtCore import Signal, QObject, QTimer
 from PySide2.QtGui import QValidator, QIntValidator
 from PySide2.QtWidgets import QComboBox, QWidget, QRadioButton
-from nexusutils.readwriteoff import parse_off_file
-from stl import mesh
 
 from nexus_constructor.common_attrs import SCALAR
+from nexus_constructor.geometry.geometry_cache import (
+    FileKey,
+    file_key,
+    geometry_cache,
+)
+from nexus_constructor.geometry.geometry_loader import (
+    load_geometry_from_file_object,
+    sniff_geometry_file,
+)
+from nexus_constructor.model.geometry import OFFGeometry, OFFGeometryNoNexus
 from nexus_constructor.unit_utils import (
+    METRES,
     units_are_recognised_by_pint,
     units_are_expected_dimensionality,
     units_have_magnitude_of_one,
@@ -47,7 +56,6 @@ class UnitValidator(QValidator):
 
     def __init__(self, expected_dimensionality=None):
         super().__init__()
-        self.ureg = pint.UnitRegistry()
         self.expected_dimensionality = expected_dimensionality
 
     def validate(self, input: str, pos: int):
@@ -103,20 +111,44 @@ class NameValidator(QValidator):
 
 
 GEOMETRY_FILE_TYPES = {"OFF Files": ["off", "OFF"], "STL Files": ["stl", "STL"]}
+# Milliseconds the file name has to stay the same for before the whole file is checked
+GEOMETRY_VALIDATION_DELAY = 300
 
 
 class GeometryFileValidator(QValidator):
     """
     Validator to ensure file exists and is the correct file type.
+
+    Only the start and size of the file are checked as the file name is edited. Once the name has stayed the same for a
+    moment, the whole file is checked in a background thread and is_valid is emitted again with the result. The mesh
+    read by the check is kept in the geometry cache, so the file is not parsed again when the component is created.
     """
 
-    def __init__(self, file_types):
+    def __init__(self, file_types, delay: int = GEOMETRY_VALIDATION_DELAY):
         """
 
         :param file_types: dict of file extensions that are valid.
+        :param delay: Milliseconds after the last edit before the whole file is checked.
         """
         super().__init__()
         self.file_types = file_types
+        # The file and extension waiting for the full check, whose result is emitted when it is done
+        self._pending: Optional[Tuple[str, str]] = None
+        # The key of the last file fully checked and whether it was valid
+        self._last_result: Optional[Tuple[FileKey, bool]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._start_full_validation)
+        self._validated.connect(self._full_validation_finished)
+
+    @property
+    def validation_pending(self) -> bool:
+        """
+        Whether the whole file is still to be checked for the last file name validated.
+        """
+        return self._pending is not None
 
     def validate(self, input: str, pos: int) -> QValidator.State:
         if not input:
@@ -127,43 +159,76 @@ class GeometryFileValidator(QValidator):
             for suff in suffixes:
                 if input.endswith(f".{suff}"):
                     if suff in GEOMETRY_FILE_TYPES["OFF Files"]:
-                        return self._validate_off_file(input)
+                        return self._validate_mesh_file(input, ".off")
                     if suff in GEOMETRY_FILE_TYPES["STL Files"]:
-                        return self._validate_stl_file(input)
+                        return self._validate_mesh_file(input, ".stl")
         return self._emit_and_return(False)
 
-    def _validate_stl_file(self, input: str) -> QValidator.State:
-        try:
-            try:
-                mesh.Mesh.from_file(
-                    "", fh=self.open_file(input), calculate_normals=False
-                )
-            except UnicodeDecodeError:
-                # File is in binary format - load it again
-                mesh.Mesh.from_file(
-                    "", fh=self.open_file(input, mode="rb"), calculate_normals=False
-                )
-            return self._emit_and_return(True)
-        except (TypeError, AssertionError, RuntimeError, ValueError):
-            # File is invalid
-            return self._emit_and_return(False)
-
     def _emit_and_return(self, is_valid: bool) -> QValidator.State:
+        self._pending = None
+        self._timer.stop()
         self.is_valid.emit(is_valid)
         if is_valid:
             return QValidator.Acceptable
         else:
             return QValidator.Intermediate
 
-    def _validate_off_file(self, input: str) -> QValidator.State:
+    def _validate_mesh_file(self, input: str, extension: str) -> QValidator.State:
+        """
+        Gives the result straight away if the file has already been checked or its header shows it is invalid,
+        otherwise emits False until the full check in the background is done.
+        """
+        key = file_key(input)
+        if self._last_result is not None and self._last_result[0] == key:
+            return self._emit_and_return(self._last_result[1])
+        if geometry_cache.contains(input, METRES):
+            return self._emit_and_return(True)
         try:
-            if parse_off_file(self.open_file(input)) is None:
-                # An invalid file can cause the function to return None
-                return self._emit_and_return(False)
-        except (ValueError, TypeError, StopIteration, IndexError):
-            # File is invalid
+            sniff_geometry_file(input)
+        except (ValueError, OSError):
             return self._emit_and_return(False)
-        return self._emit_and_return(True)
+
+        if self._pending != (input, extension):
+            self._pending = (input, extension)
+            self.is_valid.emit(False)
+        self._timer.start()
+        return QValidator.Intermediate
+
+    def _start_full_validation(self):
+        if self._pending is None:
+            return
+        filename, extension = self._pending
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="geometry-validation"
+            )
+        self._executor.submit(self._check_mesh_file, filename, extension)
+
+    def _check_mesh_file(self, filename: str, extension: str):
+        """
+        Checks the file is a valid mesh by loading it into the geometry cache. Runs in the background thread.
+        """
+        try:
+            geometry_cache.get_mesh(
+                filename, METRES, lambda filename: self._read_mesh(filename, extension),
+            )
+        except Exception:
+            # File is invalid. Any error is caught, as one left to the future would never finish the validation
+            self._validated.emit(filename, extension, False)
+        else:
+            self._validated.emit(filename, extension, True)
+
+    def _full_validation_finished(self, filename: str, extension: str, is_valid: bool):
+        self._last_result = (file_key(filename), is_valid)
+        if self._pending == (filename, extension):
+            self._pending = None
+            self.is_valid.emit(is_valid)
+
+    def _read_mesh(self, filename: str, extension: str) -> OFFGeometry:
+        with self.open_file(filename, "rb" if extension == ".stl" else "r") as file:
+            return load_geometry_from_file_object(
+                file, extension, METRES, OFFGeometryNoNexus()
+            )
 
     @staticmethod
     def is_file(input: str) -> bool:
@@ -174,6 +239,8 @@ class GeometryFileValidator(QValidator):
         return open(filename, mode)
 
     is_valid = Signal(bool)
+    # Carries the result of a full check from the background thread
+    _validated = Signal(str, str, bool)
 
 
 class PixelValidator(QObject):
@@ -3,11 +3,16 @@ import numpy as np
 
 from nexus_constructor.geometry.disk_chopper.chopper_details import ChopperDetails
 from nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator import (
-    Point,
     DiskChopperGeometryCreator,
     RESOLUTION,
+    disk_chopper_mesh,
+)
+from nexus_constructor.model.geometry import winding_order_to_faces
+from tests.geometry.chopper_test_helpers import (
+    EXPECTED_Z,
+    Point,
+    PointByPointChopperMesh,
 )
-from tests.geometry.chopper_test_helpers import EXPECTED_Z
 
 POINT_X = 2.0
 POINT_Y = 3.0
@@ -31,6 +36,11 @@ def geometry_creator(chopper_details):
     return DiskChopperGeometryCreator(chopper_details)
 
 
+@pytest.fixture(scope="function")
+def point_by_point_mesh(chopper_details):
+    return PointByPointChopperMesh(chopper_details)
+
+
 @pytest.fixture(scope="module")
 def resolution_array():
     return np.linspace(0, 2 * np.pi, 100 + 1)[:-1]
@@ -110,49 +120,52 @@ def test_GIVEN_point_WHEN_calling_point_to_qvector3d_THEN_expected_vector_is_cre
     assert vector.z() == pytest.approx(POINT_Z)
 
 
-def test_GIVEN_chopper_details_WHEN_initialising_geometry_creator_THEN_geometry_creator_is_initialised_with_expected_values(
-    geometry_creator, chopper_details
+def test_GIVEN_chopper_details_WHEN_initialising_point_by_point_mesh_THEN_point_by_point_mesh_is_initialised_with_expected_values(
+    point_by_point_mesh, chopper_details
 ):
-    assert geometry_creator.faces == []
-    assert geometry_creator.z == pytest.approx(EXPECTED_Z)
-    assert geometry_creator.arrow_size == pytest.approx(EXPECTED_Z)
-    assert geometry_creator.resolution == RESOLUTION
-
-    assert geometry_creator._radius == pytest.approx(chopper_details.radius)
-    assert np.array_equal(geometry_creator._slit_edges, chopper_details.slit_edges)
-    assert geometry_creator._slit_height == pytest.approx(chopper_details.slit_height)
+    assert point_by_point_mesh.faces == []
+    assert point_by_point_mesh.z == pytest.approx(EXPECTED_Z)
+    assert point_by_point_mesh.arrow_size == pytest.approx(EXPECTED_Z)
+    assert point_by_point_mesh.resolution == RESOLUTION
+
+    assert point_by_point_mesh._radius == pytest.approx(chopper_details.radius)
+    assert np.array_equal(point_by_point_mesh._slit_edges, chopper_details.slit_edges)
+    assert point_by_point_mesh._slit_height == pytest.approx(
+        chopper_details.slit_height
+    )
 
-    assert len(geometry_creator.points) == 2
+    assert len(point_by_point_mesh.points) == 2
 
     expected_points = [Point(0, 0, EXPECTED_Z), Point(0, 0, -EXPECTED_Z)]
 
     for i in range(2):
-        assert geometry_creator.points[i] == expected_points[i]
+        assert point_by_point_mesh.points[i] == expected_points[i]
 
 
 def test_GIVEN_polar_coordinates_WHEN_converting_polar_to_cartesian_THEN_expected_values_are_returned(
-    geometry_creator,
+    point_by_point_mesh,
 ):
-    x, y = geometry_creator._polar_to_cartesian_2d(R, THETA)
+    x, y = point_by_point_mesh._polar_to_cartesian_2d(R, THETA)
     assert abs(x - 1) < 1e-05
     assert abs(y - 1) < 1e-05
 
 
 def test_GIVEN_polar_coordinates_WHEN_creating_mirrored_points_THEN_expected_points_are_returned(
-    geometry_creator, chopper_details
+    point_by_point_mesh, chopper_details
 ):
     expected_first_point = Point(1.0, 1.0, EXPECTED_Z)
     expected_second_point = Point(1.0, 1.0, -EXPECTED_Z)
 
-    actual_first_point, actual_second_point = geometry_creator._create_mirrored_points(
-        R, THETA
-    )
+    (
+        actual_first_point,
+        actual_second_point,
+    ) = point_by_point_mesh._create_mirrored_points(R, THETA)
     assert actual_first_point == expected_first_point
     assert actual_second_point == expected_second_point
 
 
 def test_GIVEN_face_should_look_right_WHEN_creating_and_adding_point_set_THEN_expected_face_is_created_with_expected_order(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     radius = 1
     center_to_slit_start = 0.5
@@ -173,7 +186,7 @@ def test_GIVEN_face_should_look_right_WHEN_creating_and_adding_point_set_THEN_ex
         actual_upper_back,
         actual_lower_front,
         actual_lower_back,
-    ) = geometry_creator.create_and_add_point_set(
+    ) = point_by_point_mesh.create_and_add_point_set(
         radius, center_to_slit_start, slit_edge, right_facing
     )
 
@@ -184,20 +197,20 @@ def test_GIVEN_face_should_look_right_WHEN_creating_and_adding_point_set_THEN_ex
     assert expected_lower_back == actual_lower_back
 
     # Check that the points have been added to the list
-    assert actual_upper_front in geometry_creator.points
-    assert actual_lower_front in geometry_creator.points
-    assert actual_upper_back in geometry_creator.points
-    assert actual_lower_back in geometry_creator.points
+    assert actual_upper_front in point_by_point_mesh.points
+    assert actual_lower_front in point_by_point_mesh.points
+    assert actual_upper_back in point_by_point_mesh.points
+    assert actual_lower_back in point_by_point_mesh.points
 
     # Check that the face created from the four points has the expected winding order
     expected_winding_order = create_list_of_ids(
         actual_lower_front, actual_upper_front, actual_upper_back, actual_lower_back
     )
-    assert expected_winding_order == geometry_creator.faces[-1]
+    assert expected_winding_order == point_by_point_mesh.faces[-1]
 
 
 def test_GIVEN_face_should_look_left_WHEN_creating_and_adding_point_set_THEN_expected_face_is_created_with_expected_point_order(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     radius = 1
     center_to_slit_start = 0.5
@@ -218,7 +231,7 @@ def test_GIVEN_face_should_look_left_WHEN_creating_and_adding_point_set_THEN_exp
         actual_upper_back,
         actual_lower_front,
         actual_lower_back,
-    ) = geometry_creator.create_and_add_point_set(
+    ) = point_by_point_mesh.create_and_add_point_set(
         radius, center_to_slit_start, slit_edge, right_facing
     )
 
@@ -229,21 +242,21 @@ def test_GIVEN_face_should_look_left_WHEN_creating_and_adding_point_set_THEN_exp
     assert expected_lower_back == actual_lower_back
 
     # Check that the points have been added to the list
-    assert actual_upper_front in geometry_creator.points
-    assert actual_lower_front in geometry_creator.points
-    assert actual_upper_back in geometry_creator.points
-    assert actual_lower_back in geometry_creator.points
+    assert actual_upper_front in point_by_point_mesh.points
+    assert actual_lower_front in point_by_point_mesh.points
+    assert actual_upper_back in point_by_point_mesh.points
+    assert actual_lower_back in point_by_point_mesh.points
 
     # Check that the face created from the four points has the expected winding order
     expected_winding_order = create_list_of_ids(
         actual_lower_back, actual_upper_back, actual_upper_front, actual_lower_front
     )
 
-    assert expected_winding_order == geometry_creator.faces[-1]
+    assert expected_winding_order == point_by_point_mesh.faces[-1]
 
 
 def test_GIVEN_r_and_theta_WHEN_creating_and_adding_mirrored_points_THEN_expected_points_are_created_and_added_to_list(
-    geometry_creator, chopper_details
+    point_by_point_mesh, chopper_details
 ):
     r = 20
     theta = 0
@@ -254,51 +267,51 @@ def test_GIVEN_r_and_theta_WHEN_creating_and_adding_mirrored_points_THEN_expecte
     (
         actual_front_point,
         actual_back_point,
-    ) = geometry_creator.create_and_add_mirrored_points(r, theta)
+    ) = point_by_point_mesh.create_and_add_mirrored_points(r, theta)
 
     assert expected_front_point == actual_front_point
     assert expected_back_point == actual_back_point
 
-    assert actual_front_point in geometry_creator.points
-    assert actual_back_point in geometry_creator.points
+    assert actual_front_point in point_by_point_mesh.points
+    assert actual_back_point in point_by_point_mesh.points
 
 
 def test_GIVEN_points_WHEN_adding_face_connected_to_front_centre_THEN_expected_face_is_created(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     first_point, second_point = create_two_points()
-    geometry_creator.add_face_connected_to_front_centre([first_point, second_point])
+    point_by_point_mesh.add_face_connected_to_front_centre([first_point, second_point])
 
     expected_face = create_list_of_ids(
-        geometry_creator.front_centre, first_point, second_point
+        point_by_point_mesh.front_centre, first_point, second_point
     )
-    assert expected_face == geometry_creator.faces[-1]
+    assert expected_face == point_by_point_mesh.faces[-1]
 
 
 def test_GIVEN_points_WHEN_adding_face_connected_to_back_centre_THEN_expected_face_is_created(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     first_point, second_point = create_two_points()
-    geometry_creator.add_face_connected_to_back_centre([first_point, second_point])
+    point_by_point_mesh.add_face_connected_to_back_centre([first_point, second_point])
 
     expected_face = create_list_of_ids(
-        geometry_creator.back_centre, first_point, second_point
+        point_by_point_mesh.back_centre, first_point, second_point
     )
-    assert expected_face == geometry_creator.faces[-1]
+    assert expected_face == point_by_point_mesh.faces[-1]
 
 
 def test_GIVEN_point_WHEN_adding_point_to_list_THEN_point_is_added_and_assigned_an_id(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     point = Point(1, 2, 3)
-    geometry_creator._add_point_to_list(point)
+    point_by_point_mesh._add_point_to_list(point)
 
-    assert point in geometry_creator.points
-    assert point.id == len(geometry_creator.points) - 1
+    assert point in point_by_point_mesh.points
+    assert point.id == len(point_by_point_mesh.points) - 1
 
 
 def test_GIVEN_set_of_points_WHEN_adding_face_to_list_THEN_list_of_ids_is_added_to_list_of_faces(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     num_points = 3
     points = []
@@ -309,48 +322,48 @@ def test_GIVEN_set_of_points_WHEN_adding_face_to_list_THEN_list_of_ids_is_added_
         points.append(Point(i, i, i))
         points[-1].set_id(ids[-1])
 
-    geometry_creator.add_face_to_list(points)
-    assert ids in geometry_creator.faces
+    point_by_point_mesh.add_face_to_list(points)
+    assert ids in point_by_point_mesh.faces
 
 
 def test_GIVEN_length_of_arrow_position_WHEN_adding_top_dead_centre_arrow_THEN_expected_arrow_is_created(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     length_of_arrow_position = 5
 
     expected_centre_point = Point(length_of_arrow_position, 0, EXPECTED_Z)
     expected_left_point = Point(
-        length_of_arrow_position - geometry_creator.arrow_size,
+        length_of_arrow_position - point_by_point_mesh.arrow_size,
         0,
-        EXPECTED_Z + geometry_creator.arrow_size,
+        EXPECTED_Z + point_by_point_mesh.arrow_size,
     )
     expected_right_point = Point(
-        length_of_arrow_position + geometry_creator.arrow_size,
+        length_of_arrow_position + point_by_point_mesh.arrow_size,
         0,
-        EXPECTED_Z + geometry_creator.arrow_size,
+        EXPECTED_Z + point_by_point_mesh.arrow_size,
     )
 
-    geometry_creator._add_point_to_list(expected_centre_point)
+    point_by_point_mesh._add_point_to_list(expected_centre_point)
 
-    geometry_creator.add_top_dead_centre_arrow(length_of_arrow_position)
+    point_by_point_mesh.add_top_dead_centre_arrow(length_of_arrow_position)
 
-    assert geometry_creator.points[-3] == expected_centre_point
-    assert geometry_creator.points[-2] == expected_right_point
-    assert geometry_creator.points[-1] == expected_left_point
+    assert point_by_point_mesh.points[-3] == expected_centre_point
+    assert point_by_point_mesh.points[-2] == expected_right_point
+    assert point_by_point_mesh.points[-1] == expected_left_point
 
     expected_face = create_list_of_ids(
-        *[geometry_creator.points[i] for i in range(-3, 0)]
+        *[point_by_point_mesh.points[i] for i in range(-3, 0)]
     )
-    assert expected_face in geometry_creator.faces
+    assert expected_face in point_by_point_mesh.faces
 
 
 def test_GIVEN_second_angle_greater_than_first_angle_THEN_intermediate_angles_method_returns_array_with_values_between_the_two_angles(
-    geometry_creator, resolution_array
+    point_by_point_mesh, resolution_array
 ):
     first_angle = 0.5
     second_angle = 1.5
 
-    trimmed_array = geometry_creator.get_intermediate_angle_values_from_resolution_array(
+    trimmed_array = point_by_point_mesh.get_intermediate_angle_values_from_resolution_array(
         resolution_array, first_angle, second_angle
     )
 
@@ -362,12 +375,12 @@ def test_GIVEN_second_angle_greater_than_first_angle_THEN_intermediate_angles_me
 
 
 def test_GIVEN_first_angle_greater_than_second_angle_THEN_intermediate_angles_method_returns_array_with_values_between_the_two_angles(
-    geometry_creator, resolution_array
+    point_by_point_mesh, resolution_array
 ):
     first_angle = 1.5
     second_angle = 0.5
 
-    trimmed_array = geometry_creator.get_intermediate_angle_values_from_resolution_array(
+    trimmed_array = point_by_point_mesh.get_intermediate_angle_values_from_resolution_array(
         resolution_array, first_angle, second_angle
     )
 
@@ -402,33 +415,33 @@ def test_GIVEN_resolution_greater_than_one_WHEN_creating_resolution_angles_THEN_
 
 
 def test_GIVEN_angle_distance_to_centre_and_two_points_WHEN_creating_wedge_shape_THEN_expected_faces_and_points_are_created(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     theta = np.pi
     r = 10
-    prev_back, prev_front = geometry_creator.create_and_add_mirrored_points(r, theta)
-    current_back, current_front = geometry_creator.create_cake_slice(
+    prev_back, prev_front = point_by_point_mesh.create_and_add_mirrored_points(r, theta)
+    current_back, current_front = point_by_point_mesh.create_cake_slice(
         theta, prev_back, prev_front, r
     )
 
-    assert current_front == Point(-r, 0, geometry_creator.z)
-    assert current_back == Point(-r, 0, -geometry_creator.z)
+    assert current_front == Point(-r, 0, point_by_point_mesh.z)
+    assert current_back == Point(-r, 0, -point_by_point_mesh.z)
 
-    assert geometry_creator.faces[-3] == create_list_of_ids(
+    assert point_by_point_mesh.faces[-3] == create_list_of_ids(
         prev_front, prev_back, current_back, current_front
     )
 
-    assert geometry_creator.faces[-2] == create_list_of_ids(
-        geometry_creator.front_centre, prev_front, current_front
+    assert point_by_point_mesh.faces[-2] == create_list_of_ids(
+        point_by_point_mesh.front_centre, prev_front, current_front
     )
 
-    assert geometry_creator.faces[-1] == create_list_of_ids(
-        geometry_creator.back_centre, current_back, prev_back
+    assert point_by_point_mesh.faces[-1] == create_list_of_ids(
+        point_by_point_mesh.back_centre, current_back, prev_back
     )
 
 
 def test_GIVEN_slit_boundaries_WHEN_creating_intermediate_points_and_faces_THEN_expected_points_and_faces_are_created(
-    geometry_creator,
+    point_by_point_mesh,
 ):
     # Choose angles for the boundaries of the slit edge
     first_angle = np.deg2rad(80)
@@ -441,69 +454,69 @@ def test_GIVEN_slit_boundaries_WHEN_creating_intermediate_points_and_faces_THEN_
     r = 10
 
     # Create the points for the boundaries of the slit edges
-    first_front, first_back = geometry_creator.create_and_add_mirrored_points(
+    first_front, first_back = point_by_point_mesh.create_and_add_mirrored_points(
         r, first_angle
     )
-    second_front, second_back = geometry_creator.create_and_add_mirrored_points(
+    second_front, second_back = point_by_point_mesh.create_and_add_mirrored_points(
         r, second_angle
     )
 
     # Create a fake set of resolution angles with zero between the first and second angle
-    geometry_creator.resolution_angles = np.array(
+    point_by_point_mesh.resolution_angles = np.array(
         [first_angle, middle_angle, second_angle]
     )
 
     # Call the method for creating the intermediate points and faces
-    geometry_creator.create_intermediate_points_and_faces(
+    point_by_point_mesh.create_intermediate_points_and_faces(
         first_angle, second_angle, first_front, first_back, second_front, second_back, r
     )
 
     # The expected intermediate points should have a distance from the centres of r, an angle of 90 degrees and be
     # separated by 2 * z
-    expected_intermediate_front = Point(0, r, geometry_creator.z)
-    expected_intermediate_back = Point(0, r, -geometry_creator.z)
+    expected_intermediate_front = Point(0, r, point_by_point_mesh.z)
+    expected_intermediate_back = Point(0, r, -point_by_point_mesh.z)
 
     # Check that the last two points that were created in the geometry creator match what was expected
-    actual_intermediate_front = geometry_creator.points[-2]
-    actual_intermediate_back = geometry_creator.points[-1]
+    actual_intermediate_front = point_by_point_mesh.points[-2]
+    actual_intermediate_back = point_by_point_mesh.points[-1]
 
     assert actual_intermediate_front == expected_intermediate_front
     assert actual_intermediate_back == expected_intermediate_back
 
     # Check that the expected faces were created
-    assert geometry_creator.faces[-6] == create_list_of_ids(
+    assert point_by_point_mesh.faces[-6] == create_list_of_ids(
         first_front, first_back, actual_intermediate_back, actual_intermediate_front
     )
 
-    assert geometry_creator.faces[-5] == create_list_of_ids(
-        geometry_creator.front_centre, first_front, actual_intermediate_front
+    assert point_by_point_mesh.faces[-5] == create_list_of_ids(
+        point_by_point_mesh.front_centre, first_front, actual_intermediate_front
     )
 
-    assert geometry_creator.faces[-4] == create_list_of_ids(
-        geometry_creator.back_centre, actual_intermediate_back, first_back
+    assert point_by_point_mesh.faces[-4] == create_list_of_ids(
+        point_by_point_mesh.back_centre, actual_intermediate_back, first_back
     )
 
-    assert geometry_creator.faces[-3] == create_list_of_ids(
+    assert point_by_point_mesh.faces[-3] == create_list_of_ids(
         actual_intermediate_front, actual_intermediate_back, second_back, second_front
     )
 
-    assert geometry_creator.faces[-2] == create_list_of_ids(
-        geometry_creator.front_centre, actual_intermediate_front, second_front
+    assert point_by_point_mesh.faces[-2] == create_list_of_ids(
+        point_by_point_mesh.front_centre, actual_intermediate_front, second_front
     )
 
-    assert geometry_creator.faces[-1] == create_list_of_ids(
-        geometry_creator.back_centre, second_back, actual_intermediate_back
+    assert point_by_point_mesh.faces[-1] == create_list_of_ids(
+        point_by_point_mesh.back_centre, second_back, actual_intermediate_back
     )
 
 
 def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_points_not_in_top_dead_centre_arrow_have_expected_distance_from_centres(
-    geometry_creator, chopper_details
+    point_by_point_mesh, chopper_details
 ):
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
 
     centre_to_bottom_of_slit = chopper_details.radius - chopper_details.slit_height
 
-    for point in geometry_creator.points[2:-2]:
+    for point in point_by_point_mesh.points[2:-2]:
         distance_from_centre = np.sqrt(point.x ** 2 + point.y ** 2)
         assert np.isclose(distance_from_centre, chopper_details.radius) or np.isclose(
             distance_from_centre, centre_to_bottom_of_slit
@@ -511,26 +524,26 @@ def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_points_not_i
 
 
 def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_THEN_all_faces_contain_three_or_four_points(
-    geometry_creator,
+    point_by_point_mesh,
 ):
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
     expected_face_sizes = [3, 4]
 
-    for face in geometry_creator.faces:
+    for face in point_by_point_mesh.faces:
         assert len(face) in expected_face_sizes
 
 
 def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_with_three_points_all_contain_front_or_back_centre_point(
-    geometry_creator, chopper_details
+    point_by_point_mesh, chopper_details
 ):
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
 
     front_centre_point_index = 0
     back_centre_point_index = 1
 
     no_centre = 0
 
-    for face in geometry_creator.faces:
+    for face in point_by_point_mesh.faces:
         if len(face) == 3:
             if (
                 front_centre_point_index not in face
@@ -542,28 +555,28 @@ def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_with_t
 
 
 def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_connected_to_front_or_back_centre_all_have_expected_z_value(
-    geometry_creator,
+    point_by_point_mesh,
 ):
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
 
     front_centre_point_index = 0
     back_centre_point_index = 1
 
-    arrow_z = geometry_creator.z + geometry_creator.arrow_size
+    arrow_z = point_by_point_mesh.z + point_by_point_mesh.arrow_size
 
-    for face in geometry_creator.faces:
+    for face in point_by_point_mesh.faces:
 
         if len(face) == 3:
 
-            first_point = geometry_creator.points[face[1]]
-            second_point = geometry_creator.points[face[2]]
+            first_point = point_by_point_mesh.points[face[1]]
+            second_point = point_by_point_mesh.points[face[2]]
 
             expected_z = 0
 
             if front_centre_point_index in face:
-                expected_z = geometry_creator.z
+                expected_z = point_by_point_mesh.z
             if back_centre_point_index in face:
-                expected_z = -geometry_creator.z
+                expected_z = -point_by_point_mesh.z
 
             assert (
                 np.isclose(first_point.z, expected_z)
@@ -575,14 +588,14 @@ def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_connec
 
 
 def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_with_four_points_have_two_on_front_and_two_on_back(
-    geometry_creator,
+    point_by_point_mesh,
 ):
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
 
-    front_z = geometry_creator.z
-    back_z = -geometry_creator.z
+    front_z = point_by_point_mesh.z
+    back_z = -point_by_point_mesh.z
 
-    for face in geometry_creator.faces:
+    for face in point_by_point_mesh.faces:
 
         num_points_on_front = 0
         num_points_on_back = 0
@@ -591,9 +604,9 @@ def test_GIVEN_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_faces_with_f
 
             for point_index in face:
 
-                if np.isclose(geometry_creator.points[point_index].z, front_z):
+                if np.isclose(point_by_point_mesh.points[point_index].z, front_z):
                     num_points_on_front += 1
-                if np.isclose(geometry_creator.points[point_index].z, back_z):
+                if np.isclose(point_by_point_mesh.points[point_index].z, back_z):
                     num_points_on_back += 1
 
             assert num_points_on_front == 2 and num_points_on_back == 2
@@ -612,9 +625,9 @@ def test_GIVEN_simple_chopper_details_WHEN_creating_disk_chopper_THEN_chopper_me
         slit_height_units="m",
         radius_units="m",
     )
-    geometry_creator = DiskChopperGeometryCreator(chopper_details)
-    geometry_creator.resolution = resolution
-    z = geometry_creator.z
+    point_by_point_mesh = PointByPointChopperMesh(chopper_details)
+    point_by_point_mesh.resolution = resolution
+    z = point_by_point_mesh.z
 
     angles = np.linspace(0, np.pi * 2, resolution + 1)[:-1]
 
@@ -625,36 +638,36 @@ def test_GIVEN_simple_chopper_details_WHEN_creating_disk_chopper_THEN_chopper_me
         return r * np.sin(theta)
 
     def check_cake_slice_faces(indices):
-        assert indices in geometry_creator.faces
-        assert [0, indices[0], indices[-1]] in geometry_creator.faces
-        assert [1, indices[-2], indices[1]] in geometry_creator.faces
+        assert indices in point_by_point_mesh.faces
+        assert [0, indices[0], indices[-1]] in point_by_point_mesh.faces
+        assert [1, indices[-2], indices[1]] in point_by_point_mesh.faces
 
-    geometry_creator.convert_chopper_details_to_off()
+    point_by_point_mesh.convert_chopper_details_to_off()
 
     # Check the centre points
-    assert geometry_creator.points[0] == Point(0, 0, z)
-    assert geometry_creator.points[1] == Point(0, 0, -z)
+    assert point_by_point_mesh.points[0] == Point(0, 0, z)
+    assert point_by_point_mesh.points[1] == Point(0, 0, -z)
 
     # Check the next four points that make form the "right" slit boundary
-    assert geometry_creator.points[2] == Point(radius, 0, z)
-    assert geometry_creator.points[3] == Point(radius, 0, -z)
-    assert geometry_creator.points[4] == Point(slit_height, 0, z)
-    assert geometry_creator.points[5] == Point(slit_height, 0, -z)
+    assert point_by_point_mesh.points[2] == Point(radius, 0, z)
+    assert point_by_point_mesh.points[3] == Point(radius, 0, -z)
+    assert point_by_point_mesh.points[4] == Point(slit_height, 0, z)
+    assert point_by_point_mesh.points[5] == Point(slit_height, 0, -z)
 
-    assert [4, 2, 3, 5] in geometry_creator.faces
+    assert [4, 2, 3, 5] in point_by_point_mesh.faces
 
     # Check the next four points that make form the "left" slit boundary
-    assert geometry_creator.points[6] == Point(0, radius, z)
-    assert geometry_creator.points[7] == Point(0, radius, -z)
-    assert geometry_creator.points[8] == Point(0, slit_height, z)
-    assert geometry_creator.points[9] == Point(0, slit_height, -z)
+    assert point_by_point_mesh.points[6] == Point(0, radius, z)
+    assert point_by_point_mesh.points[7] == Point(0, radius, -z)
+    assert point_by_point_mesh.points[8] == Point(0, slit_height, z)
+    assert point_by_point_mesh.points[9] == Point(0, slit_height, -z)
 
-    assert [9, 7, 6, 8] in geometry_creator.faces
+    assert [9, 7, 6, 8] in point_by_point_mesh.faces
 
     # Test the intermediate points in the slit
     x, y = find_x(slit_height, angles[1]), find_y(slit_height, angles[1])
-    assert geometry_creator.points[10] == Point(x, y, z)
-    assert geometry_creator.points[11] == Point(x, y, -z)
+    assert point_by_point_mesh.points[10] == Point(x, y, z)
+    assert point_by_point_mesh.points[11] == Point(x, y, -z)
 
     # Test for the faces connected to the points 10 and 11
     check_cake_slice_faces([4, 5, 11, 10])
@@ -662,24 +675,24 @@ def test_GIVEN_simple_chopper_details_WHEN_creating_disk_chopper_THEN_chopper_me
 
     # Test for the next pair of points
     x, y = find_x(radius, angles[2]), find_y(radius, angles[2])
-    assert geometry_creator.points[12] == Point(x, y, z)
-    assert geometry_creator.points[13] == Point(x, y, -z)
+    assert point_by_point_mesh.points[12] == Point(x, y, z)
+    assert point_by_point_mesh.points[13] == Point(x, y, -z)
 
     # Test for the faces connected to points 12 and 13
     check_cake_slice_faces([6, 7, 13, 12])
 
     # Test for the next pair of points
     x, y = find_x(radius, angles[3]), find_y(radius, angles[3])
-    assert geometry_creator.points[14] == Point(x, y, z)
-    assert geometry_creator.points[15] == Point(x, y, -z)
+    assert point_by_point_mesh.points[14] == Point(x, y, z)
+    assert point_by_point_mesh.points[15] == Point(x, y, -z)
 
     # Test for the faces connected to points 14 and 15
     check_cake_slice_faces([12, 13, 15, 14])
 
     # Test for the next pair of points
     x, y = find_x(radius, angles[4]), find_y(radius, angles[4])
-    assert geometry_creator.points[16] == Point(x, y, z)
-    assert geometry_creator.points[17] == Point(x, y, -z)
+    assert point_by_point_mesh.points[16] == Point(x, y, z)
+    assert point_by_point_mesh.points[17] == Point(x, y, -z)
 
     # Test for the faces connected to points 14 and 15
     check_cake_slice_faces([14, 15, 17, 16])
@@ -688,24 +701,91 @@ def test_GIVEN_simple_chopper_details_WHEN_creating_disk_chopper_THEN_chopper_me
     check_cake_slice_faces([16, 17, 3, 2])
 
     # Test for the points in the top dead centre arrow
-    assert geometry_creator.points[18] == Point(radius, 0, z)
-    assert geometry_creator.points[19] == Point(
-        radius + geometry_creator.arrow_size, 0, z + geometry_creator.arrow_size
+    assert point_by_point_mesh.points[18] == Point(radius, 0, z)
+    assert point_by_point_mesh.points[19] == Point(
+        radius + point_by_point_mesh.arrow_size, 0, z + point_by_point_mesh.arrow_size
     )
-    assert geometry_creator.points[20] == Point(
-        radius - geometry_creator.arrow_size, 0, z + geometry_creator.arrow_size
+    assert point_by_point_mesh.points[20] == Point(
+        radius - point_by_point_mesh.arrow_size, 0, z + point_by_point_mesh.arrow_size
     )
 
     # Test for the top dead centre arrow face
-    assert [18, 19, 20] in geometry_creator.faces
+    assert [18, 19, 20] in point_by_point_mesh.faces
+
+
+def mesh_faces_as_coordinates(vertices, faces):
+    """
+    Describes each face by the coordinates of its points, starting from the smallest, so that meshes with the same faces
+    compare equal whatever order their vertices and faces are in.
+    """
+    mesh = []
+    for face in faces:
+        points = [tuple(np.round(vertices[index], 9)) for index in face]
+        first = points.index(min(points))
+        mesh.append(tuple(points[first:] + points[:first]))
+    return sorted(mesh)
 
 
+@pytest.mark.parametrize("resolution", [1, 5, RESOLUTION, 100])
 def test_GIVEN_completed_mesh_WHEN_creating_off_geometry_THEN_off_geometry_has_expected_values(
-    geometry_creator,
+    geometry_creator, point_by_point_mesh, resolution
+):
+    off_geometry = geometry_creator.create_disk_chopper_geometry(resolution)
+
+    point_by_point_mesh.resolution = resolution
+    point_by_point_mesh.convert_chopper_details_to_off()
+    expected_vertices = np.array(
+        [[point.x, point.y, point.z] for point in point_by_point_mesh.points]
+    )
+
+    assert len(off_geometry.vertices_array) == len(expected_vertices)
+    assert mesh_faces_as_coordinates(
+        off_geometry.vertices_array, off_geometry.faces
+    ) == mesh_faces_as_coordinates(expected_vertices, point_by_point_mesh.faces)
+
+
+@pytest.mark.parametrize("slit_edges", [[350.0, 10.0], [30.0], [300.0, 20.0, 100.0]])
+def test_GIVEN_slit_edges_passing_zero_WHEN_creating_disk_chopper_mesh_THEN_mesh_matches_point_by_point_mesh(
+    slit_edges,
+):
+    chopper_details = ChopperDetails(
+        slits=len(slit_edges) // 2,
+        slit_edges=np.array(slit_edges),
+        radius=1.0,
+        slit_height=0.3,
+        angle_units="deg",
+        slit_height_units="m",
+        radius_units="m",
+    )
+    point_by_point_mesh = PointByPointChopperMesh(chopper_details)
+    point_by_point_mesh.convert_chopper_details_to_off()
+    expected_vertices = np.array(
+        [[point.x, point.y, point.z] for point in point_by_point_mesh.points]
+    )
+
+    vertices, winding_order, face_offsets = disk_chopper_mesh(chopper_details)
+
+    assert mesh_faces_as_coordinates(
+        vertices, winding_order_to_faces(winding_order, face_offsets)
+    ) == mesh_faces_as_coordinates(expected_vertices, point_by_point_mesh.faces)
+
+
+def test_GIVEN_same_chopper_details_WHEN_creating_disk_chopper_mesh_THEN_read_only_mesh_is_reused(
+    chopper_details,
 ):
-    off_geometry = geometry_creator.create_disk_chopper_geometry()
+    mesh = disk_chopper_mesh(chopper_details, RESOLUTION)
+
+    assert all(
+        first is second
+        for first, second in zip(mesh, disk_chopper_mesh(chopper_details, RESOLUTION))
+    )
+    assert not any(array.flags.writeable for array in mesh)
+
 
-    assert geometry_creator.faces == off_geometry.faces
+def test_GIVEN_finer_resolution_WHEN_creating_disk_chopper_mesh_THEN_mesh_has_more_faces(
+    chopper_details,
+):
+    _, _, coarse_face_offsets = disk_chopper_mesh(chopper_details, RESOLUTION)
+    _, _, fine_face_offsets = disk_chopper_mesh(chopper_details, 10 * RESOLUTION)
 
-    for point, qvector in zip(geometry_creator.points, off_geometry.vertices):
-        assert point.point_to_qvector3d() == qvector
+    assert len(fine_face_offsets) > len(coarse_face_offsets)
@@ -0,0 +1,119 @@
+import os
+import shutil
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from nexus_constructor.geometry.geometry_cache import GeometryCache
+from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+
+CUBE_STL_FILE_PATH = os.path.join(os.path.dirname(__file__), "..", "cube.stl")
+CUBE_OFF_FILE_PATH = os.path.join(os.path.dirname(__file__), "..", "cube.off")
+
+
+@pytest.fixture
+def cube_file(tmp_path):
+    filename = str(tmp_path / "cube.stl")
+    shutil.copy(CUBE_STL_FILE_PATH, filename)
+    return filename
+
+
+def counting_reader():
+    return Mock(
+        side_effect=lambda filename: load_geometry(filename, "m", OFFGeometryNoNexus())
+    )
+
+
+def test_GIVEN_file_already_loaded_WHEN_getting_mesh_THEN_file_is_not_read_again(
+    cube_file,
+):
+    cache = GeometryCache()
+    read_mesh = counting_reader()
+
+    first = cache.get_mesh(cube_file, "m", read_mesh)
+    second = cache.get_mesh(cube_file, "m", read_mesh)
+
+    assert read_mesh.call_count == 1
+    assert second is first
+    assert first.number_of_faces == 12
+
+
+def test_GIVEN_mesh_loaded_in_metres_WHEN_getting_mesh_in_other_units_THEN_vertices_match_loading_the_file_in_those_units(
+    cube_file,
+):
+    cache = GeometryCache()
+    read_mesh = counting_reader()
+    cache.get_mesh(cube_file, "m", read_mesh)
+
+    mesh = cache.get_mesh(cube_file, "mm", read_mesh)
+
+    assert read_mesh.call_count == 1
+    assert np.array_equal(
+        mesh.vertices,
+        load_geometry(cube_file, "mm", OFFGeometryNoNexus()).vertices_array,
+    )
+
+
+def test_GIVEN_file_changed_WHEN_getting_mesh_THEN_file_is_read_again_and_old_mesh_is_evicted(
+    cube_file,
+):
+    cache = GeometryCache()
+    read_mesh = counting_reader()
+    cache.get_mesh(cube_file, "m", read_mesh)
+
+    modified = os.stat(cube_file).st_mtime_ns + 10 ** 9
+    os.utime(cube_file, ns=(modified, modified))
+    cache.get_mesh(cube_file, "m", read_mesh)
+
+    assert read_mesh.call_count == 2
+    assert len(cache) == 1
+
+
+def test_GIVEN_meshes_larger_than_budget_WHEN_getting_meshes_THEN_least_recently_used_mesh_is_evicted(
+    tmp_path,
+):
+    filenames = []
+    for index in range(3):
+        filenames.append(str(tmp_path / f"cube_{index}.off"))
+        shutil.copy(CUBE_OFF_FILE_PATH, filenames[-1])
+    mesh_size = GeometryCache().get_mesh(filenames[0], "m").nbytes
+    cache = GeometryCache(max_bytes=2 * mesh_size)
+    read_mesh = counting_reader()
+
+    cache.get_mesh(filenames[0], "m", read_mesh)
+    cache.get_mesh(filenames[1], "m", read_mesh)
+    cache.get_mesh(filenames[0], "m", read_mesh)
+    cache.get_mesh(filenames[2], "m", read_mesh)
+    cache.get_mesh(filenames[0], "m", read_mesh)
+    assert read_mesh.call_count == 3
+
+    cache.get_mesh(filenames[1], "m", read_mesh)
+    assert read_mesh.call_count == 4
+    assert cache.size <= cache.max_bytes
+
+
+def test_GIVEN_mesh_from_cache_WHEN_loading_geometry_THEN_geometry_has_read_only_mesh_arrays(
+    cube_file,
+):
+    cache = GeometryCache()
+
+    geometry = cache.load_geometry(cube_file, "cm", OFFGeometryNoNexus())
+
+    assert geometry.number_of_faces == 12
+    assert not geometry.vertices_array.flags.writeable
+    assert np.allclose(np.abs(geometry.vertices_array).max(), 0.3)
+
+
+def test_GIVEN_invalid_file_WHEN_getting_mesh_THEN_error_is_raised_and_nothing_is_cached(
+    tmp_path,
+):
+    filename = str(tmp_path / "invalid.off")
+    with open(filename, "w") as file:
+        file.write("OFF\n3 1 0\n0 0 0\n")
+    cache = GeometryCache()
+
+    with pytest.raises(ValueError):
+        cache.get_mesh(filename, "m")
+    assert len(cache) == 0
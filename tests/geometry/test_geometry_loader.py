@@ -1,8 +1,18 @@
+import os
+
+import numpy as np
+import pytest
+
 from nexus_constructor.model.geometry import OFFGeometryNoNexus
-from nexus_constructor.geometry.geometry_loader import load_geometry_from_file_object
-from nexus_constructor.instrument_view.off_renderer import repeat_shape_over_positions
+from nexus_constructor.geometry.geometry_loader import (
+    load_geometry,
+    load_geometry_from_file_object,
+    sniff_geometry_file,
+)
 from PySide2.QtGui import QVector3D
-from io import StringIO
+from io import BytesIO, StringIO
+
+CUBE_STL_FILE_PATH = os.path.join(os.path.dirname(__file__), "..", "cube.stl")
 
 
 def test_GIVEN_off_file_containing_geometry_WHEN_loading_geometry_to_file_THEN_vertices_and_faces_loaded_are_the_same_as_the_file():
@@ -251,112 +261,124 @@ def test_GIVEN_unrecognised_file_extension_WHEN_loading_geometry_THEN_returns_em
     assert len(geometry.faces) == 0
 
 
-def get_dummy_OFF():
-    # A square with a triangle on the side
-    original_vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 0),
-        QVector3D(1.5, 0.5, 0),
-    ]
-    original_faces = [[0, 1, 2, 3], [2, 3, 4]]
-
-    return OFFGeometryNoNexus(vertices=original_vertices, faces=original_faces)
-
-
-def test_WHEN_generate_off_mesh_with_no_repeat_THEN_off_unchanged():
-    off_geometry = get_dummy_OFF()
-
-    positions = [QVector3D(0, 0, 0)]
-
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
-
-    assert faces == off_geometry.faces
-    assert vertices == off_geometry.vertices
-
-
-def test_WHEN_generate_off_mesh_with_three_copies_THEN_original_shape_remains():
-    off_geometry = get_dummy_OFF()
-
-    positions = [QVector3D(0, 0, 0), QVector3D(0, 0, 1), QVector3D(1, 0, 0)]
-
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
-
-    assert faces[: len(off_geometry.faces)] == off_geometry.faces
-    assert vertices[: len(off_geometry.vertices)] == off_geometry.vertices
-
+def test_GIVEN_binary_stl_file_WHEN_loading_geometry_THEN_shared_corners_become_one_vertex():
+    geometry = load_geometry(CUBE_STL_FILE_PATH, "m", OFFGeometryNoNexus())
 
-def _test_position_with_single_translation_helper(translation):
-    off_geometry = get_dummy_OFF()
+    assert len(geometry.vertices) == 8
+    assert len(geometry.faces) == 12
+    assert all(len(face) == 3 for face in geometry.faces)
 
-    positions = [QVector3D(0, 0, 0), translation]
 
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
+def test_GIVEN_binary_stl_file_object_WHEN_loading_geometry_THEN_same_geometry_as_loading_from_path():
+    from_path = load_geometry(CUBE_STL_FILE_PATH, "m", OFFGeometryNoNexus())
+    with open(CUBE_STL_FILE_PATH, "rb") as file:
+        from_file_object = load_geometry_from_file_object(
+            BytesIO(file.read()), ".stl", "m"
+        )
 
-    second_shape_faces = faces[len(off_geometry.faces) :]
-    second_shape_vertices = vertices[len(off_geometry.vertices) :]
+    assert from_file_object.vertices == from_path.vertices
+    assert from_file_object.faces == from_path.faces
 
-    # Faces will just be the same but every vertex added to be len(vertices)
-    shifted_faces = []
-    for face in second_shape_faces:
-        shifted_face = []
-        for vertex in face:
-            shifted_face.append(vertex - len(off_geometry.vertices))
-        shifted_faces.append(shifted_face)
 
-    assert shifted_faces == off_geometry.faces
+def test_GIVEN_units_other_than_metres_WHEN_loading_stl_THEN_vertices_are_scaled():
+    in_metres = load_geometry(CUBE_STL_FILE_PATH, "m", OFFGeometryNoNexus())
+    in_centimetres = load_geometry(CUBE_STL_FILE_PATH, "cm", OFFGeometryNoNexus())
 
-    return off_geometry.vertices, second_shape_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_x_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(1, 0, 0))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setX(vertex.x() - 1)
-
-    assert second_shape_vertices == original_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_y_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 1, 0))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setY(vertex.y() - 1)
-
-    assert second_shape_vertices == original_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_negative_z_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 0, -1))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setZ(vertex.z() + 1)
-
-    assert second_shape_vertices == original_vertices
+    assert np.allclose(
+        in_centimetres.vertices_array, np.asarray(in_metres.vertices_array) * 0.01
+    )
 
 
-def test_WHEN_generate_off_mesh_with_single_diagonal_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 1, -1))
+def test_GIVEN_off_file_with_counts_on_off_line_and_colours_WHEN_loading_geometry_THEN_colours_are_ignored():
+    off_file = (
+        "OFF 4 2 0 # a square split into triangles\n"
+        "0 0 0\n"
+        "1 0 0  # a comment after a vertex\n"
+        "1 1 0\n"
+        "\n"
+        "0 1 0\n"
+        "3 0 1 2 255 0 0\n"
+        "3 2 3 0 0 255 0\n"
+    )
 
-    for vertex in second_shape_vertices:
-        vertex.setZ(vertex.z() + 1)
-        vertex.setY(vertex.y() - 1)
+    geometry = load_geometry_from_file_object(StringIO(off_file), ".off", "mm")
 
-    assert second_shape_vertices == original_vertices
+    assert np.allclose(
+        geometry.vertices_array,
+        [[0, 0, 0], [0.001, 0, 0], [0.001, 0.001, 0], [0, 0.001, 0]],
+    )
+    assert geometry.faces == [[0, 1, 2], [2, 3, 0]]
+
+
+@pytest.mark.parametrize(
+    "colour", ["1e-1 0 0", "0.1 0 0", "1E2 0 0"], ids=["exponent", "decimal", "upper"]
+)
+def test_GIVEN_off_file_with_float_colours_WHEN_loading_geometry_THEN_colours_are_ignored(
+    colour,
+):
+    off_file = f"OFF\n3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2 {colour}\n"
+
+    geometry = load_geometry_from_file_object(StringIO(off_file), ".off", "m")
+
+    assert geometry.faces == [[0, 1, 2]]
+
+
+@pytest.mark.parametrize(
+    "off_file",
+    [
+        "OFF\n3 1 0\n0 0 0\n1 0 0\n",
+        "OFF\n3 1 0\n0 0 0\n1 0 0\n1 1 0\n4 0 1 2\n",
+        "OFF\n3 1 0\n0 0 0\n1 0 zero\n1 1 0\n3 0 1 2\n",
+        "3 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1 2\n",
+        "OFF\n3 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1.5 2 0.1 0 0\n",
+    ],
+    ids=[
+        "missing_vertex",
+        "short_face",
+        "not_a_number",
+        "no_off_header",
+        "fractional_index",
+    ],
+)
+def test_GIVEN_invalid_off_file_WHEN_loading_geometry_THEN_raises_value_error(
+    off_file,
+):
+    with pytest.raises(ValueError):
+        load_geometry_from_file_object(StringIO(off_file), ".off", "m")
+
+
+@pytest.mark.parametrize(
+    "filename", ["cube.off", "cube.stl", "octa.off"],
+)
+def test_GIVEN_valid_geometry_file_WHEN_sniffing_THEN_no_error_is_raised(filename):
+    sniff_geometry_file(os.path.join(os.path.dirname(__file__), "..", filename))
+
+
+@pytest.mark.parametrize(
+    "filename,contents",
+    [
+        ("empty.off", b""),
+        ("no_header.off", b"3 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1 2\n"),
+        ("too_many_vertices.off", b"OFF\n1000 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1 2\n"),
+        ("negative_count.off", b"OFF -3 1 0\n"),
+        ("short.stl", b"binary"),
+        ("truncated.stl", bytes(80) + (10).to_bytes(4, "little") + bytes(50)),
+    ],
+)
+def test_GIVEN_invalid_header_or_size_WHEN_sniffing_THEN_raises_value_error(
+    tmp_path, filename, contents
+):
+    path = tmp_path / filename
+    path.write_bytes(contents)
+
+    with pytest.raises(ValueError):
+        sniff_geometry_file(str(path))
+
+
+def test_GIVEN_off_header_after_long_comment_WHEN_sniffing_THEN_file_is_left_to_the_full_check(
+    tmp_path,
+):
+    path = tmp_path / "commented.off"
+    path.write_text("# " + "x" * 10000 + "\nOFF\n3 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1 2\n")
+
+    sniff_geometry_file(str(path))
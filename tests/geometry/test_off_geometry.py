@@ -1,5 +1,11 @@
+import numpy as np
 from nexus_constructor.model.component import Component
-from nexus_constructor.model.geometry import OFFGeometryNoNexus, OFFGeometryNexus
+from nexus_constructor.model.geometry import (
+    OFFGeometryNoNexus,
+    OFFGeometryNexus,
+    faces_to_winding_order,
+    winding_order_to_faces,
+)
 from PySide2.QtGui import QVector3D
 
 from pytest import approx
@@ -117,3 +123,60 @@ def test_can_set_off_geometry_properties():
     assert nexus_shape.vertices[2].x() == approx(vertex_2_x)
     assert nexus_shape.vertices[2].y() == approx(vertex_2_y)
     assert nexus_shape.vertices[2].z() == approx(vertex_2_z)
+
+
+def test_GIVEN_faces_WHEN_converting_to_winding_order_and_back_THEN_faces_are_unchanged():
+    faces = [[0, 1, 2, 3], [2, 3, 4], [4, 5, 6, 7, 8]]
+
+    winding_order, face_offsets = faces_to_winding_order(faces)
+
+    assert winding_order.tolist() == [point for face in faces for point in face]
+    assert face_offsets.tolist() == [0, 4, 7]
+    assert winding_order_to_faces(winding_order, face_offsets) == faces
+
+
+def test_GIVEN_no_faces_WHEN_converting_to_winding_order_THEN_arrays_are_empty():
+    winding_order, face_offsets = faces_to_winding_order([])
+
+    assert len(winding_order) == 0
+    assert len(face_offsets) == 0
+    assert winding_order_to_faces(winding_order, face_offsets) == []
+
+
+def test_GIVEN_qvector3d_vertices_WHEN_creating_off_geometry_THEN_vertices_are_stored_as_array():
+    vertices = [QVector3D(0, 0, 1), QVector3D(0, 1, 0), QVector3D(2, 0, 0)]
+
+    geom = OFFGeometryNoNexus(vertices, [[0, 1, 2]])
+
+    assert geom.vertices_array.shape == (3, 3)
+    assert geom.vertices_array.tolist() == [[0, 0, 1], [0, 1, 0], [2, 0, 0]]
+    assert geom.number_of_faces == 1
+    assert geom.face_sizes.tolist() == [3]
+
+
+def test_GIVEN_arrays_WHEN_creating_off_geometry_from_winding_order_THEN_faces_and_vertices_are_correct():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0], [1, 0, 0], [1.5, 0.5, 0]])
+    winding_order = np.array([0, 1, 2, 3, 2, 3, 4])
+    face_offsets = np.array([0, 4])
+
+    geom = OFFGeometryNoNexus.from_winding_order(vertices, winding_order, face_offsets)
+
+    assert geom.faces == [[0, 1, 2, 3], [2, 3, 4]]
+    assert geom.vertices[4] == QVector3D(1.5, 0.5, 0)
+    assert geom.winding_order_indices == [0, 4]
+
+
+def test_GIVEN_off_shape_WHEN_getting_off_geometry_from_nexus_shape_THEN_arrays_match_original():
+    component = Component("test")
+    vertices = np.array([[0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0]])
+    shape = OFFGeometryNoNexus.from_winding_order(
+        vertices, np.array([0, 1, 2]), np.array([0])
+    )
+
+    component.set_off_shape(shape)
+    nexus_shape, _ = component.shape
+    off_geometry = nexus_shape.off_geometry
+
+    assert np.array_equal(off_geometry.vertices_array, vertices)
+    assert off_geometry.winding_order == [0, 1, 2]
+    assert off_geometry.number_of_faces == 1
@@ -1,6 +1,10 @@
 from typing import Any
+
+import numpy as np
+
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.geometry import OFFGeometryNoNexus, face_sizes_to_offsets
 from nexus_constructor.model.value_type import ValueTypes
 
 
@@ -18,3 +22,38 @@ def add_component_to_file(
         dtype=ValueTypes.DOUBLE,
     )
     return component
+
+
+def create_sphere_mesh(steps: int) -> OFFGeometryNoNexus:
+    """
+    Creates a unit sphere made of quads between lines of latitude and longitude, with triangles at the poles.
+    """
+    latitudes = np.linspace(0, np.pi, steps + 1)[1:-1]
+    longitudes = np.linspace(0, 2 * np.pi, 2 * steps + 1)[:-1]
+    theta, phi = np.meshgrid(latitudes, longitudes, indexing="ij")
+    vertices = np.concatenate(
+        [
+            [[0, 0, 1], [0, 0, -1]],
+            np.column_stack(
+                [
+                    (np.sin(theta) * np.cos(phi)).ravel(),
+                    (np.sin(theta) * np.sin(phi)).ravel(),
+                    np.cos(theta).ravel(),
+                ]
+            ),
+        ]
+    )
+    ring = len(longitudes)
+    ids = 2 + np.arange(len(latitudes) * ring).reshape(len(latitudes), ring)
+    next_ids = np.roll(ids, -1, axis=1)
+    quads = np.stack([ids[:-1], ids[1:], next_ids[1:], next_ids[:-1]], axis=-1).reshape(
+        -1, 4
+    )
+    top = np.column_stack([np.zeros(ring, dtype=int), ids[0], next_ids[0]])
+    bottom = np.column_stack([np.ones(ring, dtype=int), next_ids[-1], ids[-1]])
+    triangles = np.concatenate([top, bottom])
+    return OFFGeometryNoNexus.from_winding_order(
+        vertices,
+        np.concatenate([quads.ravel(), triangles.ravel()]),
+        face_sizes_to_offsets(np.array([4] * len(quads) + [3] * len(triangles))),
+    )
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.instrument_view.bounding_volumes import (
+    BoundingVolumeHierarchy,
+    ray_box_distance,
+    transform_bounds,
+)
+
+
+def brute_force_first_hit(boxes, origin, direction):
+    hits = []
+    for name, (lower, upper) in boxes.items():
+        distance = ray_box_distance(origin, 1 / direction, lower, upper)
+        if distance is not None:
+            hits.append((distance, name))
+    return min(hits)[1] if hits else None
+
+
+@pytest.fixture
+def random_boxes():
+    rng = np.random.default_rng(1)
+    lower = rng.uniform(-50, 50, (200, 3))
+    upper = lower + rng.uniform(0.1, 3, (200, 3))
+    return {f"component_{index}": (lower[index], upper[index]) for index in range(200)}
+
+
+@pytest.fixture
+def hierarchy(random_boxes):
+    hierarchy = BoundingVolumeHierarchy()
+    for name, (lower, upper) in random_boxes.items():
+        hierarchy.set_local_bounds(name, lower, upper)
+    return hierarchy
+
+
+def test_GIVEN_rotation_and_translation_WHEN_transforming_bounds_THEN_box_covers_transformed_corners():
+    matrix = np.identity(4)
+    angle = np.deg2rad(30)
+    matrix[:2, :2] = [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+    matrix[:3, 3] = [1, 2, 3]
+    lower, upper = np.array([0.0, 0.0, 0.0]), np.array([2.0, 1.0, 1.0])
+
+    new_lower, new_upper = transform_bounds(lower, upper, matrix)
+
+    corners = np.where(np.arange(8)[:, np.newaxis] >> np.arange(3) & 1, upper, lower)
+    moved = corners @ matrix[:3, :3].T + matrix[:3, 3]
+    assert np.allclose(new_lower, moved.min(axis=0))
+    assert np.allclose(new_upper, moved.max(axis=0))
+
+
+def test_GIVEN_ray_inside_or_missing_box_WHEN_finding_distance_THEN_zero_or_none_is_returned():
+    lower, upper = np.zeros(3), np.ones(3)
+
+    assert (
+        ray_box_distance(np.full(3, 0.5), 1 / np.array([1.0, 0, 0]), lower, upper) == 0
+    )
+    assert (
+        ray_box_distance(
+            np.array([-1.0, 2, 0.5]), 1 / np.array([1.0, 0, 0]), lower, upper
+        )
+        is None
+    )
+    assert ray_box_distance(
+        np.array([-1.0, 0.5, 0.5]), 1 / np.array([2.0, 0, 0]), lower, upper
+    ) == pytest.approx(0.5)
+
+
+def test_GIVEN_many_components_WHEN_casting_rays_THEN_first_hit_matches_brute_force(
+    hierarchy, random_boxes
+):
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        origin = rng.uniform(-80, 80, 3)
+        direction = rng.uniform(-50, 50, 3) - origin
+        hit = hierarchy.first_hit(origin, direction)
+        assert (None if hit is None else hit[0]) == brute_force_first_hit(
+            random_boxes, origin, direction
+        )
+
+
+def test_GIVEN_components_WHEN_getting_bounds_THEN_box_covers_all_components(
+    hierarchy, random_boxes
+):
+    lower, upper = hierarchy.bounds()
+
+    assert np.allclose(lower, np.min([box[0] for box in random_boxes.values()], axis=0))
+    assert np.allclose(upper, np.max([box[1] for box in random_boxes.values()], axis=0))
+
+
+def test_GIVEN_moved_component_WHEN_casting_ray_THEN_component_is_found_at_new_position(
+    hierarchy, random_boxes
+):
+    hierarchy.bounds()
+    matrix = np.identity(4)
+    matrix[:3, 3] = [0, 0, 500] - random_boxes["component_7"][0]
+    hierarchy.set_transform("component_7", matrix)
+
+    hit = hierarchy.first_hit(np.array([0.05, 0.05, 1000]), np.array([0, 0, -1.0]))
+
+    assert hit[0] == "component_7"
+    assert hierarchy.bounds()[1][2] == pytest.approx(
+        500 + random_boxes["component_7"][1][2] - random_boxes["component_7"][0][2]
+    )
+
+
+def test_GIVEN_removed_component_WHEN_querying_THEN_component_is_not_found(
+    hierarchy, random_boxes
+):
+    lower, upper = random_boxes["component_3"]
+    centre = (lower + upper) / 2
+    assert "component_3" in hierarchy.components_at(centre)
+
+    hierarchy.remove("component_3")
+
+    assert "component_3" not in hierarchy
+    assert "component_3" not in hierarchy.components_at(centre)
+
+
+def test_GIVEN_no_components_WHEN_querying_THEN_nothing_is_found():
+    hierarchy = BoundingVolumeHierarchy()
+
+    assert hierarchy.bounds() is None
+    assert hierarchy.first_hit(np.zeros(3), np.array([1.0, 0, 0])) is None
+    assert hierarchy.components_at(np.zeros(3)) == []
@@ -1,6 +1,19 @@
+import numpy as np
+import pytest
 from mock import Mock
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.QtCore import QPoint
+from PySide2.QtGui import QVector3D
 
+from nexus_constructor.instrument_view.instanced_material import InstancedPhongMaterial
 from nexus_constructor.instrument_view.instrument_view import InstrumentView
+from nexus_constructor.instrument_view.level_of_detail import DetailLevel
+from nexus_constructor.instrument_view.off_renderer import OffMesh
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.geometry import OFFCube
+from nexus_constructor.model.value_type import ValueTypes
+from tests.helpers import create_sphere_mesh
 
 
 def test_GIVEN_cube_dimensions_WHEN_calling_set_cube_mesh_dimesions_THEN_dimensions_set():
@@ -40,10 +53,277 @@ def test_GIVEN_3D_view_and_gnomon_sizes_WHEN_calling_calculate_gnomon_rect_THEN_
     assert expected_height_ratio == actual_height_ratio
 
 
-def test_GIVEN_entity_and_camera_WHEN_zooming_to_component_THEN_camera_zooms_to_component():
+@pytest.fixture
+def instrument_view(qtbot):
+    view = InstrumentView(None)
+    yield view
+    view.delete()
 
-    mock_entity = Mock()
-    mock_camera = Mock()
 
-    InstrumentView.zoom_to_component(mock_entity, mock_camera)
-    mock_camera.viewEntity.assert_called_once()
+def _create_magnitude(distance: float) -> Dataset:
+    return Dataset(name="", values=distance, type=ValueTypes.DOUBLE, size="1")
+
+
+def _create_component_with_translation(name: str, distance: float) -> Component:
+    component = Component(name)
+    component.set_cylinder_shape()
+    translation = component.add_translation(
+        QVector3D(0, 0, 1), values=_create_magnitude(distance)
+    )
+    translation.depends_on = None
+    component.depends_on = translation
+    return component
+
+
+def test_GIVEN_unchanged_components_WHEN_updating_components_THEN_meshes_are_not_rebuilt(
+    instrument_view,
+):
+    components = [
+        _create_component_with_translation("first", 1.0),
+        _create_component_with_translation("second", 2.0),
+    ]
+    instrument_view.update_components(components)
+    entities = dict(instrument_view.component_entities)
+
+    instrument_view.update_components(components)
+
+    assert instrument_view.component_entities == entities
+    assert instrument_view.component_revisions == {"first": 1, "second": 1}
+
+
+def test_GIVEN_changed_shape_WHEN_updating_components_THEN_only_that_mesh_is_rebuilt(
+    instrument_view,
+):
+    first = _create_component_with_translation("first", 1.0)
+    second = _create_component_with_translation("second", 2.0)
+    instrument_view.update_components([first, second])
+    first_entity = instrument_view.component_entities["first"]
+    second_transformation = instrument_view.transformations["second"]
+
+    second.set_cylinder_shape(height=5.0)
+    instrument_view.update_components([first, second])
+
+    assert instrument_view.component_entities["first"] is first_entity
+    assert instrument_view.component_revisions == {"first": 1, "second": 2}
+    assert np.allclose(
+        instrument_view.transformations["second"].matrix().data(),
+        second_transformation.matrix().data(),
+    )
+
+
+def test_GIVEN_changed_transformation_WHEN_updating_transformations_THEN_existing_transform_matrix_is_updated(
+    instrument_view,
+):
+    component = _create_component_with_translation("component", 1.0)
+    instrument_view.update_components([component])
+    transformation = instrument_view.transformations["component"]
+
+    component.depends_on.values = _create_magnitude(3.0)
+    component.depends_on.ui_value = 3.0
+    instrument_view.update_transformations([component])
+
+    assert instrument_view.transformations["component"] is transformation
+    assert transformation.translation() == QVector3D(0, 0, 3)
+
+
+def test_GIVEN_removed_component_WHEN_updating_components_THEN_component_is_detached(
+    instrument_view,
+):
+    first = _create_component_with_translation("first", 1.0)
+    second = _create_component_with_translation("second", 2.0)
+    instrument_view.update_components([first, second])
+    second_entity = instrument_view.component_entities["second"]
+
+    instrument_view.update_components([first])
+
+    assert list(instrument_view.component_entities.keys()) == ["first"]
+    assert "second" not in instrument_view.transformations
+    assert second_entity.parent() is None
+
+
+def _create_component_with_large_mesh(name: str) -> Component:
+    component = Component(name)
+    component.set_off_shape(create_sphere_mesh(60))
+    return component
+
+
+def test_GIVEN_large_mesh_WHEN_adding_component_THEN_levels_of_detail_replace_bounding_box(
+    instrument_view, qtbot
+):
+    component = _create_component_with_large_mesh("detector")
+
+    instrument_view.update_components([component])
+    entity = instrument_view.component_entities["detector"]
+    assert len(entity.findChildren(Qt3DCore.QEntity)) == 1
+
+    qtbot.waitUntil(lambda: "detector" in instrument_view._level_switches)
+    level_switch, level_entities = instrument_view._level_switches["detector"]
+    assert level_switch in entity.components()
+    assert [level_entity.parent() for level_entity in level_entities] == [entity] * len(
+        DetailLevel
+    )
+    assert level_switch.isEnabled()
+
+
+def test_GIVEN_detail_level_override_WHEN_levels_are_ready_THEN_only_that_level_is_enabled(
+    instrument_view, qtbot
+):
+    component = _create_component_with_large_mesh("detector")
+    instrument_view.set_detail_level("detector", DetailLevel.DECIMATED)
+
+    instrument_view.update_components([component])
+    qtbot.waitUntil(lambda: "detector" in instrument_view._level_switches)
+
+    level_switch, level_entities = instrument_view._level_switches["detector"]
+    assert not level_switch.isEnabled()
+    assert [level_entity.isEnabled() for level_entity in level_entities] == [
+        False,
+        True,
+        False,
+    ]
+
+    instrument_view.set_detail_level("detector", None)
+    assert level_switch.isEnabled()
+
+
+def test_GIVEN_mesh_replaced_WHEN_old_levels_are_ready_THEN_they_are_ignored(
+    instrument_view, qtbot
+):
+    component = _create_component_with_large_mesh("detector")
+    instrument_view.update_components([component])
+    revision = instrument_view.component_revisions["detector"]
+    qtbot.waitUntil(lambda: "detector" in instrument_view._level_switches)
+
+    component.set_cylinder_shape()
+    instrument_view.update_components([component])
+    instrument_view._add_mesh_levels("detector", revision, None)
+
+    assert "detector" not in instrument_view._level_switches
+    assert not instrument_view.component_entities["detector"].findChildren(
+        Qt3DCore.QEntity
+    )
+
+
+@pytest.mark.parametrize("supported", [True, False])
+def test_GIVEN_positions_WHEN_adding_component_THEN_mesh_is_only_instanced_if_context_supports_it(
+    instrument_view, monkeypatch, supported
+):
+    monkeypatch.setattr(
+        "nexus_constructor.instrument_view.instrument_view.instancing_supported",
+        lambda: supported,
+    )
+    positions = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 2.0], [3.0, 0.0, 0.0]])
+
+    instrument_view.add_component("detector", OFFCube, positions)
+
+    entity = instrument_view.component_entities["detector"]
+    (mesh,) = [
+        component for component in entity.components() if isinstance(component, OffMesh)
+    ]
+    materials = [
+        component
+        for component in entity.components()
+        if isinstance(component, InstancedPhongMaterial)
+    ]
+    assert mesh.instanceCount() == (len(positions) if supported else 1)
+    assert len(materials) == (1 if supported else 0)
+    lower, upper = instrument_view.bounding_volumes.world_bounds("detector")
+    assert np.allclose(lower, OFFCube.vertices_array.min(axis=0))
+    assert np.allclose(upper, OFFCube.vertices_array.max(axis=0) + [3.0, 0.0, 2.0])
+
+
+def test_GIVEN_component_deleted_WHEN_its_levels_are_ready_THEN_they_are_ignored(
+    instrument_view,
+):
+    component = _create_component_with_large_mesh("detector")
+    instrument_view.update_components([component])
+    revision = instrument_view.component_revisions["detector"]
+
+    instrument_view.delete_component("detector")
+    instrument_view._add_mesh_levels("detector", revision, None)
+
+    assert "detector" not in instrument_view.component_entities
+    assert "detector" not in instrument_view._level_switches
+
+
+def test_GIVEN_components_cleared_and_component_added_again_WHEN_old_levels_are_ready_THEN_they_are_ignored(
+    instrument_view,
+):
+    component = _create_component_with_large_mesh("detector")
+    instrument_view.update_components([component])
+    revision = instrument_view.component_revisions["detector"]
+
+    instrument_view.clear_all_components()
+    instrument_view._add_mesh_levels("detector", revision, None)
+    assert "detector" not in instrument_view._level_switches
+
+    instrument_view.update_components([component])
+    instrument_view._add_mesh_levels("detector", revision, None)
+    assert "detector" not in instrument_view._level_switches
+    assert (
+        len(
+            instrument_view.component_entities["detector"].findChildren(
+                Qt3DCore.QEntity
+            )
+        )
+        == 1
+    )
+
+
+def test_GIVEN_moved_component_WHEN_zooming_to_component_THEN_camera_looks_at_its_new_position(
+    instrument_view,
+):
+    component = _create_component_with_translation("component", 1.0)
+    instrument_view.update_components([component])
+    lower, upper = instrument_view.bounding_volumes.world_bounds("component")
+    component.depends_on.values = _create_magnitude(3.0)
+    component.depends_on.ui_value = 3.0
+    instrument_view.update_transformations([component])
+
+    instrument_view.zoom_to_component("component")
+
+    assert np.allclose(
+        instrument_view.view.camera().viewCenter().toTuple(),
+        (lower + upper) / 2 + [0, 0, 2],
+    )
+
+
+def test_GIVEN_components_WHEN_fitting_all_THEN_camera_looks_at_centre_of_all_components(
+    instrument_view,
+):
+    instrument_view.update_components(
+        [
+            _create_component_with_translation("first", -4.0),
+            _create_component_with_translation("second", 6.0),
+        ]
+    )
+
+    first_lower, _ = instrument_view.bounding_volumes.world_bounds("first")
+    _, second_upper = instrument_view.bounding_volumes.world_bounds("second")
+
+    instrument_view.fit_all()
+
+    assert np.allclose(
+        instrument_view.view.camera().viewCenter().toTuple(),
+        (first_lower + second_upper) / 2,
+    )
+
+
+def test_GIVEN_component_in_middle_of_view_WHEN_clicking_middle_THEN_component_is_picked(
+    instrument_view, qtbot
+):
+    instrument_view.update_components(
+        [
+            _create_component_with_translation("near", 0.0),
+            _create_component_with_translation("far", 50.0),
+        ]
+    )
+    instrument_view.view.resize(1600, 900)
+    instrument_view.view.camera().setPosition(QVector3D(0, 0, -20))
+    instrument_view.view.camera().setViewCenter(QVector3D(0, 0, 0))
+
+    with qtbot.waitSignal(instrument_view.component_picked) as blocker:
+        instrument_view.view.clicked.emit(QPoint(800, 450))
+
+    assert blocker.args == ["near"]
+    assert instrument_view.component_at(0, 0) is None
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.instrument_view.level_of_detail import (
+    DetailLevel,
+    bounding_box_geometry,
+    create_mesh_levels,
+    decimate_geometry,
+)
+from nexus_constructor.instrument_view.off_renderer import (
+    calculate_triangle_normals,
+    convert_faces_into_triangles,
+)
+from tests.helpers import create_sphere_mesh
+
+
+@pytest.fixture
+def sphere():
+    return create_sphere_mesh(100)
+
+
+def test_GIVEN_mesh_WHEN_creating_bounding_box_THEN_box_covers_mesh_with_outward_faces(
+    sphere,
+):
+    box = bounding_box_geometry(sphere)
+
+    assert np.allclose(box.vertices_array.min(axis=0), [-1, -1, -1], atol=1e-3)
+    assert np.allclose(box.vertices_array.max(axis=0), [1, 1, 1], atol=1e-3)
+    triangles = convert_faces_into_triangles(box.winding_order_array, box.face_offsets)
+    normals = calculate_triangle_normals(box.vertices_array, triangles)
+    outwards = box.vertices_array[triangles].mean(axis=1)
+    assert np.all(np.einsum("ij,ij->i", normals, outwards) > 0)
+
+
+def test_GIVEN_large_mesh_WHEN_decimating_THEN_about_target_number_of_triangles_are_left_on_surface(
+    sphere,
+):
+    target_faces = 1000
+
+    decimated = decimate_geometry(sphere, target_faces)
+
+    assert target_faces / 4 < decimated.number_of_faces < target_faces * 4
+    assert np.all(decimated.face_sizes == 3)
+    assert np.allclose(np.linalg.norm(decimated.vertices_array, axis=1), 1, atol=0.1)
+
+
+def test_GIVEN_large_mesh_WHEN_decimating_THEN_triangles_keep_facing_outwards(sphere):
+    decimated = decimate_geometry(sphere, 1000)
+
+    triangles = convert_faces_into_triangles(
+        decimated.winding_order_array, decimated.face_offsets
+    )
+    normals = calculate_triangle_normals(decimated.vertices_array, triangles)
+    outwards = decimated.vertices_array[triangles].mean(axis=1)
+    assert np.mean(np.einsum("ij,ij->i", normals, outwards) > 0) > 0.95
+
+
+def test_GIVEN_positions_WHEN_creating_mesh_levels_THEN_bounding_sphere_covers_every_position(
+    sphere,
+):
+    positions = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+
+    levels = create_mesh_levels(sphere, positions)
+
+    assert levels[DetailLevel.FULL] is sphere
+    assert levels[DetailLevel.DECIMATED].number_of_faces < sphere.number_of_faces
+    assert levels[DetailLevel.BOUNDING_BOX].number_of_faces == 6
+    for position in positions:
+        assert np.linalg.norm(position - levels.centre) + 1 <= levels.radius + 1e-6
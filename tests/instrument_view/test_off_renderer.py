@@ -1,11 +1,19 @@
+import numpy as np
+from nexus_constructor.instrument_view.instanced_material import (
+    INSTANCE_OFFSET_ATTRIBUTE_NAME,
+)
 from nexus_constructor.instrument_view.off_renderer import (
     QtOFFGeometry,
+    calculate_vertex_normals,
+    convert_faces_into_triangles,
     create_vertex_buffer,
     create_normal_buffer,
     OffMesh,
+    repeat_geometry,
 )
 from nexus_constructor.model.geometry import OFFCube, OFFGeometryNoNexus
 import itertools
+from PySide2.Qt3DRender import Qt3DRender
 from PySide2.QtGui import QVector3D
 
 TRIANGLES_IN_SQUARE = 2
@@ -118,3 +126,117 @@ def test_GIVEN_geometry_WHEN_creating_off_mesh_THEN_geometry_contains_original_g
     off_mesh = OffMesh(off_output, None)
 
     assert off_mesh.geometry().vertex_count == VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_faces_with_different_numbers_of_vertices_WHEN_converting_faces_into_triangles_THEN_faces_are_fan_triangulated():
+    winding_order = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+    face_offsets = np.array([0, 3, 7])
+
+    triangles = convert_faces_into_triangles(winding_order, face_offsets)
+
+    assert triangles.tolist() == [
+        [0, 1, 2],
+        [3, 4, 5],
+        [3, 5, 6],
+        [7, 8, 9],
+        [7, 9, 10],
+        [7, 10, 11],
+    ]
+
+
+def test_GIVEN_degenerate_triangle_WHEN_creating_normal_buffer_THEN_normal_is_zero():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0]])
+
+    normal = create_normal_buffer(vertices, [[0, 1, 2]])
+
+    assert list(normal) == [0.0] * 9
+
+
+def test_GIVEN_positions_WHEN_creating_off_mesh_THEN_mesh_is_uploaded_once_and_instanced_at_each_position():
+    positions = np.array([[0, 0, 0], [0, 0, 1], [1, 0, 0]])
+
+    off_mesh = OffMesh(OFFCube, None, positions)
+
+    assert off_mesh.instanceCount() == len(positions)
+    assert (
+        off_mesh.geometry().vertex_count
+        == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * VERTICES_IN_CUBE
+    )
+
+
+def test_GIVEN_positions_WHEN_creating_off_geometry_THEN_instance_offset_attribute_has_a_value_per_instance():
+    positions = [QVector3D(0, 0, 0), QVector3D(0, 0, 1)]
+
+    qt_geometry = QtOFFGeometry(OFFCube, positions)
+    (instance_attribute,) = [
+        attribute
+        for attribute in qt_geometry.attributes()
+        if attribute.name() == INSTANCE_OFFSET_ATTRIBUTE_NAME
+    ]
+
+    assert instance_attribute.divisor() == 1
+    assert instance_attribute.count() == len(positions)
+    assert np.frombuffer(
+        instance_attribute.buffer().data().data(), dtype=np.float32
+    ).tolist() == [0, 0, 0, 0, 0, 1]
+
+
+def test_GIVEN_positions_WHEN_repeating_geometry_THEN_there_is_a_copy_of_the_mesh_at_each_position():
+    positions = np.array([[0, 0, 0], [0, 0, 2]])
+
+    geometry = repeat_geometry(OFFCube, positions)
+
+    vertices = OFFCube.vertices_array
+    assert np.allclose(
+        geometry.vertices_array, np.vstack([vertices, vertices + [0, 0, 2]])
+    )
+    assert geometry.number_of_faces == 2 * OFFCube.number_of_faces
+    assert geometry.faces == OFFCube.faces + [
+        [index + len(vertices) for index in face] for face in OFFCube.faces
+    ]
+
+
+def test_GIVEN_no_positions_WHEN_creating_off_mesh_THEN_there_is_one_instance():
+    off_mesh = OffMesh(OFFCube, None)
+
+    assert off_mesh.instanceCount() == 1
+
+
+def test_GIVEN_cube_WHEN_creating_indexed_off_mesh_with_smooth_normals_THEN_each_vertex_is_uploaded_once():
+    off_mesh = OffMesh(OFFCube, None, indexed=True, smooth_normals=True)
+    attributes = {
+        attribute.attributeType(): attribute
+        for attribute in off_mesh.geometry().attributes()
+    }
+
+    assert attributes[Qt3DRender.QAttribute.VertexAttribute].count() == len(
+        OFFCube.vertices_array
+    )
+    assert (
+        attributes[Qt3DRender.QAttribute.IndexAttribute].count()
+        == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * VERTICES_IN_CUBE
+    )
+    assert (
+        off_mesh.geometry().vertex_count
+        == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * VERTICES_IN_CUBE
+    )
+
+
+def test_GIVEN_cube_WHEN_creating_indexed_off_mesh_with_flat_normals_THEN_vertices_are_copied_once_per_face():
+    off_mesh = OffMesh(OFFCube, None, indexed=True)
+    vertex_attribute_counts = [
+        attribute.count()
+        for attribute in off_mesh.geometry().attributes()
+        if attribute.attributeType() == Qt3DRender.QAttribute.VertexAttribute
+    ]
+
+    assert vertex_attribute_counts == [len(OFFCube.winding_order)] * 2
+
+
+def test_GIVEN_a_square_WHEN_calculating_vertex_normals_THEN_all_normals_are_perpendicular_to_square():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0], [1, 0, 0]])
+    triangles = np.array([[0, 1, 2], [0, 2, 3]])
+
+    normals = calculate_vertex_normals(vertices, triangles)
+
+    assert normals.tolist() == [[0.0, 0.0, -1.0]] * 4
@@ -0,0 +1,130 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from PySide2.QtGui import QVector3D
+
+from nexus_constructor.json.json_writer import (
+    array_elements,
+    document_digest,
+    document_to_json,
+    model_to_json,
+    write_json,
+    write_model_json,
+)
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.lazy_values import NpyFileValues
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.value_type import ValueTypes
+
+
+def _as_lists(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _as_lists(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_as_lists(item) for item in value]
+    return value
+
+
+@pytest.fixture
+def model_with_mesh() -> Model:
+    entry = Entry()
+    entry.instrument = Instrument()
+    component = Component("detector")
+    component.nx_class = "NXdetector"
+    component.set_off_shape(
+        OFFGeometryNoNexus(
+            [QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(0.5, 0, 1e-9)],
+            [[0, 1, 2]],
+        ),
+        units="m",
+    )
+    component.set_field_value("detector_number", np.arange(4), ValueTypes.LONG)
+    component.set_field_value(
+        "x_pixel_offset", np.linspace(-1, 1, 4).reshape(2, 2), ValueTypes.DOUBLE
+    )
+    component.set_field_value("distance", 2.5, ValueTypes.DOUBLE)
+    component.add_translation(QVector3D(0, 0, 1), name="translation")
+    entry.instrument.add_component(component)
+    return Model(entry)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([1.5, -2.0, 1e-20, 1e300]),
+        np.arange(24).reshape(2, 3, 4),
+        np.array([[True, False]]),
+        np.array([np.nan, np.inf, -np.inf]),
+        np.ones((2, 3), dtype=np.float32) / 3,
+        np.zeros((2, 0)),
+        np.array(["a", "b"]),
+        np.array(7),
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_GIVEN_array_WHEN_writing_json_THEN_text_matches_json_dumps_of_list(
+    values, indent
+):
+    document = {"children": [{"name": "field", "values": values}], "size": (1, 2)}
+    json_file = io.StringIO()
+
+    write_json(document, json_file, indent, chunk_size=8)
+
+    assert json_file.getvalue() == json.dumps(_as_lists(document), indent=indent)
+
+
+def test_GIVEN_model_WHEN_writing_json_THEN_text_matches_json_dump_of_dictionary(
+    model_with_mesh,
+):
+    json_file = io.StringIO()
+
+    write_model_json(model_with_mesh, json_file, indent=2)
+
+    assert json_file.getvalue() == json.dumps(model_with_mesh.as_dict(), indent=2)
+    assert model_to_json(model_with_mesh) == json.dumps(model_with_mesh.as_dict())
+
+
+def test_GIVEN_model_with_lazy_values_WHEN_writing_json_THEN_values_are_written_from_the_file(
+    model_with_mesh, tmp_path
+):
+    filename = str(tmp_path / "pixel_offsets.npy")
+    offsets = np.linspace(0, 1, 300).reshape(100, 3)
+    np.save(filename, offsets)
+    component = model_with_mesh.entry.instrument.get_component_list()[0]
+    component.set_field_value(
+        "y_pixel_offset", NpyFileValues(filename), ValueTypes.DOUBLE
+    )
+    json_file = io.StringIO()
+
+    write_model_json(model_with_mesh, json_file, indent=2)
+
+    assert json_file.getvalue() == json.dumps(model_with_mesh.as_dict(), indent=2)
+    assert component["y_pixel_offset"].as_dict()["values"] == offsets.tolist()
+
+
+def test_GIVEN_progress_callback_WHEN_writing_json_THEN_progress_counts_up_to_array_elements():
+    document = {"values": np.arange(200000), "offsets": np.ones((3, 2)), "name": "a"}
+    reports = []
+
+    text = document_to_json(document, progress=reports.append)
+
+    assert text == json.dumps(_as_lists(document))
+    assert reports == sorted(reports)
+    assert reports[-1] == array_elements(document) == 200006
+
+
+def test_GIVEN_same_and_changed_documents_WHEN_hashing_THEN_only_changed_document_has_different_digest():
+    document = {"children": [{"values": np.arange(5.0), "units": "m"}]}
+    same = {"children": [{"values": np.arange(5.0), "units": "m"}]}
+    changed = {"children": [{"values": np.arange(5.0) + 1e-9, "units": "m"}]}
+
+    assert document_digest(document) == document_digest(same)
+    assert document_digest(document) != document_digest(changed)
+    assert document_digest({"a": 1}) != document_digest({"a": "1"})
@@ -1,6 +1,12 @@
+import numpy as np
 import pytest
 
-from nexus_constructor.json.load_from_json_utils import _find_nx_class
+from nexus_constructor.json.load_from_json_utils import (
+    _find_nx_class,
+    _first_value_with_unexpected_type,
+    _values_to_array,
+)
+from nexus_constructor.model.value_type import FLOAT_TYPES, INT_TYPES, ValueTypes
 
 
 @pytest.mark.parametrize("class_attribute", [[{"name": "NX_class"}], [{"name": "123"}]])
@@ -19,3 +25,51 @@ def test_GIVEN_nx_class_in_different_formats_WHEN_reading_class_information_THEN
 ):
 
     assert _find_nx_class(class_attribute) == "NXmonitor"
+
+
+@pytest.mark.parametrize(
+    "values,expected_types",
+    [
+        ([[0, 1, 2], [2, 1, 0]], INT_TYPES),
+        ([[0.5, 1.0, 2.0]], FLOAT_TYPES),
+        (np.arange(10, dtype=np.int64), INT_TYPES),
+        (np.arange(10, dtype=np.int64), [ValueTypes.USHORT]),
+        (np.ones(3, dtype=np.float32), FLOAT_TYPES),
+    ],
+)
+def test_GIVEN_values_with_expected_type_WHEN_checking_types_THEN_no_index_is_returned(
+    values, expected_types
+):
+    assert (
+        _first_value_with_unexpected_type(
+            _values_to_array(values), expected_types, values
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    "values,expected_types,index",
+    [
+        ([0, 1, "astring", 3], INT_TYPES, (2,)),
+        ([[0, 1], [2, 3.5]], INT_TYPES, (1, 1)),
+        ([[0, 1], [2, 3]], FLOAT_TYPES, (0, 0)),
+        ([0, None], INT_TYPES, (1,)),
+        (np.array([0.0, 1.0, 2.5]), INT_TYPES, (2,)),
+        (np.array([0, 1, -1]), [ValueTypes.UINT], (2,)),
+        (np.array([[0, 1], [2 ** 40, 1]]), [ValueTypes.INT], (1, 0)),
+    ],
+)
+def test_GIVEN_values_with_unexpected_type_WHEN_checking_types_THEN_index_of_first_one_is_returned(
+    values, expected_types, index
+):
+    assert (
+        _first_value_with_unexpected_type(
+            _values_to_array(values), expected_types, values
+        )
+        == index
+    )
+
+
+def test_GIVEN_ragged_list_WHEN_converting_values_to_array_THEN_none_is_returned():
+    assert _values_to_array([[0, 1], [2]]) is None
@@ -1,3 +1,5 @@
+import io
+import json
 from typing import List
 
 import numpy as np
@@ -23,8 +25,11 @@ from nexus_constructor.json.shape_reader import (
     Z_PIXEL_OFFSET,
     DETECTOR_NUMBER,
 )
+from nexus_constructor.json.streaming_json import load_json_stream
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import OFFGeometryNexus, CylindricalGeometry
+from nexus_constructor.model import lazy_values
+from nexus_constructor.model.lazy_values import FileSliceValues
 from nexus_constructor.model.value_type import ValueTypes
 from tests.json.shape_json import (
     off_shape_json,
@@ -84,6 +89,12 @@ def cylindrical_shape_reader(mock_component, cylindrical_shape_json):
     return ShapeReader(mock_component, cylindrical_shape_json)
 
 
+def _find_dataset(shape_json: dict, dataset_name: str) -> dict:
+    for dataset in shape_json[CommonKeys.CHILDREN]:
+        if dataset[CommonKeys.NAME] == dataset_name:
+            return dataset
+
+
 def _any_warning_message_has_substrings(
     sub_strings: List[str], warning_messages: str
 ) -> bool:
@@ -627,6 +638,28 @@ def test_GIVEN_pixel_shape_and_no_detector_number_WHEN_reading_pixel_data_THEN_e
     )
 
 
+def test_GIVEN_ragged_pixel_offset_list_WHEN_reading_pixel_data_THEN_shape_warning_is_created_and_offset_is_not_set(
+    off_shape_reader, pixel_grid_list, mock_component, mock_off_shape
+):
+    off_shape_reader.shape = mock_off_shape
+    off_shape_reader.shape_info[CommonKeys.NAME] = PIXEL_SHAPE_GROUP_NAME
+    x_offset_dataset = off_shape_reader._get_shape_dataset_from_list(
+        X_PIXEL_OFFSET, pixel_grid_list
+    )
+    x_offset_dataset[CommonKeys.VALUES] = [[0.1, 0.2], [0.3]]
+
+    off_shape_reader.add_pixel_data_to_component(pixel_grid_list)
+
+    assert _any_warning_message_has_substrings(
+        [off_shape_reader.error_message, "Incorrect array shape", X_PIXEL_OFFSET],
+        off_shape_reader.warnings,
+    )
+    assert X_PIXEL_OFFSET not in [
+        field_call.args[0]
+        for field_call in mock_component.set_field_value.call_args_list
+    ]
+
+
 @pytest.mark.parametrize("offset_to_delete", [X_PIXEL_OFFSET, Y_PIXEL_OFFSET])
 def test_GIVEN_pixel_shape_and_no_x_y_offset_WHEN_reading_pixel_data_THEN_error_message_is_created(
     off_shape_reader, pixel_grid_list, offset_to_delete, mock_off_shape
@@ -680,6 +713,29 @@ def test_GIVEN_x_y_offset_exists_but_fails_validation_WHEN_reading_pixel_data_TH
     )
 
 
+def test_GIVEN_large_detector_number_array_WHEN_reading_pixel_data_THEN_it_is_kept_in_a_file(
+    off_shape_reader, pixel_grid_list, mock_off_shape, monkeypatch
+):
+    monkeypatch.setattr(lazy_values, "SPILL_MIN_BYTES", 0)
+    detector_number_dataset = off_shape_reader._get_shape_dataset_from_list(
+        DETECTOR_NUMBER, pixel_grid_list
+    )
+    detector_number = np.array(detector_number_dataset[CommonKeys.VALUES])
+    detector_number_dataset[CommonKeys.VALUES] = detector_number
+    component = Component(COMPONENT_NAME)
+    off_shape_reader.component = component
+    off_shape_reader.shape = mock_off_shape
+    off_shape_reader.shape_info[CommonKeys.NAME] = PIXEL_SHAPE_GROUP_NAME
+
+    off_shape_reader.add_pixel_data_to_component(pixel_grid_list)
+
+    source = component[DETECTOR_NUMBER].values_source
+    assert isinstance(source, FileSliceValues)
+    assert not source.is_open
+    assert np.array_equal(component.get_field_value(DETECTOR_NUMBER), detector_number)
+    source.release()
+
+
 def test_GIVEN_valid_pixel_grid_WHEN_reading_pixel_data_THEN_set_field_value_is_called_with_expected_values(
     off_shape_reader, pixel_grid_list, mock_component, mock_off_shape
 ):
@@ -737,4 +793,41 @@ def test_GIVEN_valid_pixel_mapping_and_cylindrical_shape_WHEN_reading_pixel_data
     mock_component.set_field_value.assert_called_once_with(
         DETECTOR_NUMBER, detector_number, detector_number_dtype
     )
-    assert mock_cylindrical_shape.detector_number == detector_number
+    component_values = mock_component.set_field_value.call_args.args[1]
+    mock_cylindrical_shape.set_field_value.assert_called_once_with(
+        DETECTOR_NUMBER, component_values, ValueTypes.INT
+    )
+
+
+def test_GIVEN_off_shape_json_loaded_as_stream_WHEN_reading_shape_THEN_geometry_matches_json_loads(
+    off_shape_json, mock_component
+):
+    streamed_shape_json = load_json_stream(io.StringIO(json.dumps(off_shape_json)))
+    vertices_dataset = _find_dataset(streamed_shape_json, CommonAttrs.VERTICES)
+    assert isinstance(vertices_dataset[CommonKeys.VALUES], np.ndarray)
+
+    shape_reader = ShapeReader(mock_component, streamed_shape_json)
+    shape_reader.add_shape_to_component()
+    shape = mock_component[SHAPE_GROUP_NAME]
+
+    ShapeReader(mock_component, off_shape_json).add_shape_to_component()
+    expected_shape = mock_component[SHAPE_GROUP_NAME]
+
+    assert not shape_reader.warnings
+    assert np.array_equal(shape.vertices_array, expected_shape.vertices_array)
+    assert shape.faces == expected_shape.faces
+
+
+def test_GIVEN_streamed_values_with_wrong_dtype_WHEN_reading_shape_THEN_error_message_is_created(
+    off_shape_json, mock_component
+):
+    _find_dataset(off_shape_json, "faces")[CommonKeys.VALUES][0] = 0.5
+    streamed_shape_json = load_json_stream(io.StringIO(json.dumps(off_shape_json)))
+
+    shape_reader = ShapeReader(mock_component, streamed_shape_json)
+    shape_reader.add_shape_to_component()
+
+    assert _any_warning_message_has_substrings(
+        [shape_reader.error_message, "Values in faces list do not all have type(s)"],
+        shape_reader.warnings,
+    )
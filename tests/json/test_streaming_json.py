@@ -0,0 +1,95 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from nexus_constructor.json.streaming_json import (
+    ARRAY,
+    JSONEventParser,
+    MAP_KEY,
+    START_MAP,
+    load_json_stream,
+)
+
+
+def _load(json_string: str, chunk_size: int = 4):
+    return load_json_stream(io.StringIO(json_string), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_GIVEN_json_without_numeric_values_WHEN_loading_stream_THEN_result_matches_json_loads(
+    chunk_size,
+):
+    json_string = """
+    {
+      "name": "entry \\u00e9\\n",
+      "children": [{"name": "instrument", "children": [1, -2.5e-3, true, false, null]}],
+      "values": "NXentry",
+      "attributes": {"size": [1, 2, 3], "values": ["a", 1]}
+    }
+    """
+    assert _load(json_string, chunk_size) == json.loads(json_string)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_GIVEN_numeric_values_WHEN_loading_stream_THEN_values_are_typed_arrays(
+    chunk_size,
+):
+    json_string = '{"children": [{"values": [[1.5, 2], [3, 4e3]]}, {"values": [1, 2, 3]}], "size": [2, 2]}'
+
+    loaded = _load(json_string, chunk_size)
+
+    vertices = loaded["children"][0]["values"]
+    assert vertices.dtype == np.float64
+    assert vertices.shape == (2, 2)
+    assert np.array_equal(vertices, [[1.5, 2.0], [3.0, 4000.0]])
+    faces = loaded["children"][1]["values"]
+    assert faces.dtype == np.int64
+    assert np.array_equal(faces, [1, 2, 3])
+    assert loaded["size"] == [2, 2]
+
+
+@pytest.mark.parametrize(
+    "values", ["[[1, 2], [3]]", "[1, [2, 3]]", "[]", "[[], []]", '[1, "a"]']
+)
+def test_GIVEN_values_that_are_not_a_regular_numeric_array_WHEN_loading_stream_THEN_values_are_a_list(
+    values,
+):
+    json_string = f'{{"values": {values}}}'
+
+    assert _load(json_string) == json.loads(json_string)
+
+
+@pytest.mark.parametrize("chunk_size", [2, 7, 64])
+def test_GIVEN_values_longer_than_a_chunk_WHEN_loading_stream_THEN_array_is_read_in_pieces(
+    chunk_size,
+):
+    vertices = np.arange(300).reshape(100, 3) / 4
+    ragged = [[1, 2, 3]] * 20 + [[1, 2]]
+    json_string = json.dumps(
+        {"values": vertices.tolist(), "ragged": {"values": ragged}}
+    )
+
+    loaded = _load(json_string, chunk_size)
+
+    assert np.array_equal(loaded["values"], vertices)
+    assert loaded["ragged"]["values"] == ragged
+
+
+@pytest.mark.parametrize(
+    "json_string",
+    ['{"a": 1,}', "[1 2]", '{"values": [1, 2', '{"a" 1}', '{"a": 1} x', "", "[1,]"],
+)
+def test_GIVEN_invalid_json_WHEN_loading_stream_THEN_value_error_is_raised(
+    json_string,
+):
+    with pytest.raises(ValueError):
+        _load(json_string)
+
+
+def test_GIVEN_numeric_values_WHEN_parsing_events_THEN_array_is_a_single_event():
+    events = list(JSONEventParser(io.StringIO('{"values": [1, 2, 3]}')).events())
+
+    assert [event for event, _ in events[:3]] == [START_MAP, MAP_KEY, ARRAY]
+    assert len(events) == 4
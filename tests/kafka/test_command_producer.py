@@ -0,0 +1,156 @@
+import threading
+
+import confluent_kafka
+import pytest
+
+from nexus_constructor.kafka.command_producer import (
+    CommandDeliveryError,
+    CommandProducer,
+    DeliveryReport,
+)
+
+TOPIC = "commands"
+
+
+class MockMessage:
+    def __init__(self, topic, offset):
+        self._topic = topic
+        self._offset = offset
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return 0
+
+    def offset(self):
+        return self._offset
+
+
+class MockProducer:
+    """
+    Acknowledges each message on the poll after it is produced, like a broker with a single partition.
+    """
+
+    def __init__(self, connected=True, error=None, hold=False):
+        self.connected = connected
+        # Connecting waits until this is set
+        self.reachable = threading.Event()
+        self.reachable.set()
+        self.error = error
+        self.messages = []
+        self._callbacks = []
+        # While set, messages are not acknowledged until it is cleared
+        self.hold = threading.Event()
+        if hold:
+            self.hold.set()
+
+    def list_topics(self):
+        self.reachable.wait()
+        if not self.connected:
+            raise confluent_kafka.KafkaException("Unable to connect")
+
+    def produce(self, topic, value, on_delivery=None):
+        self.messages.append((topic, value))
+        self._callbacks.append(
+            (on_delivery, MockMessage(topic, len(self.messages) - 1))
+        )
+
+    def poll(self, timeout=None):
+        if self.hold.is_set():
+            return 0
+        callbacks, self._callbacks = self._callbacks, []
+        for on_delivery, message in callbacks:
+            on_delivery(self.error, message)
+        return len(callbacks)
+
+    def flush(self, timeout=None):
+        return len(self._callbacks) if self.hold.is_set() else self.poll()
+
+
+@pytest.fixture
+def mock_producer():
+    return MockProducer()
+
+
+@pytest.fixture
+def command_producer(mock_producer):
+    producer = CommandProducer("localhost:9092", TOPIC, producer=mock_producer)
+    yield producer
+    producer.close()
+
+
+def test_GIVEN_command_WHEN_sending_THEN_future_resolves_to_delivery_report(
+    command_producer, mock_producer
+):
+    delivery = command_producer.send_command(b"start")
+
+    assert delivery.result(timeout=5) == DeliveryReport(TOPIC, 0, 0)
+    assert mock_producer.messages == [(TOPIC, b"start")]
+    assert command_producer.connected
+
+
+def test_GIVEN_several_commands_WHEN_sending_THEN_they_are_produced_in_order(
+    command_producer, mock_producer
+):
+    deliveries = [command_producer.send_command(bytes([i])) for i in range(5)]
+
+    assert [delivery.result(timeout=5).offset for delivery in deliveries] == list(
+        range(5)
+    )
+    assert [value for _, value in mock_producer.messages] == [
+        bytes([i]) for i in range(5)
+    ]
+
+
+def test_GIVEN_delivery_error_WHEN_sending_THEN_future_raises_delivery_error():
+    producer = CommandProducer(
+        "localhost:9092", TOPIC, producer=MockProducer(error="Broker down")
+    )
+    try:
+        delivery = producer.send_command(b"start")
+        with pytest.raises(CommandDeliveryError, match="Broker down"):
+            delivery.result(timeout=5)
+    finally:
+        producer.close()
+
+
+def test_GIVEN_no_connection_WHEN_sending_THEN_future_raises_delivery_error():
+    producer = CommandProducer(
+        "localhost:9092", TOPIC, producer=MockProducer(connected=False)
+    )
+    producer.close()
+
+    assert not producer.connected
+    with pytest.raises(CommandDeliveryError):
+        producer.send_command(b"start").result(timeout=5)
+
+
+def test_GIVEN_full_queue_WHEN_sending_THEN_command_is_refused_without_blocking():
+    mock_producer = MockProducer()
+    mock_producer.reachable.clear()
+    producer = CommandProducer(
+        "localhost:9092", TOPIC, max_queued_commands=1, producer=mock_producer
+    )
+    first = producer.send_command(b"first")
+
+    with pytest.raises(CommandDeliveryError, match="Too many commands"):
+        producer.send_command(b"second").result(timeout=0)
+
+    mock_producer.reachable.set()
+    assert first.result(timeout=5).offset == 0
+    producer.close()
+
+
+def test_GIVEN_unacknowledged_command_WHEN_closing_THEN_future_raises_delivery_error():
+    producer = CommandProducer(
+        "localhost:9092", TOPIC, producer=MockProducer(hold=True)
+    )
+    delivery = producer.send_command(b"start")
+    while not delivery.running():
+        pass
+
+    producer.close()
+
+    with pytest.raises(CommandDeliveryError, match="closed"):
+        delivery.result(timeout=5)
@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+
+import pytest
+
+from nexus_constructor.kafka.status_consumer import StatusConsumer
+
+TOPIC = "status"
+
+
+class MockMessage:
+    def __init__(self, value, timestamp):
+        self._value = value
+        self._timestamp = timestamp
+
+    def error(self):
+        return None
+
+    def value(self):
+        return self._value
+
+    def timestamp(self):
+        return 1, self._timestamp
+
+
+class MockMetadata:
+    topics = {TOPIC: None}
+
+
+class MockConsumer:
+    """
+    Hands out the batches of messages it is given, one batch for each call to consume.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def add_batch(self, messages):
+        with self._lock:
+            self.batches.append(messages)
+
+    def list_topics(self):
+        return MockMetadata()
+
+    def subscribe(self, topics):
+        assert topics == [TOPIC]
+
+    def consume(self, num_messages=1, timeout=-1):
+        with self._lock:
+            if self.batches:
+                batch = self.batches.pop(0)[:num_messages]
+                self.batch_sizes.append(len(batch))
+                return batch
+        time.sleep(0.01)
+        return []
+
+    def close(self):
+        pass
+
+
+def status_message(service_id, file_name=None, timestamp=None):
+    if timestamp is None:
+        timestamp = int(time.time() * 1000)
+    return MockMessage(
+        json.dumps({"service_id": service_id, "file_being_written": file_name}),
+        timestamp,
+    )
+
+
+def wait_for_version(consumer, version):
+    start = time.monotonic()
+    while consumer.snapshot.version < version:
+        assert time.monotonic() - start < 5
+        time.sleep(0.01)
+    return consumer.snapshot
+
+
+@pytest.fixture
+def mock_consumer():
+    return MockConsumer()
+
+
+@pytest.fixture
+def status_consumer(mock_consumer):
+    consumer = StatusConsumer("localhost:9092", TOPIC, consumer=mock_consumer)
+    yield consumer
+    consumer.close()
+
+
+def test_GIVEN_batch_of_messages_WHEN_consuming_THEN_one_snapshot_is_published(
+    status_consumer, mock_consumer
+):
+    mock_consumer.add_batch(
+        [
+            status_message("writer_1", "file_1.nxs"),
+            status_message("writer_2"),
+            status_message("writer_1", "file_1.nxs"),
+        ]
+    )
+
+    snapshot = wait_for_version(status_consumer, 1)
+
+    assert snapshot.version == 1
+    assert sorted(snapshot.file_writers) == ["writer_1", "writer_2"]
+    assert list(snapshot.files) == ["file_1.nxs"]
+    assert mock_consumer.batch_sizes == [3]
+
+
+def test_GIVEN_published_snapshot_WHEN_more_messages_arrive_THEN_earlier_snapshot_is_unchanged(
+    status_consumer, mock_consumer
+):
+    mock_consumer.add_batch(
+        [status_message("writer_1", timestamp=int(time.time() * 1000))]
+    )
+    first = wait_for_version(status_consumer, 1)
+    first_seen = first.file_writers["writer_1"]["last_seen"]
+
+    mock_consumer.add_batch(
+        [
+            status_message("writer_1", timestamp=first_seen + 1),
+            status_message("writer_2"),
+        ]
+    )
+    second = wait_for_version(status_consumer, 2)
+
+    assert list(first.file_writers) == ["writer_1"]
+    assert first.file_writers["writer_1"]["last_seen"] == first_seen
+    assert second.file_writers["writer_1"]["last_seen"] == first_seen + 1
+    with pytest.raises(TypeError):
+        second.file_writers["writer_3"] = {"last_seen": 0}
+
+
+def test_GIVEN_stale_writer_WHEN_consuming_THEN_writer_expires():
+    mock_consumer = MockConsumer()
+    consumer = StatusConsumer("localhost:9092", TOPIC, ttl=60, consumer=mock_consumer)
+    try:
+        now = int(time.time() * 1000)
+        mock_consumer.add_batch(
+            [
+                status_message("old_writer", "old.nxs", timestamp=now - 120000),
+                status_message("new_writer", timestamp=now),
+            ]
+        )
+
+        snapshot = wait_for_version(consumer, 1)
+
+        assert list(snapshot.file_writers) == ["new_writer"]
+        assert not snapshot.files
+    finally:
+        consumer.close()
+
+
+def test_GIVEN_no_messages_WHEN_consuming_THEN_no_snapshot_is_published(
+    status_consumer,
+):
+    time.sleep(0.1)
+
+    assert status_consumer.snapshot.version == 0
+    assert status_consumer.connected
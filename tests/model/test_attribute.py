@@ -1,6 +1,6 @@
 import pytest
 
-from nexus_constructor.model.attributes import FieldAttribute
+from nexus_constructor.model.attributes import Attributes, FieldAttribute
 import numpy as np
 
 NAME = "field1"
@@ -55,3 +55,13 @@ def test_attributes_with_different_names_but_same_value_are_unequal():
     a = FieldAttribute(name=NAME, values=1)
     b = FieldAttribute(name="field2", values=1)
     assert a != b
+
+
+def test_renamed_attribute_can_be_found_by_its_new_name():
+    attributes = Attributes()
+    attributes.set_attribute_value("old_name", 1)
+
+    attributes[0].name = "new_name"
+
+    assert not attributes.contains_attribute("old_name")
+    assert attributes.get_attribute_value("new_name") == 1
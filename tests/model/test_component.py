@@ -1,6 +1,7 @@
 import pytest
 from PySide2.QtGui import QVector3D
 
+from nexus_constructor.geometry.pixel_data import PixelGrid
 from nexus_constructor.model.component import Component, TRANSFORMS_GROUP_NAME
 import numpy as np
 
@@ -116,3 +117,23 @@ def test_component_as_dict_contains_links():
     assert dictionary_output["children"][0]["type"] == "link"
     assert dictionary_output["children"][0]["name"] == name
     assert dictionary_output["children"][0]["target"] == target
+
+
+def test_GIVEN_2d_pixel_offsets_WHEN_getting_shape_THEN_positions_are_array_of_flattened_offsets():
+    comp = Component("detector")
+    comp.set_cylinder_shape(pixel_data=PixelGrid())
+    comp.set_field_value(
+        "x_pixel_offset", np.array([[0.0, 1.0], [0.0, 1.0]]), ValueTypes.FLOAT
+    )
+    comp.set_field_value(
+        "y_pixel_offset", np.array([[0.0, 0.0], [2.0, 2.0]]), ValueTypes.FLOAT
+    )
+
+    _, positions = comp.shape
+
+    assert positions.tolist() == [
+        [0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0],
+        [0.0, 2.0, 0.0],
+        [1.0, 2.0, 0.0],
+    ]
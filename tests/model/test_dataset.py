@@ -1,4 +1,7 @@
+import numpy as np
+
 from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.helpers import arrays_kept_in_dicts
 from nexus_constructor.model.value_type import ValueTypes
 
 
@@ -12,3 +15,14 @@ def test_dataset_as_dict_contains_expected_keys():
         assert expected_key in dictionary_output.keys()
 
     assert dictionary_output["name"] == input_name
+
+
+def test_GIVEN_array_values_WHEN_getting_dataset_as_dict_THEN_values_are_a_list_unless_arrays_are_kept():
+    values = np.arange(6).reshape(2, 3)
+    test_dataset = Dataset(
+        name="test_dataset", size=values.shape, type=ValueTypes.LONG, values=values
+    )
+
+    assert test_dataset.as_dict()["values"] == values.tolist()
+    with arrays_kept_in_dicts():
+        assert test_dataset.as_dict()["values"] is values
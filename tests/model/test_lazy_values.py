@@ -0,0 +1,160 @@
+import gc
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.lazy_values import (
+    FileSliceValues,
+    HDF5DatasetValues,
+    NpyFileValues,
+    OpenValues,
+    open_values,
+    spill_to_file,
+)
+from nexus_constructor.model.value_type import ValueTypes
+
+VALUES = np.arange(12, dtype=np.int64).reshape(4, 3)
+
+
+@pytest.fixture
+def npy_file(tmp_path):
+    filename = str(tmp_path / "values.npy")
+    np.save(filename, VALUES)
+    return filename
+
+
+@pytest.fixture
+def lazy_dataset(npy_file):
+    source = NpyFileValues(npy_file)
+    yield Dataset(
+        name="detector_number", size=VALUES.shape, type=ValueTypes.LONG, values=source
+    )
+    source.release()
+
+
+def test_GIVEN_lazy_values_WHEN_creating_dataset_THEN_file_is_not_opened(lazy_dataset,):
+    assert not lazy_dataset.values_source.is_open
+
+
+def test_GIVEN_lazy_values_WHEN_getting_values_THEN_values_are_read_from_file(
+    lazy_dataset,
+):
+    assert np.array_equal(lazy_dataset.values, VALUES)
+    assert lazy_dataset.values_source.is_open
+    assert lazy_dataset.as_dict()["values"] == VALUES.tolist()
+
+
+def test_GIVEN_values_replaced_WHEN_setting_values_THEN_old_source_is_released(
+    lazy_dataset,
+):
+    source = lazy_dataset.values_source
+    lazy_dataset.values
+
+    lazy_dataset.values = np.zeros(3)
+
+    assert not source.is_open
+    assert source not in open_values
+    assert lazy_dataset.values_source is None
+
+
+def test_GIVEN_dataset_removed_from_group_WHEN_deleting_THEN_source_is_released(
+    lazy_dataset,
+):
+    group = Group("detector")
+    group["detector_number"] = lazy_dataset
+    lazy_dataset.values
+
+    del group["detector_number"]
+
+    assert not lazy_dataset.values_source.is_open
+
+
+def test_GIVEN_file_slice_WHEN_reading_values_THEN_only_the_slice_is_read(tmp_path):
+    filename = str(tmp_path / "values.bin")
+    with open(filename, "wb") as file:
+        file.write(b"header")
+        file.write(VALUES.astype("<f4").tobytes())
+    source = FileSliceValues(filename, "<f4", VALUES.shape, offset=len(b"header"))
+
+    assert source.shape == VALUES.shape
+    assert not source.is_open
+    assert np.array_equal(source.read(), VALUES)
+    source.release()
+
+
+def test_GIVEN_hdf5_dataset_WHEN_reading_values_THEN_file_is_closed_on_release(
+    tmp_path,
+):
+    filename = str(tmp_path / "values.h5")
+    with h5py.File(filename, "w") as file:
+        file["entry/detector_number"] = VALUES
+    source = HDF5DatasetValues(filename, "entry/detector_number")
+
+    assert np.array_equal(source.read(), VALUES)
+    assert source.array_like()[1:3].tolist() == VALUES[1:3].tolist()
+    source.release()
+
+    with h5py.File(filename, "w"):
+        # Would fail if the file were still open for reading
+        pass
+
+
+def test_GIVEN_sources_over_budget_WHEN_reading_values_THEN_least_recently_used_source_is_released(
+    npy_file, monkeypatch
+):
+    budget = OpenValues(max_bytes=2 * VALUES.nbytes)
+    monkeypatch.setattr("nexus_constructor.model.lazy_values.open_values", budget)
+    sources = [NpyFileValues(npy_file) for _ in range(3)]
+
+    sources[0].read()
+    sources[1].read()
+    sources[0].read()
+    sources[2].read()
+
+    assert [source.is_open for source in sources] == [True, False, True]
+    assert budget.size <= budget.max_bytes
+    assert np.array_equal(sources[1].read(), VALUES)
+    assert not sources[0].is_open
+
+
+def test_GIVEN_large_array_WHEN_spilling_to_file_THEN_values_are_read_back_from_a_temporary_file():
+    source = spill_to_file(VALUES, min_bytes=VALUES.nbytes)
+
+    assert isinstance(source, FileSliceValues)
+    assert not source.is_open
+    assert source.shape == VALUES.shape
+    assert np.array_equal(source.read(), VALUES)
+
+    filename = source.filename
+    source.release()
+    del source
+    assert not os.path.exists(filename)
+
+
+def test_GIVEN_small_array_or_list_WHEN_spilling_to_file_THEN_values_are_kept_in_memory():
+    assert spill_to_file(VALUES, min_bytes=VALUES.nbytes + 1) is VALUES
+    values = VALUES.tolist()
+    assert spill_to_file(values, min_bytes=0) is values
+
+
+def test_GIVEN_spilled_values_in_dataset_WHEN_dataset_is_dropped_without_release_THEN_temporary_file_is_deleted():
+    source = spill_to_file(VALUES, min_bytes=0)
+    dataset = Dataset(
+        name="spilled", size=VALUES.shape, type=ValueTypes.LONG, values=source
+    )
+    filename = source.filename
+    assert np.array_equal(dataset.values, VALUES)
+    assert source in open_values
+
+    del dataset, source
+    gc.collect()
+
+    assert not os.path.exists(filename)
+    assert all(
+        getattr(source, "filename", None) != filename
+        for source in open_values._live_sources()
+    )
@@ -1,6 +1,12 @@
 from nexus_constructor.model.component import Component
+from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.group import Group
-from nexus_constructor.model.helpers import _get_item, _remove_item, _set_item
+from nexus_constructor.model.helpers import (
+    NamedList,
+    _get_item,
+    _remove_item,
+    _set_item,
+)
 
 
 def test_get_item_returns_correct_component_when_given_component_is_in_list():
@@ -89,3 +95,107 @@ def test_get_absolute_path_works_if_component_with_parents():
     name2 = "thing2"
     node2 = Group(name=name2, parent_node=node1)
     assert node2.absolute_path == f"/{name1}/{name2}"
+
+
+def test_named_list_get_item_returns_first_item_with_name():
+    first = Dataset(name="field", values=1, type="int32")
+    second = Dataset(name="field", values=2, type="int32")
+    named_list = NamedList([first, second])
+
+    assert _get_item(named_list, "field") is first
+
+    _remove_item(named_list, "field")
+    assert _get_item(named_list, "field") is second
+
+
+def test_named_list_set_item_overwrites_item_with_same_name():
+    named_list = NamedList(
+        [
+            Dataset(name="a", values=1, type="int32"),
+            Dataset(name="b", values=2, type="int32"),
+        ]
+    )
+    replacement = Dataset(name="b", values=3, type="int32")
+
+    _set_item(None, named_list, "b", replacement)
+
+    assert len(named_list) == 2
+    assert named_list[1] is replacement
+    assert _get_item(named_list, "b") is replacement
+
+
+def test_named_list_finds_item_by_new_name_after_rename():
+    dataset = Dataset(name="old_name", values=1, type="int32")
+    named_list = NamedList([dataset])
+    assert _get_item(named_list, "old_name") is dataset
+
+    dataset.name = "new_name"
+
+    assert _get_item(named_list, "old_name") is None
+    assert _get_item(named_list, "new_name") is dataset
+
+
+def test_named_list_of_parent_is_updated_when_child_is_renamed_without_invalidating_other_lists():
+    group = Group("group")
+    dataset = Dataset(name="old_name", values=1, type="int32", parent_node=group)
+    group.children.append(dataset)
+    assert group["old_name"] is dataset
+    rename_generation = NamedList.rename_generation
+
+    dataset.name = "new_name"
+
+    assert NamedList.rename_generation == rename_generation
+    assert group["old_name"] is None
+    assert group["new_name"] is dataset
+
+
+class ScanCountingList(NamedList):
+    scans = 0
+
+    def __iter__(self):
+        self.scans += 1
+        return super().__iter__()
+
+
+def test_named_list_set_item_replaces_item_without_scanning_list():
+    named_list = ScanCountingList(
+        [Dataset(name=str(i), values=i, type="int32") for i in range(5)]
+    )
+    assert _get_item(named_list, "0") is named_list[0]
+    named_list.scans = 0
+    replacement = Dataset(name="3", values=-1, type="int32")
+
+    _set_item(None, named_list, "3", replacement)
+
+    assert named_list.scans == 0
+    assert named_list[3] is replacement
+    assert _get_item(named_list, "3") is replacement
+
+
+def test_named_list_lookup_is_consistent_after_list_mutations():
+    items = [Dataset(name=str(i), values=i, type="int32") for i in range(5)]
+    named_list = NamedList(items)
+
+    named_list.insert(0, Dataset(name="3", values=-1, type="int32"))
+    assert _get_item(named_list, "3").values == -1
+
+    del named_list[0]
+    named_list.pop(1)
+    named_list.remove(items[2])
+    assert _get_item(named_list, "3") is items[3]
+    assert _get_item(named_list, "1") is None
+    assert _get_item(named_list, "2") is None
+
+    named_list.clear()
+    assert _get_item(named_list, "0") is None
+
+
+def test_group_children_stay_indexed_when_assigned_a_plain_list():
+    group = Group("group")
+    dataset = Dataset(name="field", values=1, type="int32")
+
+    group.children = [dataset]
+
+    assert isinstance(group.children, NamedList)
+    assert group["field"] is dataset
+    assert "field" in group
@@ -1,5 +1,5 @@
 import numpy as np
-from PySide2.QtGui import QVector3D
+from PySide2.QtGui import QMatrix4x4, QVector3D
 
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
@@ -381,3 +381,143 @@ def test_GIVEN_transformation_with_scalar_value_that_is_not_castable_to_int_WHEN
 
     assert transform.ui_value != str_value
     assert transform.ui_value == 0
+
+
+def _chain_matrix(transforms):
+    matrix = QMatrix4x4()
+    for transform in transforms:
+        matrix *= transform.qmatrix
+    return np.array(matrix.data())
+
+
+def test_component_qtransform_is_product_of_transformations_in_chain():
+    component = create_component("component")
+    rotation = component.add_rotation(QVector3D(0.0, 1.0, 0.0), 30.0)
+    translation = component.add_translation(
+        QVector3D(1.0, 0.0, 0.0), depends_on=rotation
+    )
+    translation.ui_value = 5.0
+    component.depends_on = translation
+
+    assert np.allclose(
+        np.array(component.qtransform.matrix().data()),
+        _chain_matrix([translation, rotation]),
+    )
+
+
+def test_changing_transformation_invalidates_world_matrix_of_dependents_only():
+    base = create_transform(name="base", ui_value=1.0)
+    base.depends_on = None
+    dependent = create_transform(name="dependent", ui_value=2.0)
+    dependent.depends_on = base
+    other = create_transform(name="other", ui_value=3.0)
+
+    assert np.allclose(
+        np.array(dependent.world_matrix.data()), _chain_matrix([dependent, base])
+    )
+    other.world_matrix
+    assert dependent._world_matrix is not None
+    assert other._world_matrix is not None
+
+    base.vector = QVector3D(0.0, 0.0, 1.0)
+
+    assert base._world_matrix is None
+    assert dependent._world_matrix is None
+    assert other._world_matrix is not None
+    assert np.allclose(
+        np.array(dependent.world_matrix.data()), _chain_matrix([dependent, base])
+    )
+
+
+def test_reading_ui_value_does_not_invalidate_cached_world_matrix():
+    transformation = create_transform(ui_value=4.0)
+    cached_matrix = transformation.world_matrix
+
+    assert transformation.ui_value == 4.0
+    assert transformation._world_matrix is not None
+
+    transformation.ui_value = 5.0
+    assert transformation._world_matrix is None
+    assert not np.allclose(
+        np.array(transformation.world_matrix.data()), np.array(cached_matrix.data())
+    )
+
+
+def test_changing_depends_on_invalidates_world_matrix():
+    first = create_transform(name="first", ui_value=1.0)
+    second = create_transform(name="second", ui_value=2.0)
+    second.depends_on = None
+    dependent = create_transform(name="dependent", ui_value=3.0)
+    dependent.depends_on = first
+    dependent.world_matrix
+
+    dependent.depends_on = second
+
+    assert np.allclose(
+        np.array(dependent.world_matrix.data()), _chain_matrix([dependent, second])
+    )
+
+
+def test_assigning_values_of_depended_on_transformation_invalidates_world_matrix():
+    component = create_component()
+    first = component.add_translation(QVector3D(0.0, 0.0, 1.0), name="first")
+    first.values = Dataset(name="", values=1.0, type=ValueTypes.DOUBLE, size=[1])
+    second = component.add_translation(
+        QVector3D(1.0, 0.0, 0.0), name="second", depends_on=first
+    )
+    second.ui_value = 2.0
+    component.depends_on = second
+    component.qtransform
+
+    first.values = Dataset(name="", values=5.0, type=ValueTypes.DOUBLE, size=[1])
+
+    assert first.world_matrix.column(3).z() == 5.0
+    assert np.allclose(
+        np.array(component.qtransform.matrix().data()), _chain_matrix([second, first])
+    )
+
+
+def test_editing_values_in_place_invalidates_world_matrix_of_dependents():
+    base = create_transform(
+        name="base",
+        values=Dataset(name="", values=1.0, type=ValueTypes.DOUBLE, size=[1]),
+    )
+    base.depends_on = None
+    dependent = create_transform(name="dependent", ui_value=2.0)
+    dependent.depends_on = base
+    dependent.world_matrix
+
+    base.values.values = 3.0
+
+    assert np.allclose(
+        np.array(dependent.world_matrix.data()), _chain_matrix([dependent, base])
+    )
+    assert dependent.world_matrix.column(3).x() == 5.0
+
+
+def test_GIVEN_world_matrix_cached_WHEN_getting_world_matrix_THEN_chain_is_not_walked(
+    monkeypatch,
+):
+    base = create_transform(name="base", ui_value=1.0)
+    base.depends_on = None
+    dependent = create_transform(name="dependent", ui_value=2.0)
+    dependent.depends_on = base
+    expected = dependent.world_matrix
+
+    def fail(_):
+        raise AssertionError("The cached world matrix should have been used")
+
+    monkeypatch.setattr("nexus_constructor.model.transformation.next_in_chain", fail)
+
+    assert dependent.world_matrix == expected
+
+
+def test_GIVEN_chain_which_loops_WHEN_getting_world_matrix_THEN_loop_is_only_followed_once():
+    first = create_transform(name="first", ui_value=1.0)
+    second = create_transform(name="second", ui_value=2.0)
+    first.depends_on = second
+    second.depends_on = first
+
+    assert np.allclose(
+        np.array(first.world_matrix.data()), _chain_matrix([first, second])
+    )
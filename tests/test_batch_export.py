@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from streaming_data_types.fbschemas.forwarder_config_update_rf5k.UpdateType import (
+    UpdateType,
+)
+from streaming_data_types.forwarder_config_update_rf5k import deserialise_rf5k
+
+from nexus_constructor.batch_export import (
+    ExportOptions,
+    export_instrument,
+    export_instruments,
+    main,
+)
+from nexus_constructor.json.json_writer import write_model_json
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.model import Model
+
+CUBE_OFF_FILE_PATH = os.path.join(os.path.dirname(__file__), "cube.off")
+
+
+@pytest.fixture
+def instrument_json_file(tmp_path):
+    entry = Entry()
+    entry.instrument = Instrument()
+    component = Component("monitor", parent_node=entry.instrument)
+    component.nx_class = "NXmonitor"
+    entry.instrument.add_component(component)
+    filename = str(tmp_path / "instrument.json")
+    with open(filename, "w") as file:
+        write_model_json(Model(entry), file, indent=2)
+    return filename
+
+
+def _component_names(json_filename):
+    with open(json_filename) as file:
+        instrument = json.load(file)["children"][0]["children"][0]
+    return [child["name"] for child in instrument["children"]]
+
+
+def test_GIVEN_json_file_WHEN_exporting_THEN_json_and_forwarder_config_are_written(
+    instrument_json_file, tmp_path
+):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    result = export_instrument(
+        instrument_json_file, ExportOptions(str(output_dir), provider="pva")
+    )
+
+    assert result.error is None
+    assert list(result.timings) == ["load", "json", "forwarder"]
+    assert "monitor" in _component_names(output_dir / "instrument.json")
+    with open(output_dir / "instrument.flat", "rb") as file:
+        assert deserialise_rf5k(file.read()).config_change == UpdateType.ADD
+
+
+def test_GIVEN_geometry_file_WHEN_exporting_THEN_json_has_a_component_with_that_shape(
+    tmp_path,
+):
+    result = export_instrument(CUBE_OFF_FILE_PATH, ExportOptions(str(tmp_path)))
+
+    assert result.error is None
+    assert "forwarder" not in result.timings
+    assert "cube" in _component_names(tmp_path / "cube.json")
+
+
+def test_GIVEN_json_exported_from_geometry_file_WHEN_exporting_it_again_THEN_it_loads(
+    tmp_path,
+):
+    first_output_dir = tmp_path / "first"
+    second_output_dir = tmp_path / "second"
+    first_output_dir.mkdir()
+    second_output_dir.mkdir()
+    export_instrument(CUBE_OFF_FILE_PATH, ExportOptions(str(first_output_dir)))
+
+    result = export_instrument(
+        str(first_output_dir / "cube.json"), ExportOptions(str(second_output_dir))
+    )
+
+    assert result.error is None
+    assert "cube" in _component_names(second_output_dir / "cube.json")
+
+
+def test_GIVEN_missing_file_WHEN_exporting_THEN_error_is_reported_and_other_files_are_exported(
+    tmp_path, instrument_json_file
+):
+    output_dir = str(tmp_path / "output")
+    reported = []
+
+    results = export_instruments(
+        [str(tmp_path / "missing.json"), instrument_json_file],
+        ExportOptions(output_dir),
+        jobs=2,
+        report=reported.append,
+    )
+
+    assert results[0].error is not None
+    assert results[1].error is None
+    assert len(reported) == 2
+    assert os.path.exists(os.path.join(output_dir, "instrument.json"))
+
+
+def test_GIVEN_a_file_fails_WHEN_running_main_THEN_exit_code_is_one(tmp_path, capsys):
+    assert main([str(tmp_path / "missing.json"), "--output-dir", str(tmp_path)]) == 1
+    assert "Exported 0 of 1 instruments" in capsys.readouterr().out
+
+
+def test_WHEN_importing_batch_export_THEN_no_widget_or_3d_modules_are_imported():
+    code = (
+        "import sys, nexus_constructor.batch_export; "
+        "print([m for m in sys.modules if 'Qt3D' in m or 'QtWidgets' in m])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+
+    assert output.decode().strip() == "[]"
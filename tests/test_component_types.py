@@ -1,7 +1,14 @@
+import json
+
 import pytest
 from nexus_constructor.component_type import (
     __list_base_class_files,
     _create_base_class_dict,
+    bundled_cache_file,
+    definitions_hash,
+    load_class_definitions,
+    load_component_definitions_in_background,
+    write_class_definitions_cache,
 )
 
 
@@ -99,3 +106,171 @@ def test_GIVEN_a_valid_base_class_that_is_in_excludelist_WHEN_creating_base_clas
     _create_base_class_dict(xml, [class_name], base_classes, component_base_classes)
 
     assert not base_classes
+
+
+BASE_CLASS_XML = """<definition name="{name}" category="base">
+    <field name="depends_on"/>
+    <field name="{field}"/>
+</definition>"""
+
+APPLICATION_XML = """<definition name="NXexample" category="application">
+    <group type="NXentry">
+        <field name="title"/>
+        <group type="NXinstrument">
+            <group type="NXdetector">
+                <field name="image_key"/>
+                <field name="depends_on"/>
+            </group>
+        </group>
+    </group>
+</definition>"""
+
+
+@pytest.fixture
+def definitions_dir(tmp_path):
+    for directory, name, text in [
+        (
+            "base_classes",
+            "NXdetector",
+            BASE_CLASS_XML.format(name="NXdetector", field="data"),
+        ),
+        (
+            "base_classes",
+            "NXentry",
+            BASE_CLASS_XML.format(name="NXentry", field="start_time"),
+        ),
+        (
+            "contributed_definitions",
+            "NXnew",
+            BASE_CLASS_XML.format(name="NXnew", field="size"),
+        ),
+        ("applications", "NXexample", APPLICATION_XML),
+    ]:
+        (tmp_path / directory).mkdir(exist_ok=True)
+        (tmp_path / directory / f"{name}.nxdl.xml").write_text(text)
+    (tmp_path / "NXDL_VERSION").write_text("v1")
+    return tmp_path
+
+
+def test_GIVEN_contributed_and_application_definitions_WHEN_loading_class_definitions_THEN_their_fields_are_added(
+    definitions_dir, tmp_path
+):
+    all_classes, components = load_class_definitions(
+        str(definitions_dir), cache_file=str(tmp_path / "cache.json")
+    )
+
+    assert components == {"NXdetector": ["depends_on", "data", "image_key"]}
+    assert all_classes["NXentry"] == ["depends_on", "start_time", "title"]
+    assert all_classes["NXnew"] == ["depends_on", "size"]
+
+
+def test_GIVEN_cache_written_WHEN_loading_class_definitions_THEN_definitions_are_not_parsed_again(
+    definitions_dir, tmp_path, monkeypatch
+):
+    cache_file = str(tmp_path / "cache.json")
+    expected = load_class_definitions(str(definitions_dir), cache_file=cache_file)
+
+    def fail(_):
+        raise AssertionError("Definitions should have come from the cache")
+
+    monkeypatch.setattr(
+        "nexus_constructor.component_type.compile_class_definitions", fail
+    )
+
+    assert (
+        load_class_definitions(str(definitions_dir), cache_file=cache_file) == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "changed_file", ["NXDL_VERSION", "applications/NXexample.nxdl.xml"]
+)
+def test_GIVEN_definitions_changed_WHEN_loading_class_definitions_THEN_cache_is_rebuilt(
+    definitions_dir, tmp_path, changed_file
+):
+    cache_file = str(tmp_path / "cache.json")
+    load_class_definitions(str(definitions_dir), cache_file=cache_file)
+
+    changed = definitions_dir / changed_file
+    changed.write_text(changed.read_text().replace("image_key", "frame_key") + " ")
+    _, components = load_class_definitions(str(definitions_dir), cache_file=cache_file)
+
+    assert components["NXdetector"][-1] == (
+        "frame_key" if changed_file != "NXDL_VERSION" else "image_key"
+    )
+    with open(cache_file) as file:
+        assert json.load(file)["key"] == definitions_hash(str(definitions_dir))
+
+
+def test_GIVEN_cache_shipped_with_definitions_WHEN_loading_class_definitions_THEN_it_is_used_before_the_users_cache(
+    definitions_dir, tmp_path, monkeypatch
+):
+    user_cache_file = tmp_path / "user" / "cache.json"
+    monkeypatch.setattr(
+        "nexus_constructor.component_type.default_cache_file",
+        lambda: str(user_cache_file),
+    )
+    write_class_definitions_cache(
+        str(definitions_dir), bundled_cache_file(str(definitions_dir))
+    )
+    expected = load_class_definitions(str(definitions_dir))
+
+    def fail(_):
+        raise AssertionError("Definitions should have come from the shipped cache")
+
+    monkeypatch.setattr(
+        "nexus_constructor.component_type.compile_class_definitions", fail
+    )
+
+    assert load_class_definitions(str(definitions_dir)) == expected
+    assert not user_cache_file.exists()
+
+
+def test_GIVEN_shipped_cache_is_out_of_date_WHEN_loading_class_definitions_THEN_users_cache_is_written(
+    definitions_dir, tmp_path, monkeypatch
+):
+    user_cache_file = tmp_path / "user" / "cache.json"
+    monkeypatch.setattr(
+        "nexus_constructor.component_type.default_cache_file",
+        lambda: str(user_cache_file),
+    )
+    shipped_cache_file = bundled_cache_file(str(definitions_dir))
+    write_class_definitions_cache(str(definitions_dir), shipped_cache_file)
+    with open(shipped_cache_file) as file:
+        shipped_cache = file.read()
+    (definitions_dir / "NXDL_VERSION").write_text("v2")
+
+    load_class_definitions(str(definitions_dir))
+
+    with open(user_cache_file) as file:
+        assert json.load(file)["key"] == definitions_hash(str(definitions_dir))
+    with open(shipped_cache_file) as file:
+        assert file.read() == shipped_cache
+
+
+def test_GIVEN_black_list_WHEN_loading_class_definitions_THEN_classes_are_left_out(
+    definitions_dir, tmp_path
+):
+    all_classes, components = load_class_definitions(
+        str(definitions_dir),
+        black_list=["NXdetector"],
+        cache_file=str(tmp_path / "cache.json"),
+    )
+
+    assert "NXdetector" not in all_classes
+    assert components == {}
+
+
+def test_GIVEN_definitions_directory_WHEN_loading_in_background_THEN_result_matches_loading_directly(
+    definitions_dir, tmp_path
+):
+    cache_file = str(tmp_path / "cache.json")
+
+    future = load_component_definitions_in_background(
+        str(definitions_dir), cache_file=cache_file
+    )
+
+    assert (
+        future.result()
+        == load_class_definitions(str(definitions_dir), cache_file=cache_file)[1]
+    )
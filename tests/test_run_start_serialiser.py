@@ -0,0 +1,104 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+from streaming_data_types import run_start_pl72
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.value_type import ValueTypes
+from nexus_constructor.run_start_serialiser import (
+    NexusStructureCache,
+    SerialisationCancelled,
+    model_snapshot,
+    serialise_run_start,
+)
+
+RUN_START_ARGUMENTS = dict(
+    job_id="job",
+    filename="file.nxs",
+    start_time=None,
+    stop_time=None,
+    broker="localhost:9092",
+    service_id="writer",
+)
+
+
+@pytest.fixture
+def model() -> Model:
+    entry = Entry()
+    entry.instrument = Instrument()
+    return Model(entry)
+
+
+@pytest.fixture
+def detector(model):
+    component = Component("detector")
+    component.nx_class = "NXdetector"
+    component.set_field_value("detector_number", np.arange(1000), ValueTypes.LONG)
+    model.entry.instrument.add_component(component)
+    return component
+
+
+def test_GIVEN_model_WHEN_serialising_run_start_THEN_nexus_structure_is_json_of_model(
+    model, detector
+):
+    percentages = []
+
+    message = serialise_run_start(
+        model_snapshot(model),
+        NexusStructureCache(),
+        threading.Event(),
+        percentages.append,
+        **RUN_START_ARGUMENTS
+    )
+
+    run_start = run_start_pl72.deserialise_pl72(message)
+    assert run_start.nexus_structure == json.dumps(model.as_dict())
+    assert run_start.filename == "file.nxs"
+    assert percentages[0] == 0 and percentages[-1] == 100
+    assert percentages == sorted(percentages)
+
+
+def test_GIVEN_unchanged_model_WHEN_serialising_again_THEN_last_json_is_reused(
+    model, detector
+):
+    cache = NexusStructureCache()
+    first = cache.to_json(model_snapshot(model))
+    progress = []
+
+    second = cache.to_json(model_snapshot(model), progress.append)
+
+    assert second is first
+    assert not progress
+
+
+def test_GIVEN_changed_model_WHEN_serialising_again_THEN_json_is_written_again(
+    model, detector
+):
+    cache = NexusStructureCache()
+    first = cache.to_json(model_snapshot(model))
+    detector.set_field_value("detector_number", np.arange(1, 1001), ValueTypes.LONG)
+
+    second = cache.to_json(model_snapshot(model))
+
+    assert second != first
+    assert second == json.dumps(model.as_dict())
+
+
+def test_GIVEN_cancelled_event_WHEN_serialising_run_start_THEN_raises_serialisation_cancelled(
+    model, detector
+):
+    cancelled = threading.Event()
+    cancelled.set()
+
+    with pytest.raises(SerialisationCancelled):
+        serialise_run_start(
+            model_snapshot(model),
+            NexusStructureCache(),
+            cancelled,
+            **RUN_START_ARGUMENTS
+        )
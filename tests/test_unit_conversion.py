@@ -1,4 +1,16 @@
-from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
+import numpy as np
+import pint
+import pytest
+
+from nexus_constructor import unit_utils
+from nexus_constructor.unit_utils import (
+    calculate_unit_conversion_factor,
+    convert_array,
+    get_unit_registry,
+    units_are_expected_dimensionality,
+    units_are_recognised_by_pint,
+    METRES,
+)
 from pytest import approx
 
 
@@ -10,3 +22,41 @@ def test_unit_conversion_factor():
     # Check that the unit conversion factor can correctly find the unit in terms of meters
     for unit in units:
         assert approx(calculate_unit_conversion_factor(unit[0], METRES)) == unit[1]
+
+
+def test_GIVEN_units_checked_twice_WHEN_getting_registry_THEN_same_registry_is_used():
+    assert get_unit_registry() is get_unit_registry()
+    assert unit_utils.ureg is get_unit_registry()
+
+
+def test_GIVEN_units_checked_twice_WHEN_checking_units_THEN_parsed_units_are_reused():
+    unit_utils.clear_unit_cache()
+
+    assert units_are_recognised_by_pint("mm")
+    assert units_are_recognised_by_pint("mm")
+    assert units_are_expected_dimensionality("mm", METRES)
+    assert not units_are_expected_dimensionality("mm", "seconds")
+
+    assert unit_utils._parse_units.cache_info().hits >= 2
+    assert unit_utils._parse_units.cache_info().currsize == 1
+
+
+@pytest.mark.parametrize("units", ["(", "m)", "metre**"])
+def test_GIVEN_units_pint_cannot_parse_WHEN_checking_units_THEN_units_are_rejected(
+    units,
+):
+    assert not units_are_recognised_by_pint(units)
+    assert not units_are_expected_dimensionality(units, METRES)
+
+
+def test_GIVEN_incompatible_units_WHEN_calculating_conversion_factor_THEN_pint_error_is_raised():
+    with pytest.raises(pint.errors.DimensionalityError):
+        calculate_unit_conversion_factor("seconds", METRES)
+
+
+def test_GIVEN_array_WHEN_converting_units_THEN_every_value_is_converted():
+    values = np.arange(6.0).reshape(2, 3)
+
+    assert convert_array(values, "mm", METRES) == approx(values / 1000)
+    assert convert_array([0, 100], "degC", "kelvin") == approx([273.15, 373.15])
+    assert convert_array(values, METRES, METRES) is values
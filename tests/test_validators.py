@@ -1,5 +1,4 @@
 """Tests for custom validators in the nexus_constructor.validators module"""
-from io import StringIO
 from typing import List
 
 import pytest
@@ -22,7 +21,7 @@ from nexus_constructor.validators import (
 )
 import attr
 from PySide2.QtGui import QValidator
-from mock import Mock
+from mock import Mock, call
 import numpy as np
 
 
@@ -351,10 +350,24 @@ def test_GIVEN_string_when_using_numpy_validator_with_string_as_dtype_THEN_true_
     assert validator.validate("test", 0) == QValidator.Acceptable
 
 
-def test_GIVEN_valid_off_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_true():
-    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES)
+def validate_geometry_file(qtbot, tmp_path, filename: str, contents: str):
+    """
+    Validates a geometry file, waiting for the whole file to be checked in the background if its header is valid.
+    :return: The validator, and the state it returned straight away.
+    """
+    path = tmp_path / filename
+    path.write_text(contents)
+    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES, delay=0)
     validator.is_valid = Mock()
 
+    state = validator.validate(str(path), 0)
+    qtbot.waitUntil(lambda: not validator.validation_pending)
+    return validator, state
+
+
+def test_GIVEN_valid_off_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_true(
+    qtbot, tmp_path
+):
     valid_off_file = (
         "OFF\n"
         "#  cube.off\n"
@@ -376,17 +389,18 @@ def test_GIVEN_valid_off_WHEN_validating_geometry_THEN_validity_signal_is_emitte
         "4 6 0 2 4\n"
     )
 
-    validator.open_file = Mock(return_value=StringIO("".join(valid_off_file)))
-    validator.is_file = Mock(return_value=True)
+    validator, state = validate_geometry_file(
+        qtbot, tmp_path, "test.off", valid_off_file
+    )
 
-    assert validator.validate("test.off", 0) == QValidator.Acceptable
-    validator.is_valid.emit.assert_called_once_with(True)
+    # Only the header is checked straight away
+    assert state == QValidator.Intermediate
+    assert validator.is_valid.emit.call_args_list == [call(False), call(True)]
 
 
-def test_GIVEN_invalid_off_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false():
-    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES)
-    validator.is_valid = Mock()
-
+def test_GIVEN_invalid_off_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false(
+    qtbot, tmp_path
+):
     # File missing a point
     invalid_off_file = (
         "OFF\n"
@@ -408,17 +422,17 @@ def test_GIVEN_invalid_off_WHEN_validating_geometry_THEN_validity_signal_is_emit
         "4 6 0 2 4\n"
     )
 
-    validator.open_file = Mock(return_value=StringIO("".join(invalid_off_file)))
-    validator.is_file = Mock(return_value=True)
-
-    assert validator.validate("test.off", 0) == QValidator.Intermediate
-    validator.is_valid.emit.assert_called_once_with(False)
+    validator, state = validate_geometry_file(
+        qtbot, tmp_path, "test.off", invalid_off_file
+    )
 
+    assert state == QValidator.Intermediate
+    assert validator.is_valid.emit.call_args_list == [call(False), call(False)]
 
-def test_GIVEN_valid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_true():
-    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES)
-    validator.is_valid = Mock()
 
+def test_GIVEN_valid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_true(
+    qtbot, tmp_path
+):
     valid_stl_file = (
         "solid dart\n"
         "facet normal 0.00000E+000 0.00000E+000 -1.00000E+000\n"
@@ -445,17 +459,19 @@ def test_GIVEN_valid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is_e
         "endsolid dart\n"
     )
 
-    validator.open_file = Mock(return_value=StringIO("".join(valid_stl_file)))
-    validator.is_file = Mock(return_value=True)
-
-    assert validator.validate("test.stl", 0) == QValidator.Acceptable
-    validator.is_valid.emit.assert_called_once_with(True)
+    validator, state = validate_geometry_file(
+        qtbot, tmp_path, "test.stl", valid_stl_file
+    )
 
+    assert state == QValidator.Intermediate
+    assert validator.is_valid.emit.call_args_list == [call(False), call(True)]
+    # The result is remembered, so validating the same file again does not wait
+    assert validator.validate(str(tmp_path / "test.stl"), 0) == QValidator.Acceptable
 
-def test_GIVEN_invalid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false():
-    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES)
-    validator.is_valid = Mock()
 
+def test_GIVEN_invalid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false(
+    qtbot, tmp_path
+):
     # File with missing endloop statement
     invalid_stl_file = (
         "solid dart\n"
@@ -482,24 +498,41 @@ def test_GIVEN_invalid_stl_file_WHEN_validating_geometry_THEN_validity_signal_is
         "endsolid dart\n"
     )
 
-    validator.open_file = Mock(return_value=StringIO("".join(invalid_stl_file)))
-    validator.is_file = Mock(return_value=True)
+    validator, state = validate_geometry_file(
+        qtbot, tmp_path, "test.stl", invalid_stl_file
+    )
+
+    assert state == QValidator.Intermediate
+    assert validator.is_valid.emit.call_args_list == [call(False), call(False)]
+
 
-    assert validator.validate("test.stl", 0) == QValidator.Intermediate
+def test_GIVEN_blank_OFF_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false(
+    qtbot, tmp_path
+):
+    validator, state = validate_geometry_file(qtbot, tmp_path, "test.off", "")
+
+    # The header shows the file is invalid without checking the whole file
+    assert state == QValidator.Intermediate
     validator.is_valid.emit.assert_called_once_with(False)
 
 
-def test_GIVEN_blank_OFF_file_WHEN_validating_geometry_THEN_validity_signal_is_emitted_with_false():
-    validator = GeometryFileValidator(GEOMETRY_FILE_TYPES)
-    validator.is_valid = Mock()
+def test_GIVEN_unexpected_error_while_loading_mesh_WHEN_validating_geometry_THEN_validation_finishes_with_false(
+    qtbot, tmp_path, monkeypatch
+):
+    def load_geometry_with_unexpected_error(*args):
+        raise KeyError("unexpected")
 
-    blank_off_file = ""
+    monkeypatch.setattr(
+        "nexus_constructor.validators.load_geometry_from_file_object",
+        load_geometry_with_unexpected_error,
+    )
 
-    validator.open_file = Mock(return_value=StringIO("".join(blank_off_file)))
-    validator.is_file = Mock(return_value=True)
+    validator, state = validate_geometry_file(
+        qtbot, tmp_path, "test.off", "OFF\n3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n"
+    )
 
-    assert validator.validate("test.off", 0) == QValidator.Intermediate
-    validator.is_valid.emit.assert_called_once_with(False)
+    assert state == QValidator.Intermediate
+    assert validator.is_valid.emit.call_args_list == [call(False), call(False)]
 
 
 @pytest.mark.parametrize(
@@ -314,6 +314,10 @@ def enter_file_path(
     ):
         with patch("builtins.open", mock_open(read_data=file_contents)):
             systematic_button_press(qtbot, template, dialog.fileBrowseButton)
+            # Wait for the whole file to be checked in the background
+            qtbot.waitUntil(
+                lambda: not dialog.fileLineEdit.validator().validation_pending
+            )
 
 
 def enter_disk_chopper_fields(
@@ -5,6 +5,7 @@ from PySide2.QtCore import QSettings
 from PySide2.QtGui import QStandardItemModel
 from mock import Mock
 from streaming_data_types import run_start_pl72
+from nexus_constructor.kafka.status_consumer import StatusSnapshot
 from nexus_constructor.validators import BrokerAndTopicValidator
 from nexus_constructor.file_writer_ctrl_window import (
     FileWriterCtrl,
@@ -115,6 +116,7 @@ def test_UI_GIVEN_valid_command_WHEN_sending_command_THEN_command_producer_sends
     window.command_widget.service_id_lineedit.setText(service_id)
 
     window.send_command()
+    qtbot.waitUntil(lambda: window.command_producer.send_command.called)
 
     window.command_producer.send_command.assert_called_once()
 
@@ -151,8 +153,7 @@ def test_UI_GIVEN_status_consumer_but_no_command_producer_WHEN_checking_status_c
     window.command_producer = None
     window.status_consumer = Mock()
     window.status_consumer.connected = True
-    window.status_consumer.files = []
-    window.status_consumer.file_writers = []
+    window.status_consumer.snapshot = StatusSnapshot()
 
     window._check_connection_status()
     assert window.status_broker_led.is_on()
@@ -171,6 +172,31 @@ def test_UI_GIVEN_command_producer_WHEN_checking_connection_status_THEN_command_
     assert window.command_broker_led.is_on()
 
 
+def test_UI_GIVEN_new_status_snapshot_WHEN_checking_connection_status_THEN_expired_writers_are_removed(
+    qtbot, instrument, settings
+):
+    window = FileWriterCtrl(instrument, settings)
+    qtbot.addWidget(window)
+    window.command_producer = None
+    window.status_consumer = Mock()
+    window.status_consumer.connected = True
+    window.status_consumer.snapshot = StatusSnapshot(
+        1, {"a": {"last_seen": 1000}, "b": {"last_seen": 2000}}, {}
+    )
+    window._check_connection_status()
+
+    window.status_consumer.snapshot = StatusSnapshot(
+        2, {"b": {"last_seen": 3000}, "c": {"last_seen": 3000}}, {}
+    )
+    window._check_connection_status()
+
+    assert sorted(window.known_writers) == ["b", "c"]
+    assert window.known_writers["b"].row == 0
+    assert window.known_writers["b"].last_time == 3000
+    assert window.file_writers_model.rowCount() == 2
+    assert window.file_writers_model.index(1, 0).data() == "c"
+
+
 class DummyInterface:
     def __init__(self, address, topic):
         self.address = address
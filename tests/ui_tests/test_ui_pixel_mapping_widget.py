@@ -1,44 +1,142 @@
+import numpy as np
 import pytest
 from PySide2.QtCore import Qt
 
-from nexus_constructor.pixel_mapping_widget import PixelMappingWidget
+from nexus_constructor.geometry.pixel_data import NO_PIXEL_ID
+from nexus_constructor.pixel_mapping_widget import PixelMappingWidget, read_pixel_ids
 
 CYLINDER_TEXT = "cylinder"
-ID_NO = 3
+N_ITEMS = 10
 
 
 @pytest.fixture(scope="function")
 def pixel_mapping_widget(qtbot, template):
-    return PixelMappingWidget(template, ID_NO, CYLINDER_TEXT)
+    widget = PixelMappingWidget(template)
+    widget.model.reset(N_ITEMS, CYLINDER_TEXT)
+    return widget
 
 
-def test_GIVEN_id_number_and_text_WHEN_creating_pixel_mapping_widget_THEN_widget_is_created_with_expected_values(
-    pixel_mapping_widget,
-):
+@pytest.fixture(scope="function")
+def pixel_mapping_model(pixel_mapping_widget):
+    return pixel_mapping_widget.model
 
-    assert pixel_mapping_widget.pixelIDLabel.text() == "Pixel ID for {} #{}:".format(
-        CYLINDER_TEXT, ID_NO
+
+def test_GIVEN_number_of_items_and_text_WHEN_creating_pixel_mapping_THEN_rows_have_no_ids_and_expected_labels(
+    pixel_mapping_widget, pixel_mapping_model
+):
+    assert pixel_mapping_widget.count() == N_ITEMS
+    assert not pixel_mapping_model.has_pixel_ids()
+    assert pixel_mapping_model.data(pixel_mapping_model.index(3, 0)) == ""
+    assert (
+        pixel_mapping_model.headerData(3, Qt.Vertical)
+        == f"{CYLINDER_TEXT.capitalize()} #3"
     )
 
 
-def test_GIVEN_id_WHEN_calling_set_id_THEN_id_is_set(pixel_mapping_widget):
+def test_GIVEN_id_WHEN_setting_data_THEN_id_is_stored_in_array(pixel_mapping_model):
+    assert pixel_mapping_model.setData(pixel_mapping_model.index(3, 0), "5")
+
+    assert pixel_mapping_model.pixel_ids[3] == 5
+    assert pixel_mapping_model.data(pixel_mapping_model.index(3, 0)) == "5"
+    assert pixel_mapping_model.has_pixel_ids()
+
+
+def test_GIVEN_empty_text_WHEN_setting_data_THEN_id_is_removed(pixel_mapping_model):
+    pixel_mapping_model.setData(pixel_mapping_model.index(3, 0), "5")
+    pixel_mapping_model.setData(pixel_mapping_model.index(3, 0), "")
+
+    assert pixel_mapping_model.pixel_ids[3] == NO_PIXEL_ID
+
+
+@pytest.mark.parametrize("value", ["abc", "-2"])
+def test_GIVEN_invalid_id_WHEN_setting_data_THEN_data_is_rejected(
+    pixel_mapping_model, value
+):
+    assert not pixel_mapping_model.setData(pixel_mapping_model.index(3, 0), value)
+    assert not pixel_mapping_model.has_pixel_ids()
+
+
+def test_GIVEN_first_id_and_step_WHEN_filling_range_THEN_rows_have_consecutive_ids(
+    pixel_mapping_model,
+):
+    pixel_mapping_model.fill_range(100, 2, rows=[2, 3, 4])
+
+    assert pixel_mapping_model.pixel_ids.tolist() == [-1, -1, 100, 102, 104] + [-1] * 5
+
+
+def test_GIVEN_pattern_WHEN_filling_all_rows_THEN_pattern_is_repeated(
+    pixel_mapping_model,
+):
+    pixel_mapping_model.fill_pattern([7, 8, 9])
+
+    assert pixel_mapping_model.pixel_ids.tolist() == [7, 8, 9, 7, 8, 9, 7, 8, 9, 7]
+
+
+def test_GIVEN_ids_WHEN_clearing_rows_THEN_only_those_rows_lose_their_ids(
+    pixel_mapping_model,
+):
+    pixel_mapping_model.fill_range(0)
+    pixel_mapping_model.clear(rows=np.arange(1, N_ITEMS))
+
+    assert pixel_mapping_model.pixel_ids.tolist() == [0] + [NO_PIXEL_ID] * 9
 
-    id = 5
-    pixel_mapping_widget.id = id
-    assert pixel_mapping_widget.pixelIDLineEdit.text() == str(id)
+
+def test_GIVEN_more_ids_than_rows_WHEN_setting_ids_THEN_raises_value_error(
+    pixel_mapping_model,
+):
+    with pytest.raises(ValueError):
+        pixel_mapping_model.set_pixel_ids(np.arange(N_ITEMS + 1))
 
 
-def test_GIVEN_id_has_been_given_WHEN_calling_get_id_THEN_id_is_returned(
-    qtbot, pixel_mapping_widget
+def test_GIVEN_ids_change_WHEN_filling_rows_THEN_data_changed_is_emitted(
+    qtbot, pixel_mapping_model
 ):
+    with qtbot.waitSignal(pixel_mapping_model.dataChanged) as blocker:
+        pixel_mapping_model.fill_range(1, rows=[4, 6])
 
-    id = 5
-    qtbot.keyClick(pixel_mapping_widget.pixelIDLineEdit, Qt.Key_5)
-    assert pixel_mapping_widget.id == id
+    top_left, bottom_right = blocker.args[:2]
+    assert (top_left.row(), bottom_right.row()) == (4, 6)
 
 
-def test_GIVEN_id_has_not_been_given_WHEN_calling_get_id_THEN_none_is_returned(
+def test_GIVEN_selected_rows_WHEN_getting_selected_rows_THEN_rows_are_returned_in_order(
     pixel_mapping_widget,
 ):
+    assert pixel_mapping_widget.selected_rows() is None
+
+    pixel_mapping_widget.view.selectRow(5)
+
+    assert pixel_mapping_widget.selected_rows().tolist() == [5]
+
+
+def test_GIVEN_csv_file_with_missing_values_WHEN_reading_pixel_ids_THEN_missing_values_have_no_id(
+    tmp_path,
+):
+    filename = tmp_path / "ids.csv"
+    filename.write_text("1,2,\n4,,6\n")
+
+    assert read_pixel_ids(str(filename)).tolist() == [
+        1,
+        2,
+        NO_PIXEL_ID,
+        4,
+        NO_PIXEL_ID,
+        6,
+    ]
+
+
+def test_GIVEN_npy_file_WHEN_reading_pixel_ids_THEN_ids_are_returned(tmp_path):
+    filename = str(tmp_path / "ids.npy")
+    np.save(filename, np.arange(5, dtype=np.int32))
+
+    assert read_pixel_ids(filename).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("contents", ["1,2.5,3", "1,-2,3", "1,a,3"])
+def test_GIVEN_csv_file_with_invalid_ids_WHEN_reading_pixel_ids_THEN_raises_value_error(
+    tmp_path, contents
+):
+    filename = tmp_path / "ids.csv"
+    filename.write_text(contents)
 
-    assert pixel_mapping_widget.id is None
+    with pytest.raises(ValueError):
+        read_pixel_ids(str(filename))
@@ -14,6 +14,7 @@ from nexus_constructor.geometry.pixel_data import (
     Corner,
     CountDirection,
     PixelMapping,
+    NO_PIXEL_ID,
 )
 from nexus_constructor.geometry.pixel_data_utils import (
     get_y_offsets_from_pixel_grid,
@@ -76,13 +77,14 @@ def widgets_match_pixel_mapping(
     pixel_mapping: PixelMapping, pixel_options: PixelOptions
 ) -> bool:
     """
-    Checks that the contents of the pixel mapping widgets match the contents of a PixelMapping object.
+    Checks that the contents of the pixel mapping table match the contents of a PixelMapping object.
     :param pixel_mapping: The Pixel Mapping object that is being edited via the PixelOptions interface.
     :param pixel_options: The PixelOptions widget.
-    :return: True if the widget and PixelMapping match. False otherwise.
+    :return: True if the table and PixelMapping match. False otherwise.
     """
+    model = pixel_options.pixel_mapping_widget.model
     for i in range(len(pixel_mapping.pixel_ids)):
-        id_in_interface = pixel_options.pixel_mapping_widgets[i].pixelIDLineEdit.text()
+        id_in_interface = model.data(model.index(i, 0))
 
         if not id_in_interface:
             if pixel_mapping.pixel_ids[i] is not None:
@@ -94,6 +96,17 @@ def widgets_match_pixel_mapping(
     return True
 
 
+def enter_pixel_id(pixel_options: PixelOptions, row: int, text: str):
+    """
+    Mimics the user entering a pixel ID in a row of the pixel mapping table.
+    :param pixel_options: The PixelOptions widget.
+    :param row: The row of the face or cylinder.
+    :param text: The text entered for the ID.
+    """
+    model = pixel_options.pixel_mapping_widget.model
+    model.setData(model.index(row, 0), text)
+
+
 def replace_pixel_mapping_in_off_component(
     component: Component, pixel_mapping: PixelMapping, off_geometry: OFFGeometryNexus
 ):
@@ -284,7 +297,7 @@ def test_UI_GIVEN_invalid_pixel_grid_WHEN_entering_pixel_options_THEN_changing_t
     manually_create_pixel_mapping_list(pixel_options)
 
     # Make the pixel mapping valid
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "22")
+    enter_pixel_id(pixel_options, 0, "22")
 
     # Check the test for unacceptable pixel states gives False
     assert pixel_options._pixel_validator.unacceptable_pixel_states() == [False, False]
@@ -304,7 +317,7 @@ def test_UI_GIVEN_valid_pixel_mapping_WHEN_entering_pixel_options_THEN_changing_
     manually_create_pixel_mapping_list(pixel_options)
 
     # Make the pixel mapping invalid
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Check that test for unacceptable pixel states gives True
     assert pixel_options._pixel_validator.unacceptable_pixel_states() == [False, True]
@@ -320,7 +333,7 @@ def test_UI_GIVEN_invalid_pixel_mapping_WHEN_entering_pixel_options_THEN_changin
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give input that will be rejected by the validator
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Switch to pixel grid
     systematic_button_press(qtbot, template, pixel_options.single_pixel_radio_button)
@@ -339,7 +352,7 @@ def test_UI_GIVEN_valid_pixel_mapping_WHEN_entering_pixel_options_THEN_changing_
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give valid input
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "22")
+    enter_pixel_id(pixel_options, 0, "22")
 
     # Change to pixel grid
     systematic_button_press(qtbot, template, pixel_options.single_pixel_radio_button)
@@ -365,7 +378,7 @@ def test_UI_GIVEN_invalid_mapping_and_grid_WHEN_entering_pixel_options_THEN_chan
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give invalid input
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Change to no pixels
     systematic_button_press(qtbot, template, pixel_options.no_pixels_button)
@@ -424,7 +437,7 @@ def test_UI_GIVEN_user_provides_mesh_file_WHEN_entering_pixel_mapping_THEN_pixel
 
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     manually_create_pixel_mapping_list(pixel_options)
-    assert pixel_options.pixel_mapping_list_widget.count() == CORRECT_CUBE_FACES
+    assert pixel_options.pixel_mapping_widget.count() == CORRECT_CUBE_FACES
 
 
 def test_UI_GIVEN_mesh_file_changes_WHEN_entering_pxixel_mapping_THEN_pixel_mapping_list_changes(
@@ -434,7 +447,7 @@ def test_UI_GIVEN_mesh_file_changes_WHEN_entering_pxixel_mapping_THEN_pixel_mapp
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     manually_create_pixel_mapping_list(pixel_options)
     manually_create_pixel_mapping_list(pixel_options, VALID_OCTA_OFF_FILE)
-    assert pixel_options.pixel_mapping_list_widget.count() == CORRECT_OCTA_FACES
+    assert pixel_options.pixel_mapping_widget.count() == CORRECT_OCTA_FACES
 
 
 def test_UI_GIVEN_cylinder_number_WHEN_entering_pixel_mapping_THEN_pixel_mapping_list_is_populated_with_correct_number_of_widgets(
@@ -444,7 +457,7 @@ def test_UI_GIVEN_cylinder_number_WHEN_entering_pixel_mapping_THEN_pixel_mapping
     cylinder_number = 6
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(cylinder_number)
-    assert pixel_options.pixel_mapping_list_widget.count() == cylinder_number
+    assert pixel_options.pixel_mapping_widget.count() == cylinder_number
 
 
 def test_UI_GIVEN_cylinder_number_changes_WHEN_entering_pixel_mapping_THEN_pixel_mapping_list_changes(
@@ -460,7 +473,7 @@ def test_UI_GIVEN_cylinder_number_changes_WHEN_entering_pixel_mapping_THEN_pixel
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(
         second_cylinder_number
     )
-    assert pixel_options.pixel_mapping_list_widget.count() == second_cylinder_number
+    assert pixel_options.pixel_mapping_widget.count() == second_cylinder_number
 
 
 def test_UI_GIVEN_user_switches_to_pixel_mapping_WHEN_creating_component_THEN_pixel_mapping_signal_is_emitted(
@@ -522,10 +535,10 @@ def test_UI_GIVEN_entire_shape_button_is_not_selected_WHEN_calling_pixel_mapping
 ):
 
     manually_create_pixel_mapping_list(pixel_options)
-    assert pixel_options.pixel_mapping_list_widget.count() == 0
+    assert pixel_options.pixel_mapping_widget.count() == 0
 
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(4)
-    assert pixel_options.pixel_mapping_list_widget.count() == 0
+    assert pixel_options.pixel_mapping_widget.count() == 0
 
 
 def test_UI_GIVEN_mapping_list_provided_by_user_WHEN_entering_pixel_data_THEN_calling_generate_pixel_data_returns_mapping_with_list_that_matches_user_input(
@@ -534,16 +547,13 @@ def test_UI_GIVEN_mapping_list_provided_by_user_WHEN_entering_pixel_data_THEN_ca
 
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     num_faces = 6
-    expected_id_list = [i if i % 2 != 0 else None for i in range(num_faces)]
+    expected_id_list = [i if i % 2 != 0 else NO_PIXEL_ID for i in range(num_faces)]
     manually_create_pixel_mapping_list(pixel_options)
 
     for i in range(num_faces):
-        qtbot.keyClicks(
-            pixel_options.pixel_mapping_widgets[i].pixelIDLineEdit,
-            str(expected_id_list[i]),
-        )
+        enter_pixel_id(pixel_options, i, str(expected_id_list[i]) if i % 2 != 0 else "")
 
-    assert pixel_options.generate_pixel_data().pixel_ids == expected_id_list
+    assert pixel_options.generate_pixel_data().pixel_ids.tolist() == expected_id_list
 
 
 def test_UI_GIVEN_no_pixels_button_is_pressed_WHEN_entering_pixel_data_THEN_calling_generate_pixel_data_returns_none(
@@ -755,7 +765,7 @@ def test_GIVEN_component_with_pixel_mapping_WHEN_editing_pixel_data_THEN_correct
     pixel_options, pixel_mapping_with_six_pixels, off_component_with_pixel_mapping
 ):
     pixel_options.fill_existing_entries(off_component_with_pixel_mapping)
-    assert len(pixel_options.pixel_mapping_widgets) == len(
+    assert pixel_options.pixel_mapping_widget.count() == len(
         pixel_mapping_with_six_pixels.pixel_ids
     )
 
@@ -797,29 +807,28 @@ def test_GIVEN_cylindrical_geometry_WHEN_editing_pixel_mapping_with_single_pixel
     pixel_options.fill_existing_entries(cylindrical_component_with_pixel_mapping)
 
     n_cylinders = cylindrical_geometry.cylinders.size / 3
-    assert n_cylinders == len(pixel_options.pixel_mapping_widgets)
+    assert n_cylinders == pixel_options.pixel_mapping_widget.count()
     assert (
-        pixel_options.pixel_mapping_widgets[0].id
+        pixel_options.get_pixel_mapping_ids()[0]
         == pixel_mapping_with_single_pixel.pixel_ids[0]
     )
 
 
 @pytest.mark.parametrize("values", [(5, 15), (15, 5)])
-def test_GIVEN_call_to_create_pixel_mapping_widgets_WHEN_editing_a_component_THEN_previous_widgets_are_removed(
+def test_GIVEN_call_to_create_pixel_mapping_list_WHEN_editing_a_component_THEN_previous_ids_are_removed(
     pixel_options, values
 ):
     old_value = values[0]
     new_value = values[1]
 
     pixel_options.create_pixel_mapping_list(old_value, "")
-    widget_1 = pixel_options.pixel_mapping_widgets[0]
-    assert len(pixel_options.pixel_mapping_widgets) == old_value
+    pixel_options.pixel_mapping_widget.model.fill_range(0)
+    assert pixel_options.pixel_mapping_widget.count() == old_value
 
     pixel_options.create_pixel_mapping_list(new_value, "")
-    widget_2 = pixel_options.pixel_mapping_widgets[0]
-    assert len(pixel_options.pixel_mapping_widgets) == new_value
+    assert pixel_options.pixel_mapping_widget.count() == new_value
 
-    assert widget_1 is not widget_2
+    assert np.all(pixel_options.get_pixel_mapping_ids() == NO_PIXEL_ID)
 
 
 def test_GIVEN_pixel_grid_information_WHEN_creating_pixel_grid_THEN_calling_generate_pixel_data_returns_grid_that_matches_user_input(
@@ -12,6 +12,7 @@ from PySide2.QtWidgets import (
     QSpacerItem,
     QPushButton,
     QLineEdit,
+    QStatusBar,
 )
 
 from nexus_constructor.filewriter_command_widget import FilewriterCommandWidget
@@ -98,6 +99,8 @@ class Ui_FilewriterCtrl(object):
         self.vertical_layout.addLayout(self.horizontal_layout)
         self.vertical_layout_2.addLayout(self.vertical_layout)
         FilewriterCtrl.setCentralWidget(self.central_widget)
+        self.status_bar = QStatusBar(FilewriterCtrl)
+        FilewriterCtrl.setStatusBar(self.status_bar)
 
         self.status_broker_label.setText("Status broker")
         self.file_writer_table_group.setTitle("File-writers")
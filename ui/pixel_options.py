@@ -10,6 +10,8 @@
 
 from PySide2 import QtCore, QtGui, QtWidgets
 
+from nexus_constructor.pixel_mapping_widget import PixelMappingWidget
+
 
 class Ui_PixelOptionsWidget(object):
     def setupUi(self, PixelOptionsWidget):
@@ -71,9 +73,9 @@ class Ui_PixelOptionsWidget(object):
         self.pixel_mapping_label = QtWidgets.QLabel(self.pixel_mapping_page)
         self.pixel_mapping_label.setObjectName("pixelMappingLabel")
         self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_label)
-        self.pixel_mapping_list_widget = QtWidgets.QListWidget(self.pixel_mapping_page)
-        self.pixel_mapping_list_widget.setObjectName("pixelMappingListWidget")
-        self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_list_widget)
+        self.pixel_mapping_widget = PixelMappingWidget(self.pixel_mapping_page)
+        self.pixel_mapping_widget.setObjectName("pixelMappingWidget")
+        self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_widget)
         self.pixel_options_stack.addWidget(self.pixel_mapping_page)
 
     def _set_up_pixel_options_stack(self):
@@ -31,6 +31,7 @@ class ComponentTreeViewTab(QWidget):
         self.layout().addLayout(self.componentsTabLayout)
 
         self.sceneWidget = scene_widget
+        self.sceneWidget.component_picked.connect(self.select_component)
 
         self.component_tree_view.setDragEnabled(True)
         self.component_tree_view.setAcceptDrops(True)
@@ -135,6 +136,16 @@ class ComponentTreeViewTab(QWidget):
     def on_zoom_item(self):
         selected = self.component_tree_view.selectedIndexes()[0]
         component = selected.internalPointer()
-        self.sceneWidget.zoom_to_component(
-            self.sceneWidget.get_entity(component.name), self.sceneWidget.view.camera()
-        )
+        self.sceneWidget.zoom_to_component(component.name)
+
+    def select_component(self, name: str):
+        """
+        Selects a component in the tree, such as one picked in the 3D view.
+        :param name: The name of the component.
+        """
+        for row in range(self.component_model.rowCount(QModelIndex())):
+            index = self.component_model.index(row, 0, QModelIndex())
+            if index.internalPointer().name == name:
+                self.component_tree_view.setCurrentIndex(index)
+                self._set_button_state()
+                return